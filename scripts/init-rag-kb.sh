@@ -6,7 +6,7 @@
 set -e
 
 CONTAINER_NAME="ft_transcendence_ai_service"
-ENDPOINT="http://localhost:3003/api/v1/admin/rag/initialize"
+ENDPOINT="http://localhost:3003/api/v1/admin/rag/initialize?wait=true"
 
 echo "🔧 Initializing RAG Knowledge Base..."
 echo "======================================"
@@ -59,17 +59,23 @@ if command -v jq &> /dev/null; then
     FILES_PROCESSED=$(echo "$JSON_RESPONSE" | jq -r '.data.files_processed // 0')
     TOTAL_CHUNKS=$(echo "$JSON_RESPONSE" | jq -r '.data.total_chunks_created // 0')
     FILES_SKIPPED=$(echo "$JSON_RESPONSE" | jq -r '.data.files_skipped // 0')
+    FILES_UNCHANGED=$(echo "$JSON_RESPONSE" | jq -r '.data.files_unchanged // 0')
+    FILES_REMOVED=$(echo "$JSON_RESPONSE" | jq -r '.data.files_removed // 0')
     ERRORS=$(echo "$JSON_RESPONSE" | jq -r '.data.errors // []')
 else
     FILES_PROCESSED=$(echo "$JSON_RESPONSE" | grep -o '"files_processed":[0-9]*' | cut -d':' -f2 || echo "0")
     TOTAL_CHUNKS=$(echo "$JSON_RESPONSE" | grep -o '"total_chunks_created":[0-9]*' | cut -d':' -f2 || echo "0")
     FILES_SKIPPED=$(echo "$JSON_RESPONSE" | grep -o '"files_skipped":[0-9]*' | cut -d':' -f2 || echo "0")
+    FILES_UNCHANGED=$(echo "$JSON_RESPONSE" | grep -o '"files_unchanged":[0-9]*' | cut -d':' -f2 || echo "0")
+    FILES_REMOVED=$(echo "$JSON_RESPONSE" | grep -o '"files_removed":[0-9]*' | cut -d':' -f2 || echo "0")
 fi
 
 echo "📊 Ingestion Statistics:"
 echo "   Files Processed: ${FILES_PROCESSED}"
 echo "   Total Chunks Created: ${TOTAL_CHUNKS}"
 echo "   Files Skipped: ${FILES_SKIPPED}"
+echo "   Files Unchanged: ${FILES_UNCHANGED}"
+echo "   Files Removed: ${FILES_REMOVED}"
 
 # Show errors if any
 if [ "$FILES_SKIPPED" -gt 0 ]; then
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark DocumentProcessor chunking on a markdown corpus.
+
+Compares the token-offset chunker with the previous implementation (one
+tiktoken decode per overlapping window) on throughput and peak Python heap.
+
+Usage (from srcs/ai, or /app in the container):
+    python -m scripts.bench_chunker [--corpus DIR] [--repeat N] [--chunk-size T] [--overlap T] [--no-headers]
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Iterator, List
+
+from src.config import Settings
+from src.services.document_processor import DocumentProcessor
+
+
+def legacy_chunk_text(processor: DocumentProcessor, text: str) -> List[str]:
+    """Previous DocumentProcessor.chunk_text: decode every window."""
+    max_tokens = processor.chunk_size
+    overlap = processor.chunk_overlap
+    tokens = processor._tokenizer.encode(text)
+
+    if len(tokens) <= max_tokens:
+        return [text]
+
+    chunks = []
+    start = 0
+    while start < len(tokens):
+        end = min(start + max_tokens, len(tokens))
+        chunks.append(processor._tokenizer.decode(tokens[start:end]))
+        start = end - overlap if end < len(tokens) else len(tokens)
+    return chunks
+
+
+def load_corpus(corpus_dir: Path, repeat: int) -> List[str]:
+    """Read every .md file, concatenating each one `repeat` times to simulate large documents."""
+    documents = [path.read_text(encoding="utf-8") for path in sorted(corpus_dir.rglob("*.md"))]
+    if not documents:
+        raise SystemExit(f"No .md files found in {corpus_dir}")
+    return ["\n\n".join([doc] * repeat) for doc in documents]
+
+
+def chunk_corpus(documents: List[str], chunk_section: Callable[[str], Iterator[str]], processor: DocumentProcessor, split_headers: bool) -> int:
+    """Chunk every section of every document, returning the chunk count."""
+    chunk_count = 0
+    for doc in documents:
+        _, body = processor.parse_frontmatter(doc)
+        for section in processor.split_by_headers(body) if split_headers else [body]:
+            for _ in chunk_section(section):
+                chunk_count += 1
+    return chunk_count
+
+
+def run(name: str, documents: List[str], chunk_section: Callable[[str], Iterator[str]], processor: DocumentProcessor, split_headers: bool):
+    """Print throughput (untraced pass) and peak traced Python memory (second pass)."""
+    total_bytes = sum(len(doc.encode("utf-8")) for doc in documents)
+
+    started = time.perf_counter()
+    chunk_count = chunk_corpus(documents, chunk_section, processor, split_headers)
+    elapsed = time.perf_counter() - started
+
+    # tracemalloc slows allocation-heavy code, so memory is measured separately
+    tracemalloc.start()
+    chunk_corpus(documents, chunk_section, processor, split_headers)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<14} {chunk_count:>8} chunks  {elapsed:>8.3f} s  "
+        f"{total_bytes / elapsed / 1e6:>8.2f} MB/s  peak {peak / 2**20:>8.1f} MiB"
+    )
+
+
+def main():
+    settings = Settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--corpus", type=Path, default=Path(settings.KNOWLEDGE_BASE_DIR))
+    parser.add_argument("--repeat", type=int, default=50, help="Times each file is concatenated with itself")
+    parser.add_argument("--chunk-size", type=int, default=settings.CHUNK_SIZE)
+    parser.add_argument("--overlap", type=int, default=settings.CHUNK_OVERLAP)
+    parser.add_argument("--no-headers", action="store_true",
+                        help="Chunk each document as a single section (long unstructured text)")
+    args = parser.parse_args()
+
+    processor = DocumentProcessor(SimpleNamespace(
+        CHUNK_SIZE=args.chunk_size,
+        CHUNK_OVERLAP=args.overlap,
+        CHUNK_BOUNDARY_TOLERANCE=settings.CHUNK_BOUNDARY_TOLERANCE
+    ))
+    documents = load_corpus(args.corpus, args.repeat)
+    size_mb = sum(len(doc.encode("utf-8")) for doc in documents) / 1e6
+    print(f"Corpus: {len(documents)} documents, {size_mb:.1f} MB (x{args.repeat}), "
+          f"chunk_size={args.chunk_size}, overlap={args.overlap}, split_headers={not args.no_headers}")
+
+    # Warm the tokenizer and the offset tables so neither run pays for setup
+    processor.chunk_text("warm up " * args.chunk_size)
+
+    split_headers = not args.no_headers
+    run("decode/window", documents, lambda section: iter(legacy_chunk_text(processor, section)), processor, split_headers)
+    run("offsets", documents,
+        lambda section: (section[start:end] for start, end in processor.iter_chunk_spans(section)),
+        processor, split_headers)
+
+
+if __name__ == "__main__":
+    main()
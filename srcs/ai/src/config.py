@@ -14,15 +14,40 @@ class Settings(BaseSettings):
     OLLAMA_MODEL: str = "qwen3-vl:8b"
     OLLAMA_TIMEOUT: int = 300  # Increased for complex crossbreed detection (can take 120-180s)
     OLLAMA_TEMPERATURE: float = 0.1
+    OLLAMA_STRUCTURED_OUTPUT: bool = True  # Send a JSON schema as "format" with JSON-returning prompts
+    OLLAMA_KEEP_ALIVE: str = "30m"  # Sent with every call: how long Ollama keeps the model loaded ("-1m" = forever)
+    OLLAMA_WARMUP_ENABLED: bool = True  # Load the model on every backend before serving requests
+    OLLAMA_WARMUP_TIMEOUT: float = 120.0  # Seconds startup waits for the model to load
+    OLLAMA_KEEPALIVE_PING_SECONDS: float = 300.0  # Interval of background warmup calls (0 disables)
+
+    # Ollama backends (load balanced; health and model residency tracked per worker)
+    OLLAMA_BACKEND_URLS: str = ""  # Comma-separated Ollama hosts; empty = OLLAMA_BASE_URL only
+    OLLAMA_BACKEND_EJECT_AFTER: int = 3  # Consecutive failures before a backend sits out
+    OLLAMA_BACKEND_EJECT_SECONDS: float = 30.0
+    OLLAMA_BACKEND_PS_INTERVAL: float = 30.0  # Seconds between /api/ps checks for a loaded OLLAMA_MODEL
+
+    # Ollama request scheduler (per uvicorn worker)
+    OLLAMA_SCHEDULER_ENABLED: bool = True
+    OLLAMA_SCHEDULER_SLOTS: int = 1  # OLLAMA_NUM_PARALLEL summed over backends, divided by the number of workers
+    OLLAMA_SCHEDULER_MAX_QUEUE: int = 8  # Waiting calls per class (and more urgent) before fast rejection
 
     # Classification Service (NEW)
     CLASSIFICATION_SERVICE_URL: str = "http://classification-service:3004"
     CLASSIFICATION_TIMEOUT: int = 30
+    CLASSIFICATION_FUSED_PIPELINE: bool = True  # One /classify/pipeline call instead of three
+    CLASSIFICATION_BINARY_TRANSPORT: bool = True  # Send images as raw bytes instead of base64 JSON
+
+    # Upstream HTTP connection pools (one long-lived client per upstream)
+    HTTP_POOL_MAX_CONNECTIONS: int = 20
+    HTTP_POOL_MAX_KEEPALIVE: int = 10
+    HTTP_POOL_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept open
+    HTTP_POOL_HTTP2: bool = True  # Negotiated via TLS ALPN; plain-http upstreams stay on HTTP/1.1
 
     # Image Processing
     MAX_IMAGE_SIZE_MB: int = 5
     MAX_IMAGE_DIMENSION: int = 1024
     MIN_IMAGE_DIMENSION: int = 224
+    CLASSIFICATION_IMAGE_SIZE: int = 224  # Short side of the thumbnail sent to the classifiers (their input size)
     SUPPORTED_FORMATS: List[str] = ["jpeg", "jpg", "png", "webp"]
 
     # Vision Analysis Thresholds
@@ -30,21 +55,50 @@ class Settings(BaseSettings):
     SPECIES_MIN_CONFIDENCE: float = 0.10  # Minimum confidence for species detection
     BREED_MIN_CONFIDENCE: float = 0.05  # Minimum confidence for breed detection (lowered for crossbreeds)
 
+    # Vision Result Cache (keyed on a hash of the processed image bytes)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_TTL_SECONDS: int = 86400
+    RESULT_CACHE_MAX_ENTRIES: int = 512  # In-process LRU size per worker
+    REDIS_URL: str = ""  # e.g. redis://redis:6379/1 to share results across workers; empty = in-process only
+
     # RAG - ChromaDB
     CHROMA_PERSIST_DIR: str = "./data/chroma"
     CHROMA_COLLECTION_NAME: str = "pet_knowledge"
+    BREED_CONTEXT_TABLE_ENABLED: bool = True  # Precomputed per-breed context stored in CHROMA_PERSIST_DIR
+    KEYWORD_INDEX_ENABLED: bool = True  # BM25 index over the same chunks, stored in CHROMA_PERSIST_DIR
 
     # RAG - Embeddings
     EMBEDDING_MODEL: str = "all-MiniLM-L6-v2"
     EMBEDDING_DIMENSION: int = 384
+    EMBEDDING_CACHE_SIZE: int = 1024  # Query embeddings kept in the LRU cache (0 disables)
+    EMBEDDING_CACHE_WARM: bool = True  # Precompute breed-context queries for all classifier labels at startup
 
     # RAG - Document Processing
     CHUNK_SIZE: int = 500
     CHUNK_OVERLAP: int = 50
+    CHUNK_BOUNDARY_TOLERANCE: int = 64  # Tokens a chunk may end early to stop at a paragraph/sentence boundary
+
+    # RAG - Ingestion
+    INGEST_WORKERS: int = 0  # Processes reading/chunking files (0 = one per CPU core, 1 = in-process)
+    INGEST_EMBED_BATCH_SIZE: int = 256  # Chunks (from any number of files) per embedding + Chroma upsert
+    INGEST_WORKER_NICE: int = 10  # Niceness of chunking processes (queries keep CPU priority)
+    INGEST_QUERY_YIELD_MS: int = 2000  # Max time an embedding batch waits for in-flight queries
+    INGEST_JOB_POLL_INTERVAL: float = 1.0  # Seconds between job queue scans (jobs queued by other workers)
 
     # RAG - Query
     RAG_TOP_K: int = 5
     RAG_MIN_RELEVANCE: float = 0.3
+    RAG_RETRIEVAL_MODE: str = "hybrid"  # Default for queries: hybrid (BM25 + vectors), vector or keyword
+    RAG_RRF_K: int = 60  # Reciprocal rank fusion constant (higher flattens rank differences)
+    RAG_FUSION_DEPTH: int = 20  # Candidates taken from each retriever before fusion (at least top_k)
+
+    # RAG - Semantic Answer Cache (near-identical questions over the same retrieved chunks)
+    SEMANTIC_CACHE_ENABLED: bool = True
+    SEMANTIC_CACHE_THRESHOLD: float = 0.95  # Minimum cosine similarity between question embeddings
+    SEMANTIC_CACHE_TTL_SECONDS: int = 3600
+    SEMANTIC_CACHE_MAX_ENTRIES: int = 256  # Per worker
+    RAG_EXECUTOR_WORKERS: int = 4  # Threads for blocking embedding/ChromaDB calls
+    RAG_EXECUTOR_MAX_QUEUE: int = 32  # Calls allowed to wait for a thread before rejecting
 
     # RAG - Knowledge Base
     KNOWLEDGE_BASE_DIR: str = "./data/knowledge_base"
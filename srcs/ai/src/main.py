@@ -1,10 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import httpx
 import logging
 from contextlib import asynccontextmanager
 
 from src.config import Settings
-from src.routes import vision, rag
+from src.routes import vision, rag, metrics
 from src.services.image_processor import ImageProcessor
 from src.services.ollama_client import OllamaVisionClient
 from src.services.embedder import Embedder
@@ -12,6 +14,14 @@ from src.services.document_processor import DocumentProcessor
 from src.services.rag_service import RAGService
 from src.services.classification_client import ClassificationClient
 from src.services.vision_orchestrator import VisionOrchestrator
+from src.services.http_pool import PooledHTTPClient
+from src.services.ollama_backends import OllamaBackendPool
+from src.services.ollama_scheduler import OllamaScheduler
+from src.services.result_cache import AnalysisResultCache
+from src.services.breed_context_table import BreedContextTable
+from src.services.keyword_index import KeywordIndex
+from src.services.semantic_cache import SemanticAnswerCache
+from src.services.ingestion_jobs import IngestionJobManager
 from src.utils.logger import setup_logging
 
 # Initialize settings
@@ -21,29 +31,95 @@ settings = Settings()
 setup_logging(settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+
+async def prepare_breed_context(classification_client: ClassificationClient, rag_service: RAGService):
+    """Warm breed-context query embeddings and build the breed context table.
+
+    Both cover every label the breed classifiers can emit. Runs in the
+    background; on failure the cache and table fill on demand instead.
+    """
+    try:
+        labels = await classification_client.get_labels()
+        breed_labels = labels["dog_breeds"] + labels["cat_breeds"]
+
+        if settings.EMBEDDING_CACHE_WARM:
+            warmed = await rag_service.warm_breed_queries(breed_labels)
+            logger.info(f"Embedding cache warm-up complete: {warmed} breed queries")
+
+        table = rag_service.breed_table
+        if table is not None and (len(table) == 0 or set(table.labels) != set(breed_labels)):
+            built = await rag_service.build_breed_context_table(breed_labels)
+            logger.info(f"Breed context table built: {built} breeds")
+    except Exception as e:
+        logger.warning(f"Breed context preparation skipped: {e}")
+
+
+async def keep_ollama_warm(ollama_client: OllamaVisionClient, interval: float):
+    """Ping every Ollama backend so the model is reloaded before a request needs it.
+
+    Each ping is a warmup call, which loads the model if Ollama evicted it
+    and restarts its keep_alive timer otherwise.
+    """
+    while True:
+        await asyncio.sleep(interval)
+        resident = await ollama_client.warmup(timeout=settings.OLLAMA_WARMUP_TIMEOUT)
+        logger.debug(f"Ollama keepalive ping: {resident}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application startup and shutdown events."""
     # Startup
     logger.info(f"Starting {settings.SERVICE_NAME}...")
 
+    # Long-lived connection pools, one per upstream
+    ollama_http = PooledHTTPClient(
+        "ollama",
+        settings,
+        timeout=httpx.Timeout(settings.OLLAMA_TIMEOUT, connect=settings.OLLAMA_TIMEOUT)
+    )
+    classification_http = PooledHTTPClient(
+        "classification",
+        settings,
+        timeout=settings.CLASSIFICATION_TIMEOUT
+    )
+
     # Initialize core services
     image_processor = ImageProcessor(settings)
-    ollama_client = OllamaVisionClient(settings)
-    classification_client = ClassificationClient(settings)
+    ollama_scheduler = OllamaScheduler(settings) if settings.OLLAMA_SCHEDULER_ENABLED else None
+    ollama_backends = OllamaBackendPool(settings)
+    ollama_client = OllamaVisionClient(
+        settings,
+        http_pool=ollama_http,
+        scheduler=ollama_scheduler,
+        backends=ollama_backends
+    )
+    classification_client = ClassificationClient(settings, http_pool=classification_http)
 
     # Initialize RAG services
     logger.info("Initializing RAG services...")
     embedder = Embedder(settings)
     document_processor = DocumentProcessor(settings)
-    rag_service = RAGService(settings, embedder, ollama_client)
+    breed_table = BreedContextTable(settings) if settings.BREED_CONTEXT_TABLE_ENABLED else None
+    keyword_index = KeywordIndex(settings) if settings.KEYWORD_INDEX_ENABLED else None
+    answer_cache = SemanticAnswerCache(settings) if settings.SEMANTIC_CACHE_ENABLED else None
+    rag_service = RAGService(
+        settings,
+        embedder,
+        ollama_client,
+        breed_table=breed_table,
+        keyword_index=keyword_index,
+        answer_cache=answer_cache
+    )
 
     # Initialize orchestrator
+    result_cache = AnalysisResultCache(settings) if settings.RESULT_CACHE_ENABLED else None
     vision_orchestrator = VisionOrchestrator(
         classification_client,
         ollama_client,
         rag_service,
-        settings
+        settings,
+        result_cache=result_cache
     )
 
     # Inject into routes
@@ -52,8 +128,35 @@ async def lifespan(app: FastAPI):
 
     rag.rag_service = rag_service
     rag.document_processor = document_processor
-
-    logger.info(f"Ollama URL: {settings.OLLAMA_BASE_URL}")
+    ingestion_jobs = IngestionJobManager(settings)
+    ingestion_jobs.register("initialize", rag.run_initialize_job)
+    ingestion_jobs.register("ingest", rag.run_ingest_job)
+    rag.ingestion_jobs = ingestion_jobs
+
+    metrics.http_pools = [ollama_http, classification_http]
+    metrics.result_cache = result_cache
+    metrics.ollama_scheduler = ollama_scheduler
+    metrics.ollama_backends = ollama_backends
+    app.state.ollama_backends = ollama_backends
+    metrics.rag_service = rag_service
+
+    # Picks up jobs queued before a restart and resumes interrupted ones
+    ingestion_jobs.start()
+
+    warmup_task = None
+    if settings.EMBEDDING_CACHE_WARM or breed_table is not None:
+        warmup_task = asyncio.create_task(prepare_breed_context(classification_client, rag_service))
+
+    # Load the model before serving, so the first request does not pay for it
+    if settings.OLLAMA_WARMUP_ENABLED:
+        resident = await ollama_client.warmup(timeout=settings.OLLAMA_WARMUP_TIMEOUT)
+        logger.info(f"Ollama warmup complete: {resident}")
+
+    keepalive_task = None
+    if settings.OLLAMA_KEEPALIVE_PING_SECONDS > 0:
+        keepalive_task = asyncio.create_task(keep_ollama_warm(ollama_client, settings.OLLAMA_KEEPALIVE_PING_SECONDS))
+
+    logger.info(f"Ollama URLs: {[backend.url for backend in ollama_backends.backends]}")
     logger.info(f"Model: {settings.OLLAMA_MODEL}")
     logger.info(f"RAG Collection: {settings.CHROMA_COLLECTION_NAME}")
     logger.info(f"{settings.SERVICE_NAME} started successfully")
@@ -62,6 +165,20 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info(f"Shutting down {settings.SERVICE_NAME}...")
+    if warmup_task is not None:
+        warmup_task.cancel()
+    if keepalive_task is not None:
+        keepalive_task.cancel()
+    await ollama_http.aclose()
+    await classification_http.aclose()
+    if result_cache is not None:
+        await result_cache.aclose()
+    await ingestion_jobs.stop()
+    rag_service.executor.shutdown()
+    if keyword_index is not None:
+        keyword_index.save_if_dirty()
+    if breed_table is not None:
+        breed_table.save_if_dirty()
 
 # Create FastAPI app
 app = FastAPI(
@@ -83,15 +200,22 @@ app.add_middleware(
 # Health check
 @app.get("/health")
 async def health_check():
-    """Service health check endpoint."""
+    """Service health check endpoint.
+
+    Includes whether OLLAMA_MODEL is resident on the Ollama backends (as of
+    the last warmup, keepalive ping or /api/ps check; None if unknown).
+    """
+    ollama_backends = getattr(app.state, "ollama_backends", None)
     return {
         "status": "healthy",
         "service": settings.SERVICE_NAME,
         "ollama_url": settings.OLLAMA_BASE_URL,
-        "model": settings.OLLAMA_MODEL
+        "model": settings.OLLAMA_MODEL,
+        "model_residency": ollama_backends.residency() if ollama_backends is not None else None
     }
 
 # Include routers
 app.include_router(vision.router)
 app.include_router(rag.router)
 app.include_router(rag.admin_router)
+app.include_router(metrics.router)
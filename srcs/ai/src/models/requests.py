@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator, field_validator
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Literal
 
 
 class VisionAnalysisOptions(BaseModel):
@@ -27,6 +27,10 @@ class RAGQueryRequest(BaseModel):
     question: str = Field(..., min_length=1, description="Question to answer")
     filters: Optional[Dict[str, Any]] = Field(None, description="Metadata filters")
     top_k: int = Field(5, ge=1, le=20, description="Number of chunks to retrieve")
+    mode: Optional[Literal["hybrid", "vector", "keyword"]] = Field(
+        None,
+        description="Retrieval mode (default: RAG_RETRIEVAL_MODE); keyword skips embedding the question"
+    )
 
     @field_validator('question')
     @classmethod
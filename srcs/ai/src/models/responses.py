@@ -95,3 +95,21 @@ class RAGBulkIngestResponse(BaseModel):
     total_chunks_created: int
     files_skipped: int
     errors: List[str]
+    files_unchanged: int = 0
+    files_removed: int = 0
+    chunks_deleted: int = 0
+
+
+class RAGIngestionJobResponse(BaseModel):
+    """Background ingestion job state."""
+    job_id: str
+    kind: str
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    progress: Dict[str, int] = Field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None  # RAGBulkIngestResponse or RAGIngestResponse, by kind
+    error: Optional[str] = None
+    attempts: int = 0
+    cancel_requested: bool = False
@@ -0,0 +1,41 @@
+"""Internal service metrics endpoint."""
+
+from fastapi import APIRouter
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter(tags=["metrics"])
+
+# Metric sources (injected at startup)
+http_pools = []
+result_cache = None
+ollama_scheduler = None
+ollama_backends = None
+rag_service = None
+
+
+@router.get("/metrics")
+async def get_metrics():
+    """Report runtime metrics for the AI service.
+
+    Returns:
+        Dict with connection reuse statistics per upstream HTTP pool and
+        vision result cache, Ollama scheduler, Ollama backend, embedding
+        cache, breed context table, keyword index, semantic answer cache,
+        RAG retrieval and RAG executor statistics
+    """
+    return {
+        "http_pools": {pool.name: pool.get_stats() for pool in http_pools},
+        "result_cache": result_cache.get_stats() if result_cache is not None else None,
+        "ollama_scheduler": ollama_scheduler.get_stats() if ollama_scheduler is not None else None,
+        "ollama_backends": ollama_backends.get_stats() if ollama_backends is not None else None,
+        "embedding_cache": rag_service.embedder.get_cache_stats() if rag_service is not None else None,
+        "breed_context_table": rag_service.breed_table.get_stats()
+        if rag_service is not None and rag_service.breed_table is not None else None,
+        "keyword_index": rag_service.keyword_index.get_stats()
+        if rag_service is not None and rag_service.keyword_index is not None else None,
+        "semantic_cache": rag_service.answer_cache.get_stats()
+        if rag_service is not None and rag_service.answer_cache is not None else None,
+        "rag_retrieval": rag_service.get_retrieval_stats() if rag_service is not None else None,
+        "rag_executor": rag_service.executor.get_stats() if rag_service is not None else None
+    }
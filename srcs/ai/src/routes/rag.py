@@ -1,8 +1,11 @@
 """RAG API endpoints."""
 
 from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import JSONResponse, StreamingResponse
 import logging
+from dataclasses import asdict
 from pathlib import Path
+from typing import AsyncIterator, List
 
 from src.models.requests import RAGQueryRequest, RAGIngestRequest
 from src.models.responses import (
@@ -10,11 +13,15 @@ from src.models.responses import (
     RAGSourceData,
     RAGIngestResponse,
     RAGStatusResponse,
-    RAGBulkIngestResponse
+    RAGBulkIngestResponse,
+    RAGIngestionJobResponse
 )
-from src.services.rag_service import RAGService
+from src.services.rag_service import RAGService, Source
+from src.services.ollama_scheduler import OllamaBusy
 from src.services.document_processor import DocumentProcessor
-from src.utils.responses import success_response, error_response
+from src.services.kb_ingestor import KnowledgeBaseIngestor
+from src.services.ingestion_jobs import IngestionJob, IngestionJobManager, JobContext
+from src.utils.responses import success_response, error_response, sse_event
 from src.middleware.localhost import require_localhost
 
 logger = logging.getLogger(__name__)
@@ -24,104 +31,249 @@ admin_router = APIRouter(prefix="/api/v1/admin/rag", tags=["admin_rag"])
 # Service instances (injected at startup)
 rag_service: RAGService = None
 document_processor: DocumentProcessor = None
+ingestion_jobs: IngestionJobManager = None
+
+
+async def _rebuild_breed_context():
+    """Rebuild the breed context table after the knowledge base changed.
+
+    Failure is not fatal: the table was reset on ingest and refills lazily.
+    """
+    try:
+        await rag_service.build_breed_context_table()
+    except Exception as e:
+        logger.warning(f"Breed context table rebuild failed: {e}")
+
+
+def _services_unavailable() -> HTTPException:
+    """503 raised when the RAG services or job queue were not injected."""
+    logger.error("RAG services not initialized")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=error_response(
+            code="SERVICE_UNAVAILABLE",
+            message="RAG services are not initialized. Please restart the service."
+        )
+    )
+
+
+def _job_not_found(job_id: str) -> HTTPException:
+    """404 for an unknown (or pruned) job id."""
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=error_response(
+            code="JOB_NOT_FOUND",
+            message=f"Ingestion job not found: {job_id}"
+        )
+    )
+
+
+def _job_accepted(job: IngestionJob) -> JSONResponse:
+    """202 response pointing the caller at GET /jobs/{job_id}."""
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content=success_response(RAGIngestionJobResponse(**asdict(job)).model_dump())
+    )
+
+
+def _queries_in_flight() -> bool:
+    """Whether this worker is currently serving RAG queries."""
+    return rag_service.executor.in_flight > 0
+
+
+async def run_initialize_job(job: IngestionJob, context: JobContext) -> dict:
+    """Job handler: sync the collection with the knowledge base directory.
+
+    Args:
+        job: The running job
+        context: Job context (progress, cancellation, ingestion thread)
+
+    Returns:
+        Bulk ingestion stats (RAGBulkIngestResponse)
+    """
+    ingestor = KnowledgeBaseIngestor(rag_service.config, document_processor, rag_service)
+
+    def sync_knowledge_base() -> dict:
+        # Collection-wide bookkeeping once per job, also when cancelled part-way
+        try:
+            return ingestor.ingest_directory(context.progress, context.cancelled, _queries_in_flight)
+        finally:
+            rag_service.finish_ingest()
+
+    result = await context.run_in_thread(sync_knowledge_base)
+    data = RAGBulkIngestResponse(**result)
+
+    logger.info(
+        f"Bulk ingestion complete: {data.files_processed} files, {data.total_chunks_created} chunks, "
+        f"{data.files_unchanged} unchanged, {data.files_removed} removed"
+    )
+
+    if data.total_chunks_created or data.chunks_deleted:
+        await _rebuild_breed_context()
+
+    return data.model_dump()
+
+
+async def run_ingest_job(job: IngestionJob, context: JobContext) -> dict:
+    """Job handler: chunk, embed and store one submitted document.
+
+    Args:
+        job: The running job; payload holds content, metadata and source_name
+        context: Job context (progress, cancellation, ingestion thread)
+
+    Returns:
+        Ingest stats (RAGIngestResponse)
+
+    Raises:
+        ValueError: If the document cannot be chunked
+    """
+    request = RAGIngestRequest(**job.payload)
+
+    def ingest_document() -> int:
+        chunks = document_processor.process(
+            content=request.content,
+            metadata={
+                **request.metadata,
+                "source_file": request.source_name
+            }
+        )
+        context.check_cancelled()
+        try:
+            return rag_service.add_documents(chunks)
+        finally:
+            rag_service.finish_ingest()
+
+    chunks_added = await context.run_in_thread(ingest_document)
+    await _rebuild_breed_context()
+
+    # Generate document ID from source name
+    doc_id = request.source_name.replace("/", "_").replace(".", "_")
+
+    return RAGIngestResponse(
+        chunks_created=chunks_added,
+        document_id=doc_id
+    ).model_dump()
+
 
 @admin_router.post("/initialize", response_model=dict)
-async def initialize_knowledge_base(_: bool = Depends(require_localhost)):
+async def initialize_knowledge_base(wait: bool = False, _: bool = Depends(require_localhost)):
     """Initialize knowledge base by ingesting all files from knowledge_base directory.
 
-    This endpoint walks through the knowledge base directory, reads all .md files,
-    processes them into chunks, and adds them to ChromaDB.
+    Queues a background ingestion job that syncs ChromaDB with the knowledge
+    base's .md files: new and changed files are read and chunked in a process
+    pool, embedded and upserted in large batches, chunks of removed files are
+    deleted, and unchanged files are skipped. Calling this while a sync is
+    queued or running returns that job.
 
     SECURITY: This endpoint is restricted to localhost access only via require_localhost dependency.
 
+    Args:
+        wait: Block until the job finishes and return its bulk ingestion stats
+
     Returns:
-        Standardized response with bulk ingestion stats
+        202 with the job (poll GET /jobs/{job_id}), or 200 with bulk
+        ingestion stats when wait=true
     """
-    if document_processor is None or rag_service is None:
-        logger.error("RAG services not initialized")
+    if document_processor is None or rag_service is None or ingestion_jobs is None:
+        raise _services_unavailable()
+
+    kb_dir = Path(rag_service.config.KNOWLEDGE_BASE_DIR)
+    if not kb_dir.exists():
+        logger.error(f"Knowledge base directory not found: {kb_dir}")
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            status_code=status.HTTP_404_NOT_FOUND,
             detail=error_response(
-                code="SERVICE_UNAVAILABLE",
-                message="RAG services are not initialized. Please restart the service."
+                code="DIRECTORY_NOT_FOUND",
+                message=f"Knowledge base directory not found: {kb_dir}"
             )
         )
 
-    try:
-        # Get knowledge base directory from config
-        kb_dir = Path(rag_service.config.KNOWLEDGE_BASE_DIR)
-
-        if not kb_dir.exists():
-            logger.error(f"Knowledge base directory not found: {kb_dir}")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=error_response(
-                    code="DIRECTORY_NOT_FOUND",
-                    message=f"Knowledge base directory not found: {kb_dir}"
-                )
-            )
+    job = ingestion_jobs.enqueue("initialize", coalesce=True)
+    if not wait:
+        return _job_accepted(job)
 
-        files_processed = 0
-        files_skipped = 0
-        total_chunks = 0
-        errors = []
-
-        # Walk through all subdirectories and find .md files
-        for md_file in kb_dir.rglob("*.md"):
-            try:
-                # Read file content
-                content = md_file.read_text(encoding="utf-8")
-
-                # Get relative path for source tracking
-                relative_path = md_file.relative_to(kb_dir)
-
-                # Process document into chunks
-                chunks = document_processor.process(
-                    content=content,
-                    metadata={
-                        "source_file": str(relative_path),
-                        "source_type": "knowledge_base"
-                    }
-                )
-
-                # Add to vector store
-                chunks_added = rag_service.add_documents(chunks)
-
-                files_processed += 1
-                total_chunks += chunks_added
-
-                logger.info(f"Ingested {relative_path}: {chunks_added} chunks")
-
-            except Exception as e:
-                files_skipped += 1
-                error_msg = f"{md_file.name}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(f"Failed to ingest {md_file}: {e}", exc_info=True)
-
-        # Build response
-        data = RAGBulkIngestResponse(
-            files_processed=files_processed,
-            total_chunks_created=total_chunks,
-            files_skipped=files_skipped,
-            errors=errors
+    job = await ingestion_jobs.wait(job.job_id)
+    if job is None or job.status != "completed":
+        logger.error(f"Bulk ingestion failed: {job.error if job else 'job lost'}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_response(
+                code="INTERNAL_ERROR",
+                message="Failed to initialize knowledge base"
+            )
         )
 
-        logger.info(f"Bulk ingestion complete: {files_processed} files, {total_chunks} chunks")
+    return success_response(job.result)
 
-        return success_response(data.model_dump())
 
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Bulk ingestion failed: {e}", exc_info=True)
+@admin_router.get("/jobs", response_model=dict)
+async def list_ingestion_jobs(_: bool = Depends(require_localhost)):
+    """List queued, running and recently finished ingestion jobs.
+
+    SECURITY: This endpoint is restricted to localhost access only via require_localhost dependency.
+
+    Returns:
+        Standardized response with jobs, oldest first
+    """
+    if ingestion_jobs is None:
+        raise _services_unavailable()
+
+    return success_response([
+        RAGIngestionJobResponse(**asdict(job)).model_dump()
+        for job in ingestion_jobs.list_jobs()
+    ])
+
+
+@admin_router.get("/jobs/{job_id}", response_model=dict)
+async def get_ingestion_job(job_id: str, _: bool = Depends(require_localhost)):
+    """Get the state and progress of an ingestion job.
+
+    SECURITY: This endpoint is restricted to localhost access only via require_localhost dependency.
+
+    Args:
+        job_id: Job id returned by POST /initialize or POST /rag/ingest
+
+    Returns:
+        Standardized response with job status, progress and (when
+        completed) the job's result
+    """
+    job = ingestion_jobs.get(job_id) if ingestion_jobs is not None else None
+    if job is None:
+        raise _job_not_found(job_id)
+
+    return success_response(RAGIngestionJobResponse(**asdict(job)).model_dump())
+
+
+@admin_router.post("/jobs/{job_id}/cancel", response_model=dict)
+async def cancel_ingestion_job(job_id: str, _: bool = Depends(require_localhost)):
+    """Cancel an ingestion job.
+
+    A queued job is dropped immediately. A running job stops at its next
+    checkpoint (between files); files already committed stay ingested.
+
+    SECURITY: This endpoint is restricted to localhost access only via require_localhost dependency.
+
+    Args:
+        job_id: Job identifier
+
+    Returns:
+        Standardized response with the job's updated state
+    """
+    job = ingestion_jobs.cancel(job_id) if ingestion_jobs is not None else None
+    if job is None:
+        raise _job_not_found(job_id)
+
+    if job.status in ("completed", "failed"):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            status_code=status.HTTP_409_CONFLICT,
             detail=error_response(
-                code="INTERNAL_ERROR",
-                message="Failed to initialize knowledge base"
+                code="JOB_FINISHED",
+                message=f"Ingestion job already {job.status}: {job_id}"
             )
         )
 
+    return success_response(RAGIngestionJobResponse(**asdict(job)).model_dump())
+
 
 @router.post("/query", response_model=dict)
 async def query(request: RAGQueryRequest):
@@ -145,24 +297,29 @@ async def query(request: RAGQueryRequest):
         response = await rag_service.query(
             question=request.question,
             filters=request.filters,
-            top_k=request.top_k
+            top_k=request.top_k,
+            mode=request.mode
         )
 
         data = RAGQueryResponse(
             answer=response.answer,
-            sources=[
-                RAGSourceData(
-                    content=s.content,
-                    source_file=s.source_file,
-                    relevance_score=s.relevance_score
-                )
-                for s in response.sources
-            ],
+            sources=_source_data(response.sources),
             model=response.model
         )
 
         return success_response(data.model_dump())
 
+    except OllamaBusy as e:
+        logger.warning(f"RAG query rejected - Ollama busy: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=error_response(
+                code="RAG_SERVICE_BUSY",
+                message="RAG service is busy, please retry later",
+                details={"retry_after": e.retry_after}
+            ),
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except ConnectionError as e:
         logger.error(f"RAG query failed - Ollama unavailable: {e}")
         raise HTTPException(
@@ -183,65 +340,136 @@ async def query(request: RAGQueryRequest):
         )
 
 
+@router.post("/query/stream")
+async def query_stream(request: RAGQueryRequest):
+    """Query the knowledge base, streaming the answer as server-sent events.
+
+    Events:
+
+    - sources: retrieved sources, sent before generation starts
+    - token: one answer fragment
+    - complete: the same data object /query returns
+    - error: {code, message} if the query fails mid-stream (plus
+      retry_after in seconds when rejected because Ollama is busy)
+
+    Returns:
+        text/event-stream response
+    """
+    if rag_service is None:
+        raise _services_unavailable()
+
+    return StreamingResponse(
+        _stream_query_events(request),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+async def _stream_query_events(request: RAGQueryRequest) -> AsyncIterator[str]:
+    """Run a streaming RAG query and format its events as SSE frames."""
+    try:
+        async for event, data in rag_service.query_stream(
+            question=request.question,
+            filters=request.filters,
+            top_k=request.top_k,
+            mode=request.mode
+        ):
+            if event == "sources":
+                data = [source.model_dump() for source in _source_data(data)]
+            elif event == "complete":
+                data = RAGQueryResponse(
+                    answer=data.answer,
+                    sources=_source_data(data.sources),
+                    model=data.model
+                ).model_dump()
+            yield sse_event(event, data)
+
+    except OllamaBusy as e:
+        logger.warning(f"Streaming RAG query rejected - Ollama busy: {e}")
+        yield sse_event("error", {
+            "code": "RAG_SERVICE_BUSY",
+            "message": "RAG service is busy, please retry later",
+            "retry_after": e.retry_after
+        })
+
+    except ConnectionError as e:
+        logger.error(f"Streaming RAG query failed - Ollama unavailable: {e}")
+        yield sse_event("error", {
+            "code": "RAG_SERVICE_UNAVAILABLE",
+            "message": "RAG service temporarily unavailable"
+        })
+
+    except Exception as e:
+        logger.error(f"Streaming RAG query failed: {e}", exc_info=True)
+        yield sse_event("error", {
+            "code": "INTERNAL_ERROR",
+            "message": "An unexpected error occurred"
+        })
+
+
+def _source_data(sources: List[Source]) -> List[RAGSourceData]:
+    """Convert retrieved sources to their response model."""
+    return [
+        RAGSourceData(
+            content=s.content,
+            source_file=s.source_file,
+            relevance_score=s.relevance_score
+        )
+        for s in sources
+    ]
+
+
 @router.post("/ingest", response_model=dict)
-async def ingest(request: RAGIngestRequest):
+async def ingest(request: RAGIngestRequest, wait: bool = False):
     """Ingest a document into the knowledge base.
 
+    The document is chunked and embedded by a background ingestion job.
+
     Args:
         request: Ingest request with content and metadata
+        wait: Block until the job finishes and return its ingestion stats
 
     Returns:
-        Standardized response with ingestion stats
+        202 with the job (poll GET /api/v1/admin/rag/jobs/{job_id}), or
+        200 with ingestion stats when wait=true
     """
-    if document_processor is None or rag_service is None:
+    if document_processor is None or rag_service is None or ingestion_jobs is None:
         logger.error("RAG services not initialized")
         return error_response(
             "SERVICE_UNAVAILABLE",
             "RAG services are not initialized. Please restart the service.",
             status.HTTP_503_SERVICE_UNAVAILABLE
         )
-    
-    try:
-        # Process document into chunks
-        chunks = document_processor.process(
-            content=request.content,
-            metadata={
-                **request.metadata,
-                "source_file": request.source_name
-            }
-        )
-
-        # Add to vector store
-        chunks_added = rag_service.add_documents(chunks)
 
-        # Generate document ID from source name
-        doc_id = request.source_name.replace("/", "_").replace(".", "_")
+    job = ingestion_jobs.enqueue("ingest", payload=request.model_dump())
+    if not wait:
+        return _job_accepted(job)
 
-        data = RAGIngestResponse(
-            chunks_created=chunks_added,
-            document_id=doc_id
-        )
+    job = await ingestion_jobs.wait(job.job_id)
+    if job is not None and job.status == "completed":
+        return success_response(job.result)
 
-        return success_response(data.model_dump())
-
-    except ValueError as e:
-        logger.warning(f"Ingest validation failed: {e}")
+    if job is not None and job.error_type == "ValueError":
+        logger.warning(f"Ingest validation failed: {job.error}")
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=error_response(
                 code="INVALID_DOCUMENT",
-                message=str(e)
+                message=job.error
             )
         )
-    except Exception as e:
-        logger.error(f"Document ingestion failed: {e}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=error_response(
-                code="INTERNAL_ERROR",
-                message="Failed to ingest document"
-            )
+
+    logger.error(f"Document ingestion failed: {job.error if job else 'job lost'}")
+    raise HTTPException(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        detail=error_response(
+            code="INTERNAL_ERROR",
+            message="Failed to ingest document"
         )
+    )
 
 
 @router.get("/status", response_model=dict)
@@ -1,9 +1,14 @@
 from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 import logging
 from datetime import datetime
+from typing import AsyncIterator
 
 from src.models.responses import VisionAnalysisResponse, VisionAnalysisData
+from src.services.image_processor import ProcessedImage
+from src.services.ollama_scheduler import OllamaBusy
+from src.utils.responses import sse_event
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +25,17 @@ class VisionAnalysisRequest(BaseModel):
 image_processor = None
 vision_orchestrator = None  # Changed from ollama_client
 
+# Validation error codes (raised as ValueError by the pipeline) -> user-facing messages
+VALIDATION_ERROR_MESSAGES = {
+    "CONTENT_POLICY_VIOLATION": "Image does not meet content policy requirements",
+    "UNSUPPORTED_SPECIES": "Only dog and cat images are supported",
+    "SPECIES_DETECTION_FAILED": "Unable to identify species with sufficient confidence",
+    "BREED_DETECTION_FAILED": "Unable to identify breed with sufficient confidence",
+    "INVALID_IMAGE_FORMAT": "Invalid image format or corrupted image",
+    "IMAGE_TOO_LARGE": "Image size exceeds maximum allowed size",
+    "IMAGE_TOO_SMALL": "Image dimensions are too small for analysis"
+}
+
 
 @router.post("/analyze", response_model=VisionAnalysisResponse)
 async def analyze_image(request: VisionAnalysisRequest):
@@ -42,7 +58,10 @@ async def analyze_image(request: VisionAnalysisRequest):
         processed_image = image_processor.process_image(request.image)
 
         # Run orchestrated pipeline
-        result = await vision_orchestrator.analyze_image(processed_image)
+        result = await vision_orchestrator.analyze_image(
+            processed_image.vlm,
+            classification_image=processed_image.classification
+        )
 
         # Build response
         data = VisionAnalysisData(**result)
@@ -56,15 +75,6 @@ async def analyze_image(request: VisionAnalysisRequest):
     except ValueError as e:
         # Classification rejection errors (422)
         error_code = str(e)
-        error_map = {
-            "CONTENT_POLICY_VIOLATION": "Image does not meet content policy requirements",
-            "UNSUPPORTED_SPECIES": "Only dog and cat images are supported",
-            "SPECIES_DETECTION_FAILED": "Unable to identify species with sufficient confidence",
-            "BREED_DETECTION_FAILED": "Unable to identify breed with sufficient confidence",
-            "INVALID_IMAGE_FORMAT": "Invalid image format or corrupted image",
-            "IMAGE_TOO_LARGE": "Image size exceeds maximum allowed size",
-            "IMAGE_TOO_SMALL": "Image dimensions are too small for analysis"
-        }
 
         logger.warning(f"Validation error: {error_code}")
         raise HTTPException(
@@ -74,12 +84,30 @@ async def analyze_image(request: VisionAnalysisRequest):
                 "data": None,
                 "error": {
                     "code": error_code,
-                    "message": error_map.get(error_code, "Validation failed")
+                    "message": VALIDATION_ERROR_MESSAGES.get(error_code, "Validation failed")
                 },
                 "timestamp": datetime.utcnow().isoformat()
             }
         )
 
+    except OllamaBusy as e:
+        # Ollama queue full: fast rejection with a retry hint (503)
+        logger.warning(f"Vision analysis rejected: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail={
+                "success": False,
+                "data": None,
+                "error": {
+                    "code": "VISION_SERVICE_BUSY",
+                    "message": "Vision analysis is busy, please try again later",
+                    "retry_after": e.retry_after
+                },
+                "timestamp": datetime.utcnow().isoformat()
+            },
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
     except ConnectionError as e:
         # Service unavailability (503)
         logger.error(f"Service connection failed: {str(e)}")
@@ -113,6 +141,94 @@ async def analyze_image(request: VisionAnalysisRequest):
         )
 
 
+@router.post("/analyze/stream")
+async def analyze_image_stream(request: VisionAnalysisRequest):
+    """Analyze pet image, streaming per-stage progress as server-sent events.
+
+    Image validation happens before the stream starts, so invalid images get
+    the same 422 response as /analyze. After that, events are emitted as the
+    pipeline progresses:
+
+    - classification: species and breed_analysis (after stages 2-4)
+    - enrichment: enriched_info from RAG (after stage 5)
+    - token: one Ollama output fragment (during stage 6)
+    - complete: the same data object /analyze returns
+    - error: {code, message} if the pipeline fails mid-stream (plus
+      retry_after in seconds when rejected because Ollama is busy)
+
+    Returns:
+        text/event-stream response
+    """
+    try:
+        processed_image = image_processor.process_image(request.image)
+    except ValueError as e:
+        error_code = str(e)
+        logger.warning(f"Validation error: {error_code}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "success": False,
+                "data": None,
+                "error": {
+                    "code": error_code,
+                    "message": VALIDATION_ERROR_MESSAGES.get(error_code, "Validation failed")
+                },
+                "timestamp": datetime.utcnow().isoformat()
+            }
+        )
+
+    return StreamingResponse(
+        _stream_events(processed_image),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+        }
+    )
+
+
+async def _stream_events(processed_image: ProcessedImage) -> AsyncIterator[str]:
+    """Run the streaming pipeline and format its events as SSE frames."""
+    try:
+        async for event, data in vision_orchestrator.analyze_image_stream(
+            processed_image.vlm,
+            classification_image=processed_image.classification
+        ):
+            if event == "complete":
+                data = VisionAnalysisData(**data).model_dump()
+            yield sse_event(event, data)
+
+    except ValueError as e:
+        error_code = str(e)
+        logger.warning(f"Validation error: {error_code}")
+        yield sse_event("error", {
+            "code": error_code,
+            "message": VALIDATION_ERROR_MESSAGES.get(error_code, "Validation failed")
+        })
+
+    except OllamaBusy as e:
+        logger.warning(f"Vision analysis rejected: {str(e)}")
+        yield sse_event("error", {
+            "code": "VISION_SERVICE_BUSY",
+            "message": "Vision analysis is busy, please try again later",
+            "retry_after": e.retry_after
+        })
+
+    except ConnectionError as e:
+        logger.error(f"Service connection failed: {str(e)}")
+        yield sse_event("error", {
+            "code": "VISION_SERVICE_UNAVAILABLE",
+            "message": "Vision analysis temporarily unavailable, please try again"
+        })
+
+    except Exception as e:
+        logger.error(f"Unexpected error during streaming vision analysis: {str(e)}", exc_info=True)
+        yield sse_event("error", {
+            "code": "INTERNAL_ERROR",
+            "message": "An unexpected error occurred during analysis"
+        })
+
+
 @router.get("/health")
 async def health_check():
     """Vision service health check."""
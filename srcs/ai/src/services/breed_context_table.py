@@ -0,0 +1,227 @@
+"""Precomputed per-breed retrieval results, persisted next to the Chroma collection."""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BreedContextTable:
+    """Breed label -> top retrieved documents and sources.
+
+    The breed vocabulary is closed (the classifiers' id2label), so the
+    breed-context vector search can run once per label at ingestion time.
+    The table records a fingerprint of the collection it was built from;
+    when the knowledge base changes it is reset to the new fingerprint and
+    entries are refilled by the next rebuild or lazily on lookup.
+
+    Ingestion changes the collection on the ingestion thread while lookups
+    fill entries from the event loop. Ingestion only invalidates the table
+    (in memory, no fingerprint) and resets it once at the end of the job.
+    Every invalidation bumps a generation counter, and a lazily filled
+    entry is only stored if the generation it was searched under is still
+    current, so a result from before a change never survives it.
+
+    The JSON file is shared by all uvicorn workers: a worker reloads it
+    whenever another worker has rewritten it.
+    """
+
+    def __init__(self, config):
+        """Initialize breed context table.
+
+        Args:
+            config: Settings instance (table is stored in CHROMA_PERSIST_DIR)
+        """
+        self.path = Path(config.CHROMA_PERSIST_DIR) / "breed_context.json"
+        self.fingerprint: Optional[str] = None
+        self.labels: List[str] = []
+        self._entries: Dict[str, Dict[str, List[str]]] = {}
+        self._mtime: Optional[float] = None
+        self._dirty = False
+        self._stale = False
+        self.generation = 0
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+        self.load()
+        logger.info(f"BreedContextTable initialized: {self.path} ({len(self._entries)} entries)")
+
+    def load(self):
+        """Load the table from disk (missing or corrupt files give an empty table)."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable breed context table {self.path}: {e}")
+            return
+
+        with self._lock:
+            self.fingerprint = data.get("fingerprint")
+            self.labels = data.get("labels", [])
+            self._entries = data.get("entries", {})
+            self._dirty = False
+            self._stale = False
+            self.generation += 1
+
+    def save(self):
+        """Atomically write the table to disk."""
+        with self._save_lock:
+            # Snapshot under the lock: put() may insert from the event loop while this serialises
+            with self._lock:
+                data = {
+                    "fingerprint": self.fingerprint,
+                    "labels": list(self.labels),
+                    "entries": dict(self._entries)
+                }
+                self._dirty = False
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.tmp")  # Workers may save concurrently
+            tmp_path.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._mtime = self.path.stat().st_mtime
+
+    def save_if_dirty(self):
+        """Persist entries filled lazily since the last save."""
+        if self._dirty:
+            self.save()
+
+    @property
+    def stale(self) -> bool:
+        """Whether the collection changed since the table was last reset or rebuilt."""
+        return self._stale
+
+    def invalidate(self):
+        """Drop all entries because the collection is being changed (not persisted).
+
+        Lookups miss and lazily searched results are discarded until the
+        next reset() or replace().
+        """
+        with self._lock:
+            self._entries = {}
+            self._stale = True
+            self.generation += 1
+
+    def reset(self, fingerprint: str):
+        """Drop all entries because the collection changed, and persist.
+
+        Args:
+            fingerprint: Fingerprint of the collection's new contents
+        """
+        with self._lock:
+            if fingerprint == self.fingerprint and not self._entries and not self._stale:
+                return
+            self.fingerprint = fingerprint
+            self._entries = {}
+            self._stale = False
+            self.generation += 1
+        self.save()
+        logger.info("Breed context table reset: knowledge base changed")
+
+    def replace(
+        self,
+        fingerprint: str,
+        labels: List[str],
+        entries: Dict[str, Dict[str, List[str]]],
+        generation: Optional[int] = None
+    ) -> bool:
+        """Swap in a freshly built table and persist it.
+
+        Args:
+            fingerprint: Fingerprint of the collection the entries came from
+            labels: Breed labels the table covers
+            entries: Breed label -> {"documents": [...], "sources": [...]}
+            generation: Value of generation read before the build, if the
+                build should be dropped when the table was invalidated since
+
+        Returns:
+            False if the build was dropped
+        """
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                logger.info("Breed context table rebuild dropped: knowledge base changed during the build")
+                return False
+            self.fingerprint = fingerprint
+            self.labels = list(labels)
+            self._entries = dict(entries)
+            self._stale = False
+            self.generation += 1
+        self.save()
+        logger.info(f"Breed context table rebuilt: {len(self._entries)} breeds")
+        return True
+
+    def get(self, breed: str) -> Optional[Dict[str, List[str]]]:
+        """Look up the precomputed retrieval for a breed.
+
+        Args:
+            breed: Normalized breed label (e.g. "golden_retriever")
+
+        Returns:
+            Dict with documents and sources, or None on miss
+        """
+        self._reload_if_changed()
+        entry = self._entries.get(breed)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, breed: str, documents: List[str], sources: List[str], generation: int) -> bool:
+        """Store one breed's retrieval result (persisted on the next save).
+
+        Args:
+            breed: Normalized breed label
+            documents: Retrieved document texts, best match first
+            sources: source_file of each retrieved document
+            generation: Value of generation read before the search
+
+        Returns:
+            False if the table was invalidated since (the result is dropped)
+        """
+        with self._lock:
+            if generation != self.generation or self._stale:
+                return False
+            self._entries[breed] = {"documents": documents, "sources": sources}
+            self._dirty = True
+            return True
+
+    def _reload_if_changed(self):
+        """Pick up a table rewritten by another worker."""
+        if self._stale:
+            # Invalidated here: the file still holds the pre-change table
+            return
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get table statistics.
+
+        Returns:
+            Dict with entry count, covered labels, hits and misses
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "labels": len(self.labels),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0
+        }
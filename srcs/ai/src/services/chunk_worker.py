@@ -0,0 +1,60 @@
+"""Process-pool workers that read and chunk knowledge-base files.
+
+Kept free of heavy imports (ChromaDB, sentence-transformers) because each
+worker process is started with spawn and imports this module from scratch.
+"""
+
+import os
+from types import SimpleNamespace
+from typing import List, Tuple
+
+from src.services.document_processor import Chunk, DocumentProcessor
+
+# One DocumentProcessor (and tiktoken encoder) per worker process
+_processor: DocumentProcessor = None
+
+
+def init_worker(chunk_size: int, chunk_overlap: int, boundary_tolerance: int, niceness: int = 0):
+    """Process-pool initializer: build this worker's DocumentProcessor.
+
+    Args:
+        chunk_size: Maximum tokens per chunk
+        chunk_overlap: Token overlap between chunks
+        boundary_tolerance: Tokens a chunk may end early at a boundary
+        niceness: Scheduling priority decrement, so chunking yields the CPU
+            to the service process answering queries
+    """
+    global _processor
+    if niceness:
+        os.nice(niceness)
+    _processor = DocumentProcessor(SimpleNamespace(
+        CHUNK_SIZE=chunk_size,
+        CHUNK_OVERLAP=chunk_overlap,
+        CHUNK_BOUNDARY_TOLERANCE=boundary_tolerance
+    ))
+
+
+def chunk_file(path: str, relative_path: str) -> Tuple[str, List[Chunk]]:
+    """Read one knowledge-base file and split it into chunks.
+
+    Args:
+        path: Absolute file path
+        relative_path: Path relative to the knowledge base (stored as source_file)
+
+    Returns:
+        Tuple of (relative_path, chunks)
+
+    Raises:
+        ValueError: If the document is empty
+    """
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+
+    chunks = _processor.process(
+        content=content,
+        metadata={
+            "source_file": relative_path,
+            "source_type": "knowledge_base"
+        }
+    )
+    return relative_path, chunks
@@ -1,24 +1,69 @@
+import base64
+import binascii
 import httpx
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import logging
 
+from src.services.http_pool import PooledHTTPClient
+
 logger = logging.getLogger(__name__)
 
 
 class ClassificationClient:
     """HTTP client for classification service."""
 
-    def __init__(self, config):
+    def __init__(self, config, http_pool: Optional[PooledHTTPClient] = None):
         """Initialize classification client.
 
         Args:
             config: Settings instance with classification service config
+            http_pool: Shared pooled HTTP client (created lazily if not given)
         """
+        self.config = config
         self.base_url = config.CLASSIFICATION_SERVICE_URL
         self.timeout = config.CLASSIFICATION_TIMEOUT
+        self.http_pool = http_pool
+        self.binary_transport = config.CLASSIFICATION_BINARY_TRANSPORT
 
         logger.info(f"ClassificationClient initialized: {self.base_url}")
 
+    def _client(self) -> httpx.AsyncClient:
+        """Get the long-lived HTTP client, creating the pool on first use."""
+        if self.http_pool is None:
+            self.http_pool = PooledHTTPClient("classification", self.config, timeout=self.timeout)
+        return self.http_pool.client
+
+    def _image_request(self, image: str, **options) -> Dict[str, Any]:
+        """Build the body of a /classify/* POST carrying an image.
+
+        With CLASSIFICATION_BINARY_TRANSPORT the image goes as raw bytes
+        (application/octet-stream) and the options as query parameters,
+        so neither side base64-encodes or JSON-parses the image; otherwise
+        the JSON body the classification service has always accepted.
+
+        Args:
+            image: Base64-encoded image (data URI allowed)
+            **options: Route options (e.g. top_k)
+
+        Returns:
+            Keyword arguments for httpx.AsyncClient.post
+
+        Raises:
+            ValueError: If the image is not valid base64
+        """
+        if not self.binary_transport:
+            return {"json": {"image": image, **options}}
+
+        try:
+            image_bytes = base64.b64decode(image.split(",", 1)[-1], validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"Invalid base64 image: {e}")
+        return {
+            "content": image_bytes,
+            "params": options,
+            "headers": {"Content-Type": "application/octet-stream"}
+        }
+
     async def check_content(self, image: str) -> Dict[str, Any]:
         """Check image content safety (NSFW detection).
 
@@ -32,14 +77,13 @@ class ClassificationClient:
             ConnectionError: If classification service unreachable
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/classify/content",
-                    json={"image": image}
-                )
-                logger.debug(f"Content check response: {response.json()}")
-                response.raise_for_status()
-                return response.json()
+            response = await self._client().post(
+                f"{self.base_url}/classify/content",
+                **self._image_request(image)
+            )
+            logger.debug(f"Content check response: {response.json()}")
+            response.raise_for_status()
+            return response.json()
 
         except httpx.ConnectError as e:
             logger.error(f"Classification service connection failed: {e}")
@@ -62,14 +106,13 @@ class ClassificationClient:
             ConnectionError: If classification service unreachable
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/classify/species",
-                    json={"image": image, "top_k": top_k}
-                )
-                logger.debug(f"Species detection response: {response.json()}")
-                response.raise_for_status()
-                return response.json()
+            response = await self._client().post(
+                f"{self.base_url}/classify/species",
+                **self._image_request(image, top_k=top_k)
+            )
+            logger.debug(f"Species detection response: {response.json()}")
+            response.raise_for_status()
+            return response.json()
 
         except httpx.ConnectError as e:
             logger.error(f"Classification service connection failed: {e}")
@@ -98,18 +141,79 @@ class ClassificationClient:
             ConnectionError: If classification service unreachable
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/classify/breed",
-                    json={
-                        "image": image,
-                        "species": species,
-                        "top_k": top_k
-                    }
+            response = await self._client().post(
+                f"{self.base_url}/classify/breed",
+                **self._image_request(image, species=species, top_k=top_k)
+            )
+            logger.debug(f"Breed detection response: {response.json()}")
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.ConnectError as e:
+            logger.error(f"Classification service connection failed: {e}")
+            raise ConnectionError("Classification service unavailable")
+        except httpx.TimeoutException as e:
+            logger.error(f"Classification service timeout: {e}")
+            raise ConnectionError("Classification service timeout")
+
+    async def classify_pipeline(
+        self,
+        image: str,
+        species_top_k: int = 3,
+        breed_top_k: int = 5,
+        species_min_confidence: float = 0.0
+    ) -> Dict[str, Any]:
+        """Run content check, species and breed detection in a single call.
+
+        The classification service decodes the image once and stops early
+        when content is unsafe or the species is unsupported.
+
+        Args:
+            image: Base64-encoded image
+            species_top_k: Number of top species predictions
+            breed_top_k: Number of top breed predictions
+            species_min_confidence: Skip breed stage below this species confidence
+
+        Returns:
+            Dict with content, species, breed (None for skipped stages) and stopped_at
+
+        Raises:
+            ConnectionError: If classification service unreachable
+        """
+        try:
+            response = await self._client().post(
+                f"{self.base_url}/classify/pipeline",
+                **self._image_request(
+                    image,
+                    species_top_k=species_top_k,
+                    breed_top_k=breed_top_k,
+                    species_min_confidence=species_min_confidence
                 )
-                logger.debug(f"Breed detection response: {response.json()}")
-                response.raise_for_status()
-                return response.json()
+            )
+            logger.debug(f"Classification pipeline response: {response.json()}")
+            response.raise_for_status()
+            return response.json()
+
+        except httpx.ConnectError as e:
+            logger.error(f"Classification service connection failed: {e}")
+            raise ConnectionError("Classification service unavailable")
+        except httpx.TimeoutException as e:
+            logger.error(f"Classification service timeout: {e}")
+            raise ConnectionError("Classification service timeout")
+
+    async def get_labels(self) -> Dict[str, Any]:
+        """List every breed label the classification service can emit.
+
+        Returns:
+            Dict with dog_breeds and cat_breeds label lists
+
+        Raises:
+            ConnectionError: If classification service unreachable
+        """
+        try:
+            response = await self._client().get(f"{self.base_url}/classify/labels")
+            response.raise_for_status()
+            return response.json()
 
         except httpx.ConnectError as e:
             logger.error(f"Classification service connection failed: {e}")
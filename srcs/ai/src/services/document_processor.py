@@ -2,14 +2,34 @@
 
 import logging
 import re
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Dict, List, Tuple, Any
+from typing import Dict, Iterator, List, Tuple, Any
 
+import numpy as np
 import yaml
 import tiktoken
 
 logger = logging.getLogger(__name__)
 
+# UTF-8 continuation bytes (10xxxxxx): every other byte starts a character
+_UTF8_CONTINUATION = bytes(range(0x80, 0xC0))
+
+# Bump whenever the metadata derived for each chunk changes (forces a knowledge base re-ingest)
+CHUNK_METADATA_VERSION = 2
+
+
+def breed_key(name: str) -> str:
+    """Normalize a breed name to the key chunks are indexed under.
+
+    Args:
+        name: Breed name or label (e.g. "Yorkshire Terrier", "german-shepherd")
+
+    Returns:
+        Lowercase snake_case key (e.g. "yorkshire_terrier")
+    """
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_")
+
 
 @dataclass
 class Chunk:
@@ -24,6 +44,13 @@ class DocumentProcessor:
     FRONTMATTER_PATTERN = re.compile(r'^---\s*\n(.*?)\n---\s*\n', re.DOTALL)
     HEADER_PATTERN = re.compile(r'^(#{1,3})\s+(.+)$', re.MULTILINE)
 
+    # Preferred chunk boundaries, best first
+    BOUNDARY_PATTERNS = (
+        re.compile(r'\n[ \t]*\n\s*'),  # Paragraph break
+        re.compile(r'[.!?]["\')\]]*\s+'),  # Sentence end
+        re.compile(r'\n\s*'),  # Line break
+    )
+
     def __init__(self, config):
         """Initialize processor with configuration.
 
@@ -32,7 +59,11 @@ class DocumentProcessor:
         """
         self.chunk_size = config.CHUNK_SIZE
         self.chunk_overlap = config.CHUNK_OVERLAP
+        self.boundary_tolerance = config.CHUNK_BOUNDARY_TOLERANCE
         self._tokenizer = tiktoken.get_encoding("cl100k_base")
+        # Per-vocabulary lookup tables for token -> character offsets, built on first use
+        self._token_chars = None
+        self._token_mid_char = None
         logger.info(f"Initialized document processor: chunk_size={self.chunk_size}, overlap={self.chunk_overlap}")
 
     def _sanitize_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
@@ -60,6 +91,32 @@ class DocumentProcessor:
                 logger.warning(f"Skipping metadata key '{key}' with unsupported type {type(value)}")
         return sanitized
 
+    def _index_metadata(self, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Derive the normalized keys breed-context retrieval filters on.
+
+        breed_key comes from the breed tag, or for crossbreed documents from
+        their first common name; species is lowercased. Keys already present
+        are kept.
+
+        Args:
+            metadata: Frontmatter merged with caller metadata (before sanitizing)
+
+        Returns:
+            Metadata with breed_key and species normalized where available
+        """
+        indexed = dict(metadata)
+
+        breed = metadata.get("breed")
+        if not breed and metadata.get("doc_type") == "crossbreed":
+            names = metadata.get("common_names")
+            breed = names[0] if isinstance(names, list) and names else names
+        if breed and "breed_key" not in metadata:
+            indexed["breed_key"] = breed_key(breed)
+
+        if isinstance(metadata.get("species"), str):
+            indexed["species"] = metadata["species"].strip().lower()
+        return indexed
+
     def parse_frontmatter(self, content: str) -> Tuple[Dict[str, Any], str]:
         """Extract YAML frontmatter from document.
 
@@ -124,37 +181,149 @@ class DocumentProcessor:
         Returns:
             List of text chunks
         """
+        return [text[start:end] for start, end in self.iter_chunk_spans(text, max_tokens, overlap)]
+
+    def iter_chunk_spans(self, text: str, max_tokens: int = None, overlap: int = None) -> Iterator[Tuple[int, int]]:
+        """Yield the character spans of text's chunks.
+
+        The text is tokenized once and each token is mapped to its character
+        offset, so chunks are slices of the original string: no tokens are
+        decoded into text and no chunk splits a multibyte character. A chunk
+        ends at the last paragraph break, sentence end or line break within
+        the final CHUNK_BOUNDARY_TOLERANCE tokens of its window (at most a
+        quarter of the window; the token limit when there is none), and the
+        overlap into the next chunk is extended back to a boundary when one
+        is within the same tolerance.
+
+        Args:
+            text: Text to chunk
+            max_tokens: Maximum tokens per chunk (default: config value)
+            overlap: Token overlap between chunks (default: config value)
+
+        Yields:
+            (start, end) character offsets of each chunk, stripped of
+            surrounding whitespace
+        """
         max_tokens = max_tokens or self.chunk_size
-        overlap = overlap or self.chunk_overlap
+        overlap = self.chunk_overlap if overlap is None else overlap
+        tolerance = min(self.boundary_tolerance, max_tokens // 4)
 
         tokens = self._tokenizer.encode(text)
 
         if len(tokens) <= max_tokens:
-            return [text]
+            yield self._strip_span(text, 0, len(text))
+            return
+
+        offsets = self._token_offsets(tokens, text)
 
-        chunks = []
         start = 0
+        while True:
+            if start + max_tokens >= len(tokens):
+                yield self._strip_span(text, int(offsets[start]), len(text))
+                return
 
-        while start < len(tokens):
-            end = min(start + max_tokens, len(tokens))
-            chunk_tokens = tokens[start:end]
-            chunk_text = self._tokenizer.decode(chunk_tokens)
-            chunks.append(chunk_text)
+            # Offsets of this window's tokens; indices below are relative to start
+            window = offsets[start:start + max_tokens + 1].tolist()
 
-            # Move start with overlap
-            start = end - overlap if end < len(tokens) else len(tokens)
+            char_end = self._last_boundary(text, window[max(1, max_tokens - tolerance)], window[-1]) or window[-1]
+            yield self._strip_span(text, window[0], char_end)
 
-        return chunks
+            # First token not entirely inside this chunk
+            cut = max(self._token_at(window, char_end), 1)
+            start += self._overlap_start(text, window, cut, overlap, tolerance)
 
-    def process(self, content: str, metadata: Dict[str, Any]) -> List[Chunk]:
-        """Process document into chunks with metadata.
+    def _overlap_start(self, text: str, window: List[int], cut: int, overlap: int, tolerance: int) -> int:
+        """Token (relative to the window) the next chunk starts at.
+
+        overlap tokens before the end of the current chunk, moved back to
+        the start of a paragraph or sentence when one is within the
+        tolerance (at most doubling the overlap). Always after the window
+        start and never in the middle of a multibyte character.
+        """
+        next_start = max(cut - overlap, 1)
+        if next_start < cut:
+            lo = window[max(next_start - min(tolerance, overlap), 1)]
+            boundary = self._last_boundary(text, lo, window[next_start])
+            if boundary is not None:
+                next_start = max(self._token_at(window, boundary), 1)
+
+        # A token holding the tail bytes of a character shares its offset
+        # with the token before it; slicing from there would add those bytes
+        while next_start < cut and window[next_start] == window[next_start - 1]:
+            next_start += 1
+        return next_start
+
+    def _token_offsets(self, tokens: List[int], text: str) -> np.ndarray:
+        """Character offset of every token, plus len(text) as a final sentinel.
+
+        Same offsets as Encoding.decode_with_offsets (a token starting
+        inside a multibyte character gets that character's offset), computed
+        from per-token lookup tables instead of decoding the tokens.
+        """
+        if self._token_chars is None:
+            self._build_token_tables()
+
+        ids = np.fromiter(tokens, dtype=np.int32, count=len(tokens))
+        offsets = np.zeros(len(tokens) + 1, dtype=np.int32)
+        np.cumsum(self._token_chars[ids], out=offsets[1:])
+        if not text.isascii():
+            offsets[:-1] -= self._token_mid_char[ids]
+        return offsets
+
+    def _build_token_tables(self):
+        """Tabulate each token's character count and whether it starts mid-character."""
+        n_vocab = self._tokenizer.n_vocab
+        chars = np.zeros(n_vocab, dtype=np.int32)
+        mid_char = np.zeros(n_vocab, dtype=np.int32)
+
+        for token in range(n_vocab):
+            try:
+                token_bytes = self._tokenizer.decode_single_token_bytes(token)
+            except KeyError:  # Unused id
+                continue
+            if token_bytes:
+                chars[token] = len(token_bytes.translate(None, _UTF8_CONTINUATION))
+                mid_char[token] = 0x80 <= token_bytes[0] < 0xC0
+
+        self._token_chars = chars
+        self._token_mid_char = mid_char
+
+    @staticmethod
+    def _token_at(offsets: List[int], pos: int) -> int:
+        """Index of the first token starting at character pos, or of the token spanning it."""
+        index = bisect_left(offsets, pos)
+        if index == len(offsets) or offsets[index] != pos:
+            index -= 1
+        return index
+
+    def _last_boundary(self, text: str, lo: int, hi: int):
+        """End of the best boundary in text[lo:hi] (latest match of the preferred kind), or None."""
+        for pattern in self.BOUNDARY_PATTERNS:
+            last = None
+            for last in pattern.finditer(text, lo, hi):
+                pass
+            if last is not None:
+                return last.end()
+        return None
+
+    @staticmethod
+    def _strip_span(text: str, start: int, end: int) -> Tuple[int, int]:
+        """Shrink a span to exclude leading and trailing whitespace."""
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        return start, end
+
+    def iter_chunks(self, content: str, metadata: Dict[str, Any]) -> Iterator[Chunk]:
+        """Stream a document's chunks with metadata, one section at a time.
 
         Args:
             content: Document content (markdown or plain text)
             metadata: Additional metadata to merge with frontmatter
 
-        Returns:
-            List of Chunk objects
+        Yields:
+            Chunk objects in document order
 
         Raises:
             ValueError: If content is empty
@@ -164,24 +333,34 @@ class DocumentProcessor:
 
         # Extract frontmatter
         doc_metadata, body = self.parse_frontmatter(content)
-        merged_metadata = self._sanitize_metadata({**doc_metadata, **metadata})
+        merged_metadata = self._sanitize_metadata(self._index_metadata({**doc_metadata, **metadata}))
 
-        # Split by headers first
-        sections = self.split_by_headers(body)
-
-        # Chunk each section
-        chunks = []
+        # Split by headers first, then chunk each section
         chunk_index = 0
-
-        for section in sections:
-            section_chunks = self.chunk_text(section)
-            for chunk_text in section_chunks:
+        for section in self.split_by_headers(body):
+            for start, end in self.iter_chunk_spans(section):
+                if start == end:
+                    continue
                 chunk_metadata = {
                     **merged_metadata,
                     "chunk_index": chunk_index
                 }
-                chunks.append(Chunk(content=chunk_text, metadata=chunk_metadata))
+                yield Chunk(content=section[start:end], metadata=chunk_metadata)
                 chunk_index += 1
 
+    def process(self, content: str, metadata: Dict[str, Any]) -> List[Chunk]:
+        """Process document into chunks with metadata.
+
+        Args:
+            content: Document content (markdown or plain text)
+            metadata: Additional metadata to merge with frontmatter
+
+        Returns:
+            List of Chunk objects
+
+        Raises:
+            ValueError: If content is empty
+        """
+        chunks = list(self.iter_chunks(content, metadata))
         logger.info(f"Processed document into {len(chunks)} chunks")
         return chunks
@@ -1,7 +1,9 @@
 """Embedder service for generating text embeddings."""
 
 import logging
-from typing import List
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Tuple
 
 from sentence_transformers import SentenceTransformer
 
@@ -9,7 +11,13 @@ logger = logging.getLogger(__name__)
 
 
 class Embedder:
-    """Generates text embeddings using sentence-transformers."""
+    """Generates text embeddings using sentence-transformers.
+
+    Single-text embeddings (queries) go through a bounded LRU cache keyed on
+    the model name and whitespace-normalized text, since most queries come
+    from a small set of per-breed templates. Batch embeddings (document
+    ingestion) bypass the cache.
+    """
 
     def __init__(self, config):
         """Initialize embedder with configuration.
@@ -20,7 +28,20 @@ class Embedder:
         self.model_name = config.EMBEDDING_MODEL
         self.dimension = config.EMBEDDING_DIMENSION
         self._model = SentenceTransformer(self.model_name)
-        logger.info(f"Initialized embedder with model: {self.model_name}")
+
+        self.cache_size = config.EMBEDDING_CACHE_SIZE
+        self._cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        # embed() runs on several RAG executor threads at once
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+        logger.info(f"Initialized embedder with model: {self.model_name}, cache_size={self.cache_size}")
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Collapse whitespace so trivially different query strings share a cache entry."""
+        return " ".join(text.split())
 
     def embed(self, text: str) -> List[float]:
         """Generate embedding for a single text.
@@ -37,8 +58,20 @@ class Embedder:
         if not text or not text.strip():
             raise ValueError("Cannot embed empty text")
 
-        embedding = self._model.encode(text)
-        return embedding.tolist()
+        text = self._normalize(text)
+        key = (self.model_name, text)
+
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            self.cache_misses += 1
+
+        embedding = self._model.encode(text).tolist()
+        self._store(key, embedding)
+        return embedding
 
     def embed_batch(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for multiple texts.
@@ -57,3 +90,54 @@ class Embedder:
 
         embeddings = self._model.encode(texts)
         return embeddings.tolist()
+
+    def warm(self, texts: Iterable[str]) -> int:
+        """Precompute and cache embeddings for known query texts.
+
+        Args:
+            texts: Query texts expected at runtime
+
+        Returns:
+            Number of embeddings computed (texts already cached are skipped)
+        """
+        with self._cache_lock:
+            missing = list(dict.fromkeys(
+                normalized for normalized in (self._normalize(t) for t in texts)
+                if normalized and (self.model_name, normalized) not in self._cache
+            ))
+
+        # Warming more than fits would only evict the first entries again
+        missing = missing[:self.cache_size]
+        if not missing:
+            return 0
+
+        for text, embedding in zip(missing, self._model.encode(missing).tolist()):
+            self._store((self.model_name, text), embedding)
+
+        logger.info(f"Warmed embedding cache with {len(missing)} entries")
+        return len(missing)
+
+    def _store(self, key: Tuple[str, str], embedding: List[float]):
+        """Insert into the LRU cache, evicting the least recently used entries."""
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._cache[key] = embedding
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get embedding cache statistics.
+
+        Returns:
+            Dict with hits, misses, hit ratio and current/max entries
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "hit_ratio": round(self.cache_hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._cache),
+            "max_entries": self.cache_size
+        }
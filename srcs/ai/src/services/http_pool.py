@@ -0,0 +1,105 @@
+"""Shared, long-lived HTTP clients for upstream services."""
+
+import logging
+from typing import Any, Dict, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# httpcore trace events emitted when a brand-new connection is established
+_CONNECT_EVENTS = (
+    "connection.connect_tcp.complete",
+    "connection.connect_unix_socket.complete",
+)
+
+
+class PooledHTTPClient:
+    """One pooled httpx.AsyncClient per upstream, with connection-reuse accounting.
+
+    Every request is counted, and httpcore's trace extension reports each new
+    TCP connection, so the difference between the two is the number of
+    requests served over a kept-alive connection.
+    """
+
+    def __init__(self, name: str, config, timeout: Union[float, httpx.Timeout]):
+        """Initialize pooled client.
+
+        Args:
+            name: Upstream name for logging and metrics (e.g. "ollama")
+            config: Settings instance with HTTP pool configuration
+            timeout: Request timeout for this upstream
+        """
+        self.name = name
+        self.requests_sent = 0
+        self.connections_opened = 0
+        self.http_versions: Dict[str, int] = {}
+
+        limits = httpx.Limits(
+            max_connections=config.HTTP_POOL_MAX_CONNECTIONS,
+            max_keepalive_connections=config.HTTP_POOL_MAX_KEEPALIVE,
+            keepalive_expiry=config.HTTP_POOL_KEEPALIVE_EXPIRY
+        )
+        http2 = config.HTTP_POOL_HTTP2 and self._http2_available()
+
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=limits,
+            http2=http2,
+            event_hooks={
+                "request": [self._on_request],
+                "response": [self._on_response]
+            }
+        )
+
+        logger.info(
+            f"HTTP pool '{name}' initialized: "
+            f"max_connections={config.HTTP_POOL_MAX_CONNECTIONS}, "
+            f"max_keepalive={config.HTTP_POOL_MAX_KEEPALIVE}, "
+            f"keepalive_expiry={config.HTTP_POOL_KEEPALIVE_EXPIRY}s, http2={http2}"
+        )
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """Check whether the optional h2 package needed for HTTP/2 is installed."""
+        try:
+            import h2  # noqa: F401
+            return True
+        except ImportError:
+            logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+            return False
+
+    async def _on_request(self, request: httpx.Request):
+        """Count the request and attach the connection trace callback."""
+        self.requests_sent += 1
+        request.extensions["trace"] = self._on_trace
+
+    async def _on_response(self, response: httpx.Response):
+        """Record the negotiated HTTP version."""
+        version = response.http_version
+        self.http_versions[version] = self.http_versions.get(version, 0) + 1
+
+    async def _on_trace(self, event_name: str, info: Dict[str, Any]):
+        """httpcore trace callback: count newly opened connections."""
+        if event_name in _CONNECT_EVENTS:
+            self.connections_opened += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get connection reuse statistics.
+
+        Returns:
+            Dict with requests sent, connections opened/reused and HTTP versions
+        """
+        reused = max(0, self.requests_sent - self.connections_opened)
+        return {
+            "requests_sent": self.requests_sent,
+            "connections_opened": self.connections_opened,
+            "connections_reused": reused,
+            "reuse_ratio": round(reused / self.requests_sent, 3) if self.requests_sent else 0.0,
+            "http_versions": dict(self.http_versions)
+        }
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        await self.client.aclose()
+        logger.info(f"HTTP pool '{self.name}' closed")
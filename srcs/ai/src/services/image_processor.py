@@ -1,13 +1,29 @@
 from PIL import Image
 import base64
 import io
+from dataclasses import dataclass
 from typing import Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+@dataclass
+class ProcessedImage:
+    """One uploaded image, prepared separately for each consumer."""
+    vlm: str  # Data URI for Ollama, long side at most MAX_IMAGE_DIMENSION
+    classification: str  # JPEG data URI for the classifiers, short side CLASSIFICATION_IMAGE_SIZE
+
+
 class ImageProcessor:
-    """Process and validate images for AI analysis."""
+    """Process and validate images for AI analysis.
+
+    Each upload is decoded once and produces two variants: the VLM image
+    and a thumbnail at the classifiers' input resolution (their processors
+    resize to 224x224 anyway), so the classification service is sent and
+    decodes a few KB instead of the full VLM image. JPEGs are decoded at a
+    reduced DCT scale (Image.draft) when the VLM size allows it.
+    """
 
     def __init__(self, config):
         """Initialize image processor with configuration.
@@ -18,16 +34,17 @@ class ImageProcessor:
         self.max_size_bytes = config.MAX_IMAGE_SIZE_MB * 1024 * 1024
         self.max_dimension = config.MAX_IMAGE_DIMENSION
         self.min_dimension = config.MIN_IMAGE_DIMENSION
+        self.classification_size = config.CLASSIFICATION_IMAGE_SIZE
         self.supported_formats = config.SUPPORTED_FORMATS
 
-    def process_image(self, data_uri: str) -> str:
+    def process_image(self, data_uri: str) -> ProcessedImage:
         """Process and optimize image from data URI.
 
         Args:
             data_uri: Base64-encoded image with data URI format
 
         Returns:
-            Processed image as data URI
+            ProcessedImage with the VLM image and the classification thumbnail
 
         Raises:
             ValueError: If image is invalid, wrong format, or wrong size
@@ -54,17 +71,24 @@ class ImageProcessor:
                 f"Image too small (min {self.min_dimension}x{self.min_dimension})"
             )
 
-        # Resize if needed
-        if width > self.max_dimension or height > self.max_dimension:
-            logger.info(f"Resizing image from {width}x{height}")
-            image = self._resize_image(image)
+        # JPEG: decode directly at 1/2, 1/4 or 1/8 scale if still >= the VLM size
+        vlm_size = self._fit(width, height, self.max_dimension)
+        image.draft(None, vlm_size)
 
         # Convert to RGB if needed
         if image.mode not in ('RGB', 'L'):
             image = image.convert('RGB')
 
-        # Re-encode optimized image
-        return self._encode_image(image, format_str)
+        # Resize if needed
+        if image.size != vlm_size:
+            logger.info(f"Resizing image from {width}x{height} to {vlm_size[0]}x{vlm_size[1]}")
+            image = self._resize_image(image, vlm_size)
+
+        # Re-encode optimized images
+        return ProcessedImage(
+            vlm=self._encode_image(image, format_str),
+            classification=self._encode_image(self._classification_thumbnail(image), "jpeg", quality=90)
+        )
 
     def _parse_data_uri(self, data_uri: str) -> Tuple[str, str]:
         """Parse data URI into format and base64 data.
@@ -93,27 +117,51 @@ class ImageProcessor:
 
         return format_str, parts[1]
 
-    def _resize_image(self, image: Image.Image) -> Image.Image:
-        """Resize image maintaining aspect ratio.
+    @staticmethod
+    def _fit(width: int, height: int, max_dimension: int) -> Tuple[int, int]:
+        """Size with the long side at most max_dimension, keeping aspect ratio (never upscales)."""
+        scale = min(1.0, max_dimension / max(width, height))
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def _resize_image(self, image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        """Resize image to the given size.
+
+        reducing_gap first box-reduces by an integer factor, so bicubic
+        only filters the last step (LANCZOS-like quality at a fraction of
+        the cost for large downscales).
 
         Args:
             image: PIL Image instance
+            size: Target (width, height)
 
         Returns:
             Resized PIL Image
         """
-        image.thumbnail(
-            (self.max_dimension, self.max_dimension),
-            Image.Resampling.LANCZOS
-        )
-        return image
+        return image.resize(size, Image.Resampling.BICUBIC, reducing_gap=2.0)
+
+    def _classification_thumbnail(self, image: Image.Image) -> Image.Image:
+        """Downscale so the short side is CLASSIFICATION_IMAGE_SIZE.
+
+        Args:
+            image: VLM-sized PIL Image
+
+        Returns:
+            Thumbnail (the image itself if already small enough)
+        """
+        width, height = image.size
+        scale = self.classification_size / min(width, height)
+        if scale >= 1:
+            return image
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return image.resize(size, Image.Resampling.BILINEAR, reducing_gap=2.0)
 
-    def _encode_image(self, image: Image.Image, format_str: str) -> str:
+    def _encode_image(self, image: Image.Image, format_str: str, quality: int = 85) -> str:
         """Encode image to base64 data URI.
 
         Args:
             image: PIL Image instance
             format_str: Image format (jpeg, png, webp)
+            quality: JPEG quality
 
         Returns:
             Base64-encoded data URI
@@ -123,7 +171,7 @@ class ImageProcessor:
 
         # Save with optimization
         if save_format == 'JPEG':
-            image.save(buffer, format=save_format, quality=85, optimize=True)
+            image.save(buffer, format=save_format, quality=quality, optimize=True)
         else:
             image.save(buffer, format=save_format, optimize=True)
 
@@ -0,0 +1,374 @@
+"""Persistent background queue for knowledge-base ingestion jobs."""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat() + "Z"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job once cancellation has been requested."""
+
+
+@dataclass
+class IngestionJob:
+    """State of one queued ingestion job."""
+    job_id: str
+    kind: str = "initialize"  # initialize (knowledge base sync) or ingest (single document)
+    status: str = "queued"  # queued, running, completed, failed, cancelled
+    created_at: str = field(default_factory=_now)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    progress: Dict[str, int] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    error_type: Optional[str] = None
+    payload: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    cancel_requested: bool = False
+
+
+class JobContext:
+    """Handle given to a running job's handler."""
+
+    def __init__(self, manager: "IngestionJobManager", job: IngestionJob):
+        self.job = job
+        self._manager = manager
+        self._stopping = False
+
+    def progress(self, progress: Dict[str, int]):
+        """Record progress (safe to call from the ingestion thread)."""
+        self.job.progress = progress
+        self._manager._save(self.job)
+
+    def cancelled(self) -> bool:
+        """Whether the job should stop at its next checkpoint."""
+        return self._stopping or self._manager.cancel_requested(self.job.job_id)
+
+    def check_cancelled(self):
+        """Raise JobCancelled if the job should stop.
+
+        Raises:
+            JobCancelled: If cancellation was requested or the service is stopping
+        """
+        if self.cancelled():
+            raise JobCancelled(self.job.job_id)
+
+    def stop(self):
+        """Ask the job to stop because the service is shutting down."""
+        self._stopping = True
+
+    async def run_in_thread(self, fn: Callable[..., Any], *args) -> Any:
+        """Run blocking ingestion work on the dedicated ingestion thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._manager._thread, fn, *args)
+
+
+JobHandler = Callable[[IngestionJob, JobContext], Awaitable[Dict[str, Any]]]
+
+
+class IngestionJobManager:
+    """Queues ingestion jobs on disk and runs them one at a time in the background.
+
+    Every job is a JSON file in CHROMA_PERSIST_DIR/ingestion_jobs/; the
+    queued files are the queue, so jobs survive a restart and any uvicorn
+    worker can enqueue, poll or cancel them. Only the worker holding the
+    runner lock (an flock on ingestion_jobs/runner.lock, released by the OS
+    when the process exits) executes jobs; the others keep polling and take
+    over if it dies. A job found "running" by a new lock holder was
+    interrupted and is resumed: handlers checkpoint their progress, so the
+    rerun continues after the last committed file.
+
+    Blocking work runs on a single dedicated thread, never on the RAG
+    executor that serves queries.
+    """
+
+    def __init__(self, config, keep_jobs: int = 20):
+        """Initialize job manager.
+
+        Args:
+            config: Settings instance (jobs are stored under CHROMA_PERSIST_DIR)
+            keep_jobs: Number of finished jobs kept on disk
+        """
+        self.jobs_dir = Path(config.CHROMA_PERSIST_DIR) / "ingestion_jobs"
+        self.keep_jobs = keep_jobs
+        self.poll_interval = config.INGEST_JOB_POLL_INTERVAL
+
+        self._handlers: Dict[str, JobHandler] = {}
+        self._thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest")
+        self._lock_file = None
+        self._runner: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def register(self, kind: str, handler: JobHandler):
+        """Register the coroutine function that executes jobs of a kind.
+
+        Args:
+            kind: Job kind
+            handler: Coroutine function (job, context) -> result dict; it
+                should call context.check_cancelled() between units of work
+        """
+        self._handlers[kind] = handler
+
+    def get(self, job_id: str) -> Optional[IngestionJob]:
+        """Load a job's current state.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            IngestionJob, or None if unknown
+        """
+        try:
+            data = json.loads((self.jobs_dir / f"{job_id}.json").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        known = {f.name for f in fields(IngestionJob)}
+        job = IngestionJob(**{k: v for k, v in data.items() if k in known})
+        job.cancel_requested = job.status in ACTIVE_STATUSES and self.cancel_requested(job_id)
+        return job
+
+    def list_jobs(self) -> List[IngestionJob]:
+        """Load all jobs on disk.
+
+        Returns:
+            Jobs in creation order (oldest first)
+        """
+        if not self.jobs_dir.exists():
+            return []
+        jobs = [self.get(path.stem) for path in self.jobs_dir.glob("*.json")]
+        return sorted((j for j in jobs if j is not None), key=lambda j: (j.created_at, j.job_id))
+
+    def active_job(self, kind: Optional[str] = None) -> Optional[IngestionJob]:
+        """Find the oldest queued or running job, if any.
+
+        Args:
+            kind: Only consider jobs of this kind
+
+        Returns:
+            The active IngestionJob, or None
+        """
+        for job in self.list_jobs():
+            if job.status in ACTIVE_STATUSES and (kind is None or job.kind == kind):
+                return job
+        return None
+
+    def enqueue(self, kind: str, payload: Optional[Dict[str, Any]] = None, coalesce: bool = False) -> IngestionJob:
+        """Add a job to the queue and make sure this worker's runner is started.
+
+        Args:
+            kind: Registered job kind
+            payload: JSON-serializable job input
+            coalesce: Return an already queued or running job of the same
+                kind instead of adding another
+
+        Returns:
+            The queued (or coalesced) IngestionJob
+        """
+        if coalesce:
+            active = self.active_job(kind)
+            if active is not None:
+                logger.info(f"Ingestion job {active.job_id} ({kind}) already {active.status}")
+                return active
+
+        job = IngestionJob(job_id=uuid.uuid4().hex, kind=kind, payload=payload or {})
+        self._save(job)
+        logger.info(f"Queued ingestion job {job.job_id} ({kind})")
+        self.start()
+        return job
+
+    def cancel(self, job_id: str) -> Optional[IngestionJob]:
+        """Cancel a job: queued jobs are dropped, running jobs stop at their next checkpoint.
+
+        Works from any worker, the request is a marker file next to the job.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            Updated IngestionJob, or None if unknown
+        """
+        job = self.get(job_id)
+        if job is None or job.status not in ACTIVE_STATUSES:
+            return job
+
+        (self.jobs_dir / f"{job_id}.cancel").touch()
+        if job.status == "queued":
+            job.status = "cancelled"
+            job.finished_at = _now()
+            self._save(job)
+        else:
+            job.cancel_requested = True
+
+        logger.info(f"Cancellation requested for ingestion job {job_id}")
+        return job
+
+    def cancel_requested(self, job_id: str) -> bool:
+        """Check for a job's cancellation marker.
+
+        Args:
+            job_id: Job identifier
+
+        Returns:
+            True if the job was asked to cancel
+        """
+        return (self.jobs_dir / f"{job_id}.cancel").exists()
+
+    async def wait(self, job_id: str, poll_interval: float = 0.2) -> Optional[IngestionJob]:
+        """Wait for a job to finish, whichever worker runs it.
+
+        Args:
+            job_id: Job identifier
+            poll_interval: Seconds between state checks
+
+        Returns:
+            Final IngestionJob state, or None if unknown
+        """
+        job = self.get(job_id)
+        while job is not None and job.status in ACTIVE_STATUSES:
+            await asyncio.sleep(poll_interval)
+            job = self.get(job_id)
+        return job
+
+    def start(self):
+        """Start (or wake) this worker's runner task on the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._runner is None or self._runner.done() or self._runner.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._runner = loop.create_task(self._run())
+        else:
+            self._wakeup.set()
+
+    async def stop(self):
+        """Stop the runner; a job in progress is put back in the queue to resume later."""
+        if self._runner is not None and not self._runner.done():
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+        self._runner = None
+
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+        self._thread.shutdown(wait=False)
+        logger.info("Ingestion job runner stopped")
+
+    async def _run(self):
+        """Runner loop: execute queued jobs while holding the runner lock."""
+        while True:
+            job = self._next_job() if self._acquire_runner_lock() else None
+            if job is not None:
+                await self._execute(job)
+                continue
+
+            # Jobs queued by other workers are only noticed by polling
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def _acquire_runner_lock(self) -> bool:
+        """Become the worker that runs jobs, if no other worker is."""
+        if self._lock_file is not None:
+            return True
+
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.jobs_dir / "runner.lock", "a+")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+
+        self._lock_file = lock_file
+        logger.info(f"Ingestion job runner active in process {os.getpid()}")
+        return True
+
+    def _next_job(self) -> Optional[IngestionJob]:
+        """Pick the next job: interrupted jobs first, then the oldest queued one."""
+        jobs = self.list_jobs()
+        for status in ("running", "queued"):
+            for job in jobs:
+                if job.status == status:
+                    return job
+        return None
+
+    async def _execute(self, job: IngestionJob):
+        """Run a job's handler and record its outcome."""
+        handler = self._handlers.get(job.kind)
+        if handler is None:
+            job.error = f"Unknown job kind: {job.kind}"
+            self._finish(job, "failed")
+            return
+        if self.cancel_requested(job.job_id):
+            self._finish(job, "cancelled")
+            return
+
+        if job.status == "running":
+            logger.info(f"Resuming interrupted ingestion job {job.job_id}")
+        job.status = "running"
+        job.attempts += 1
+        job.started_at = job.started_at or _now()
+        self._save(job)
+
+        context = JobContext(self, job)
+        try:
+            job.result = await handler(job, context)
+            status = "completed"
+        except JobCancelled:
+            status = "cancelled"
+        except asyncio.CancelledError:
+            # Service shutting down: stop at the next checkpoint and resume on restart
+            context.stop()
+            job.status = "queued"
+            self._save(job)
+            raise
+        except Exception as e:
+            logger.error(f"Ingestion job {job.job_id} failed: {e}", exc_info=True)
+            job.error = str(e)
+            job.error_type = type(e).__name__
+            status = "failed"
+
+        self._finish(job, status)
+
+    def _finish(self, job: IngestionJob, status: str):
+        """Record a job's final state."""
+        job.status = status
+        job.cancel_requested = False
+        job.finished_at = _now()
+        self._save(job)
+        (self.jobs_dir / f"{job.job_id}.cancel").unlink(missing_ok=True)
+        self._prune()
+        logger.info(f"Ingestion job {job.job_id} {status}")
+
+    def _save(self, job: IngestionJob):
+        """Atomically write a job's state."""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        path = self.jobs_dir / f"{job.job_id}.json"
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")  # Unique: progress is saved from the ingestion thread
+        tmp_path.write_text(json.dumps(asdict(job)), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def _prune(self):
+        """Delete the oldest finished jobs beyond keep_jobs."""
+        finished = [j for j in self.list_jobs() if j.status not in ACTIVE_STATUSES]
+        for job in finished[:max(0, len(finished) - self.keep_jobs)]:
+            (self.jobs_dir / f"{job.job_id}.json").unlink(missing_ok=True)
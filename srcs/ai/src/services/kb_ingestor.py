@@ -0,0 +1,347 @@
+"""Incremental knowledge-base ingestion driven by a content-hash manifest."""
+
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.services import chunk_worker
+from src.services.document_processor import CHUNK_METADATA_VERSION, Chunk
+from src.services.ingestion_jobs import JobCancelled
+from src.services.rag_service import chunk_id
+
+logger = logging.getLogger(__name__)
+
+
+class KnowledgeBaseIngestor:
+    """Syncs the Chroma collection with the .md files in KNOWLEDGE_BASE_DIR.
+
+    A manifest (file path -> content hash -> chunk ids) is kept next to the
+    collection. Each run only chunks and embeds new or changed files,
+    deletes chunks that a changed file no longer produces, and deletes all
+    chunks of removed files. Re-ingesting an unchanged knowledge base is a
+    directory scan plus one hash per file.
+
+    The manifest is checkpointed after every embedding batch, so a run that
+    is cancelled or killed resumes after the last committed file.
+    """
+
+    def __init__(self, config, document_processor, rag_service):
+        """Initialize ingestor.
+
+        Args:
+            config: Settings instance
+            document_processor: DocumentProcessor for in-process chunking
+                (used when a single worker is enough)
+            rag_service: RAGService owning the collection
+        """
+        self.kb_dir = Path(config.KNOWLEDGE_BASE_DIR)
+        self.manifest_path = Path(config.CHROMA_PERSIST_DIR) / "kb_manifest.json"
+        self.document_processor = document_processor
+        self.rag_service = rag_service
+
+        self.workers = config.INGEST_WORKERS or os.cpu_count() or 1
+        self.embed_batch_size = max(1, config.INGEST_EMBED_BATCH_SIZE)
+        self.chunk_size = config.CHUNK_SIZE
+        self.chunk_overlap = config.CHUNK_OVERLAP
+        self.boundary_tolerance = config.CHUNK_BOUNDARY_TOLERANCE
+        self.worker_nice = config.INGEST_WORKER_NICE
+        self.query_yield = config.INGEST_QUERY_YIELD_MS / 1000
+
+        # Anything that changes the produced chunks or vectors invalidates every entry
+        self.pipeline_settings = {
+            "collection": config.CHROMA_COLLECTION_NAME,
+            "embedding_model": config.EMBEDDING_MODEL,
+            "chunk_size": config.CHUNK_SIZE,
+            "chunk_overlap": config.CHUNK_OVERLAP,
+            "chunk_boundary_tolerance": config.CHUNK_BOUNDARY_TOLERANCE,
+            "chunk_metadata_version": CHUNK_METADATA_VERSION
+        }
+
+    @staticmethod
+    def file_hash(path: Path) -> str:
+        """Hash a file's bytes.
+
+        Args:
+            path: File to hash
+
+        Returns:
+            Hex SHA-256 digest
+        """
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+
+    def load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Load the manifest, discarding it if it was built with different settings.
+
+        Returns:
+            Relative file path -> {"hash": str, "chunk_ids": [...]}
+        """
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable ingestion manifest {self.manifest_path}: {e}")
+            return {}
+
+        if data.get("settings") != self.pipeline_settings:
+            logger.info("Ingestion settings changed, re-ingesting all files")
+            # Keep chunk ids so stale chunks are still cleaned up
+            return {path: {"hash": None, "chunk_ids": entry.get("chunk_ids", [])}
+                    for path, entry in data.get("files", {}).items()}
+        return data.get("files", {})
+
+    def save_manifest(self, files: Dict[str, Dict[str, Any]]):
+        """Atomically write the manifest.
+
+        Args:
+            files: Relative file path -> {"hash": str, "chunk_ids": [...]}
+        """
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps({
+            "settings": self.pipeline_settings,
+            "files": files
+        }, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.manifest_path)
+
+    def ingest_directory(
+        self,
+        progress: Optional[Callable[[Dict[str, int]], None]] = None,
+        cancelled: Optional[Callable[[], bool]] = None,
+        queries_busy: Optional[Callable[[], bool]] = None
+    ) -> Dict[str, Any]:
+        """Bring the collection in line with the knowledge base directory.
+
+        Pipeline: scan and hash every file; read and chunk new/changed files
+        in a process pool; gather chunks from many files into embedding
+        batches of about INGEST_EMBED_BATCH_SIZE and upsert each batch into
+        Chroma in one call; finally delete chunks of removed files.
+
+        Args:
+            progress: Optional callback receiving {"files_total",
+                "files_done", "chunks_embedded"} as the run advances
+            cancelled: Optional callback checked between files; when it
+                returns True the run stops after checkpointing
+            queries_busy: Optional callback; while it returns True, each
+                embedding batch waits up to INGEST_QUERY_YIELD_MS so
+                queries get the embedding model first
+
+        Returns:
+            Dict with files_processed (new or changed), total_chunks_created,
+            files_skipped (failed), files_unchanged, files_removed,
+            chunks_deleted and errors
+
+        Raises:
+            FileNotFoundError: If KNOWLEDGE_BASE_DIR does not exist
+            JobCancelled: If cancelled returned True
+        """
+        if not self.kb_dir.exists():
+            raise FileNotFoundError(str(self.kb_dir))
+
+        previous = self.load_manifest()
+        current: Dict[str, Dict[str, Any]] = {}
+
+        stats = {
+            "files_processed": 0,
+            "total_chunks_created": 0,
+            "files_skipped": 0,
+            "files_unchanged": 0,
+            "files_removed": 0,
+            "chunks_deleted": 0
+        }
+        errors: List[str] = []
+
+        # 1. Scan: only new or changed files go through the pipeline
+        pending: List[Tuple[Path, str, str]] = []
+        for md_file in self.kb_dir.rglob("*.md"):
+            relative_path = str(md_file.relative_to(self.kb_dir))
+            old_entry = previous.get(relative_path)
+            try:
+                digest = self.file_hash(md_file)
+            except Exception as e:
+                self._record_failure(md_file, relative_path, e, previous, current, stats, errors)
+                continue
+
+            if old_entry is not None and old_entry["hash"] == digest:
+                current[relative_path] = old_entry
+                stats["files_unchanged"] += 1
+            else:
+                pending.append((md_file, relative_path, digest))
+
+        state = {"files_total": len(pending), "files_done": 0, "chunks_embedded": 0}
+        if progress is not None:
+            progress(dict(state))
+
+        # 2-3. Chunk in parallel, embed and upsert in large batches
+        batch: List[Tuple[Path, str, str, List[Chunk]]] = []
+        batch_chunks = 0
+        for md_file, relative_path, digest, chunks, error in self._chunk_files(pending):
+            if cancelled is not None and cancelled():
+                self.save_manifest(self._checkpoint(previous, current))
+                logger.info(f"Knowledge base sync cancelled after {state['files_done']} of {state['files_total']} files")
+                raise JobCancelled("Knowledge base sync cancelled")
+
+            if error is not None:
+                self._record_failure(md_file, relative_path, error, previous, current, stats, errors)
+                state["files_done"] += 1
+            else:
+                batch.append((md_file, relative_path, digest, chunks))
+                batch_chunks += len(chunks)
+
+            if batch_chunks >= self.embed_batch_size:
+                self._flush(batch, previous, current, stats, errors, state, queries_busy)
+                batch, batch_chunks = [], 0
+
+            if progress is not None:
+                progress(dict(state))
+
+        if batch:
+            self._flush(batch, previous, current, stats, errors, state, queries_busy)
+            if progress is not None:
+                progress(dict(state))
+
+        # 4. Files gone from disk: drop their chunks
+        for relative_path in previous.keys() - current.keys():
+            stats["chunks_deleted"] += self.rag_service.delete_chunks(previous[relative_path]["chunk_ids"])
+            stats["files_removed"] += 1
+            logger.info(f"Removed {relative_path} from knowledge base")
+
+        self.save_manifest(current)
+
+        logger.info(
+            f"Knowledge base sync: {stats['files_processed']} ingested, "
+            f"{stats['files_unchanged']} unchanged, {stats['files_removed']} removed, "
+            f"{stats['files_skipped']} failed"
+        )
+        return {**stats, "errors": errors}
+
+    def _chunk_files(
+        self,
+        pending: List[Tuple[Path, str, str]]
+    ) -> Iterator[Tuple[Path, str, str, Optional[List[Chunk]], Optional[Exception]]]:
+        """Read and chunk files, in a process pool when there is enough work.
+
+        Args:
+            pending: (path, relative path, content hash) of files to ingest
+
+        Yields:
+            (path, relative path, hash, chunks, error) per file; in
+            completion order when parallel, directory order otherwise
+        """
+        workers = min(self.workers, len(pending))
+
+        if workers <= 1:
+            for md_file, relative_path, digest in pending:
+                try:
+                    chunks = self.document_processor.process(
+                        content=md_file.read_text(encoding="utf-8"),
+                        metadata={
+                            "source_file": relative_path,
+                            "source_type": "knowledge_base"
+                        }
+                    )
+                    yield md_file, relative_path, digest, chunks, None
+                except Exception as e:
+                    yield md_file, relative_path, digest, None, e
+            return
+
+        # spawn, not fork: the service process runs many threads (torch, executors)
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=chunk_worker.init_worker,
+            initargs=(self.chunk_size, self.chunk_overlap, self.boundary_tolerance, self.worker_nice)
+        ) as pool:
+            futures = {
+                pool.submit(chunk_worker.chunk_file, str(md_file), relative_path): (md_file, relative_path, digest)
+                for md_file, relative_path, digest in pending
+            }
+            try:
+                for future in as_completed(futures):
+                    md_file, relative_path, digest = futures[future]
+                    try:
+                        _, chunks = future.result()
+                        yield md_file, relative_path, digest, chunks, None
+                    except Exception as e:
+                        yield md_file, relative_path, digest, None, e
+            finally:
+                # Stopped early (cancelled): don't chunk the remaining files
+                pool.shutdown(cancel_futures=True)
+
+    def _flush(
+        self,
+        batch: List[Tuple[Path, str, str, List[Chunk]]],
+        previous: Dict[str, Dict[str, Any]],
+        current: Dict[str, Dict[str, Any]],
+        stats: Dict[str, int],
+        errors: List[str],
+        state: Dict[str, int],
+        queries_busy: Optional[Callable[[], bool]] = None
+    ):
+        """Embed and upsert the chunks of several files in one call, then checkpoint the manifest."""
+        all_chunks = [chunk for _, _, _, chunks in batch for chunk in chunks]
+
+        if queries_busy is not None:
+            self._yield_to_queries(queries_busy)
+
+        try:
+            chunks_added = self.rag_service.add_documents(all_chunks)
+        except Exception as e:
+            for md_file, relative_path, _, _ in batch:
+                self._record_failure(md_file, relative_path, e, previous, current, stats, errors)
+            state["files_done"] += len(batch)
+            return
+
+        for md_file, relative_path, digest, chunks in batch:
+            new_ids = [chunk_id(c) for c in chunks]
+            old_entry = previous.get(relative_path)
+            if old_entry is not None:
+                stale_ids = sorted(set(old_entry["chunk_ids"]) - set(new_ids))
+                stats["chunks_deleted"] += self.rag_service.delete_chunks(stale_ids)
+
+            current[relative_path] = {"hash": digest, "chunk_ids": new_ids}
+            stats["files_processed"] += 1
+            logger.info(f"Ingested {relative_path}: {len(chunks)} chunks")
+
+        stats["total_chunks_created"] += chunks_added
+        state["files_done"] += len(batch)
+        state["chunks_embedded"] += chunks_added
+        self.save_manifest(self._checkpoint(previous, current))
+        logger.info(f"Embedded batch of {len(all_chunks)} chunks from {len(batch)} files")
+
+    def _yield_to_queries(self, queries_busy: Callable[[], bool]):
+        """Hold the next embedding batch back while queries are in flight, up to INGEST_QUERY_YIELD_MS."""
+        deadline = time.monotonic() + self.query_yield
+        while queries_busy() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    @staticmethod
+    def _checkpoint(previous: Dict[str, Dict[str, Any]], current: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Manifest for a partial run: committed files plus the previous entries of files not reached yet."""
+        files = {path: entry for path, entry in previous.items() if path not in current}
+        files.update(current)
+        return files
+
+    @staticmethod
+    def _record_failure(
+        md_file: Path,
+        relative_path: str,
+        error: Exception,
+        previous: Dict[str, Dict[str, Any]],
+        current: Dict[str, Dict[str, Any]],
+        stats: Dict[str, int],
+        errors: List[str]
+    ):
+        """Count a failed file, keeping its previous chunks tracked so they can be cleaned up later."""
+        stats["files_skipped"] += 1
+        errors.append(f"{md_file.name}: {str(error)}")
+        logger.error(f"Failed to ingest {md_file}: {error}")
+        old_entry = previous.get(relative_path)
+        if old_entry is not None:
+            current[relative_path] = {**old_entry, "hash": None}
@@ -0,0 +1,322 @@
+"""BM25 keyword index over the knowledge-base chunks, persisted next to the Chroma collection."""
+
+import json
+import logging
+import math
+import os
+import re
+import threading
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# BM25 term-frequency saturation and document-length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Frequent words that carry no retrieval signal (kept short: rare terms matter most)
+STOPWORDS = frozenset(
+    "a an and are as at be but by can do does for from has have how i if in is it its of on or "
+    "should so than that the their them then there these they this to was what when which who "
+    "why will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric terms, dropping stopwords.
+
+    Args:
+        text: Document or query text
+
+    Returns:
+        Terms in order of appearance
+    """
+    return [term for term in _TERM_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+def matches_filter(metadata: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    """Evaluate a ChromaDB-style metadata filter against one chunk's metadata.
+
+    Supports field equality ({"breed": "beagle"}), the $eq, $ne, $in, $nin,
+    $gt, $gte, $lt and $lte operators, and $and / $or.
+
+    Args:
+        metadata: Chunk metadata
+        where: Filter, or None to match everything
+
+    Returns:
+        True if the metadata satisfies the filter
+    """
+    if not where:
+        return True
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif key == "$or":
+            if not any(matches_filter(metadata, clause) for clause in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for operator, operand in condition.items():
+                if not _compare(value, operator, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+    return True
+
+
+def _compare(value: Any, operator: str, operand: Any) -> bool:
+    """Apply one ChromaDB comparison operator."""
+    if operator == "$eq":
+        return value == operand
+    if operator == "$ne":
+        return value != operand
+    if operator == "$in":
+        return value in operand
+    if operator == "$nin":
+        return value not in operand
+    if value is None:
+        return False
+    if operator == "$gt":
+        return value > operand
+    if operator == "$gte":
+        return value >= operand
+    if operator == "$lt":
+        return value < operand
+    if operator == "$lte":
+        return value <= operand
+    raise ValueError(f"Unsupported filter operator: {operator}")
+
+
+class KeywordIndex:
+    """Inverted index scoring chunks with BM25.
+
+    Holds the same chunk ids as the Chroma collection (RAGService keeps
+    them in step on every add and delete), with each chunk's term
+    frequencies and metadata so filtered searches need no Chroma call.
+    Exact terms such as breed and condition names ("GDV",
+    "brachycephalic") are matched literally, which embeddings often miss.
+
+    Ingestion updates the index on the ingestion thread while queries
+    search it on RAG executor threads, so every read and write holds a
+    lock. add() and delete() only change the index in memory; it is
+    persisted by save_if_dirty() once per ingestion job and at shutdown.
+
+    Stored as one JSON file in CHROMA_PERSIST_DIR shared by all uvicorn
+    workers: a worker reloads it whenever another has rewritten it.
+    """
+
+    def __init__(self, config):
+        """Initialize keyword index.
+
+        Args:
+            config: Settings instance (index is stored in CHROMA_PERSIST_DIR)
+        """
+        self.path = Path(config.CHROMA_PERSIST_DIR) / "keyword_index.json"
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._total_length = 0
+        self._mtime: Optional[float] = None
+        self._dirty = False
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+
+        self.searches = 0
+
+        self.load()
+        logger.info(f"KeywordIndex initialized: {self.path} ({len(self._documents)} chunks)")
+
+    def load(self):
+        """Load the index from disk (missing or corrupt files give an empty index)."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self._mtime = self.path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable keyword index {self.path}: {e}")
+            return
+
+        with self._lock:
+            self._documents = {}
+            self._postings = {}
+            self._total_length = 0
+            for doc_id, document in data.get("documents", {}).items():
+                self._insert(doc_id, document["terms"], document.get("metadata", {}))
+            self._dirty = False
+
+    def save(self):
+        """Atomically write the index to disk."""
+        with self._save_lock:
+            # Snapshot under the lock, serialise outside it so searches are not held up
+            with self._lock:
+                documents = dict(self._documents)
+                self._dirty = False
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.tmp")  # Workers may rebuild concurrently
+            tmp_path.write_text(json.dumps({"documents": documents}), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._mtime = self.path.stat().st_mtime
+
+    def save_if_dirty(self):
+        """Persist changes made by add() and delete() since the last save."""
+        if self._dirty:
+            self.save()
+
+    def add(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]):
+        """Index chunks, replacing any already indexed under the same ids (persisted on the next save).
+
+        Args:
+            ids: Chunk ids (as stored in Chroma)
+            texts: Chunk contents
+            metadatas: Chunk metadata
+        """
+        documents = [(doc_id, dict(Counter(tokenize(text))), metadata or {})
+                     for doc_id, text, metadata in zip(ids, texts, metadatas)]
+        with self._lock:
+            self._reload_if_changed()
+            for doc_id, terms, metadata in documents:
+                self._remove(doc_id)
+                self._insert(doc_id, terms, metadata)
+            self._dirty = True
+
+    def delete(self, ids: List[str]):
+        """Remove chunks from the index (persisted on the next save).
+
+        Args:
+            ids: Chunk ids
+        """
+        with self._lock:
+            self._reload_if_changed()
+            for doc_id in ids:
+                self._remove(doc_id)
+            self._dirty = True
+
+    def replace(self, ids: List[str], texts: List[str], metadatas: List[Dict[str, Any]]):
+        """Rebuild the whole index from the given chunks and persist.
+
+        Args:
+            ids: Chunk ids
+            texts: Chunk contents
+            metadatas: Chunk metadata
+        """
+        documents = [(doc_id, dict(Counter(tokenize(text))), metadata or {})
+                     for doc_id, text, metadata in zip(ids, texts, metadatas)]
+        with self._lock:
+            self._documents = {}
+            self._postings = {}
+            self._total_length = 0
+            for doc_id, terms, metadata in documents:
+                self._insert(doc_id, terms, metadata)
+        self.save()
+        logger.info(f"Keyword index rebuilt: {len(self._documents)} chunks")
+
+    def search(
+        self,
+        query: str,
+        n_results: int,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> List[Tuple[str, float]]:
+        """Rank chunks against a query with BM25.
+
+        Args:
+            query: Query text
+            n_results: Maximum number of chunks returned
+            filters: Optional ChromaDB-style metadata filter
+
+        Returns:
+            (chunk id, BM25 score) pairs, best first; chunks sharing no
+            term with the query are not returned
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            self._reload_if_changed()
+            self.searches += 1
+
+            count = len(self._documents)
+            if count == 0:
+                return []
+            average_length = self._total_length / count or 1.0
+
+            scores: Dict[str, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    length_norm = 1 - BM25_B + BM25_B * self._documents[doc_id]["length"] / average_length
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (BM25_K1 + 1) / (
+                        frequency + BM25_K1 * length_norm
+                    )
+
+            ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+            if filters:
+                ranked = [item for item in ranked if matches_filter(self._documents[item[0]]["metadata"], filters)]
+        return ranked[:n_results]
+
+    def _insert(self, doc_id: str, terms: Dict[str, int], metadata: Dict[str, Any]):
+        """Add one chunk's term frequencies to the postings."""
+        length = sum(terms.values())
+        self._documents[doc_id] = {"terms": terms, "length": length, "metadata": metadata}
+        self._total_length += length
+        for term, frequency in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+
+    def _remove(self, doc_id: str):
+        """Drop one chunk from the postings, if indexed."""
+        document = self._documents.pop(doc_id, None)
+        if document is None:
+            return
+        self._total_length -= document["length"]
+        for term in document["terms"]:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+
+    def _reload_if_changed(self):
+        """Pick up an index rewritten by another worker (call with the lock held)."""
+        if self._dirty:
+            # Unsaved changes made here are newer than the file
+            return
+        try:
+            mtime = self.path.stat().st_mtime
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.load()
+
+    def chunk_ids(self) -> Set[str]:
+        """Ids of all indexed chunks (after picking up changes from other workers).
+
+        Returns:
+            Set of chunk ids
+        """
+        with self._lock:
+            self._reload_if_changed()
+            return set(self._documents)
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics.
+
+        Returns:
+            Dict with indexed chunk count, vocabulary size and searches served
+        """
+        with self._lock:
+            return {
+                "chunks": len(self._documents),
+                "terms": len(self._postings),
+                "searches": self.searches
+            }
@@ -0,0 +1,245 @@
+"""Health-aware load balancing across several Ollama hosts."""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Weight of the newest call in the moving average of call latency
+_LATENCY_SMOOTHING = 0.2
+
+# Seconds a /api/ps probe may take before the backend is treated as unknown
+_PS_TIMEOUT = 2.0
+
+
+def _model_tag(name: str) -> str:
+    """Model name with Ollama's implicit ":latest" tag made explicit."""
+    return name if ":" in name else f"{name}:latest"
+
+
+class OllamaBackend:
+    """One Ollama host and what the pool knows about it."""
+
+    def __init__(self, url: str):
+        """Initialize backend state.
+
+        Args:
+            url: Base URL of the Ollama host
+        """
+        self.url = url.rstrip("/")
+        self.outstanding = 0
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        self.ejections = 0
+        self.latency: Optional[float] = None  # Moving average, seconds
+        self.model_loaded: Optional[bool] = None  # None until /api/ps or a warmup call answered
+
+    def is_ejected(self, now: float) -> bool:
+        """Whether the backend is still sitting out after repeated failures."""
+        return now < self.ejected_until
+
+    def get_stats(self, now: float) -> Dict[str, Any]:
+        """Get backend statistics.
+
+        Args:
+            now: Current monotonic time
+
+        Returns:
+            Dict with outstanding requests, request and failure counts,
+            error rate, latency, ejection state and model residency
+        """
+        return {
+            "outstanding": self.outstanding,
+            "requests": self.requests,
+            "failures": self.failures,
+            "error_rate": round(self.failures / self.requests, 3) if self.requests else 0.0,
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "ejected": self.is_ejected(now),
+            "ejections": self.ejections,
+            "model_loaded": self.model_loaded
+        }
+
+
+class OllamaBackendPool:
+    """Routes each Ollama call to the backend with the fewest outstanding requests.
+
+    Backends that failed OLLAMA_BACKEND_EJECT_AFTER calls in a row sit out
+    for OLLAMA_BACKEND_EJECT_SECONDS; afterwards a single failure ejects
+    them again, a success restores them. If every backend is ejected, all
+    are tried anyway rather than failing without a request.
+
+    Among healthy backends, those that have OLLAMA_MODEL loaded (per
+    /api/ps, refreshed every OLLAMA_BACKEND_PS_INTERVAL seconds) are
+    preferred, so a call does not wait for a cold model load while another
+    host has it in memory. Ties on outstanding requests go to the backend
+    with the lower average latency.
+    """
+
+    def __init__(self, config):
+        """Initialize backend pool.
+
+        Args:
+            config: Settings instance (OLLAMA_BACKEND_URLS, or OLLAMA_BASE_URL
+                when that is empty)
+        """
+        urls = [url.strip() for url in config.OLLAMA_BACKEND_URLS.split(",") if url.strip()]
+        self.backends = [OllamaBackend(url) for url in urls or [config.OLLAMA_BASE_URL]]
+        self.model = _model_tag(config.OLLAMA_MODEL)
+        self.eject_after = max(1, config.OLLAMA_BACKEND_EJECT_AFTER)
+        self.eject_seconds = config.OLLAMA_BACKEND_EJECT_SECONDS
+        self.ps_interval = config.OLLAMA_BACKEND_PS_INTERVAL
+
+        self._ps_checked_at: Optional[float] = None
+        self._ps_lock = asyncio.Lock()
+
+        logger.info(f"OllamaBackendPool initialized: {[backend.url for backend in self.backends]}")
+
+    @property
+    def primary_url(self) -> str:
+        """URL of the first configured backend (for logging)."""
+        return self.backends[0].url
+
+    async def choose(self, client: httpx.AsyncClient) -> OllamaBackend:
+        """Pick the backend for the next call.
+
+        Args:
+            client: HTTP client used for /api/ps probes
+
+        Returns:
+            Chosen backend
+        """
+        now = time.monotonic()
+        candidates = [backend for backend in self.backends if not backend.is_ejected(now)] or self.backends
+        if len(candidates) > 1:
+            await self.refresh_models(client)
+            loaded = [backend for backend in candidates if backend.model_loaded]
+            candidates = loaded or candidates
+
+        return min(
+            candidates,
+            key=lambda backend: (
+                backend.outstanding,
+                backend.latency if backend.latency is not None else 0.0
+            )
+        )
+
+    @asynccontextmanager
+    async def route(self, client: httpx.AsyncClient) -> AsyncIterator[OllamaBackend]:
+        """Pick a backend and account for the call made inside the block.
+
+        Transport errors, 5xx responses and ConnectionError count as backend
+        failures; any other exception is the caller's problem and does not.
+
+        Args:
+            client: HTTP client used for /api/ps probes
+
+        Yields:
+            Backend to send the call to
+        """
+        backend = await self.choose(client)
+        backend.outstanding += 1
+        backend.requests += 1
+        started = time.perf_counter()
+        try:
+            yield backend
+        except (httpx.TransportError, ConnectionError) as e:
+            self._record_failure(backend, e)
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                self._record_failure(backend, e)
+            raise
+        else:
+            self._record_success(backend, time.perf_counter() - started)
+        finally:
+            backend.outstanding -= 1
+
+    def _record_success(self, backend: OllamaBackend, seconds: float):
+        """Update latency and clear the failure streak."""
+        if backend.latency is None:
+            backend.latency = seconds
+        else:
+            backend.latency += _LATENCY_SMOOTHING * (seconds - backend.latency)
+        if backend.consecutive_failures >= self.eject_after:
+            logger.info(f"Ollama backend {backend.url} recovered")
+        backend.consecutive_failures = 0
+
+    def _record_failure(self, backend: OllamaBackend, error: Exception):
+        """Count a failure, ejecting the backend once the streak is long enough."""
+        backend.failures += 1
+        backend.consecutive_failures += 1
+        if backend.consecutive_failures >= self.eject_after:
+            backend.ejected_until = time.monotonic() + self.eject_seconds
+            backend.ejections += 1
+            logger.warning(
+                f"Ejecting Ollama backend {backend.url} for {self.eject_seconds}s "
+                f"after {backend.consecutive_failures} consecutive failures: {error}"
+            )
+
+    async def refresh_models(self, client: httpx.AsyncClient, force: bool = False):
+        """Ask every backend which models it has loaded, at most once per interval.
+
+        Args:
+            client: HTTP client for the /api/ps requests
+            force: Probe even if the last refresh is recent
+        """
+        async with self._ps_lock:
+            now = time.monotonic()
+            if not force and self._ps_checked_at is not None and now - self._ps_checked_at < self.ps_interval:
+                return
+            self._ps_checked_at = now
+            await asyncio.gather(*(self._probe(client, backend) for backend in self.backends))
+
+    async def _probe(self, client: httpx.AsyncClient, backend: OllamaBackend):
+        """Record whether OLLAMA_MODEL is loaded on one backend."""
+        try:
+            response = await client.get(f"{backend.url}/api/ps", timeout=_PS_TIMEOUT)
+            response.raise_for_status()
+            models = response.json().get("models", [])
+        except (httpx.HTTPError, ValueError) as e:
+            logger.debug(f"Ollama backend {backend.url} /api/ps failed: {e}")
+            backend.model_loaded = None
+            return
+        backend.model_loaded = any(
+            _model_tag(model.get("model") or model.get("name", "")) == self.model for model in models
+        )
+
+    def set_model_loaded(self, backend: OllamaBackend, loaded: Optional[bool]):
+        """Record model residency learned outside /api/ps (e.g. from a warmup call).
+
+        Args:
+            backend: Backend the call went to
+            loaded: Whether OLLAMA_MODEL is loaded, or None if unknown
+        """
+        backend.model_loaded = loaded
+
+    def residency(self) -> Dict[str, Any]:
+        """Get OLLAMA_MODEL residency for health reporting.
+
+        Returns:
+            Dict with the model name, whether any backend has it loaded
+            (None if no backend has reported) and each backend's state
+        """
+        states = {backend.url: backend.model_loaded for backend in self.backends}
+        known = [loaded for loaded in states.values() if loaded is not None]
+        return {
+            "model": self.model,
+            "resident": any(known) if known else None,
+            "backends": states
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-backend statistics.
+
+        Returns:
+            Dict mapping backend URL to its statistics
+        """
+        now = time.monotonic()
+        return {backend.url: backend.get_stats(now) for backend in self.backends}
@@ -1,26 +1,113 @@
+import asyncio
 import httpx
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from contextlib import aclosing, nullcontext
+from typing import Dict, Any, List, Optional, AsyncIterator, Tuple
+
+from src.services.http_pool import PooledHTTPClient
+from src.services.ollama_backends import OllamaBackend, OllamaBackendPool
+from src.services.ollama_scheduler import INTERACTIVE, VISION, OllamaScheduler
+from src.utils.json_extract import JSONExtractionError, JSONExtractor, extract_json
 
 logger = logging.getLogger(__name__)
 
+# JSON schemas passed as Ollama's "format" so generation is constrained to
+# the shape each prompt asks for
+_TRAITS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "size": {"type": "string"},
+        "energy_level": {"type": "string"},
+        "temperament": {"type": "string"}
+    },
+    "required": ["size", "energy_level", "temperament"]
+}
+
+BREED_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "breed": {"type": "string"},
+        "confidence": {"type": "number"},
+        "traits": _TRAITS_SCHEMA,
+        "health_considerations": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["breed", "confidence", "traits", "health_considerations"]
+}
+
+CROSSBREED_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "breed_probabilities": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "breed": {"type": "string"},
+                    "probability": {"type": "number"}
+                },
+                "required": ["breed", "probability"]
+            }
+        },
+        "traits": _TRAITS_SCHEMA,
+        "health_considerations": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["breed_probabilities", "traits", "health_considerations"]
+}
+
+CONTEXTUAL_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "description": {"type": "string"},
+        "traits": _TRAITS_SCHEMA,
+        "health_observations": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["description", "traits", "health_observations"]
+}
+
+
+def _missing_keys(value: Any, schema: Dict[str, Any], path: str = "") -> List[str]:
+    """Required keys absent from value, checked through nested object schemas."""
+    if not isinstance(value, dict):
+        return [path.rstrip(".") or "<root>"] if schema.get("type") == "object" else []
+    missing = [f"{path}{key}" for key in schema.get("required", []) if key not in value]
+    for key, child in schema.get("properties", {}).items():
+        if key in value and child.get("type") == "object":
+            missing += _missing_keys(value[key], child, f"{path}{key}.")
+    return missing
+
+
 class OllamaVisionClient:
     """Client for Ollama vision analysis using native HTTP API.
     
     Supports both simple breed detection and multi-breed/crossbreed detection.
     """
 
-    def __init__(self, config):
+    def __init__(
+        self,
+        config,
+        http_pool: Optional[PooledHTTPClient] = None,
+        scheduler: Optional[OllamaScheduler] = None,
+        backends: Optional[OllamaBackendPool] = None
+    ):
         """Initialize Ollama client with configuration.
 
         Args:
             config: Settings instance with Ollama configuration
+            http_pool: Shared pooled HTTP client (created lazily if not given)
+            scheduler: Optional scheduler every call must get a slot from
+            backends: Ollama hosts to balance across (built from config if not given)
         """
-        self.base_url = config.OLLAMA_BASE_URL
+        self.config = config
+        self.http_pool = http_pool
+        self.scheduler = scheduler
+        self.backends = backends if backends is not None else OllamaBackendPool(config)
         self.model = config.OLLAMA_MODEL
         self.timeout = config.OLLAMA_TIMEOUT
         self.temperature = config.OLLAMA_TEMPERATURE
+        self.keep_alive = config.OLLAMA_KEEP_ALIVE
+        self.structured_output = config.OLLAMA_STRUCTURED_OUTPUT
         self.low_confidence_threshold = config.LOW_CONFIDENCE_THRESHOLD
         
         # Crossbreed detection thresholds
@@ -28,7 +115,105 @@ class OllamaVisionClient:
         self.purebred_confidence_threshold = 0.75
         self.purebred_gap_threshold = 0.30
         
-        logger.info(f"Initialized Ollama client: {self.base_url}, model: {self.model}")
+        logger.info(f"Initialized Ollama client: {self.backends.primary_url}, model: {self.model}")
+
+    def _client(self) -> httpx.AsyncClient:
+        """Get the long-lived HTTP client, creating the pool on first use."""
+        if self.http_pool is None:
+            self.http_pool = PooledHTTPClient(
+                "ollama",
+                self.config,
+                timeout=httpx.Timeout(self.timeout, connect=self.timeout)
+            )
+        return self.http_pool.client
+
+    def _slot(self, priority: str):
+        """Context manager holding a scheduler slot (no-op without a scheduler)."""
+        return self.scheduler.slot(priority) if self.scheduler is not None else nullcontext()
+
+    def _chat_request(
+        self,
+        messages: List[Dict[str, Any]],
+        stream: bool,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Build an /api/chat request body.
+
+        Every call carries keep_alive, so each one also extends how long
+        Ollama keeps the model in memory.
+
+        Args:
+            messages: Chat messages
+            stream: Whether Ollama should stream the response
+            schema: JSON schema the response must follow (sent as "format"
+                when OLLAMA_STRUCTURED_OUTPUT is set)
+
+        Returns:
+            JSON request body
+        """
+        body = {
+            "model": self.model,
+            "messages": messages,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": {"temperature": self.temperature}
+        }
+        if schema is not None and self.structured_output:
+            body["format"] = schema
+        return body
+
+    async def warmup(self, timeout: Optional[float] = None) -> Dict[str, bool]:
+        """Load the model on every backend and restart its keep_alive timer.
+
+        A chat request without messages makes Ollama load the model (if it is
+        not already resident) and return without generating anything. Called
+        at startup and periodically as a keepalive ping; failures are logged,
+        never raised.
+
+        Args:
+            timeout: Seconds to wait per backend (default: OLLAMA_TIMEOUT)
+
+        Returns:
+            Dict mapping backend URL to whether the model is now resident
+        """
+        backends = self.backends.backends
+        resident = await asyncio.gather(*(self._warm_backend(backend, timeout) for backend in backends))
+        return {backend.url: loaded for backend, loaded in zip(backends, resident)}
+
+    async def _warm_backend(self, backend: OllamaBackend, timeout: Optional[float]) -> bool:
+        """Load the model on one backend, recording whether it is resident."""
+        started = time.perf_counter()
+        try:
+            response = await self._client().post(
+                f"{backend.url}/api/chat",
+                json={"model": self.model, "messages": [], "keep_alive": self.keep_alive},
+                timeout=timeout if timeout is not None else self.timeout
+            )
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            logger.warning(f"Ollama warmup failed on {backend.url}: {e!r}")
+            self.backends.set_model_loaded(backend, None)
+            return False
+
+        self.backends.set_model_loaded(backend, True)
+        logger.info(f"Ollama model {self.model} resident on {backend.url} ({time.perf_counter() - started:.1f}s)")
+        return True
+
+    def _route(self):
+        """Context manager yielding the backend for one call and recording its outcome."""
+        return self.backends.route(self._client())
+
+    def check_capacity(self, priority: str):
+        """Fail fast if a call of this priority class would be rejected now.
+
+        Args:
+            priority: Scheduler priority class
+
+        Raises:
+            OllamaBusy: If the scheduler queue for this class is full
+        """
+        if self.scheduler is not None:
+            self.scheduler.check_capacity(priority)
 
     async def analyze_breed(
         self,
@@ -59,40 +244,32 @@ class OllamaVisionClient:
             # Build structured prompt
             if detect_crossbreed:
                 prompt = self._build_crossbreed_prompt(top_n_breeds)
+                schema = CROSSBREED_ANALYSIS_SCHEMA
             else:
                 prompt = self._build_analysis_prompt()
+                schema = BREED_ANALYSIS_SCHEMA
 
             logger.info(f"Sending image to Ollama for {'crossbreed' if detect_crossbreed else 'standard'} analysis")
 
-            # Call Ollama HTTP API with explicit timeout
-            timeout = httpx.Timeout(self.timeout, connect=self.timeout)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": prompt,
-                                "images": [image_base64]
-                            }
-                        ],
-                        "stream": False,
-                        "options": {
-                            "temperature": self.temperature
-                        }
-                    }
+            # Call Ollama HTTP API over the shared connection pool
+            async with self._slot(VISION), self._route() as backend:
+                response = await self._client().post(
+                    f"{backend.url}/api/chat",
+                    json=self._chat_request(
+                        [{"role": "user", "content": prompt, "images": [image_base64]}],
+                        stream=False,
+                        schema=schema
+                    )
                 )
-
                 response.raise_for_status()
-                response_data = response.json()
+
+            response_data = response.json()
 
             # Extract content from response
             content = response_data.get("message", {}).get("content", "")
 
             # Parse JSON response
-            result = self._parse_response(content)
+            result = self._parse_response(content, schema)
 
             # Process crossbreed detection if requested
             if detect_crossbreed:
@@ -167,11 +344,16 @@ Return ONLY valid JSON with the TOP {top_n} most likely breeds:
 
 Probabilities should sum to approximately 1.0."""
 
-    def _parse_response(self, response_text: str) -> Dict[str, Any]:
+    def _parse_response(self, response_text: str, schema: Dict[str, Any]) -> Dict[str, Any]:
         """Parse JSON from model response.
 
+        Tolerates prose around the object, code fences, comments, trailing
+        commas and output cut off mid-object (see JSONExtractor). A salvaged
+        object still has to carry every key the prompt's schema requires.
+
         Args:
             response_text: Raw response text from Ollama
+            schema: JSON schema the prompt asked for
 
         Returns:
             Parsed JSON dict
@@ -180,19 +362,31 @@ Probabilities should sum to approximately 1.0."""
             RuntimeError: If JSON cannot be parsed (service error, not user input error)
         """
         try:
-            # Try direct JSON parse
-            return json.loads(response_text)
-        except json.JSONDecodeError:
-            # Extract JSON from markdown code blocks if present
-            if "```json" in response_text:
-                start = response_text.find("```json") + 7
-                end = response_text.find("```", start)
-                if end > start:
-                    json_str = response_text[start:end].strip()
-                    return json.loads(json_str)
-
+            result = extract_json(response_text)
+        except JSONExtractionError:
             logger.error(f"Failed to parse response: {response_text[:200]}")
             raise RuntimeError("Failed to parse JSON from response")
+        return self._check_required(result, schema, response_text)
+
+    def _check_required(self, result: Dict[str, Any], schema: Dict[str, Any], response_text: str) -> Dict[str, Any]:
+        """Reject a parsed object missing keys the schema requires.
+
+        Args:
+            result: Parsed JSON object
+            schema: JSON schema the prompt asked for
+            response_text: Raw response text (for logging)
+
+        Returns:
+            result, unchanged
+
+        Raises:
+            RuntimeError: If a required key (at any object level) is missing
+        """
+        missing = _missing_keys(result, schema)
+        if missing:
+            logger.error(f"Response missing required keys {missing}: {response_text[:200]}")
+            raise RuntimeError("Failed to parse JSON from response")
+        return result
 
     def _process_crossbreed_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """Process crossbreed detection result and add breed_analysis.
@@ -345,33 +539,28 @@ Probabilities should sum to approximately 1.0."""
         
         return None
 
-    async def generate(self, prompt: str) -> str:
+    async def generate(self, prompt: str, priority: str = INTERACTIVE) -> str:
         """Generate text response from prompt (no image).
 
         Args:
             prompt: Text prompt for generation
+            priority: Scheduler priority class
 
         Returns:
             Generated text response
 
         Raises:
-            ConnectionError: If Ollama is unreachable
+            ConnectionError: If Ollama is unreachable (OllamaBusy if the
+                scheduler queue is full)
         """
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {"role": "user", "content": prompt}
-                        ],
-                        "stream": False,
-                        "options": {"temperature": self.temperature}
-                    }
+            async with self._slot(priority), self._route() as backend:
+                response = await self._client().post(
+                    f"{backend.url}/api/chat",
+                    json=self._chat_request([{"role": "user", "content": prompt}], stream=False)
                 )
                 response.raise_for_status()
-                response_data = response.json()
+            response_data = response.json()
 
             return response_data.get("message", {}).get("content", "")
 
@@ -379,6 +568,22 @@ Probabilities should sum to approximately 1.0."""
             logger.error(f"Ollama generation failed: {str(e)}")
             raise ConnectionError(f"Failed to connect to Ollama: {str(e)}")
 
+    async def generate_stream(self, prompt: str, priority: str = INTERACTIVE) -> AsyncIterator[str]:
+        """Streaming variant of generate: yield the response as Ollama produces it.
+
+        Args:
+            prompt: Text prompt for generation
+            priority: Scheduler priority class
+
+        Yields:
+            Non-empty text fragments in generation order
+
+        Raises:
+            ConnectionError: If Ollama is unreachable or the stream fails
+        """
+        async for token in self._stream_chat([{"role": "user", "content": prompt}], priority):
+            yield token
+
     async def analyze_with_context(
         self,
         image_base64: str,
@@ -410,25 +615,17 @@ Probabilities should sum to approximately 1.0."""
 
         # Call Ollama HTTP API
         try:
-            timeout = httpx.Timeout(self.timeout, connect=self.timeout)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/chat",
-                    json={
-                        "model": self.model,
-                        "messages": [
-                            {
-                                "role": "user",
-                                "content": prompt,
-                                "images": [image_base64]
-                            }
-                        ],
-                        "stream": False,
-                        "options": {"temperature": self.temperature}
-                    }
+            async with self._slot(VISION), self._route() as backend:
+                response = await self._client().post(
+                    f"{backend.url}/api/chat",
+                    json=self._chat_request(
+                        [{"role": "user", "content": prompt, "images": [image_base64]}],
+                        stream=False,
+                        schema=CONTEXTUAL_ANALYSIS_SCHEMA
+                    )
                 )
                 response.raise_for_status()
-                response_data = response.json()
+            response_data = response.json()
 
         except httpx.ConnectError as e:
             logger.error(f"Ollama connection failed: {e}")
@@ -439,11 +636,121 @@ Probabilities should sum to approximately 1.0."""
 
         # Parse JSON response
         content = response_data.get("message", {}).get("content", "")
-        result = self._parse_response(content)
+        result = self._parse_response(content, CONTEXTUAL_ANALYSIS_SCHEMA)
 
         logger.info(f"Visual analysis complete for {breed_analysis['primary_breed']}")
         return result
 
+    async def analyze_with_context_stream(
+        self,
+        image_base64: str,
+        species: str,
+        breed_analysis: Dict[str, Any],
+        rag_context: Optional[Dict[str, Any]]
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming variant of analyze_with_context.
+
+        Yields ("token", text) for every content fragment Ollama produces,
+        then a single ("analysis", result) with the parsed JSON result. The
+        stream is closed as soon as the JSON object is complete, so Ollama
+        stops generating any text the model adds after it.
+
+        Args:
+            image_base64: Base64-encoded image (data URI or raw)
+            species: Pre-classified species (dog/cat)
+            breed_analysis: Complete breed classification result
+            rag_context: RAG-enriched breed knowledge (can be None)
+
+        Raises:
+            ConnectionError: If Ollama unreachable
+            RuntimeError: If response parsing fails
+        """
+        # Extract base64 part if data URI
+        if "," in image_base64:
+            image_base64 = image_base64.split(",")[1]
+
+        prompt = self._build_contextual_prompt(species, breed_analysis, rag_context)
+        messages = [
+            {
+                "role": "user",
+                "content": prompt,
+                "images": [image_base64]
+            }
+        ]
+
+        extractor = JSONExtractor()
+        async with aclosing(self._stream_chat(messages, VISION, schema=CONTEXTUAL_ANALYSIS_SCHEMA)) as tokens:
+            async for token in tokens:
+                yield "token", token
+                if extractor.feed(token) is not None:
+                    break
+
+        try:
+            result = extractor.finish()
+        except JSONExtractionError:
+            logger.error(f"Failed to parse streamed response: {extractor.text[:200]}")
+            raise RuntimeError("Failed to parse JSON from response")
+        self._check_required(result, CONTEXTUAL_ANALYSIS_SCHEMA, extractor.text)
+
+        logger.info(f"Streamed visual analysis complete for {breed_analysis['primary_breed']}")
+        yield "analysis", result
+
+    async def _stream_chat(
+        self,
+        messages: List[Dict[str, Any]],
+        priority: str,
+        schema: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Call /api/chat with streaming enabled and yield content fragments.
+
+        Ollama streams newline-delimited JSON objects, each carrying a
+        message.content fragment, until one with "done": true. The scheduler
+        slot is held until the stream ends.
+
+        Args:
+            messages: Chat messages for the request
+            priority: Scheduler priority class
+            schema: Optional JSON schema for the response (see _chat_request)
+
+        Yields:
+            Non-empty content fragments in generation order
+
+        Raises:
+            ConnectionError: If Ollama unreachable or the stream fails
+        """
+        try:
+            async with self._slot(priority), self._route() as backend, self._client().stream(
+                "POST",
+                f"{backend.url}/api/chat",
+                json=self._chat_request(messages, stream=True, schema=schema)
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    try:
+                        chunk = json.loads(line)
+                    except ValueError as e:
+                        logger.error(f"Ollama stream returned invalid data: {e}")
+                        raise ConnectionError("Ollama stream returned invalid data")
+                    if "error" in chunk:
+                        raise ConnectionError(f"Ollama stream error: {chunk['error']}")
+                    token = chunk.get("message", {}).get("content", "")
+                    if token:
+                        yield token
+                    if chunk.get("done"):
+                        break
+
+        except httpx.ConnectError as e:
+            logger.error(f"Ollama connection failed: {e}")
+            raise ConnectionError("Ollama service unavailable")
+        except httpx.TimeoutException as e:
+            logger.error(f"Ollama timeout: {e}")
+            raise ConnectionError("Ollama service timeout")
+        except httpx.HTTPError as e:
+            logger.error(f"Ollama streaming failed: {e}")
+            raise ConnectionError(f"Failed to connect to Ollama: {str(e)}")
+
     def _build_contextual_prompt(
         self,
         species: str,
@@ -0,0 +1,217 @@
+"""Admission control and priority scheduling for Ollama calls."""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from bisect import bisect_left
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, most urgent first
+INTERACTIVE = "interactive"  # RAG answers a user is waiting for
+VISION = "vision"  # Image analysis (long generations)
+BACKGROUND = "background"  # Enrichment and other work nobody is waiting on
+PRIORITIES = (INTERACTIVE, VISION, BACKGROUND)
+
+# Histogram bucket upper bounds in seconds (the last bucket is unbounded)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# Weight of the newest call in the moving average of call duration
+_DURATION_SMOOTHING = 0.2
+
+
+class OllamaBusy(ConnectionError):
+    """Raised when an Ollama call is rejected because the queue is full.
+
+    A ConnectionError, so every caller that already degrades on an
+    unreachable Ollama handles it; retry_after is a hint in seconds.
+    """
+
+    def __init__(self, priority: str, retry_after: int):
+        super().__init__(f"Ollama busy: {priority} queue full, retry after {retry_after}s")
+        self.priority = priority
+        self.retry_after = retry_after
+
+
+class LatencyHistogram:
+    """Cumulative-bucket latency histogram (Prometheus style)."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        """Record one duration."""
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the histogram as cumulative counts per upper bound.
+
+        Returns:
+            Dict with count, sum_seconds, mean_ms and buckets ("le" bound -> count)
+        """
+        cumulative = list(itertools.accumulate(self.counts))
+        buckets = {str(bound): total for bound, total in zip(self.buckets, cumulative)}
+        buckets["+Inf"] = cumulative[-1]
+        return {
+            "count": self.count,
+            "sum_seconds": round(self.sum, 3),
+            "mean_ms": round(self.sum / self.count * 1000, 1) if self.count else 0.0,
+            "buckets": buckets
+        }
+
+
+class OllamaScheduler:
+    """Runs at most OLLAMA_SCHEDULER_SLOTS Ollama calls at once, most urgent first.
+
+    Ollama processes OLLAMA_NUM_PARALLEL requests per model and queues the
+    rest internally in arrival order, so a 3-minute vision analysis can sit
+    in front of a short RAG answer. Matching the slot count to Ollama's
+    parallelism moves that queue here, where waiting calls are ordered by
+    priority class (interactive, then vision, then background) and FIFO
+    within a class.
+
+    A call is rejected with OllamaBusy instead of queued when
+    OLLAMA_SCHEDULER_MAX_QUEUE calls of the same or a more urgent class are
+    already waiting; the Retry-After hint is the expected time for that
+    queue to drain. Queue wait and call duration are recorded per class.
+    """
+
+    def __init__(self, config):
+        """Initialize scheduler.
+
+        Args:
+            config: Settings instance with scheduler configuration
+        """
+        self.slots = max(1, config.OLLAMA_SCHEDULER_SLOTS)
+        self.max_queue = max(0, config.OLLAMA_SCHEDULER_MAX_QUEUE)
+
+        self.running = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        # Rough guess (a tenth of the timeout) until real calls have been measured
+        self._avg_duration = {priority: float(config.OLLAMA_TIMEOUT) / 10 for priority in PRIORITIES}
+
+        self.completed = {priority: 0 for priority in PRIORITIES}
+        self.rejected = {priority: 0 for priority in PRIORITIES}
+        self.wait_histograms = {priority: LatencyHistogram() for priority in PRIORITIES}
+        self.run_histograms = {priority: LatencyHistogram() for priority in PRIORITIES}
+
+        logger.info(f"OllamaScheduler initialized: slots={self.slots}, max_queue={self.max_queue}")
+
+    def queued(self, priority: str = BACKGROUND) -> int:
+        """Number of calls waiting at the given priority or a more urgent one."""
+        rank = PRIORITIES.index(priority)
+        return sum(1 for waiter_rank, _, future in self._waiters if waiter_rank <= rank and not future.done())
+
+    def check_capacity(self, priority: str):
+        """Fail fast if a call of this class would be rejected right now.
+
+        Lets callers with expensive work before their Ollama call (e.g. the
+        vision pipeline's classification stages) reject early.
+
+        Args:
+            priority: Priority class
+
+        Raises:
+            OllamaBusy: If the queue for this class is full
+        """
+        if self.running < self.slots and not self.queued():
+            return
+        ahead = self.queued(priority)
+        if ahead >= self.max_queue:
+            self.rejected[priority] += 1
+            retry_after = self._estimate_wait(ahead)
+            logger.warning(f"Ollama scheduler rejecting {priority} call: {ahead} queued, retry after {retry_after}s")
+            raise OllamaBusy(priority, retry_after)
+
+    @asynccontextmanager
+    async def slot(self, priority: str) -> AsyncIterator[None]:
+        """Hold one Ollama slot for the duration of the block.
+
+        Args:
+            priority: Priority class (INTERACTIVE, VISION or BACKGROUND)
+
+        Raises:
+            OllamaBusy: If the queue for this class is full
+            ValueError: If priority is not a known class
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown Ollama priority class: {priority}")
+
+        submitted = time.perf_counter()
+        await self._acquire(priority)
+        started = time.perf_counter()
+        self.wait_histograms[priority].observe(started - submitted)
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            self.run_histograms[priority].observe(duration)
+            self.completed[priority] += 1
+            self._avg_duration[priority] += _DURATION_SMOOTHING * (duration - self._avg_duration[priority])
+            self._release()
+
+    async def _acquire(self, priority: str):
+        """Take a free slot, or wait in the priority queue for one to be handed over."""
+        if self.running < self.slots and not self.queued():
+            self.running += 1
+            return
+
+        self.check_capacity(priority)
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (PRIORITIES.index(priority), next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as the caller gave up
+                self._release()
+            raise
+
+    def _release(self):
+        """Hand the slot to the most urgent waiter, or free it."""
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.running -= 1
+
+    def _estimate_wait(self, ahead: int) -> int:
+        """Seconds until `ahead` queued calls and the running ones have finished."""
+        durations = sorted(self._avg_duration.values())
+        per_call = durations[len(durations) // 2]  # Median over classes
+        return max(1, math.ceil((ahead + self.running) * per_call / self.slots))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get scheduler statistics.
+
+        Returns:
+            Dict with slots, running/queued calls, and per-class completed and
+            rejected counts with queue-wait and call-duration histograms
+        """
+        return {
+            "slots": self.slots,
+            "max_queue": self.max_queue,
+            "running": self.running,
+            "queued": self.queued(),
+            "classes": {
+                priority: {
+                    "completed": self.completed[priority],
+                    "rejected": self.rejected[priority],
+                    "queue_wait": self.wait_histograms[priority].snapshot(),
+                    "duration": self.run_histograms[priority].snapshot()
+                }
+                for priority in PRIORITIES
+            }
+        }
@@ -0,0 +1,104 @@
+"""Bounded thread pool for blocking RAG work (embedding, ChromaDB lookups)."""
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class RAGExecutor:
+    """Dedicated worker threads for blocking RAG calls.
+
+    SentenceTransformer forward passes and ChromaDB queries are synchronous;
+    running them here keeps the event loop free for other requests. At most
+    RAG_EXECUTOR_WORKERS calls run at once and at most RAG_EXECUTOR_MAX_QUEUE
+    more wait for a thread. Beyond that, new work is rejected with
+    ConnectionError so callers fail fast (503 / graceful enrichment skip)
+    instead of piling up behind a saturated pool.
+    """
+
+    def __init__(self, config):
+        """Initialize RAG executor.
+
+        Args:
+            config: Settings instance with executor configuration
+        """
+        self.workers = max(1, config.RAG_EXECUTOR_WORKERS)
+        self.max_queue = max(0, config.RAG_EXECUTOR_MAX_QUEUE)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="rag")
+
+        # In-flight = submitted and not yet finished (running + queued)
+        self.in_flight = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self.total_wait = 0.0
+
+        logger.info(f"RAGExecutor initialized: workers={self.workers}, max_queue={self.max_queue}")
+
+    @property
+    def queued(self) -> int:
+        """Number of submitted calls waiting for a free worker thread."""
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """Run a blocking function on a RAG worker thread.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+
+        Returns:
+            Whatever fn returns
+
+        Raises:
+            ConnectionError: If the executor queue is full
+            Exception: Whatever fn raised
+        """
+        if self.in_flight >= self.workers + self.max_queue:
+            self.rejected += 1
+            logger.warning(f"RAG executor saturated: {self.in_flight} calls in flight, rejecting")
+            raise ConnectionError("RAG executor saturated")
+
+        submitted = time.perf_counter()
+        started = []
+
+        def call():
+            started.append(time.perf_counter())
+            return fn(*args)
+
+        self.in_flight += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            if started:
+                self.total_wait += started[0] - submitted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics.
+
+        Returns:
+            Dict with limits, current running/queued calls, peak queue depth,
+            completed and rejected counts and average queue wait
+        """
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": min(self.in_flight, self.workers),
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_queue_wait_ms": round(self.total_wait / self.completed * 1000, 2) if self.completed else 0.0
+        }
+
+    def shutdown(self):
+        """Release the worker threads."""
+        self._executor.shutdown(wait=False)
+        logger.info("RAGExecutor stopped")
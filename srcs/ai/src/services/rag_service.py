@@ -1,15 +1,52 @@
 """RAG service for retrieval-augmented generation."""
 
+import asyncio
+import hashlib
 import logging
+import time
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Any
+from typing import AsyncIterator, Dict, List, Optional, Any, Set, Tuple
 
 import chromadb
 
-from src.services.document_processor import Chunk
+from src.services.document_processor import Chunk, breed_key
+from src.services.rag_executor import RAGExecutor
+from src.services.breed_context_table import BreedContextTable
+from src.services.keyword_index import KeywordIndex
+from src.services.ollama_scheduler import BACKGROUND, INTERACTIVE
+from src.services.semantic_cache import SemanticAnswerCache
 
 logger = logging.getLogger(__name__)
 
+# Retrieval query used for breed context (purebred and each crossbreed parent)
+BREED_QUERY_TEMPLATE = "{breed} breed characteristics health care requirements"
+
+# Documents retrieved per breed (purebred context uses all, each crossbreed parent the first 3)
+BREED_CONTEXT_DEPTH = 5
+CROSSBREED_PARENT_DEPTH = 3
+
+RETRIEVAL_MODES = ("hybrid", "vector", "keyword")
+
+
+def chunk_id(chunk: Chunk) -> str:
+    """Stable id for a chunk, derived from its source, position and content.
+
+    The same chunk always gets the same id, in every process, so
+    re-ingesting a document overwrites its chunks instead of duplicating them.
+
+    Args:
+        chunk: Document chunk
+
+    Returns:
+        Hex digest id
+    """
+    key = "\0".join([
+        str(chunk.metadata.get("source_file", "")),
+        str(chunk.metadata.get("chunk_index", "")),
+        chunk.content
+    ])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+
 
 @dataclass
 class Source:
@@ -27,20 +64,54 @@ class RAGResponse:
     model: str
 
 
+@dataclass
+class PreparedQuery:
+    """Retrieval result for a question, ready for answer generation."""
+    sources: List[Source]
+    prompt: str
+    chunk_ids: List[str]
+    filters: Optional[Dict[str, Any]]
+    top_k: int
+    mode: str
+    embedding: Optional[List[float]] = None
+    cached_answer: Optional[str] = None
+
+
 class RAGService:
     """Orchestrates RAG queries with ChromaDB and Ollama."""
 
-    def __init__(self, config, embedder, ollama_client):
+    def __init__(
+        self,
+        config,
+        embedder,
+        ollama_client,
+        executor: Optional[RAGExecutor] = None,
+        breed_table: Optional[BreedContextTable] = None,
+        keyword_index: Optional[KeywordIndex] = None,
+        answer_cache: Optional[SemanticAnswerCache] = None
+    ):
         """Initialize RAG service.
 
         Args:
             config: Settings instance
             embedder: Embedder service for generating embeddings
             ollama_client: Ollama client for text generation
+            executor: Thread pool for blocking embedding/ChromaDB calls
+                (created from config when not given)
+            breed_table: Optional precomputed breed context table; breed
+                lookups fall back to vector search when absent or missing
+            keyword_index: Optional BM25 index kept in step with the
+                collection; without it every query is vector-only
+            answer_cache: Optional semantic cache of generated answers,
+                cleared whenever the collection is modified
         """
         self.config = config
         self.embedder = embedder
         self.ollama = ollama_client
+        self.executor = executor or RAGExecutor(config)
+        self.breed_table = breed_table
+        self.keyword_index = keyword_index
+        self.answer_cache = answer_cache
 
         # Initialize ChromaDB
         self._chroma_client = chromadb.PersistentClient(path=config.CHROMA_PERSIST_DIR)
@@ -48,13 +119,29 @@ class RAGService:
             name=config.CHROMA_COLLECTION_NAME
         )
 
+        # Critical-path accounting for concurrent per-parent retrieval
+        self.parallel_retrievals = 0
+        self.retrieval_time_saved_ms = 0.0
+
+        # A table built from a different knowledge base is stale
+        if self.breed_table is not None:
+            fingerprint = self.collection_fingerprint()
+            if self.breed_table.fingerprint != fingerprint:
+                self.breed_table.reset(fingerprint)
+
+        # Chunks ingested before the index existed (or by an older version) are indexed now
+        if self.keyword_index is not None:
+            self.sync_keyword_index()
+
         logger.info(f"Initialized RAG service with collection: {config.CHROMA_COLLECTION_NAME}")
 
     async def query(
         self,
         question: str,
         filters: Optional[Dict[str, Any]] = None,
-        top_k: int = None
+        top_k: int = None,
+        mode: Optional[str] = None,
+        priority: str = INTERACTIVE
     ) -> RAGResponse:
         """Query the knowledge base and generate an answer.
 
@@ -62,39 +149,128 @@ class RAGService:
             question: User's question
             filters: Optional metadata filters (e.g., {"breed": "golden_retriever"})
             top_k: Number of chunks to retrieve (default: config value)
+            mode: Retrieval mode, "hybrid", "vector" or "keyword"
+                (default: config value)
+            priority: Ollama scheduler priority class for generation
 
         Returns:
             RAGResponse with answer and sources
+
+        Raises:
+            ValueError: If mode is not a known retrieval mode
+            ConnectionError: If Ollama is unreachable (OllamaBusy if its
+                queue is full)
         """
-        top_k = top_k or self.config.RAG_TOP_K
+        prepared = await self._prepare_query(question, filters, top_k, mode)
+        answer = prepared.cached_answer
 
-        # 1. Embed the question
-        query_embedding = self.embedder.embed(question)
+        # 4. Generate answer with Ollama
+        if answer is None:
+            answer = await self.ollama.generate(prepared.prompt, priority=priority)
+            self._cache_answer(prepared, answer)
 
-        # 2. Search ChromaDB
-        query_params = {
-            "query_embeddings": [query_embedding],
-            "n_results": top_k
-        }
-        if filters:
-            query_params["where"] = filters
+        return RAGResponse(
+            answer=answer,
+            sources=prepared.sources,
+            model=self.config.OLLAMA_MODEL
+        )
 
-        results = self._collection.query(**query_params)
+    async def query_stream(
+        self,
+        question: str,
+        filters: Optional[Dict[str, Any]] = None,
+        top_k: int = None,
+        mode: Optional[str] = None,
+        priority: str = INTERACTIVE
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Streaming variant of query.
 
-        # 3. Build context from retrieved chunks
-        sources = self._build_sources(results)
-        context = self._format_context(sources)
+        Yields ("sources", sources) as soon as retrieval finishes, then
+        ("token", text) for every answer fragment Ollama produces (a cached
+        answer arrives as one fragment), then ("complete", RAGResponse).
 
-        # 4. Generate answer with Ollama
-        prompt = self._build_prompt(question, context)
-        answer = await self.ollama.generate(prompt)
+        Args:
+            question: User's question
+            filters: Optional metadata filters
+            top_k: Number of chunks to retrieve (default: config value)
+            mode: Retrieval mode (default: config value)
+            priority: Ollama scheduler priority class for generation
 
-        return RAGResponse(
-            answer=answer,
+        Raises:
+            ValueError: If mode is not a known retrieval mode
+            ConnectionError: If Ollama is unreachable or the stream fails
+        """
+        prepared = await self._prepare_query(question, filters, top_k, mode)
+        yield "sources", prepared.sources
+
+        if prepared.cached_answer is not None:
+            answer = prepared.cached_answer
+            yield "token", answer
+        else:
+            parts = []
+            async for token in self.ollama.generate_stream(prepared.prompt, priority=priority):
+                parts.append(token)
+                yield "token", token
+            answer = "".join(parts)
+            self._cache_answer(prepared, answer)
+
+        yield "complete", RAGResponse(answer=answer, sources=prepared.sources, model=self.config.OLLAMA_MODEL)
+
+    async def _prepare_query(
+        self,
+        question: str,
+        filters: Optional[Dict[str, Any]],
+        top_k: Optional[int],
+        mode: Optional[str]
+    ) -> PreparedQuery:
+        """Retrieve context for a question and check the semantic answer cache.
+
+        Args:
+            question: User's question
+            filters: Optional metadata filters
+            top_k: Number of chunks to retrieve (default: config value)
+            mode: Retrieval mode (default: config value)
+
+        Returns:
+            PreparedQuery with sources, generation prompt and any cached answer
+
+        Raises:
+            ValueError: If mode is not a known retrieval mode
+        """
+        top_k = top_k or self.config.RAG_TOP_K
+        mode = mode or self.config.RAG_RETRIEVAL_MODE
+        if mode not in RETRIEVAL_MODES:
+            raise ValueError(f"Unknown retrieval mode: {mode}")
+
+        # 1-2. Embed the question and search the vector and/or keyword index (off the event loop)
+        embedding, results = await self.executor.run(self._embed_and_search, question, top_k, filters, mode)
+
+        # 3. Build context from retrieved chunks
+        sources = self._build_sources(results)
+        prepared = PreparedQuery(
             sources=sources,
-            model=self.config.OLLAMA_MODEL
+            prompt=self._build_prompt(question, self._format_context(sources)),
+            chunk_ids=results["ids"][0] if results["ids"] else [],
+            filters=filters,
+            top_k=top_k,
+            mode=mode
         )
 
+        # Keyword-only queries are not embedded, so they bypass the semantic cache
+        if self.answer_cache is not None and embedding is not None:
+            prepared.embedding = embedding
+            prepared.cached_answer = self.answer_cache.get(
+                prepared.embedding, prepared.chunk_ids, filters, top_k, mode
+            )
+        return prepared
+
+    def _cache_answer(self, prepared: PreparedQuery, answer: str):
+        """Store a freshly generated answer in the semantic cache, if enabled."""
+        if prepared.embedding is not None:
+            self.answer_cache.put(
+                prepared.embedding, prepared.chunk_ids, prepared.filters, prepared.top_k, prepared.mode, answer
+            )
+
     def _build_sources(self, results: Dict) -> List[Source]:
         """Build Source objects from ChromaDB results.
 
@@ -161,7 +337,7 @@ Question: {question}
 Answer concisely and cite sources by number when applicable."""
 
     def add_documents(self, chunks: List[Chunk]) -> int:
-        """Add document chunks to the collection.
+        """Add or update document chunks in the collection.
 
         Args:
             chunks: List of Chunk objects to add
@@ -176,11 +352,11 @@ Answer concisely and cite sources by number when applicable."""
         texts = [c.content for c in chunks]
         embeddings = self.embedder.embed_batch(texts)
 
-        # Generate IDs
-        ids = [f"chunk_{i}_{hash(c.content) % 10000}" for i, c in enumerate(chunks)]
+        # Content-hash IDs make re-ingestion idempotent
+        ids = [chunk_id(c) for c in chunks]
 
-        # Add to collection
-        self._collection.add(
+        # Insert new chunks, overwrite existing ones
+        self._collection.upsert(
             ids=ids,
             embeddings=embeddings,
             documents=texts,
@@ -188,8 +364,79 @@ Answer concisely and cite sources by number when applicable."""
         )
 
         logger.info(f"Added {len(chunks)} chunks to collection")
+
+        if self.keyword_index is not None:
+            self.keyword_index.add(ids, texts, [c.metadata for c in chunks])
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
+
+        # Reset to the new fingerprint once, by finish_ingest()
+        if self.breed_table is not None:
+            self.breed_table.invalidate()
+
         return len(chunks)
 
+    def delete_chunks(self, ids: List[str]) -> int:
+        """Remove chunks from the collection.
+
+        Args:
+            ids: Chunk ids to delete
+
+        Returns:
+            Number of chunk ids deleted
+        """
+        if not ids:
+            return 0
+
+        self._collection.delete(ids=ids)
+        logger.info(f"Deleted {len(ids)} chunks from collection")
+
+        if self.keyword_index is not None:
+            self.keyword_index.delete(ids)
+        if self.answer_cache is not None:
+            self.answer_cache.clear()
+
+        if self.breed_table is not None:
+            self.breed_table.invalidate()
+
+        return len(ids)
+
+    def finish_ingest(self):
+        """Record the collection's new contents after a run of add_documents / delete_chunks calls.
+
+        Called once at the end of an ingestion job (blocking): fingerprinting
+        scans every chunk id and persisting the keyword index rewrites it
+        whole, so neither is done per batch.
+        """
+        if self.keyword_index is not None:
+            self.keyword_index.save_if_dirty()
+        if self.breed_table is not None and self.breed_table.stale:
+            self.breed_table.reset(self.collection_fingerprint())
+
+    def sync_keyword_index(self) -> bool:
+        """Rebuild the keyword index from the collection if they hold different chunks.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        ids = self._collection.get(include=[])["ids"]
+        if set(ids) == self.keyword_index.chunk_ids():
+            return False
+
+        logger.info(f"Keyword index out of date, indexing {len(ids)} chunks")
+        contents = self._collection.get(include=["documents", "metadatas"])
+        self.keyword_index.replace(contents["ids"], contents["documents"], contents["metadatas"])
+        return True
+
+    def collection_fingerprint(self) -> str:
+        """Fingerprint the collection contents (changes whenever chunks are added or removed).
+
+        Returns:
+            Hex SHA-256 digest of the sorted chunk ids
+        """
+        ids = sorted(self._collection.get(include=[])["ids"])
+        return hashlib.sha256("\n".join(ids).encode()).hexdigest()
+
     def get_stats(self) -> Dict[str, Any]:
         """Get collection statistics.
 
@@ -210,14 +457,15 @@ Answer concisely and cite sources by number when applicable."""
         Returns:
             Dict with description, care_summary, and sources
         """
-        # Normalize breed name for filter
-        breed_key = breed.lower().replace(" ", "_")
+        # Only chunks indexed under this breed at ingest time
+        filters = {"breed_key": breed_key(breed)}
 
         # Query for breed-specific information
         response = await self.query(
             question=f"Summarize key facts, temperament, and care requirements for {breed}",
-            filters={"breed": breed_key},
-            top_k=3
+            filters=filters,
+            top_k=3,
+            priority=BACKGROUND
         )
 
         # Handle no results
@@ -231,8 +479,9 @@ Answer concisely and cite sources by number when applicable."""
         # Extract care-related query
         care_response = await self.query(
             question=f"What are the care requirements and health considerations for {breed}?",
-            filters={"breed": breed_key},
-            top_k=2
+            filters=filters,
+            top_k=2,
+            priority=BACKGROUND
         )
 
         return {
@@ -252,27 +501,7 @@ Answer concisely and cite sources by number when applicable."""
         """
         breed_display = breed.replace("_", " ").title()
 
-        # Query ChromaDB
-        query_text = f"{breed_display} breed characteristics health care requirements"
-        query_embedding = self.embedder.embed(query_text)
-
-        results = self._collection.query(
-            query_embeddings=[query_embedding],
-            n_results=5
-        )
-
-        # Extract sources
-        sources = []
-        if results["metadatas"] and len(results["metadatas"]) > 0:
-            for metadata_list in results["metadatas"]:
-                for metadata in metadata_list:
-                    sources.append(metadata.get("source_file", "unknown"))
-
-        # Extract documents
-        documents = []
-        if results["documents"] and len(results["documents"]) > 0:
-            for doc_list in results["documents"]:
-                documents.extend(doc_list)
+        documents, sources, _ = await self._breed_documents(breed_display)
 
         # Synthesize context from retrieved documents
         description = documents[0] if len(documents) >= 1 else "No information available"
@@ -300,26 +529,18 @@ Answer concisely and cite sources by number when applicable."""
         all_documents = []
         all_sources = []
 
-        # Query for each parent breed
-        for breed in parent_breeds:
-            query_text = f"{breed} breed characteristics health care requirements"
-            query_embedding = self.embedder.embed(query_text)
-
-            results = self._collection.query(
-                query_embeddings=[query_embedding],
-                n_results=3
-            )
-
-            # Collect documents
-            if results["documents"] and len(results["documents"]) > 0:
-                for doc_list in results["documents"]:
-                    all_documents.extend(doc_list)
+        # Look up all parent breeds concurrently
+        started = time.perf_counter()
+        retrievals = await asyncio.gather(*[self._breed_documents(breed) for breed in parent_breeds])
+        self._record_parallel_retrieval(
+            [elapsed for _, _, elapsed in retrievals],
+            time.perf_counter() - started
+        )
 
-            # Collect sources
-            if results["metadatas"] and len(results["metadatas"]) > 0:
-                for metadata_list in results["metadatas"]:
-                    for metadata in metadata_list:
-                        all_sources.append(metadata.get("source_file", "unknown"))
+        # Results come back in parent order, so the combined context is unchanged
+        for documents, sources, _ in retrievals:
+            all_documents.extend(documents[:CROSSBREED_PARENT_DEPTH])
+            all_sources.extend(sources[:CROSSBREED_PARENT_DEPTH])
 
         # Combine contexts
         description = " ".join(all_documents[:3]) if len(all_documents) >= 3 else " ".join(all_documents)
@@ -334,3 +555,354 @@ Answer concisely and cite sources by number when applicable."""
             "health_info": health_info[:300],
             "sources": list(set(all_sources))
         }
+
+    async def _breed_documents(self, breed_display: str) -> Tuple[List[str], List[str], float]:
+        """Get the top documents for a breed, from the breed table when possible.
+
+        Args:
+            breed_display: Display breed name (e.g. "Golden Retriever")
+
+        Returns:
+            Tuple of (documents, source_file per document, seconds spent on vector search)
+        """
+        key = breed_key(breed_display)
+
+        if self.breed_table is not None:
+            # Read before searching: a result searched across an invalidation is not stored
+            generation = self.breed_table.generation
+            entry = self.breed_table.get(key)
+            if entry is not None:
+                return entry["documents"], entry["sources"], 0.0
+
+        query_text = BREED_QUERY_TEMPLATE.format(breed=breed_display)
+        results, elapsed = await self.executor.run(self._retrieve_breed, query_text, key)
+        documents, sources = self._flatten_results(results)
+
+        if self.breed_table is not None:
+            self.breed_table.put(key, documents, sources, generation)
+
+        return documents, sources, elapsed
+
+    def _retrieve_breed(self, query_text: str, key: str) -> Tuple[Dict[str, Any], float]:
+        """Search a breed's own chunks first, the whole collection if it has none (blocking).
+
+        Args:
+            query_text: Breed-context query
+            key: Normalized breed key
+
+        Returns:
+            Tuple of (ChromaDB query results, elapsed seconds)
+        """
+        results, elapsed = self._retrieve(query_text, BREED_CONTEXT_DEPTH, {"breed_key": key})
+        if results["documents"] and results["documents"][0]:
+            return results, elapsed
+
+        # Breed without its own documents: best matches from any document
+        results, fallback_elapsed = self._retrieve(query_text, BREED_CONTEXT_DEPTH)
+        return results, elapsed + fallback_elapsed
+
+    @staticmethod
+    def _flatten_results(results: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Flatten ChromaDB query results into document texts and their source files."""
+        documents = []
+        if results["documents"] and len(results["documents"]) > 0:
+            for doc_list in results["documents"]:
+                documents.extend(doc_list)
+
+        sources = []
+        if results["metadatas"] and len(results["metadatas"]) > 0:
+            for metadata_list in results["metadatas"]:
+                for metadata in metadata_list:
+                    sources.append(metadata.get("source_file", "unknown"))
+
+        return documents, sources
+
+    async def build_breed_context_table(self, breed_labels: Optional[List[str]] = None) -> int:
+        """Precompute breed-context retrieval for every breed label.
+
+        Args:
+            breed_labels: Normalized breed labels (defaults to the labels the
+                table was last built for)
+
+        Returns:
+            Number of breeds in the rebuilt table (0 if there is no table,
+            no labels are known yet or the collection changed during the build)
+        """
+        if self.breed_table is None:
+            return 0
+
+        labels = breed_labels if breed_labels is not None else self.breed_table.labels
+        if not labels:
+            return 0
+
+        generation = self.breed_table.generation
+        fingerprint, entries = await self.executor.run(self._search_breed_contexts, labels)
+        if not self.breed_table.replace(fingerprint, labels, entries, generation):
+            return 0
+        return len(entries)
+
+    def _search_breed_contexts(self, breed_labels: List[str]) -> Tuple[str, Dict[str, Dict[str, List[str]]]]:
+        """Run the breed-context vector search for many breeds (blocking).
+
+        Breeds with their own documents search only those (one filtered
+        query each); all other breeds share one unfiltered ChromaDB call.
+
+        Args:
+            breed_labels: Normalized breed labels
+
+        Returns:
+            Tuple of (collection fingerprint, breed label -> documents/sources)
+        """
+        fingerprint = self.collection_fingerprint()
+        if self._collection.count() == 0:
+            return fingerprint, {}
+
+        indexed = self.indexed_breed_keys()
+        entries = {}
+        for label in breed_labels:
+            if breed_key(label) in indexed:
+                entries.update(self._query_breed_contexts([label], {"breed_key": breed_key(label)}))
+
+        unindexed = [label for label in breed_labels if label not in entries]
+        if unindexed:
+            entries.update(self._query_breed_contexts(unindexed))
+        return fingerprint, entries
+
+    def _query_breed_contexts(
+        self,
+        breed_labels: List[str],
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Dict[str, List[str]]]:
+        """Run the breed-context query for several breeds in one ChromaDB call.
+
+        Args:
+            breed_labels: Normalized breed labels
+            filters: Optional ChromaDB metadata filter applied to every breed
+
+        Returns:
+            Breed label -> documents/sources
+        """
+        query_params = {
+            "query_embeddings": [
+                self.embedder.embed(BREED_QUERY_TEMPLATE.format(breed=label.replace("_", " ").title()))
+                for label in breed_labels
+            ],
+            "n_results": BREED_CONTEXT_DEPTH
+        }
+        if filters:
+            query_params["where"] = filters
+        results = self._collection.query(**query_params)
+
+        entries = {}
+        for label, documents, metadatas in zip(breed_labels, results["documents"], results["metadatas"]):
+            entries[label] = {
+                "documents": documents,
+                "sources": [metadata.get("source_file", "unknown") for metadata in metadatas]
+            }
+        return entries
+
+    def indexed_breed_keys(self) -> Set[str]:
+        """Breed keys that have their own chunks (assigned at ingest from frontmatter).
+
+        Returns:
+            Set of normalized breed keys
+        """
+        metadatas = self._collection.get(include=["metadatas"])["metadatas"]
+        return {metadata["breed_key"] for metadata in metadatas if metadata and metadata.get("breed_key")}
+
+    async def warm_breed_queries(self, breed_labels: List[str]) -> int:
+        """Precompute query embeddings for every breed the classifiers can emit.
+
+        Args:
+            breed_labels: Normalized breed labels (e.g. "golden_retriever")
+
+        Returns:
+            Number of embeddings computed
+        """
+        texts = [
+            BREED_QUERY_TEMPLATE.format(breed=label.replace("_", " ").title())
+            for label in breed_labels
+        ]
+        return await self.executor.run(self.embedder.warm, texts)
+
+    def _embed_and_search(
+        self,
+        query_text: str,
+        n_results: int,
+        filters: Optional[Dict[str, Any]],
+        mode: str
+    ) -> Tuple[Optional[List[float]], Dict[str, Any]]:
+        """Embed a query once and retrieve chunks with it (blocking, runs on the RAG executor).
+
+        Args:
+            query_text: Query text
+            n_results: Number of chunks to retrieve
+            filters: Optional metadata filter
+            mode: "hybrid", "vector" or "keyword"
+
+        Returns:
+            Tuple of (query embedding, or None in keyword mode; results as returned by _search)
+        """
+        embedding = None
+        if mode != "keyword" or self.keyword_index is None:
+            embedding = self.embedder.embed(query_text)
+        return embedding, self._search(query_text, n_results, filters, mode, embedding)
+
+    def _search(
+        self,
+        query_text: str,
+        n_results: int,
+        filters: Optional[Dict[str, Any]],
+        mode: str,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict[str, Any]:
+        """Retrieve chunks for a query in the given mode (blocking, runs on the RAG executor).
+
+        Hybrid mode takes the top RAG_FUSION_DEPTH candidates from both the
+        vector and the keyword index and merges them with reciprocal rank
+        fusion, so a chunk ranked high by either retriever makes the cut.
+        Keyword mode never embeds the query.
+
+        Args:
+            query_text: Query text
+            n_results: Number of chunks to retrieve
+            filters: Optional metadata filter
+            mode: "hybrid", "vector" or "keyword"
+            query_embedding: Embedding of query_text, if already computed
+
+        Returns:
+            Results in ChromaDB query format (distance = 1 - relevance)
+        """
+        if mode == "vector" or self.keyword_index is None:
+            results, _ = self._retrieve(query_text, n_results, filters, query_embedding)
+            return results
+
+        if mode == "keyword":
+            hits = self.keyword_index.search(query_text, n_results, filters)
+            best = hits[0][1] if hits else 1.0
+            # BM25 scores are unbounded; relevance is relative to the best hit
+            return self._fetch_ranked([(chunk, score / best) for chunk, score in hits])
+
+        depth = max(n_results, self.config.RAG_FUSION_DEPTH)
+        vector_results, _ = self._retrieve(query_text, depth, filters, query_embedding)
+        vector_ids = vector_results["ids"][0] if vector_results["ids"] else []
+        keyword_ids = [chunk for chunk, _ in self.keyword_index.search(query_text, depth, filters)]
+
+        ranked = self._reciprocal_rank_fusion([vector_ids, keyword_ids])[:n_results]
+        return self._fetch_ranked(ranked, vector_results)
+
+    def _reciprocal_rank_fusion(self, rankings: List[List[str]]) -> List[Tuple[str, float]]:
+        """Merge rankings by summing 1 / (RAG_RRF_K + rank) per chunk.
+
+        Args:
+            rankings: Chunk ids per retriever, best first
+
+        Returns:
+            (chunk id, relevance) pairs, best first; relevance is the fused
+            score scaled so a chunk ranked first by every retriever gets 1.0
+        """
+        k = self.config.RAG_RRF_K
+        scores: Dict[str, float] = {}
+        for ranking in rankings:
+            for rank, chunk in enumerate(ranking, 1):
+                scores[chunk] = scores.get(chunk, 0.0) + 1 / (k + rank)
+
+        best_possible = len(rankings) / (k + 1)
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        return [(chunk, score / best_possible) for chunk, score in ranked]
+
+    def _fetch_ranked(
+        self,
+        ranked: List[Tuple[str, float]],
+        vector_results: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Assemble ranked chunk ids into ChromaDB query-format results.
+
+        Args:
+            ranked: (chunk id, relevance) pairs, best first
+            vector_results: Vector query results whose documents can be
+                reused; other chunks are fetched from the collection by id
+
+        Returns:
+            Dict with ids, documents, metadatas and distances (one query)
+        """
+        found: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        if vector_results and vector_results["ids"]:
+            found = {
+                chunk: (document, metadata)
+                for chunk, document, metadata in zip(
+                    vector_results["ids"][0], vector_results["documents"][0], vector_results["metadatas"][0]
+                )
+            }
+
+        missing = [chunk for chunk, _ in ranked if chunk not in found]
+        if missing:
+            fetched = self._collection.get(ids=missing, include=["documents", "metadatas"])
+            for chunk, document, metadata in zip(fetched["ids"], fetched["documents"], fetched["metadatas"]):
+                found[chunk] = (document, metadata)
+
+        # Chunks deleted from the collection since the index was loaded are dropped
+        ranked = [(chunk, relevance) for chunk, relevance in ranked if chunk in found]
+        return {
+            "ids": [[chunk for chunk, _ in ranked]],
+            "documents": [[found[chunk][0] for chunk, _ in ranked]],
+            "metadatas": [[found[chunk][1] for chunk, _ in ranked]],
+            "distances": [[1 - relevance for _, relevance in ranked]]
+        }
+
+    def _retrieve(
+        self,
+        query_text: str,
+        n_results: int,
+        filters: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None
+    ) -> Tuple[Dict[str, Any], float]:
+        """Embed a query and run it against ChromaDB (blocking, runs on the RAG executor).
+
+        Args:
+            query_text: Text to embed and search for
+            n_results: Number of chunks to retrieve
+            filters: Optional ChromaDB metadata filter
+            query_embedding: Embedding of query_text, if already computed
+
+        Returns:
+            Tuple of (ChromaDB query results, elapsed seconds)
+        """
+        started = time.perf_counter()
+        query_params = {
+            "query_embeddings": [query_embedding if query_embedding is not None else self.embedder.embed(query_text)],
+            "n_results": n_results
+        }
+        if filters:
+            query_params["where"] = filters
+
+        results = self._collection.query(**query_params)
+        return results, time.perf_counter() - started
+
+    def _record_parallel_retrieval(self, durations: List[float], wall_time: float):
+        """Record how much latency concurrent retrieval removed from the critical path.
+
+        Args:
+            durations: Elapsed seconds of each individual retrieval
+            wall_time: Elapsed seconds of the whole concurrent batch
+        """
+        saved_ms = max(0.0, sum(durations) - wall_time) * 1000
+        self.parallel_retrievals += 1
+        self.retrieval_time_saved_ms += saved_ms
+        logger.info(
+            f"Retrieved {len(durations)} parent breeds concurrently in {wall_time * 1000:.1f}ms "
+            f"(sequential {sum(durations) * 1000:.1f}ms, saved {saved_ms:.1f}ms)"
+        )
+
+    def get_retrieval_stats(self) -> Dict[str, Any]:
+        """Get concurrent retrieval statistics.
+
+        Returns:
+            Dict with number of concurrent retrievals and critical-path time saved
+        """
+        return {
+            "parallel_retrievals": self.parallel_retrievals,
+            "time_saved_ms_total": round(self.retrieval_time_saved_ms, 1),
+            "time_saved_ms_avg": round(self.retrieval_time_saved_ms / self.parallel_retrievals, 1)
+            if self.parallel_retrievals else 0.0
+        }
@@ -0,0 +1,160 @@
+"""Content-addressed cache for vision analysis results."""
+
+import base64
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def image_digest(image: str) -> str:
+    """Hash the normalized image bytes of a processed image.
+
+    Args:
+        image: Base64-encoded image (with or without data URI prefix), as
+            ImageProcessor.process_image returns it for the VLM
+
+    Returns:
+        Hex SHA-256 digest of the decoded image bytes
+    """
+    payload = image.split(",", 1)[1] if "," in image else image
+    return hashlib.sha256(base64.b64decode(payload)).hexdigest()
+
+
+class AnalysisResultCache:
+    """Two-level cache for full VisionOrchestrator.analyze_image results.
+
+    An in-process LRU with TTL always sits in front; when REDIS_URL is set,
+    Redis is used as a shared second level so all uvicorn workers see each
+    other's results. Redis failures degrade to the in-process level only.
+    """
+
+    def __init__(self, config, redis_client=None):
+        """Initialize result cache.
+
+        Args:
+            config: Settings instance with cache configuration
+            redis_client: Optional redis.asyncio client (created from
+                REDIS_URL when not given)
+        """
+        self.ttl = config.RESULT_CACHE_TTL_SECONDS
+        self.max_entries = config.RESULT_CACHE_MAX_ENTRIES
+        # Results depend on the model, so switching models starts a fresh keyspace
+        self.key_prefix = f"vision_result:{config.OLLAMA_MODEL}:"
+
+        self._local: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._redis = redis_client if redis_client is not None else self._connect_redis(config.REDIS_URL)
+
+        self.hits = 0
+        self.misses = 0
+        self.redis_errors = 0
+
+        logger.info(
+            f"AnalysisResultCache initialized: ttl={self.ttl}s, max_entries={self.max_entries}, "
+            f"backend={'redis+memory' if self._redis is not None else 'memory'}"
+        )
+
+    @staticmethod
+    def _connect_redis(redis_url: str):
+        """Create a Redis client, or None when Redis is not configured/installed."""
+        if not redis_url:
+            return None
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            logger.warning("REDIS_URL set but 'redis' is not installed, using in-process cache only")
+            return None
+        return redis_asyncio.from_url(redis_url, decode_responses=True)
+
+    async def get(self, image: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached analysis result.
+
+        Args:
+            image: Processed base64 image
+
+        Returns:
+            Cached result dict, or None on miss
+        """
+        key = self.key_prefix + image_digest(image)
+
+        value = self._get_local(key)
+        if value is None and self._redis is not None:
+            try:
+                value = await self._redis.get(key)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Result cache Redis read failed: {e}")
+            if value is not None:
+                self._set_local(key, value)
+
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        logger.info(f"Result cache hit: {key}")
+        return json.loads(value)
+
+    async def set(self, image: str, result: Dict[str, Any]):
+        """Store an analysis result.
+
+        Args:
+            image: Processed base64 image
+            result: Result dict from VisionOrchestrator.analyze_image
+        """
+        key = self.key_prefix + image_digest(image)
+        value = json.dumps(result)
+
+        self._set_local(key, value)
+        if self._redis is not None:
+            try:
+                await self._redis.set(key, value, ex=self.ttl)
+            except Exception as e:
+                self.redis_errors += 1
+                logger.warning(f"Result cache Redis write failed: {e}")
+
+    def _get_local(self, key: str) -> Optional[str]:
+        """Read from the in-process LRU, dropping expired entries."""
+        entry = self._local.get(key)
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._local[key]
+            return None
+
+        self._local.move_to_end(key)
+        return value
+
+    def _set_local(self, key: str, value: str):
+        """Write to the in-process LRU, evicting the least recently used entries."""
+        self._local[key] = (time.monotonic() + self.ttl, value)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dict with hits, misses, hit ratio, local size and Redis errors
+        """
+        lookups = self.hits + self.misses
+        return {
+            "backend": "redis+memory" if self._redis is not None else "memory",
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "local_entries": len(self._local),
+            "redis_errors": self.redis_errors
+        }
+
+    async def aclose(self):
+        """Close the Redis connection if one is open."""
+        if self._redis is not None:
+            await self._redis.aclose()
@@ -0,0 +1,178 @@
+"""Semantic cache for generated RAG answers."""
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedAnswer:
+    """One generated answer and what it was generated from."""
+    scope: str
+    embedding: np.ndarray  # Unit-length question embedding
+    chunk_ids: FrozenSet[str]
+    answer: str
+    expires_at: float
+
+
+class SemanticAnswerCache:
+    """Reuses answers to near-identical questions over the same retrieved chunks.
+
+    A lookup hits when an unexpired entry has the same filters, top_k and
+    retrieval mode, its question embedding has cosine similarity of at least
+    SEMANTIC_CACHE_THRESHOLD with the new question, and retrieval returned
+    exactly the same chunk set. Chunk ids are content hashes, so an answer
+    is never reused once its context changed, even in a worker whose cache
+    was not cleared.
+
+    Entries are kept in-process in LRU order, bounded by
+    SEMANTIC_CACHE_MAX_ENTRIES; RAGService clears the cache whenever it
+    modifies the collection.
+    """
+
+    def __init__(self, config):
+        """Initialize semantic answer cache.
+
+        Args:
+            config: Settings instance with cache configuration
+        """
+        self.threshold = config.SEMANTIC_CACHE_THRESHOLD
+        self.ttl = config.SEMANTIC_CACHE_TTL_SECONDS
+        self.max_entries = config.SEMANTIC_CACHE_MAX_ENTRIES
+
+        self._entries: "OrderedDict[int, CachedAnswer]" = OrderedDict()
+        self._next_id = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+        logger.info(
+            f"SemanticAnswerCache initialized: threshold={self.threshold}, "
+            f"ttl={self.ttl}s, max_entries={self.max_entries}"
+        )
+
+    @staticmethod
+    def _scope(filters: Optional[Dict[str, Any]], top_k: int, mode: str) -> str:
+        """Key for the query parameters an answer is only valid under."""
+        return json.dumps([filters or {}, top_k, mode], sort_keys=True, default=str)
+
+    @staticmethod
+    def _unit(embedding: List[float]) -> np.ndarray:
+        """Embedding scaled to unit length, so a dot product is the cosine similarity."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(
+        self,
+        embedding: List[float],
+        chunk_ids: List[str],
+        filters: Optional[Dict[str, Any]],
+        top_k: int,
+        mode: str
+    ) -> Optional[str]:
+        """Look up an answer for a question.
+
+        Args:
+            embedding: Question embedding
+            chunk_ids: Ids of the chunks retrieved for the question
+            filters: Metadata filters of the query
+            top_k: Number of chunks retrieved
+            mode: Retrieval mode
+
+        Returns:
+            Cached answer, or None on miss
+        """
+        self._drop_expired()
+        scope = self._scope(filters, top_k, mode)
+        retrieved = frozenset(chunk_ids)
+        candidates = [
+            (entry_id, entry) for entry_id, entry in self._entries.items()
+            if entry.scope == scope and entry.chunk_ids == retrieved
+        ]
+
+        if candidates:
+            similarities = np.stack([entry.embedding for _, entry in candidates]) @ self._unit(embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                entry_id, entry = candidates[best]
+                self._entries.move_to_end(entry_id)
+                self.hits += 1
+                logger.info(f"Semantic cache hit (similarity {similarities[best]:.3f})")
+                return entry.answer
+
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        embedding: List[float],
+        chunk_ids: List[str],
+        filters: Optional[Dict[str, Any]],
+        top_k: int,
+        mode: str,
+        answer: str
+    ):
+        """Store a generated answer, evicting the least recently used entries.
+
+        Args:
+            embedding: Question embedding
+            chunk_ids: Ids of the chunks the answer was generated from
+            filters: Metadata filters of the query
+            top_k: Number of chunks retrieved
+            mode: Retrieval mode
+            answer: Generated answer
+        """
+        if self.max_entries <= 0:
+            return
+
+        self._entries[self._next_id] = CachedAnswer(
+            scope=self._scope(filters, top_k, mode),
+            embedding=self._unit(embedding),
+            chunk_ids=frozenset(chunk_ids),
+            answer=answer,
+            expires_at=time.monotonic() + self.ttl
+        )
+        self._next_id += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every entry (the knowledge base changed)."""
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+            logger.info("Semantic cache cleared: knowledge base changed")
+
+    def _drop_expired(self):
+        """Remove entries past their TTL."""
+        now = time.monotonic()
+        for entry_id in [entry_id for entry_id, entry in self._entries.items() if entry.expires_at < now]:
+            del self._entries[entry_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics.
+
+        Returns:
+            Dict with hits, misses, hit ratio, entries and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "invalidations": self.invalidations
+        }
@@ -1,13 +1,16 @@
-from typing import Dict, Any
+from typing import Dict, Any, Tuple, AsyncIterator, Optional
 import logging
 
+from src.services.ollama_scheduler import VISION
+
 logger = logging.getLogger(__name__)
 
 
 class VisionOrchestrator:
     """Orchestrates multi-stage vision analysis pipeline.
 
-    Coordinates sequential execution:
+    Coordinates sequential execution (stages 1-3 run as a single fused
+    classification service call when CLASSIFICATION_FUSED_PIPELINE is set):
     1. Content safety check (NSFW detection)
     2. Species detection (dog/cat validation)
     3. Breed classification (with crossbreed detection)
@@ -15,7 +18,7 @@ class VisionOrchestrator:
     5. Contextual Ollama analysis
     """
 
-    def __init__(self, classification_client, ollama_client, rag_service, config):
+    def __init__(self, classification_client, ollama_client, rag_service, config, result_cache=None):
         """Initialize orchestrator with service dependencies.
 
         Args:
@@ -23,23 +26,28 @@ class VisionOrchestrator:
             ollama_client: OllamaVisionClient instance
             rag_service: RAGService instance
             config: Settings instance with threshold configuration
+            result_cache: Optional AnalysisResultCache for repeated images
         """
         self.classification = classification_client
         self.ollama = ollama_client
         self.rag = rag_service
         self.config = config
+        self.result_cache = result_cache
 
         logger.info(
             f"VisionOrchestrator initialized: "
             f"species_threshold={config.SPECIES_MIN_CONFIDENCE}, "
-            f"breed_threshold={config.BREED_MIN_CONFIDENCE}"
+            f"breed_threshold={config.BREED_MIN_CONFIDENCE}, "
+            f"fused_classification={config.CLASSIFICATION_FUSED_PIPELINE}"
         )
 
-    async def analyze_image(self, image: str) -> Dict[str, Any]:
+    async def analyze_image(self, image: str, classification_image: Optional[str] = None) -> Dict[str, Any]:
         """Execute full vision analysis pipeline with early rejection.
 
         Args:
             image: Base64-encoded image (with or without data URI prefix)
+            classification_image: Smaller copy of the image for stages 1-3
+                (default: image)
 
         Returns:
             Dict with species, breed_analysis, description, traits,
@@ -50,19 +58,238 @@ class VisionOrchestrator:
                        UNSUPPORTED_SPECIES, SPECIES_DETECTION_FAILED,
                        BREED_DETECTION_FAILED)
             ConnectionError: If classification or Ollama service unavailable
+                (OllamaBusy if the Ollama queue is full)
         """
         logger.info("Starting vision analysis pipeline")
 
+        # Identical image already analyzed: skip every stage
+        if self.result_cache is not None:
+            cached = await self.result_cache.get(image)
+            if cached is not None:
+                logger.info("Vision analysis served from result cache")
+                return cached
+
+        # Reject before classification if the Ollama stage would be turned away
+        self.ollama.check_capacity(VISION)
+
+        # Stages 1-3: Content safety, species and breed classification (strict)
+        if self.config.CLASSIFICATION_FUSED_PIPELINE:
+            species_result, breed_result = await self._classify_fused(classification_image or image)
+        else:
+            species_result, breed_result = await self._classify_sequential(classification_image or image)
+
+        # Stage 4: RAG enrichment (graceful failure)
+        rag_context = await self._enrich(breed_result["breed_analysis"])
+
+        # Stage 5: Contextual Ollama analysis
+        logger.info("Starting Ollama visual analysis")
+        ollama_result = await self.ollama.analyze_with_context(
+            image_base64=image,
+            species=species_result["species"],
+            breed_analysis=breed_result["breed_analysis"],
+            rag_context=rag_context
+        )
+
+        # Assemble final response
+        result = self._assemble(species_result, breed_result, ollama_result, rag_context)
+
+        if self.result_cache is not None:
+            await self.result_cache.set(image, result)
+
+        logger.info("Vision analysis pipeline completed successfully")
+        return result
+
+    async def analyze_image_stream(
+        self,
+        image: str,
+        classification_image: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Execute the pipeline, yielding progress events as each stage finishes.
+
+        Events, in order:
+            ("classification", {species, breed_analysis}) after stages 1-3
+            ("enrichment", {enriched_info}) after stage 4
+            ("token", {content}) for each Ollama output fragment in stage 5
+            ("complete", result) with the same dict analyze_image returns
+
+        A cached result produces the classification, enrichment and complete
+        events immediately, without tokens.
+
+        Args:
+            image: Base64-encoded image (with or without data URI prefix)
+            classification_image: Smaller copy of the image for stages 1-3
+                (default: image)
+
+        Raises:
+            ValueError: If any validation stage fails (same codes as analyze_image)
+            ConnectionError: If classification or Ollama service unavailable
+                (OllamaBusy if the Ollama queue is full)
+        """
+        logger.info("Starting streaming vision analysis pipeline")
+
+        if self.result_cache is not None:
+            cached = await self.result_cache.get(image)
+            if cached is not None:
+                logger.info("Vision analysis served from result cache")
+                yield "classification", {
+                    "species": cached["species"],
+                    "breed_analysis": cached["breed_analysis"]
+                }
+                yield "enrichment", {"enriched_info": cached["enriched_info"]}
+                yield "complete", cached
+                return
+
+        # Reject before classification if the Ollama stage would be turned away
+        self.ollama.check_capacity(VISION)
+
+        # Stages 1-3: Content safety, species and breed classification (strict)
+        if self.config.CLASSIFICATION_FUSED_PIPELINE:
+            species_result, breed_result = await self._classify_fused(classification_image or image)
+        else:
+            species_result, breed_result = await self._classify_sequential(classification_image or image)
+
+        yield "classification", {
+            "species": species_result["species"],
+            "breed_analysis": breed_result["breed_analysis"]
+        }
+
+        # Stage 4: RAG enrichment (graceful failure)
+        rag_context = await self._enrich(breed_result["breed_analysis"])
+        yield "enrichment", {"enriched_info": rag_context}
+
+        # Stage 5: Contextual Ollama analysis, token by token
+        logger.info("Starting streaming Ollama visual analysis")
+        ollama_result = None
+        async for event, data in self.ollama.analyze_with_context_stream(
+            image_base64=image,
+            species=species_result["species"],
+            breed_analysis=breed_result["breed_analysis"],
+            rag_context=rag_context
+        ):
+            if event == "token":
+                yield "token", {"content": data}
+            else:
+                ollama_result = data
+
+        result = self._assemble(species_result, breed_result, ollama_result, rag_context)
+
+        if self.result_cache is not None:
+            await self.result_cache.set(image, result)
+
+        logger.info("Streaming vision analysis pipeline completed successfully")
+        yield "complete", result
+
+    async def _enrich(self, breed_analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Stage 4: retrieve RAG context for the detected breed(s).
+
+        Args:
+            breed_analysis: Breed classification result
+
+        Returns:
+            RAG context dict, or None if retrieval failed (graceful degradation)
+        """
+        try:
+            if breed_analysis["is_likely_crossbreed"]:
+                detected_breeds = breed_analysis["crossbreed_analysis"]["detected_breeds"]
+                logger.info(f"Retrieving crossbreed context for: {detected_breeds}")
+                rag_context = await self.rag.get_crossbreed_context(detected_breeds)
+            else:
+                logger.info(f"Retrieving breed context for: {breed_analysis['primary_breed']}")
+                rag_context = await self.rag.get_breed_context(breed_analysis["primary_breed"])
+            logger.info("RAG enrichment successful")
+            return rag_context
+        except Exception as e:
+            logger.warning(f"RAG enrichment failed (graceful degradation): {e}")
+            return None
+
+    @staticmethod
+    def _assemble(
+        species_result: Dict[str, Any],
+        breed_result: Dict[str, Any],
+        ollama_result: Dict[str, Any],
+        rag_context: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Build the final pipeline result from the stage outputs."""
+        return {
+            "species": species_result["species"],
+            "breed_analysis": breed_result["breed_analysis"],
+            "description": ollama_result["description"],
+            "traits": ollama_result["traits"],
+            "health_observations": ollama_result["health_observations"],
+            "enriched_info": rag_context
+        }
+
+    async def _classify_sequential(self, image: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run stages 1-3 as three separate classification service calls.
+
+        Args:
+            image: Base64-encoded image
+
+        Returns:
+            Tuple of (species_result, breed_result)
+
+        Raises:
+            ValueError: If any classification stage rejects the image
+        """
         # Stage 1: Content safety (strict)
         safety = await self.classification.check_content(image)
+        self._check_content(safety)
+
+        # Stage 2: Species detection (strict)
+        species_result = await self.classification.detect_species(image)
+        self._check_species(species_result)
+
+        # Stage 3: Breed classification (strict)
+        breed_result = await self.classification.detect_breed(
+            image,
+            species_result["species"],
+            top_k=5
+        )
+        self._check_breed(breed_result)
+
+        return species_result, breed_result
+
+    async def _classify_fused(self, image: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run stages 1-3 with a single fused classification pipeline call.
+
+        Args:
+            image: Base64-encoded image
+
+        Returns:
+            Tuple of (species_result, breed_result)
+
+        Raises:
+            ValueError: If any classification stage rejects the image
+        """
+        pipeline = await self.classification.classify_pipeline(
+            image,
+            breed_top_k=5,
+            species_min_confidence=self.config.SPECIES_MIN_CONFIDENCE
+        )
+
+        # Same checks as the sequential path; the service stops early on the
+        # same conditions, so a skipped stage is always rejected here first.
+        self._check_content(pipeline["content"])
+        self._check_species(pipeline["species"])
+
+        breed_result = pipeline["breed"]
+        if breed_result is None:
+            logger.warning(f"Classification pipeline stopped at: {pipeline.get('stopped_at')}")
+            raise ValueError("BREED_DETECTION_FAILED")
+        self._check_breed(breed_result)
+
+        return pipeline["species"], breed_result
+
+    def _check_content(self, safety: Dict[str, Any]):
+        """Reject unsafe content (stage 1)."""
         if not safety["is_safe"]:
             logger.warning(f"Content policy violation: NSFW probability {safety['nsfw_probability']}")
             raise ValueError("CONTENT_POLICY_VIOLATION")
 
         logger.info("Content safety check passed")
 
-        # Stage 2: Species detection (strict)
-        species_result = await self.classification.detect_species(image)
+    def _check_species(self, species_result: Dict[str, Any]):
+        """Reject unsupported or low-confidence species (stage 2)."""
         if species_result["species"] not in ["dog", "cat"]:
             logger.warning(f"Unsupported species: {species_result['species']}")
             raise ValueError("UNSUPPORTED_SPECIES")
@@ -72,12 +299,8 @@ class VisionOrchestrator:
 
         logger.info(f"Species detected: {species_result['species']} (confidence: {species_result['confidence']:.2f})")
 
-        # Stage 3: Breed classification (strict)
-        breed_result = await self.classification.detect_breed(
-            image,
-            species_result["species"],
-            top_k=5
-        )
+    def _check_breed(self, breed_result: Dict[str, Any]):
+        """Reject low-confidence breed classification (stage 3)."""
         if breed_result["breed_analysis"]["confidence"] < self.config.BREED_MIN_CONFIDENCE:
             logger.warning(f"Low breed confidence: {breed_result['breed_analysis']['confidence']}")
             raise ValueError("BREED_DETECTION_FAILED")
@@ -87,42 +310,3 @@ class VisionOrchestrator:
             f"(confidence: {breed_result['breed_analysis']['confidence']:.2f}, "
             f"crossbreed: {breed_result['breed_analysis']['is_likely_crossbreed']})"
         )
-
-        # Stage 4: RAG enrichment (graceful failure)
-        rag_context = None
-        try:
-            if breed_result["breed_analysis"]["is_likely_crossbreed"]:
-                detected_breeds = breed_result["breed_analysis"]["crossbreed_analysis"]["detected_breeds"]
-                logger.info(f"Retrieving crossbreed context for: {detected_breeds}")
-                rag_context = await self.rag.get_crossbreed_context(detected_breeds)
-            else:
-                logger.info(f"Retrieving breed context for: {breed_result['breed_analysis']['primary_breed']}")
-                rag_context = await self.rag.get_breed_context(
-                    breed_result["breed_analysis"]["primary_breed"]
-                )
-            logger.info("RAG enrichment successful")
-        except Exception as e:
-            logger.warning(f"RAG enrichment failed (graceful degradation): {e}")
-            rag_context = None
-
-        # Stage 5: Contextual Ollama analysis
-        logger.info("Starting Ollama visual analysis")
-        ollama_result = await self.ollama.analyze_with_context(
-            image_base64=image,
-            species=species_result["species"],
-            breed_analysis=breed_result["breed_analysis"],
-            rag_context=rag_context
-        )
-
-        # Assemble final response
-        result = {
-            "species": species_result["species"],
-            "breed_analysis": breed_result["breed_analysis"],
-            "description": ollama_result["description"],
-            "traits": ollama_result["traits"],
-            "health_observations": ollama_result["health_observations"],
-            "enriched_info": rag_context
-        }
-
-        logger.info("Vision analysis pipeline completed successfully")
-        return result
@@ -0,0 +1,251 @@
+"""Tolerant extraction of a JSON object from LLM output."""
+
+import ast
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Python literals models emit in place of their JSON spelling
+_PYTHON_LITERALS = {"True": "true", "False": "false", "None": "null"}
+
+_WORD = re.compile(r"[A-Za-z_]+")
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONExtractionError(ValueError):
+    """Raised when no JSON object can be recovered from the text."""
+
+
+class JSONExtractor:
+    """Finds the first balanced JSON object in text that arrives in fragments.
+
+    Prose before the object, ```json fences and anything after the closing
+    brace are ignored. The scanner tracks strings, escapes and comments, so
+    braces inside them do not count. Once the outermost brace closes, the
+    candidate is parsed (and repaired if needed, see repair_json); if even
+    the repaired text is not an object, scanning resumes after its opening
+    brace.
+
+    Usage:
+        extractor = JSONExtractor()
+        for fragment in stream:
+            if extractor.feed(fragment) is not None:
+                break  # Object complete: the rest of the stream is not needed
+        result = extractor.finish()
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self.result: Optional[Dict[str, Any]] = None
+        self._reset_scan()
+
+    def _reset_scan(self):
+        """Forget the current candidate and look for the next opening brace."""
+        self._start: Optional[int] = None
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._comment: Optional[str] = None  # "//" or "/*" while inside a comment
+        self._comment_star = False  # Previous character in a /* comment was "*"
+        self._cuts: List[Tuple[int, Tuple[str, ...]]] = []  # (comma position, open brackets there)
+
+    @property
+    def text(self) -> str:
+        """All output fed so far."""
+        return self._text
+
+    def feed(self, fragment: str) -> Optional[Dict[str, Any]]:
+        """Scan another fragment of output.
+
+        Args:
+            fragment: Next piece of text
+
+        Returns:
+            The extracted object once it is complete, else None
+        """
+        if self.result is not None:
+            return self.result
+        self._text += fragment
+        self._scan()
+        return self.result
+
+    def finish(self) -> Dict[str, Any]:
+        """Get the extracted object at the end of the output.
+
+        An object still open when the output ends (e.g. generation hit the
+        token limit) is closed and repaired, dropping a trailing incomplete
+        member if that is what keeps it from parsing.
+
+        Returns:
+            Extracted JSON object
+
+        Raises:
+            JSONExtractionError: If the output holds no recoverable object
+        """
+        if self.result is not None:
+            return self.result
+        while self._start is not None:
+            start = self._start
+            tail = ""
+            if self._in_string:
+                tail = '"'
+            elif self._comment == "//":
+                tail = "\n"
+            elif self._comment == "/*":
+                tail = "*/"
+            candidates = [(self._text[start:] + tail, tuple(self._stack))]
+            candidates += [(self._text[start:cut], stack) for cut, stack in reversed(self._cuts)]
+            for text, stack in candidates:
+                parsed = _parse_object(text + "".join(_CLOSERS[opener] for opener in reversed(stack)))
+                if parsed is not None:
+                    self.result = parsed
+                    return parsed
+            # Not an object after all: keep looking after its opening brace
+            self._reset_scan()
+            self._pos = start + 1
+            self._scan()
+            if self.result is not None:
+                return self.result
+        raise JSONExtractionError("No JSON object found in model output")
+
+    def _scan(self):
+        """Advance the scanner over the buffered text."""
+        text = self._text
+        while self._pos < len(text):
+            char = text[self._pos]
+            self._pos += 1
+
+            if self._start is None:
+                if char == "{":
+                    self._start = self._pos - 1
+                    self._stack = ["{"]
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if self._comment == "//":
+                if char == "\n":
+                    self._comment = None
+                continue
+            if self._comment == "/*":
+                if char == "/" and self._comment_star:
+                    self._comment = None
+                self._comment_star = char == "*"
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char == "/":
+                if self._pos == len(text):
+                    self._pos -= 1  # Wait for the next fragment to tell if a comment starts
+                    return
+                if text[self._pos] in "/*":
+                    self._comment = "/" + text[self._pos]
+                    self._comment_star = False
+                    self._pos += 1
+            elif char == ",":
+                self._cuts.append((self._pos - 1, tuple(self._stack)))
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in "}]":
+                self._stack.pop()
+                if not self._stack:
+                    start = self._start
+                    parsed = _parse_object(text[start:self._pos])
+                    if parsed is not None:
+                        self.result = parsed
+                        return
+                    self._reset_scan()
+                    self._pos = start + 1
+
+
+def _parse_object(candidate: str) -> Optional[Dict[str, Any]]:
+    """Parse a candidate as a JSON object, repairing it if needed."""
+    for text in (candidate, repair_json(candidate)):
+        try:
+            parsed = json.loads(text, strict=False)  # strict=False: raw newlines in strings
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+
+    # Last resort: a Python dict literal (single-quoted strings)
+    try:
+        parsed = ast.literal_eval(candidate)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def repair_json(text: str) -> str:
+    """Fix the mistakes models make in otherwise valid JSON.
+
+    Outside string literals: removes // and /* */ comments, replaces
+    True/False/None with true/false/null and drops trailing commas before
+    a closing bracket.
+
+    Args:
+        text: Almost-JSON text
+
+    Returns:
+        Repaired text (not guaranteed to be valid JSON)
+    """
+    out: List[str] = []
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '"':
+            end = i + 1
+            while end < length and text[end] != '"':
+                end += 2 if text[end] == "\\" else 1
+            out.append(text[i:end + 1])
+            i = end + 1
+        elif text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = length if newline == -1 else newline
+        elif text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            i = length if close == -1 else close + 2
+        elif char == ",":
+            following = i + 1
+            while following < length and text[following].isspace():
+                following += 1
+            if following < length and text[following] in "}]":
+                i += 1  # Trailing comma
+            else:
+                out.append(char)
+                i += 1
+        elif char.isalpha() or char == "_":
+            word = _WORD.match(text, i).group()
+            out.append(_PYTHON_LITERALS.get(word, word))
+            i += len(word)
+        else:
+            out.append(char)
+            i += 1
+    return "".join(out)
+
+
+def extract_json(text: str) -> Dict[str, Any]:
+    """Extract the first JSON object from complete model output.
+
+    Args:
+        text: Model output
+
+    Returns:
+        Extracted JSON object
+
+    Raises:
+        JSONExtractionError: If the output holds no recoverable object
+    """
+    extractor = JSONExtractor()
+    extractor.feed(text)
+    return extractor.finish()
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from typing import Any, Optional
 
@@ -38,3 +39,16 @@ def error_response(code: str, message: str, details: Optional[dict] = None) -> d
         },
         "timestamp": datetime.utcnow().isoformat() + "Z"
     }
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one server-sent event frame.
+
+    Args:
+        event: Event name
+        data: JSON-serializable event payload
+
+    Returns:
+        SSE frame ("event: ...\ndata: ...\n\n")
+    """
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,161 @@
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+
+from src.services.breed_context_table import BreedContextTable
+from src.services.rag_service import RAGService
+from src.config import Settings
+
+
+@pytest.fixture
+def settings(tmp_path):
+    """Settings with the Chroma directory (and table file) under tmp_path."""
+    return Settings(CHROMA_PERSIST_DIR=str(tmp_path / "chroma"))
+
+
+@pytest.fixture
+def collection():
+    """Fake Chroma collection with two chunks."""
+    collection = Mock()
+    collection.get = Mock(return_value={"ids": ["chunk_a", "chunk_b"], "metadatas": [{}, {}]})
+    collection.count = Mock(return_value=2)
+    collection.query = Mock(side_effect=lambda query_embeddings, n_results, where=None: {
+        "documents": [[f"doc for {e}"] for e in query_embeddings],
+        "metadatas": [[{"source_file": f"{e}.md"}] for e in query_embeddings]
+    })
+    return collection
+
+
+def make_service(settings, collection, table):
+    """Create a RAG service over the fake collection, embedding text to its breed name."""
+    embedder = Mock()
+    embedder.embed = Mock(side_effect=lambda text: text.split(" breed")[0])
+    with patch('chromadb.PersistentClient') as client:
+        client.return_value.get_or_create_collection.return_value = collection
+        return RAGService(settings, embedder, Mock(), breed_table=table)
+
+
+def test_table_round_trips_through_disk(settings):
+    """Test a replaced table is persisted and reloaded."""
+    table = BreedContextTable(settings)
+    table.replace("fp1", ["beagle"], {"beagle": {"documents": ["Beagle facts"], "sources": ["beagle.md"]}})
+
+    reloaded = BreedContextTable(settings)
+
+    assert reloaded.fingerprint == "fp1"
+    assert reloaded.labels == ["beagle"]
+    assert reloaded.get("beagle") == {"documents": ["Beagle facts"], "sources": ["beagle.md"]}
+
+
+@pytest.mark.asyncio
+async def test_lookup_served_from_table(settings, collection):
+    """Test breed context comes from the table without a vector search."""
+    table = BreedContextTable(settings)
+    service = make_service(settings, collection, table)
+
+    built = await service.build_breed_context_table(["golden_retriever", "poodle"])
+    collection.query.reset_mock()
+
+    result = await service.get_breed_context("golden_retriever")
+    crossbreed = await service.get_crossbreed_context(["Golden Retriever", "Poodle"])
+
+    assert built == 2
+    assert result["description"] == "doc for Golden Retriever"
+    assert result["sources"] == ["Golden Retriever.md"]
+    assert crossbreed["description"] == "doc for Golden Retriever doc for Poodle"
+    collection.query.assert_not_called()
+    assert table.get_stats()["hits"] == 3
+
+
+@pytest.mark.asyncio
+async def test_ingest_resets_table(settings, collection):
+    """Test adding documents invalidates the table and misses refill it lazily."""
+    table = BreedContextTable(settings)
+    service = make_service(settings, collection, table)
+    await service.build_breed_context_table(["beagle"])
+
+    old_fingerprint = table.fingerprint
+    collection.get.return_value = {"ids": ["chunk_a", "chunk_b", "chunk_c"], "metadatas": [{}, {}, {}]}
+    service.embedder.embed_batch = Mock(return_value=[[0.1]])
+    service.add_documents([Mock(content="New beagle facts", metadata={"source_file": "beagle.md"})])
+
+    assert len(table) == 0
+    assert table.stale
+    assert table.fingerprint == old_fingerprint  # Fingerprinted once per job, not per batch
+
+    service.finish_ingest()
+    assert not table.stale
+    assert table.fingerprint != old_fingerprint
+    assert table.labels == ["beagle"]
+
+    await service.get_breed_context("beagle")
+    assert len(table) == 1
+    assert collection.query.call_count == 2  # Build + lazy refill
+
+
+@pytest.mark.asyncio
+async def test_lookup_across_invalidation_is_not_stored(settings, collection):
+    """Test a breed searched before the collection changed is not stored under the new fingerprint."""
+    table = BreedContextTable(settings)
+    service = make_service(settings, collection, table)
+    search = service._retrieve_breed
+
+    def search_then_ingest(query_text, key):
+        results = search(query_text, key)
+        table.invalidate()  # Ingestion thread lands between the search and put()
+        table.reset("fp-after")
+        return results
+
+    service._retrieve_breed = search_then_ingest
+    result = await service.get_breed_context("beagle")
+
+    assert result["description"] == "doc for Beagle"
+    assert len(table) == 0
+
+
+def test_save_snapshots_entries(settings):
+    """Test entries put while the table is being saved neither break nor leak into the save."""
+    table = BreedContextTable(settings)
+    table.replace("fp1", ["beagle"], {"beagle": {"documents": ["x"], "sources": ["y"]}})
+
+    dumps_snapshot = json.dumps
+
+    def dumps(data):
+        table.put("poodle", ["z"], ["w"], table.generation)  # Event loop inserting mid-save
+        return dumps_snapshot(data)
+
+    with patch("src.services.breed_context_table.json.dumps", side_effect=dumps):
+        table.save()
+
+    assert table.get("poodle") is not None
+    assert BreedContextTable(settings).get("poodle") is None
+    assert list(table.path.parent.glob("*.tmp")) == []
+
+
+def test_stale_table_reset_on_startup(settings, collection):
+    """Test a table built from a different collection is discarded."""
+    table = BreedContextTable(settings)
+    table.replace("old-fingerprint", ["beagle"], {"beagle": {"documents": ["x"], "sources": ["y"]}})
+
+    make_service(settings, collection, BreedContextTable(settings))
+
+    reloaded = BreedContextTable(settings)
+    assert reloaded.fingerprint != "old-fingerprint"
+    assert len(reloaded) == 0
+    assert reloaded.labels == ["beagle"]
+
+
+@pytest.mark.asyncio
+async def test_table_build_filters_indexed_breeds(settings, collection):
+    """Test breeds with their own chunks are searched with a breed_key filter, the rest in one call."""
+    collection.get.return_value = {
+        "ids": ["chunk_a", "chunk_b"],
+        "metadatas": [{"breed_key": "beagle"}, {"source_file": "bloat.md"}]
+    }
+    service = make_service(settings, collection, BreedContextTable(settings))
+
+    await service.build_breed_context_table(["beagle", "poodle", "pug"])
+
+    calls = [(len(call.kwargs["query_embeddings"]), call.kwargs.get("where")) for call in collection.query.call_args_list]
+    assert calls == [(1, {"breed_key": "beagle"}), (2, None)]
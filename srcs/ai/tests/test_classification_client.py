@@ -1,3 +1,6 @@
+import base64
+import json
+
 import pytest
 from unittest.mock import AsyncMock, Mock, patch
 import httpx
@@ -35,7 +38,7 @@ async def test_check_content_safe(client):
     mock_async_client.__aexit__ = AsyncMock(return_value=None)
 
     with patch('src.services.classification_client.httpx.AsyncClient', return_value=mock_async_client):
-        result = await client.check_content("data:image/jpeg;base64,test123")
+        result = await client.check_content("data:image/jpeg;base64,dGVzdDEyMw==")
 
         assert result["is_safe"] is True
         assert result["nsfw_probability"] == 0.1
@@ -62,7 +65,7 @@ async def test_detect_species(client):
     mock_async_client.__aexit__ = AsyncMock(return_value=None)
 
     with patch('src.services.classification_client.httpx.AsyncClient', return_value=mock_async_client):
-        result = await client.detect_species("data:image/jpeg;base64,test123")
+        result = await client.detect_species("data:image/jpeg;base64,dGVzdDEyMw==")
 
         assert result["species"] == "dog"
         assert result["confidence"] == 0.87
@@ -93,7 +96,7 @@ async def test_detect_breed(client):
     mock_async_client.__aexit__ = AsyncMock(return_value=None)
 
     with patch('src.services.classification_client.httpx.AsyncClient', return_value=mock_async_client):
-        result = await client.detect_breed("data:image/jpeg;base64,test123", "dog", top_k=5)
+        result = await client.detect_breed("data:image/jpeg;base64,dGVzdDEyMw==", "dog", top_k=5)
 
         assert result["breed_analysis"]["primary_breed"] == "golden_retriever"
         assert result["breed_analysis"]["is_likely_crossbreed"] is False
@@ -112,7 +115,7 @@ async def test_connection_error_handling(client):
 
     with patch('src.services.classification_client.httpx.AsyncClient', return_value=mock_async_client):
         with pytest.raises(ConnectionError, match="Classification service unavailable"):
-            await client.check_content("data:image/jpeg;base64,test123")
+            await client.check_content("data:image/jpeg;base64,dGVzdDEyMw==")
 
 
 @pytest.mark.asyncio
@@ -128,4 +131,99 @@ async def test_timeout_handling(client):
 
     with patch('src.services.classification_client.httpx.AsyncClient', return_value=mock_async_client):
         with pytest.raises(ConnectionError, match="Classification service timeout"):
-            await client.check_content("data:image/jpeg;base64,test123")
+            await client.check_content("data:image/jpeg;base64,dGVzdDEyMw==")
+
+
+@pytest.mark.asyncio
+async def test_classify_pipeline(client):
+    """Test fused classification pipeline call."""
+    mock_response = {
+        "content": {"is_safe": True, "nsfw_probability": 0.1, "threshold": 0.7},
+        "species": {"species": "dog", "confidence": 0.87, "top_predictions": []},
+        "breed": {"breed_analysis": {"primary_breed": "golden_retriever"}},
+        "stopped_at": None
+    }
+
+    mock_http_response = Mock()
+    mock_http_response.json.return_value = mock_response
+    mock_http_response.raise_for_status = Mock()
+
+    mock_async_client = AsyncMock()
+    mock_async_client.post = AsyncMock(return_value=mock_http_response)
+    mock_async_client.__aenter__ = AsyncMock(return_value=mock_async_client)
+    mock_async_client.__aexit__ = AsyncMock(return_value=None)
+
+    with patch('src.services.classification_client.httpx.AsyncClient', return_value=mock_async_client):
+        result = await client.classify_pipeline("data:image/jpeg;base64,dGVzdDEyMw==", species_min_confidence=0.1)
+
+        assert result["breed"]["breed_analysis"]["primary_breed"] == "golden_retriever"
+        call_args = mock_async_client.post.call_args
+        assert call_args[0][0].endswith("/classify/pipeline")
+        assert call_args[1]["params"]["species_min_confidence"] == 0.1
+
+
+@pytest.mark.asyncio
+async def test_get_labels(client):
+    """Test listing breed labels."""
+    mock_http_response = Mock()
+    mock_http_response.json.return_value = {"dog_breeds": ["beagle"], "cat_breeds": ["persian"]}
+    mock_http_response.raise_for_status = Mock()
+
+    with patch.object(httpx.AsyncClient, 'get', AsyncMock(return_value=mock_http_response)) as mock_get:
+        result = await client.get_labels()
+
+    assert result == {"dog_breeds": ["beagle"], "cat_breeds": ["persian"]}
+    assert mock_get.call_args[0][0].endswith("/classify/labels")
+
+
+def _client_with_transport(handler, **settings):
+    """Classification client whose HTTP pool talks to a MockTransport handler."""
+    pool = Mock()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return ClassificationClient(
+        Settings(CLASSIFICATION_SERVICE_URL="http://test-classification:3004", **settings),
+        http_pool=pool
+    )
+
+
+@pytest.mark.asyncio
+async def test_image_sent_as_raw_bytes():
+    """Test the image goes as an octet-stream body with options in the query."""
+    captured = {}
+
+    def handler(request):
+        captured["request"] = request
+        return httpx.Response(200, json={"breed_analysis": {}})
+
+    client = _client_with_transport(handler)
+    image_bytes = b"\xff\xd8\xff\xe0 jpeg bytes"
+
+    await client.detect_breed("data:image/jpeg;base64," + base64.b64encode(image_bytes).decode(), "cat", top_k=3)
+
+    request = captured["request"]
+    assert request.headers["content-type"] == "application/octet-stream"
+    assert request.content == image_bytes
+    assert dict(request.url.params) == {"species": "cat", "top_k": "3"}
+
+
+@pytest.mark.asyncio
+async def test_binary_transport_can_be_disabled():
+    """Test CLASSIFICATION_BINARY_TRANSPORT=False keeps the base64 JSON body."""
+    captured = {}
+
+    def handler(request):
+        captured["json"] = json.loads(request.content)
+        return httpx.Response(200, json={"species": "dog", "confidence": 0.9, "top_predictions": []})
+
+    client = _client_with_transport(handler, CLASSIFICATION_BINARY_TRANSPORT=False)
+
+    await client.detect_species("data:image/jpeg;base64,dGVzdA==", top_k=2)
+
+    assert captured["json"] == {"image": "data:image/jpeg;base64,dGVzdA==", "top_k": 2}
+
+
+@pytest.mark.asyncio
+async def test_invalid_base64_image_rejected(client):
+    """Test an image that is not base64 raises ValueError before any request."""
+    with pytest.raises(ValueError, match="Invalid base64 image"):
+        await client.check_content("data:image/jpeg;base64,not base64!")
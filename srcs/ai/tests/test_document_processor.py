@@ -1,7 +1,8 @@
-"""Tests for document processor metadata sanitization."""
+"""Tests for document processor metadata sanitization and chunking."""
 
 import pytest
-from src.services.document_processor import DocumentProcessor
+from unittest.mock import patch
+from src.services.document_processor import DocumentProcessor, breed_key
 from src.config import Settings
 
 
@@ -124,3 +125,121 @@ tags: [foo, bar]
         # Parameter should override frontmatter
         assert chunks[0].metadata["source_file"] == "override.md"
         assert chunks[0].metadata["tags"] == "new, tags"
+
+
+class TestBreedIndexMetadata:
+    """Normalized keys derived from frontmatter for breed-filtered retrieval."""
+
+    def test_breed_key_normalizes_names(self):
+        """Breed names and labels should map to one snake_case key."""
+        assert breed_key("Yorkshire Terrier") == "yorkshire_terrier"
+        assert breed_key("german-shepherd") == "german_shepherd"
+        assert breed_key("golden_retriever") == "golden_retriever"
+
+    def test_breed_document_gets_breed_key_and_species(self, processor):
+        """Breed tag should become breed_key and species should be lowercased."""
+        content = """---
+doc_type: breed
+species: Dog
+breed: Yorkshire Terrier
+---
+# Yorkshire Terrier"""
+
+        chunks = processor.process(content, metadata={"source_file": "yorkie.md"})
+
+        assert chunks[0].metadata["breed_key"] == "yorkshire_terrier"
+        assert chunks[0].metadata["species"] == "dog"
+
+    def test_crossbreed_document_keyed_by_first_common_name(self, processor):
+        """Crossbreed documents should be keyed by their first common name."""
+        content = """---
+doc_type: crossbreed
+species: dog
+parent_breeds: [golden_retriever, poodle]
+common_names: [Goldendoodle, Groodle]
+---
+# Goldendoodle"""
+
+        chunks = processor.process(content, metadata={})
+
+        assert chunks[0].metadata["breed_key"] == "goldendoodle"
+        assert chunks[0].metadata["parent_breeds"] == "golden_retriever, poodle"
+
+    def test_health_document_has_no_breed_key(self, processor):
+        """Documents without a breed should not get a breed_key."""
+        chunks = processor.process("---\ndoc_type: health\n---\n# Bloat", metadata={})
+
+        assert "breed_key" not in chunks[0].metadata
+
+
+def _paragraphs(count: int, text: str = "Dogs need daily walks.") -> str:
+    """Build markdown with many short sentences grouped into paragraphs."""
+    return "\n\n".join(" ".join([text] * 4) for _ in range(count))
+
+
+class TestChunking:
+    """Test token-offset chunking."""
+
+    def test_short_text_single_chunk(self, processor):
+        """Text within the token limit is returned whole."""
+        assert processor.chunk_text("# Beagle\nScent hound.") == ["# Beagle\nScent hound."]
+
+    def test_chunks_are_slices_without_per_chunk_decode(self, processor):
+        """Chunks are cut from the original string; tokens are never decoded per chunk."""
+        text = _paragraphs(40)
+
+        with patch.object(processor._tokenizer, "decode", side_effect=AssertionError("decode called")):
+            chunks = processor.chunk_text(text, max_tokens=100, overlap=10)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert chunk in text
+            assert len(processor._tokenizer.encode(chunk)) <= 100
+
+    def test_chunks_end_at_sentence_boundaries(self, processor):
+        """Every chunk but the last ends at a sentence end within the tolerance."""
+        chunks = processor.chunk_text(_paragraphs(40), max_tokens=100, overlap=10)
+
+        for chunk in chunks[:-1]:
+            assert chunk.endswith(".")
+
+    def test_consecutive_chunks_overlap(self, processor):
+        """The next chunk repeats the tail of the previous one."""
+        text = " ".join(f"Dog {i} runs." for i in range(400))
+
+        chunks = processor.chunk_text(text, max_tokens=100, overlap=20)
+
+        for previous, current in zip(chunks, chunks[1:]):
+            first_sentence = current.split(".")[0] + "."
+            assert first_sentence in previous
+
+    def test_multibyte_characters_not_split(self, processor):
+        """Chunks never contain partial characters and cover the whole text."""
+        text = " ".join("犬は毎日の散歩が必要です 🐕🐾 café." for _ in range(200))
+
+        chunks = processor.chunk_text(text, max_tokens=64, overlap=8)
+
+        assert "\ufffd" not in "".join(chunks)
+        for chunk in chunks:
+            assert chunk in text
+            assert len(processor._tokenizer.encode(chunk)) <= 64
+        assert text.endswith(chunks[-1])
+
+    def test_unbroken_text_falls_back_to_token_limit(self, processor):
+        """Text without any boundary is cut at the token limit."""
+        text = "x" * 5000
+
+        chunks = processor.chunk_text(text, max_tokens=100, overlap=0)
+
+        assert "".join(chunks) == text
+
+    def test_process_streams_sections(self, processor):
+        """iter_chunks yields chunks lazily with consecutive chunk indices."""
+        content = "# Care\n" + _paragraphs(20) + "\n# Health\n" + _paragraphs(20)
+
+        total = len(processor.process(content, metadata={}))
+
+        chunks = processor.iter_chunks(content, metadata={"source_file": "care.md"})
+
+        assert next(chunks).metadata["chunk_index"] == 0
+        assert [c.metadata["chunk_index"] for c in chunks] == list(range(1, total))
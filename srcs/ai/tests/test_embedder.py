@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from unittest.mock import Mock, patch
+
+from src.services.embedder import Embedder
+from src.config import Settings
+
+
+@pytest.fixture
+def embedder():
+    """Create embedder with a fake SentenceTransformer that counts encodes."""
+    model = Mock()
+    model.encode = Mock(side_effect=lambda texts: (
+        np.array([[float(len(t))] * 4 for t in texts]) if isinstance(texts, list)
+        else np.array([float(len(texts))] * 4)
+    ))
+    with patch('src.services.embedder.SentenceTransformer', return_value=model):
+        return Embedder(Settings(EMBEDDING_CACHE_SIZE=3))
+
+
+def test_repeated_query_skips_model(embedder):
+    """Test repeated (whitespace-variant) queries hit the cache."""
+    first = embedder.embed("Beagle breed characteristics")
+    second = embedder.embed("  Beagle   breed characteristics ")
+
+    assert first == second
+    assert embedder._model.encode.call_count == 1
+    stats = embedder.get_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used(embedder):
+    """Test the cache stays bounded and keeps recently used entries."""
+    for text in ["a", "b", "c"]:
+        embedder.embed(text)
+    embedder.embed("a")  # Refresh "a"
+    embedder.embed("d")  # Evicts "b"
+
+    assert embedder.get_cache_stats()["entries"] == 3
+    calls = embedder._model.encode.call_count
+    embedder.embed("a")
+    assert embedder._model.encode.call_count == calls
+    embedder.embed("b")
+    assert embedder._model.encode.call_count == calls + 1
+
+
+def test_warm_precomputes_in_one_batch(embedder):
+    """Test warm() batch-encodes only missing texts, then lookups are hits."""
+    embedder.embed("Poodle breed")
+
+    warmed = embedder.warm(["Poodle breed", "Beagle breed", "Beagle breed"])
+
+    assert warmed == 1
+    embedder._model.encode.assert_called_with(["Beagle breed"])
+    embedder.embed("Beagle breed")
+    assert embedder.get_cache_stats()["hits"] == 1
+
+
+def test_embed_batch_bypasses_cache(embedder):
+    """Test document batches are not cached."""
+    embedder.embed_batch(["chunk one", "chunk two"])
+
+    assert embedder.get_cache_stats()["entries"] == 0
+
+
+def test_empty_text_rejected(embedder):
+    """Test empty text raises ValueError."""
+    with pytest.raises(ValueError, match="empty text"):
+        embedder.embed("   ")
@@ -0,0 +1,59 @@
+import asyncio
+import pytest
+
+from src.services.http_pool import PooledHTTPClient
+from src.config import Settings
+
+
+async def _handle_keepalive(reader, writer):
+    """Minimal HTTP/1.1 server that answers every request on the same connection."""
+    try:
+        while True:
+            headers = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in headers.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            if length:
+                await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: application/json\r\n"
+                b"Content-Length: 11\r\n"
+                b"\r\n"
+                b'{"ok":true}'
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionResetError):
+        pass
+    finally:
+        writer.close()
+
+
+@pytest.fixture
+async def stub_server():
+    """Start a local keep-alive HTTP server and yield its base URL."""
+    server = await asyncio.start_server(_handle_keepalive, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused(stub_server):
+    """Test sequential requests share one kept-alive connection."""
+    pool = PooledHTTPClient("stub", Settings(), timeout=5)
+
+    for _ in range(3):
+        response = await pool.client.post(f"{stub_server}/classify/content", json={"image": "x"})
+        assert response.json() == {"ok": True}
+
+    stats = pool.get_stats()
+    await pool.aclose()
+
+    assert stats["requests_sent"] == 3
+    assert stats["connections_opened"] == 1
+    assert stats["connections_reused"] == 2
+    assert stats["http_versions"] == {"HTTP/1.1": 3}
+
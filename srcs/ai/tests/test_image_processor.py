@@ -0,0 +1,74 @@
+import base64
+import io
+
+import pytest
+from PIL import Image, JpegImagePlugin
+
+from src.services.image_processor import ImageProcessor
+from src.config import Settings
+
+
+@pytest.fixture
+def processor():
+    """Image processor with default limits."""
+    return ImageProcessor(Settings(MAX_IMAGE_DIMENSION=1024, CLASSIFICATION_IMAGE_SIZE=224))
+
+
+def data_uri(image: Image.Image, format_str: str = "jpeg") -> str:
+    """Encode a PIL image as a data URI."""
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG" if format_str == "jpeg" else format_str.upper())
+    return f"data:image/{format_str};base64,{base64.b64encode(buffer.getvalue()).decode()}"
+
+
+def decode(uri: str) -> Image.Image:
+    """Open a data URI as a PIL image."""
+    return Image.open(io.BytesIO(base64.b64decode(uri.split(",", 1)[1])))
+
+
+def test_large_jpeg_gets_vlm_and_classification_variants(processor):
+    """Test a large JPEG yields a 1024px VLM image and a 224px-short-side thumbnail."""
+    processed = processor.process_image(data_uri(Image.new("RGB", (4000, 3000), (180, 120, 60))))
+
+    assert decode(processed.vlm).size == (1024, 768)
+    thumbnail = decode(processed.classification)
+    assert thumbnail.size == (299, 224)
+    assert thumbnail.format == "JPEG"
+    assert len(processed.classification) < len(processed.vlm)
+
+
+def test_jpeg_decoded_at_reduced_scale(processor, monkeypatch):
+    """Test JPEG decoding is drafted to the smallest DCT scale still >= the VLM size."""
+    drafted = []
+    original_draft = JpegImagePlugin.JpegImageFile.draft
+
+    def draft(self, mode, size):
+        result = original_draft(self, mode, size)
+        drafted.append(self.size)
+        return result
+
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft", draft)
+    processor.process_image(data_uri(Image.new("RGB", (4096, 3072))))
+
+    assert drafted == [(1024, 768)]
+
+
+def test_small_png_keeps_size_and_format(processor):
+    """Test an image within limits is not resized and keeps its format for the VLM."""
+    processed = processor.process_image(data_uri(Image.new("RGBA", (300, 240), (0, 0, 0, 0)), "png"))
+
+    assert processed.vlm.startswith("data:image/png;base64,")
+    assert decode(processed.vlm).size == (300, 240)
+    assert decode(processed.classification).size == (280, 224)
+
+
+def test_too_small_image_rejected(processor):
+    """Test images below MIN_IMAGE_DIMENSION are rejected."""
+    with pytest.raises(ValueError, match="too small"):
+        processor.process_image(data_uri(Image.new("RGB", (200, 400))))
+
+
+def test_unsupported_format_rejected(processor):
+    """Test formats outside SUPPORTED_FORMATS are rejected."""
+    with pytest.raises(ValueError, match="Unsupported format"):
+        processor.process_image("data:image/gif;base64,R0lGODlhAQABAAAAACw=")
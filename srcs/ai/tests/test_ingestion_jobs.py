@@ -0,0 +1,201 @@
+import asyncio
+import pytest
+
+from src.services.ingestion_jobs import IngestionJob, IngestionJobManager
+from src.config import Settings
+
+
+def _manager(directory) -> IngestionJobManager:
+    """Job manager storing jobs under directory, polling quickly."""
+    return IngestionJobManager(Settings(CHROMA_PERSIST_DIR=str(directory), INGEST_JOB_POLL_INTERVAL=0.01))
+
+
+@pytest.fixture
+async def manager(tmp_path):
+    """Job manager storing jobs under tmp_path."""
+    manager = _manager(tmp_path)
+    yield manager
+    await manager.stop()
+
+
+@pytest.mark.asyncio
+async def test_job_reports_progress_and_result(manager):
+    """Test a job moves through running to completed with progress visible to pollers."""
+    release = asyncio.Event()
+
+    async def handler(job, context):
+        context.progress({"files_total": 2, "files_done": 1, "chunks_embedded": 10})
+        await release.wait()
+        return {"files_processed": 2}
+
+    manager.register("initialize", handler)
+    job = manager.enqueue("initialize")
+    await asyncio.sleep(0.05)
+
+    # A second manager (e.g. another uvicorn worker) sees the same state
+    polled = _manager(manager.jobs_dir.parent).get(job.job_id)
+    assert polled.status == "running"
+    assert polled.progress["files_done"] == 1
+
+    release.set()
+    finished = await manager.wait(job.job_id, poll_interval=0.01)
+
+    assert finished.status == "completed"
+    assert finished.result == {"files_processed": 2}
+    assert finished.attempts == 1
+    assert finished.finished_at is not None
+
+
+@pytest.mark.asyncio
+async def test_jobs_run_one_at_a_time_in_order(manager):
+    """Test queued jobs run sequentially, oldest first."""
+    order = []
+
+    async def handler(job, context):
+        order.append(job.payload["n"])
+        await asyncio.sleep(0.01)
+        return {}
+
+    manager.register("ingest", handler)
+    jobs = [manager.enqueue("ingest", {"n": n}) for n in range(3)]
+    for job in jobs:
+        await manager.wait(job.job_id, poll_interval=0.01)
+
+    assert order == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_returns_active_job(manager):
+    """Test enqueueing with coalesce while a job of that kind is active returns it."""
+    release = asyncio.Event()
+
+    async def handler(job, context):
+        await release.wait()
+        return {}
+
+    manager.register("initialize", handler)
+    first = manager.enqueue("initialize", coalesce=True)
+    second = manager.enqueue("initialize", coalesce=True)
+    release.set()
+    await manager.wait(first.job_id, poll_interval=0.01)
+
+    assert second.job_id == first.job_id
+
+
+@pytest.mark.asyncio
+async def test_failed_job_records_error(manager):
+    """Test an exception in the job marks it failed with the error message and type."""
+    async def handler(job, context):
+        raise RuntimeError("embedding failed")
+
+    manager.register("initialize", handler)
+    job = manager.enqueue("initialize")
+    finished = await manager.wait(job.job_id, poll_interval=0.01)
+
+    assert finished.status == "failed"
+    assert finished.error == "embedding failed"
+    assert finished.error_type == "RuntimeError"
+
+
+@pytest.mark.asyncio
+async def test_cancel_running_job(manager):
+    """Test a running job stops at its next checkpoint after cancel, from any worker."""
+    started = asyncio.Event()
+
+    async def handler(job, context):
+        started.set()
+        while True:
+            context.check_cancelled()
+            await asyncio.sleep(0.01)
+
+    manager.register("initialize", handler)
+    job = manager.enqueue("initialize")
+    await started.wait()
+
+    cancelling = _manager(manager.jobs_dir.parent).cancel(job.job_id)
+    assert cancelling.status == "running"
+    assert cancelling.cancel_requested is True
+
+    finished = await manager.wait(job.job_id, poll_interval=0.01)
+    assert finished.status == "cancelled"
+    assert finished.cancel_requested is False
+
+
+@pytest.mark.asyncio
+async def test_cancel_queued_job_never_runs(manager):
+    """Test a cancelled queued job is skipped by the runner."""
+    calls = []
+
+    async def handler(job, context):
+        calls.append(job.job_id)
+        return {}
+
+    manager.register("ingest", handler)
+    manager._save(IngestionJob(job_id="queued", kind="ingest"))
+    assert manager.cancel("queued").status == "cancelled"
+
+    manager.start()
+    await asyncio.sleep(0.05)
+
+    assert calls == []
+    assert manager.get("queued").status == "cancelled"
+
+
+@pytest.mark.asyncio
+async def test_interrupted_job_resumed(manager):
+    """Test a job left running by a previous process is run again at startup."""
+    async def handler(job, context):
+        return {"resumed_from": job.progress.get("files_done")}
+
+    manager.register("initialize", handler)
+    manager._save(IngestionJob(job_id="stale", status="running", attempts=1, progress={"files_done": 7}))
+
+    manager.start()
+    finished = await manager.wait("stale", poll_interval=0.01)
+
+    assert finished.status == "completed"
+    assert finished.attempts == 2
+    assert finished.result == {"resumed_from": 7}
+
+
+@pytest.mark.asyncio
+async def test_stop_requeues_running_job(manager):
+    """Test shutting down puts the running job back in the queue."""
+    started = asyncio.Event()
+
+    async def handler(job, context):
+        started.set()
+        await asyncio.Event().wait()
+
+    manager.register("initialize", handler)
+    job = manager.enqueue("initialize")
+    await started.wait()
+    await manager.stop()
+
+    assert manager.get(job.job_id).status == "queued"
+
+
+@pytest.mark.asyncio
+async def test_only_lock_holder_runs_jobs(manager):
+    """Test a second worker defers to the runner lock holder."""
+    ran_by = []
+
+    def handler_for(name):
+        async def handler(job, context):
+            ran_by.append(name)
+            return {}
+        return handler
+
+    manager.register("ingest", handler_for("first"))
+    manager.start()
+    await asyncio.sleep(0.02)
+
+    other = _manager(manager.jobs_dir.parent)
+    other.register("ingest", handler_for("other"))
+    try:
+        job = other.enqueue("ingest")
+        await other.wait(job.job_id, poll_interval=0.01)
+    finally:
+        await other.stop()
+
+    assert ran_by == ["first"]
@@ -0,0 +1,233 @@
+import json
+
+import httpx
+import pytest
+from unittest.mock import Mock
+
+from src.utils.json_extract import JSONExtractionError, JSONExtractor, extract_json, repair_json
+from src.services.ollama_client import CONTEXTUAL_ANALYSIS_SCHEMA, OllamaVisionClient
+from src.config import Settings
+
+
+ANALYSIS = {
+    "description": "An adult Golden Retriever with a glossy coat.",
+    "traits": {"size": "large", "energy_level": "medium", "temperament": "Relaxed and friendly"},
+    "health_observations": ["Clear eyes", "Healthy weight"]
+}
+
+# Malformed outputs of the kind vision models return for "Return ONLY valid JSON"
+# prompts, each with the object that should be recovered
+CORPUS = [
+    (
+        "prose_before",
+        "Sure! Here is the analysis of the image:\n\n" + json.dumps(ANALYSIS),
+        ANALYSIS
+    ),
+    (
+        "json_fence_with_prose_after",
+        "```json\n" + json.dumps(ANALYSIS, indent=2) + "\n```\n\nLet me know if you need anything else!",
+        ANALYSIS
+    ),
+    (
+        "plain_fence",
+        "```\n" + json.dumps(ANALYSIS) + "\n```",
+        ANALYSIS
+    ),
+    (
+        "trailing_commas",
+        '{\n  "description": "An adult Golden Retriever with a glossy coat.",\n'
+        '  "traits": {"size": "large", "energy_level": "medium", "temperament": "Relaxed and friendly",},\n'
+        '  "health_observations": ["Clear eyes", "Healthy weight",],\n}',
+        ANALYSIS
+    ),
+    (
+        "line_comments",
+        '{\n  "description": "An adult Golden Retriever with a glossy coat.", // based on coat\n'
+        '  "traits": {"size": "large", "energy_level": "medium", "temperament": "Relaxed and friendly"},\n'
+        '  // Only visible observations {not breed knowledge}\n'
+        '  "health_observations": ["Clear eyes", "Healthy weight"]\n}',
+        ANALYSIS
+    ),
+    (
+        "block_comment",
+        '{"description": "An adult Golden Retriever with a glossy coat.", /* estimated */ '
+        '"traits": {"size": "large", "energy_level": "medium", "temperament": "Relaxed and friendly"}, '
+        '"health_observations": ["Clear eyes", "Healthy weight"]}',
+        ANALYSIS
+    ),
+    (
+        "python_dict",
+        str(ANALYSIS),
+        ANALYSIS
+    ),
+    (
+        "python_literals",
+        '{"breed": "Beagle", "confidence": 0.8, "is_mixed": False, "note": None}',
+        {"breed": "Beagle", "confidence": 0.8, "is_mixed": False, "note": None}
+    ),
+    (
+        "braces_inside_strings",
+        '{"description": "Wears a collar tag shaped like {a bone} and a \\"star\\"", "traits": {}}',
+        {"description": 'Wears a collar tag shaped like {a bone} and a "star"', "traits": {}}
+    ),
+    (
+        "raw_newline_in_string",
+        '{"description": "Line one\nline two", "traits": {}}',
+        {"description": "Line one\nline two", "traits": {}}
+    ),
+    (
+        "braces_in_prose_before",
+        "The {breed} field is uncertain, so I left it out. {\"breed\": \"Unknown\", \"confidence\": 0.2}",
+        {"breed": "Unknown", "confidence": 0.2}
+    ),
+    (
+        "second_object_ignored",
+        '{"breed": "Pug", "confidence": 0.9}\n\nAlternative: {"breed": "Boxer", "confidence": 0.1}',
+        {"breed": "Pug", "confidence": 0.9}
+    ),
+    (
+        "truncated_in_string",
+        '{"description": "An adult Golden Retriever", "traits": {"size": "large", "temperament": "Relaxed and fri',
+        {"description": "An adult Golden Retriever", "traits": {"size": "large", "temperament": "Relaxed and fri"}}
+    ),
+    (
+        "truncated_after_key",
+        '{"description": "An adult Golden Retriever", "health_observations": ["Clear eyes"], "traits": ',
+        {"description": "An adult Golden Retriever", "health_observations": ["Clear eyes"]}
+    ),
+    (
+        "breed_probabilities",
+        'Based on the ears and coat:\n{"breed_probabilities": [{"breed": "labrador_retriever", "probability": 0.6},'
+        ' {"breed": "poodle", "probability": 0.4},], "traits": {"size": "large"}, "health_considerations": []}\n'
+        "This looks like a Labradoodle.",
+        {
+            "breed_probabilities": [
+                {"breed": "labrador_retriever", "probability": 0.6},
+                {"breed": "poodle", "probability": 0.4}
+            ],
+            "traits": {"size": "large"},
+            "health_considerations": []
+        }
+    ),
+]
+
+
+@pytest.mark.parametrize("text,expected", [(text, expected) for _, text, expected in CORPUS],
+                         ids=[name for name, _, _ in CORPUS])
+def test_extracts_object_from_malformed_output(text, expected):
+    """Test every corpus output yields the intended object."""
+    assert extract_json(text) == expected
+
+
+@pytest.mark.parametrize("text,expected", [(text, expected) for _, text, expected in CORPUS],
+                         ids=[name for name, _, _ in CORPUS])
+def test_incremental_extraction_matches(text, expected):
+    """Test feeding the output in small fragments gives the same object."""
+    extractor = JSONExtractor()
+    for start in range(0, len(text), 3):
+        extractor.feed(text[start:start + 3])
+    assert extractor.finish() == expected
+
+
+@pytest.mark.parametrize("text", ["", "I could not analyze this image.", "[1, 2, 3]", "{not json at all}"])
+def test_no_object_raises(text):
+    """Test output without a recoverable object raises JSONExtractionError."""
+    with pytest.raises(JSONExtractionError):
+        extract_json(text)
+
+
+def test_feed_reports_completion_before_stream_ends():
+    """Test the object is available as soon as its closing brace arrives."""
+    extractor = JSONExtractor()
+    assert extractor.feed('Result: {"breed": "Pug", ') is None
+    assert extractor.feed('"confidence": 0.9}') == {"breed": "Pug", "confidence": 0.9}
+    assert extractor.feed(" Hope this helps!") == {"breed": "Pug", "confidence": 0.9}
+
+
+def test_repair_leaves_strings_untouched():
+    """Test repairs never rewrite string contents."""
+    assert repair_json('{"note": "True, // not a comment,]", "ok": True,}') == \
+        '{"note": "True, // not a comment,]", "ok": true}'
+
+
+def _client(handler, **settings):
+    """Ollama client talking to a MockTransport handler."""
+    pool = Mock()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return OllamaVisionClient(Settings(OLLAMA_SCHEDULER_ENABLED=False, **settings), http_pool=pool)
+
+
+PUG_START = '{"description": "A pug", "traits": {"size": "small", "energy_level": "low", '
+PUG_END = '"temperament": "playful"}, "health_observations": []}'
+
+
+@pytest.mark.asyncio
+async def test_stream_stops_once_object_is_complete():
+    """Test the streamed analysis returns without waiting for trailing prose."""
+    captured = {}
+
+    async def body():
+        for fragment in [PUG_START, PUG_END, " I hope", " this helps"]:
+            yield (json.dumps({"message": {"content": fragment}, "done": False}) + "\n").encode()
+        raise AssertionError("stream read past the JSON object")
+
+    def handler(request):
+        captured["json"] = json.loads(request.content)
+        return httpx.Response(200, content=body())
+
+    client = _client(handler)
+    breed_analysis = {"primary_breed": "pug", "confidence": 0.9, "is_likely_crossbreed": False}
+
+    events = [event async for event in client.analyze_with_context_stream("img", "dog", breed_analysis, None)]
+
+    assert events[-1] == ("analysis", json.loads(PUG_START + PUG_END))
+    assert [data for event, data in events if event == "token"] == [PUG_START, PUG_END]
+    assert captured["json"]["format"] == CONTEXTUAL_ANALYSIS_SCHEMA
+
+
+@pytest.mark.asyncio
+async def test_structured_output_can_be_disabled():
+    """Test no format is sent when OLLAMA_STRUCTURED_OUTPUT is off."""
+    captured = {}
+
+    def handler(request):
+        captured["json"] = json.loads(request.content)
+        return httpx.Response(200, json={"message": {"content": "Here: " + json.dumps(ANALYSIS)}})
+
+    client = _client(handler, OLLAMA_STRUCTURED_OUTPUT=False)
+    breed_analysis = {"primary_breed": "golden_retriever", "confidence": 0.9, "is_likely_crossbreed": False}
+
+    assert await client.analyze_with_context("img", "dog", breed_analysis, None) == ANALYSIS
+    assert "format" not in captured["json"]
+
+
+BREED_ANALYSIS = {"primary_breed": "golden_retriever", "confidence": 0.9, "is_likely_crossbreed": False}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content", [
+    # Cut off before health_observations: salvaged, but unusable
+    json.dumps(ANALYSIS)[:json.dumps(ANALYSIS).index(', "health_observations"')],
+    # Nested traits object missing a required key
+    json.dumps({**ANALYSIS, "traits": {"size": "large"}})
+], ids=["truncated_before_key", "nested_key_missing"])
+async def test_salvaged_object_missing_required_keys_rejected(content):
+    """Test repaired output without every schema-required key raises RuntimeError."""
+    client = _client(lambda request: httpx.Response(200, json={"message": {"content": content}}))
+
+    with pytest.raises(RuntimeError, match="Failed to parse JSON from response"):
+        await client.analyze_with_context("img", "dog", BREED_ANALYSIS, None)
+
+
+@pytest.mark.asyncio
+async def test_streamed_object_missing_required_keys_rejected():
+    """Test a stream that ends before a required key raises RuntimeError."""
+    def handler(request):
+        line = json.dumps({"message": {"content": '{"description": "A pug", "traits": {'}, "done": True})
+        return httpx.Response(200, content=line.encode())
+
+    client = _client(handler)
+
+    with pytest.raises(RuntimeError, match="Failed to parse JSON from response"):
+        async for _ in client.analyze_with_context_stream("img", "dog", BREED_ANALYSIS, None):
+            pass
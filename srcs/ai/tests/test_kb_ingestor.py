@@ -0,0 +1,106 @@
+import pytest
+from unittest.mock import Mock
+
+from src.services.kb_ingestor import KnowledgeBaseIngestor
+from src.config import Settings
+
+
+def _tiktoken_available() -> bool:
+    """Check the cl100k_base encoding can be loaded (it is downloaded on first use)."""
+    try:
+        import tiktoken
+        tiktoken.get_encoding("cl100k_base")
+        return True
+    except Exception:
+        return False
+
+
+@pytest.mark.skipif(not _tiktoken_available(), reason="tiktoken cl100k_base encoding unavailable")
+def test_process_pool_chunks_all_files(tmp_path):
+    """Test files are chunked in worker processes and embedded in one batch."""
+    kb_dir = tmp_path / "knowledge_base"
+    kb_dir.mkdir()
+    for name in ["beagle", "poodle", "pug", "husky"]:
+        (kb_dir / f"{name}.md").write_text(f"---\nbreed: {name}\n---\n# {name}\nFacts about the {name}.")
+
+    settings = Settings(
+        KNOWLEDGE_BASE_DIR=str(kb_dir),
+        CHROMA_PERSIST_DIR=str(tmp_path / "chroma"),
+        INGEST_WORKERS=2,
+        INGEST_EMBED_BATCH_SIZE=100
+    )
+    rag_service = Mock()
+    rag_service.add_documents = Mock(side_effect=lambda chunks: len(chunks))
+    progress = []
+
+    result = KnowledgeBaseIngestor(settings, None, rag_service).ingest_directory(progress.append)
+
+    assert result["files_processed"] == 4
+    assert result["errors"] == []
+    rag_service.add_documents.assert_called_once()
+    sources = {c.metadata["source_file"] for c in rag_service.add_documents.call_args[0][0]}
+    assert sources == {"beagle.md", "poodle.md", "pug.md", "husky.md"}
+    assert progress[-1]["files_done"] == 4
+
+
+def test_cancelled_run_resumes_after_last_committed_file(tmp_path):
+    """Test a cancelled sync checkpoints committed files and the rerun only ingests the rest."""
+    from src.services.document_processor import Chunk
+    from src.services.ingestion_jobs import JobCancelled
+
+    kb_dir = tmp_path / "knowledge_base"
+    kb_dir.mkdir()
+    for name in ["beagle", "poodle", "pug"]:
+        (kb_dir / f"{name}.md").write_text(f"# {name}\nContent")
+
+    settings = Settings(
+        KNOWLEDGE_BASE_DIR=str(kb_dir),
+        CHROMA_PERSIST_DIR=str(tmp_path / "chroma"),
+        INGEST_WORKERS=1,
+        INGEST_EMBED_BATCH_SIZE=1
+    )
+    processor = Mock()
+    processor.process = Mock(side_effect=lambda content, metadata: [Chunk(content=content, metadata={**metadata, "chunk_index": 0})])
+    rag_service = Mock()
+    rag_service.add_documents = Mock(side_effect=lambda chunks: len(chunks))
+    ingestor = KnowledgeBaseIngestor(settings, processor, rag_service)
+
+    progress = []
+    with pytest.raises(JobCancelled):
+        ingestor.ingest_directory(progress.append, cancelled=lambda: len(progress) > 2)
+    assert rag_service.add_documents.call_count == 2
+
+    result = ingestor.ingest_directory()
+
+    assert result["files_unchanged"] == 2
+    assert result["files_processed"] == 1
+    assert rag_service.add_documents.call_count == 3
+
+
+def test_embedding_batches_yield_to_queries(tmp_path):
+    """Test each embedding batch waits (bounded) while queries are in flight."""
+    kb_dir = tmp_path / "knowledge_base"
+    kb_dir.mkdir()
+    (kb_dir / "beagle.md").write_text("# Beagle\nContent")
+
+    settings = Settings(
+        KNOWLEDGE_BASE_DIR=str(kb_dir),
+        CHROMA_PERSIST_DIR=str(tmp_path / "chroma"),
+        INGEST_WORKERS=1,
+        INGEST_QUERY_YIELD_MS=1000
+    )
+    processor = Mock()
+    processor.process = Mock(return_value=[Mock(content="chunk", metadata={})])
+    rag_service = Mock()
+    rag_service.add_documents = Mock(return_value=1)
+    busy_checks = []
+
+    def queries_busy():
+        busy_checks.append(rag_service.add_documents.called)
+        return len(busy_checks) < 3
+
+    KnowledgeBaseIngestor(settings, processor, rag_service).ingest_directory(queries_busy=queries_busy)
+
+    # Polled until the queries finished, all before the batch was embedded
+    assert busy_checks == [False, False, False]
+    rag_service.add_documents.assert_called_once()
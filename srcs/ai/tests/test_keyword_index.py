@@ -0,0 +1,223 @@
+import threading
+
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from src.services.keyword_index import KeywordIndex, matches_filter, tokenize
+from src.services.rag_service import RAGService
+from src.config import Settings
+
+
+CHUNKS = {
+    "gdv": ("Gastric dilatation-volvulus (GDV) is an emergency in deep-chested dogs.", {"source_file": "gdv.md", "species": "dog"}),
+    "pugs": ("Brachycephalic breeds such as pugs struggle in hot weather.", {"source_file": "pug.md", "species": "dog"}),
+    "yorkie": ("The Yorkshire Terrier is a small, confident companion dog.", {"source_file": "yorkie.md", "species": "dog"}),
+    "persian": ("Persian cats are brachycephalic and need daily grooming.", {"source_file": "persian.md", "species": "cat"}),
+}
+
+
+@pytest.fixture
+def settings(tmp_path):
+    """Settings with the Chroma directory (and index file) under tmp_path."""
+    return Settings(CHROMA_PERSIST_DIR=str(tmp_path / "chroma"), RAG_FUSION_DEPTH=4)
+
+
+@pytest.fixture
+def index(settings):
+    """Keyword index holding CHUNKS."""
+    index = KeywordIndex(settings)
+    index.add(list(CHUNKS), [text for text, _ in CHUNKS.values()], [meta for _, meta in CHUNKS.values()])
+    return index
+
+
+def test_tokenize_lowercases_and_drops_stopwords():
+    """Test terms are lowercase alphanumerics without stopwords."""
+    assert tokenize("What is GDV in a Great Dane?") == ["gdv", "great", "dane"]
+
+
+def test_search_ranks_exact_terms(index):
+    """Test rare exact terms find their chunks."""
+    assert [chunk for chunk, _ in index.search("GDV", 5)] == ["gdv"]
+    assert [chunk for chunk, _ in index.search("yorkshire terrier", 5)] == ["yorkie"]
+    assert {chunk for chunk, _ in index.search("brachycephalic", 5)} == {"pugs", "persian"}
+    assert index.search("parrot", 5) == []
+
+
+def test_search_applies_filters(index):
+    """Test metadata filters restrict keyword hits."""
+    assert [chunk for chunk, _ in index.search("brachycephalic", 5, {"species": "cat"})] == ["persian"]
+    assert [chunk for chunk, _ in index.search("brachycephalic", 5, {"species": {"$ne": "cat"}})] == ["pugs"]
+
+
+def test_add_replaces_and_delete_removes(index):
+    """Test re-adding an id replaces its terms and deleting removes it."""
+    index.add(["gdv"], ["Bloat needs emergency surgery."], [{"source_file": "gdv.md"}])
+    assert index.search("GDV", 5) == []
+    assert [chunk for chunk, _ in index.search("bloat", 5)] == ["gdv"]
+
+    index.delete(["gdv"])
+    assert index.search("bloat", 5) == []
+    assert len(index) == 3
+
+
+def test_index_round_trips_through_disk(index, settings):
+    """Test another worker loads the same index from disk once it is saved."""
+    assert not index.path.exists()  # add() only changes the index in memory
+
+    index.save_if_dirty()
+    other = KeywordIndex(settings)
+    assert other.chunk_ids() == set(CHUNKS)
+    assert other.search("GDV", 5) == index.search("GDV", 5)
+
+
+def test_search_during_ingestion(index):
+    """Test searches running while another thread adds and deletes chunks never fail."""
+    errors = []
+    done = threading.Event()
+
+    def ingest():
+        for n in range(300):
+            index.add([f"new{n}"], [f"Brachycephalic breed number {n}"], [{"species": "dog"}])
+            if n >= 10:
+                index.delete([f"new{n - 10}"])
+        done.set()
+
+    def query():
+        try:
+            while not done.is_set():
+                index.search("brachycephalic breed", 5, {"species": "dog"})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=ingest)] + [threading.Thread(target=query) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(index) == len(CHUNKS) + 10
+
+
+def test_matches_filter_operators():
+    """Test the supported ChromaDB filter operators."""
+    metadata = {"species": "dog", "chunk_index": 3}
+    assert matches_filter(metadata, {"$and": [{"species": "dog"}, {"chunk_index": {"$gte": 3}}]})
+    assert matches_filter(metadata, {"$or": [{"species": "cat"}, {"chunk_index": {"$in": [1, 3]}}]})
+    assert not matches_filter(metadata, {"chunk_index": {"$lt": 3}})
+
+
+class FakeCollection:
+    """In-memory stand-in for the Chroma collection."""
+
+    def __init__(self, chunks):
+        self.chunks = dict(chunks)
+        self.query = Mock(side_effect=self._query)
+
+    def get(self, ids=None, include=None):
+        ids = [chunk for chunk in (ids or self.chunks) if chunk in self.chunks]
+        return {
+            "ids": ids,
+            "documents": [self.chunks[chunk][0] for chunk in ids],
+            "metadatas": [self.chunks[chunk][1] for chunk in ids]
+        }
+
+    def count(self):
+        return len(self.chunks)
+
+    def _query(self, query_embeddings, n_results, where=None):
+        # Pretend the embedding ranks chunks in insertion order
+        ids = list(self.chunks)[:n_results]
+        return {
+            "ids": [ids],
+            "documents": [[self.chunks[chunk][0] for chunk in ids]],
+            "metadatas": [[self.chunks[chunk][1] for chunk in ids]],
+            "distances": [[0.1 * rank for rank in range(len(ids))]]
+        }
+
+
+def make_service(settings, collection, index):
+    """Create a RAG service over the fake collection."""
+    embedder = Mock()
+    embedder.embed = Mock(return_value=[0.1] * 384)
+    ollama = Mock()
+    ollama.generate = AsyncMock(return_value="answer")
+    with patch('chromadb.PersistentClient') as client:
+        client.return_value.get_or_create_collection.return_value = collection
+        return RAGService(settings, embedder, ollama, keyword_index=index)
+
+
+def test_service_indexes_existing_collection(settings):
+    """Test chunks already in Chroma are indexed when the service starts."""
+    index = KeywordIndex(settings)
+    make_service(settings, FakeCollection(CHUNKS), index)
+
+    assert index.chunk_ids() == set(CHUNKS)
+
+
+@pytest.mark.asyncio
+async def test_hybrid_query_fuses_keyword_hits(settings, index):
+    """Test a chunk only the keyword index finds is fused into the results."""
+    service = make_service(settings, FakeCollection(CHUNKS), index)
+
+    response = await service.query("Persian grooming", top_k=2, mode="hybrid")
+
+    # Vector search ranks persian last but it is the only keyword hit
+    sources = [source.source_file for source in response.sources]
+    assert sources == ["persian.md", "gdv.md"]
+    assert all(0 < source.relevance_score <= 1 for source in response.sources)
+
+
+@pytest.mark.asyncio
+async def test_keyword_query_skips_embedding(settings, index):
+    """Test keyword mode answers without embedding the question or a vector search."""
+    collection = FakeCollection(CHUNKS)
+    service = make_service(settings, collection, index)
+
+    response = await service.query("GDV", mode="keyword")
+
+    assert [source.source_file for source in response.sources] == ["gdv.md"]
+    assert response.sources[0].relevance_score == 1.0
+    service.embedder.embed.assert_not_called()
+    collection.query.assert_not_called()
+
+
+def test_add_and_delete_keep_index_in_step(settings):
+    """Test add_documents and delete_chunks update the keyword index."""
+    from src.services.document_processor import Chunk
+
+    index = KeywordIndex(settings)
+    collection = FakeCollection({})
+    collection.upsert = Mock()
+    collection.delete = Mock()
+    service = make_service(settings, collection, index)
+    service.embedder.embed_batch = Mock(return_value=[[0.1]])
+
+    service.add_documents([Chunk(content="Beagles are scent hounds.", metadata={"source_file": "beagle.md"})])
+    ids = collection.upsert.call_args[1]["ids"]
+    assert [chunk for chunk, _ in index.search("beagles", 5)] == ids
+
+    service.delete_chunks(ids)
+    assert len(index) == 0
+
+
+def test_index_persisted_once_per_ingest(settings):
+    """Test add_documents leaves the file alone and finish_ingest writes it once."""
+    from src.services.document_processor import Chunk
+
+    index = KeywordIndex(settings)
+    collection = FakeCollection({})
+    collection.upsert = Mock()
+    service = make_service(settings, collection, index)
+    service.embedder.embed_batch = Mock(return_value=[[0.1]])
+
+    with patch.object(index, "save", wraps=index.save) as save:
+        for breed in ("beagle", "poodle", "pug"):
+            service.add_documents([Chunk(content=f"{breed} facts", metadata={"source_file": f"{breed}.md"})])
+        assert save.call_count == 0
+
+        service.finish_ingest()
+        service.finish_ingest()
+        assert save.call_count == 1
+
+    assert len(KeywordIndex(settings)) == 3
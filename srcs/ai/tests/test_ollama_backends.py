@@ -0,0 +1,223 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from unittest.mock import Mock
+
+from src.services.ollama_backends import OllamaBackendPool
+from src.services.ollama_client import OllamaVisionClient
+from src.config import Settings
+
+
+class StubOllama:
+    """Stub Ollama hosts behind one MockTransport, keyed by host name."""
+
+    def __init__(self, loaded=None):
+        self.loaded = loaded or {}  # host -> models listed by /api/ps
+        self.down = set()
+        self.failing = set()  # Hosts answering /api/chat with a 500
+        self.chats = []  # Hosts that served /api/chat, in order
+
+    def handler(self, request):
+        host = request.url.host
+        if host in self.down:
+            raise httpx.ConnectError("Connection refused", request=request)
+        if request.url.path == "/api/ps":
+            return httpx.Response(200, json={"models": [{"name": m, "model": m} for m in self.loaded.get(host, [])]})
+        if host in self.failing:
+            return httpx.Response(500, json={"error": "out of memory"})
+        self.chats.append(host)
+        return httpx.Response(200, json={"message": {"content": f"answer from {host}"}})
+
+
+@pytest.fixture
+def settings():
+    """Settings with three Ollama backends."""
+    return Settings(
+        OLLAMA_BACKEND_URLS="http://ollama-a:11434, http://ollama-b:11434,http://ollama-c:11434",
+        OLLAMA_MODEL="qwen3-vl:8b",
+        OLLAMA_BACKEND_EJECT_AFTER=2,
+        OLLAMA_BACKEND_EJECT_SECONDS=60,
+        OLLAMA_SCHEDULER_ENABLED=False
+    )
+
+
+def make_client(settings, stub):
+    """Ollama client whose HTTP pool talks to the stub hosts."""
+    pool = Mock()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(stub.handler))
+    return OllamaVisionClient(settings, http_pool=pool)
+
+
+def test_backends_parsed_from_config(settings):
+    """Test comma-separated backend URLs, falling back to OLLAMA_BASE_URL."""
+    pool = OllamaBackendPool(settings)
+    assert [backend.url for backend in pool.backends] == [
+        "http://ollama-a:11434", "http://ollama-b:11434", "http://ollama-c:11434"
+    ]
+
+    single = OllamaBackendPool(Settings(OLLAMA_BASE_URL="http://ollama:11434/"))
+    assert [backend.url for backend in single.backends] == ["http://ollama:11434"]
+
+
+@pytest.mark.asyncio
+async def test_prefers_backends_with_model_loaded(settings):
+    """Test calls go to the hosts whose /api/ps lists OLLAMA_MODEL."""
+    stub = StubOllama(loaded={"ollama-b": ["qwen3-vl:8b"], "ollama-c": ["llama3:latest"]})
+    client = make_client(settings, stub)
+
+    for _ in range(3):
+        assert await client.generate("question") == "answer from ollama-b"
+
+    stats = client.backends.get_stats()
+    assert stats["http://ollama-b:11434"]["model_loaded"] is True
+    assert stats["http://ollama-c:11434"]["model_loaded"] is False
+
+
+@pytest.mark.asyncio
+async def test_routes_to_least_outstanding_backend(settings):
+    """Test concurrent calls spread across backends by outstanding requests."""
+    stub = StubOllama()
+    release = asyncio.Event()
+    served = []
+
+    async def handler(request):
+        if request.url.path == "/api/ps":
+            return httpx.Response(200, json={"models": []})
+        served.append(request.url.host)
+        await release.wait()
+        return httpx.Response(200, json={"message": {"content": "ok"}})
+
+    stub.handler = handler
+    client = make_client(settings, stub)
+
+    tasks = [asyncio.create_task(client.generate("question")) for _ in range(3)]
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert sorted(served) == ["ollama-a", "ollama-b", "ollama-c"]
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert all(backend.outstanding == 0 for backend in client.backends.backends)
+
+
+@pytest.mark.asyncio
+async def test_failing_backend_is_ejected(settings):
+    """Test a backend is skipped after consecutive failures and readmitted later."""
+    stub = StubOllama()
+    stub.down.add("ollama-a")
+    client = make_client(settings, stub)
+    backend_a = client.backends.backends[0]
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            await client.generate("question")
+        # Keep routing to ollama-a until it is ejected
+        backend_a.latency = None
+        for backend in client.backends.backends[1:]:
+            backend.latency = 1.0
+
+    assert client.backends.get_stats()["http://ollama-a:11434"]["ejected"] is True
+    for _ in range(4):
+        assert await client.generate("question") != "answer from ollama-a"
+
+    # Ejection over: one successful call restores the backend
+    stub.down.clear()
+    backend_a.ejected_until = 0.0
+    backend_a.latency = None
+    assert await client.generate("question") == "answer from ollama-a"
+    assert backend_a.consecutive_failures == 0
+
+
+@pytest.mark.asyncio
+async def test_server_errors_count_as_failures(settings):
+    """Test 5xx responses count towards the error rate and ejection."""
+    stub = StubOllama()
+    stub.failing = {"ollama-a", "ollama-b", "ollama-c"}
+    client = make_client(settings, stub)
+
+    for _ in range(6):
+        with pytest.raises(ConnectionError):
+            await client.generate("question")
+
+    stats = client.backends.get_stats()
+    assert all(backend["error_rate"] == 1.0 for backend in stats.values())
+    assert all(backend["ejected"] for backend in stats.values())
+
+    # Every backend ejected: calls are still attempted rather than refused
+    stub.failing.clear()
+    assert (await client.generate("question")).startswith("answer from")
+
+
+@pytest.mark.asyncio
+async def test_streaming_call_is_routed(settings):
+    """Test streamed generation goes through the pool as well."""
+    stub = StubOllama(loaded={"ollama-c": ["qwen3-vl:8b"]})
+    lines = [json.dumps({"message": {"content": "ok"}, "done": True})]
+    default_handler = stub.handler
+
+    def handler(request):
+        if request.url.path == "/api/chat":
+            stub.chats.append(request.url.host)
+            return httpx.Response(200, content="\n".join(lines).encode())
+        return default_handler(request)
+
+    stub.handler = handler
+    client = make_client(settings, stub)
+
+    assert [token async for token in client.generate_stream("question")] == ["ok"]
+    assert stub.chats == ["ollama-c"]
+    assert client.backends.get_stats()["http://ollama-c:11434"]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_warmup_loads_model_on_every_backend(settings):
+    """Test warmup sends an empty chat to each backend and records residency."""
+    stub = StubOllama()
+    stub.down.add("ollama-c")
+    requests = []
+    default_handler = stub.handler
+
+    def handler(request):
+        requests.append((request.url.host, json.loads(request.content)))
+        return default_handler(request)
+
+    stub.handler = handler
+    client = make_client(settings, stub)
+
+    assert await client.warmup(timeout=5) == {
+        "http://ollama-a:11434": True,
+        "http://ollama-b:11434": True,
+        "http://ollama-c:11434": False
+    }
+    assert all(body["messages"] == [] and body["keep_alive"] == "30m" for _, body in requests)
+    assert client.backends.residency() == {
+        "model": "qwen3-vl:8b",
+        "resident": True,
+        "backends": {
+            "http://ollama-a:11434": True,
+            "http://ollama-b:11434": True,
+            "http://ollama-c:11434": None
+        }
+    }
+
+
+@pytest.mark.asyncio
+async def test_every_call_sets_keep_alive(settings):
+    """Test generation requests carry OLLAMA_KEEP_ALIVE."""
+    settings.OLLAMA_KEEP_ALIVE = "-1m"
+    bodies = []
+
+    def handler(request):
+        if request.url.path == "/api/ps":
+            return httpx.Response(200, json={"models": []})
+        bodies.append(json.loads(request.content))
+        return httpx.Response(200, json={"message": {"content": "ok"}})
+
+    stub = StubOllama()
+    stub.handler = handler
+    client = make_client(settings, stub)
+
+    await client.generate("question")
+    assert bodies[0]["keep_alive"] == "-1m"
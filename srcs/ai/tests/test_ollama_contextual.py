@@ -1,4 +1,5 @@
 import pytest
+import json
 from unittest.mock import AsyncMock, patch, Mock
 import httpx
 
@@ -239,3 +240,91 @@ async def test_analyze_with_context_timeout_error(
                 breed_analysis=sample_breed_analysis_purebred,
                 rag_context=None
             )
+
+
+def _streaming_client(settings, lines):
+    """Create an Ollama client whose HTTP pool replays NDJSON stream lines."""
+    captured = {}
+
+    def handler(request):
+        captured["json"] = json.loads(request.content)
+        return httpx.Response(200, content="\n".join(lines).encode())
+
+    pool = Mock()
+    pool.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return OllamaVisionClient(settings, http_pool=pool), captured
+
+
+@pytest.mark.asyncio
+async def test_analyze_with_context_stream_yields_tokens_then_analysis(
+    sample_breed_analysis_purebred,
+    sample_rag_context_purebred
+):
+    """Test streamed analysis emits every fragment, then the parsed result."""
+    fragments = [
+        '{"description": "A healthy ', 'Golden Retriever", ',
+        '"traits": {"size": "large", "energy_level": "high", "temperament": "friendly"}, ',
+        '"health_observations": []}'
+    ]
+    lines = [json.dumps({"message": {"content": f}, "done": False}) for f in fragments]
+    lines.append(json.dumps({"message": {"content": ""}, "done": True}))
+
+    client, captured = _streaming_client(Settings(OLLAMA_BASE_URL="http://test-ollama:11434"), lines)
+
+    events = [
+        event async for event in client.analyze_with_context_stream(
+            image_base64="data:image/jpeg;base64,/9j/test123",
+            species="dog",
+            breed_analysis=sample_breed_analysis_purebred,
+            rag_context=sample_rag_context_purebred
+        )
+    ]
+
+    assert events[:-1] == [("token", f) for f in fragments]
+    assert events[-1][0] == "analysis"
+    assert events[-1][1]["description"] == "A healthy Golden Retriever"
+    assert events[-1][1]["traits"]["size"] == "large"
+    assert captured["json"]["stream"] is True
+
+
+@pytest.mark.asyncio
+async def test_analyze_with_context_stream_error_chunk(sample_breed_analysis_purebred):
+    """Test an in-stream Ollama error is raised as ConnectionError."""
+    lines = [json.dumps({"error": "model not found"})]
+    client, _ = _streaming_client(Settings(OLLAMA_BASE_URL="http://test-ollama:11434"), lines)
+
+    with pytest.raises(ConnectionError, match="model not found"):
+        async for _ in client.analyze_with_context_stream(
+            image_base64="test",
+            species="dog",
+            breed_analysis=sample_breed_analysis_purebred,
+            rag_context=None
+        ):
+            pass
+
+
+@pytest.mark.asyncio
+async def test_generate_stream_yields_fragments():
+    """Test text generation can be streamed fragment by fragment."""
+    fragments = ["Beagles ", "need daily ", "walks."]
+    lines = [json.dumps({"message": {"content": f}, "done": False}) for f in fragments]
+    lines.append(json.dumps({"message": {"content": ""}, "done": True}))
+
+    client, captured = _streaming_client(Settings(OLLAMA_BASE_URL="http://test-ollama:11434"), lines)
+
+    tokens = [token async for token in client.generate_stream("How much exercise does a beagle need?")]
+
+    assert tokens == fragments
+    assert captured["json"]["stream"] is True
+    assert captured["json"]["messages"] == [{"role": "user", "content": "How much exercise does a beagle need?"}]
+
+
+@pytest.mark.asyncio
+async def test_stream_invalid_line_raises_connection_error():
+    """Test a malformed NDJSON line is raised as ConnectionError, not a decode error."""
+    lines = [json.dumps({"message": {"content": "Beagles"}, "done": False}), "{not json"]
+    client, _ = _streaming_client(Settings(OLLAMA_BASE_URL="http://test-ollama:11434"), lines)
+
+    with pytest.raises(ConnectionError, match="Ollama stream returned invalid data"):
+        async for _ in client.generate_stream("How much exercise does a beagle need?"):
+            pass
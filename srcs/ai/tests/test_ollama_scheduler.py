@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from src.services.ollama_scheduler import (
+    BACKGROUND,
+    INTERACTIVE,
+    VISION,
+    LatencyHistogram,
+    OllamaBusy,
+    OllamaScheduler
+)
+from src.services.ollama_client import OllamaVisionClient
+from src.config import Settings
+
+
+@pytest.fixture
+def settings():
+    """Settings with one Ollama slot and a short queue."""
+    return Settings(OLLAMA_SCHEDULER_SLOTS=1, OLLAMA_SCHEDULER_MAX_QUEUE=2, OLLAMA_TIMEOUT=100)
+
+
+@pytest.fixture
+def scheduler(settings):
+    """Ollama scheduler."""
+    return OllamaScheduler(settings)
+
+
+async def _hold(scheduler, priority, release, order):
+    """Hold a slot until release is set, recording when the slot was granted."""
+    async with scheduler.slot(priority):
+        order.append(priority)
+        await release.wait()
+
+
+@pytest.mark.asyncio
+async def test_slots_limit_concurrent_calls(settings):
+    """Test no more than OLLAMA_SCHEDULER_SLOTS calls run at once."""
+    settings.OLLAMA_SCHEDULER_SLOTS = 2
+    settings.OLLAMA_SCHEDULER_MAX_QUEUE = 10
+    scheduler = OllamaScheduler(settings)
+    release = asyncio.Event()
+    order = []
+
+    tasks = [asyncio.create_task(_hold(scheduler, INTERACTIVE, release, order)) for _ in range(5)]
+    await asyncio.sleep(0)
+
+    assert scheduler.running == 2
+    assert scheduler.queued() == 3
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert scheduler.running == 0
+    assert scheduler.get_stats()["classes"][INTERACTIVE]["completed"] == 5
+
+
+@pytest.mark.asyncio
+async def test_waiting_calls_run_most_urgent_first(scheduler):
+    """Test a freed slot goes to interactive, then vision, then background calls."""
+    scheduler.max_queue = 10
+    release = asyncio.Event()
+    order = []
+
+    first = asyncio.create_task(_hold(scheduler, BACKGROUND, release, order))
+    await asyncio.sleep(0)
+    waiting = [
+        asyncio.create_task(_hold(scheduler, priority, release, order))
+        for priority in (BACKGROUND, VISION, INTERACTIVE, VISION)
+    ]
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(first, *waiting)
+    assert order == [BACKGROUND, INTERACTIVE, VISION, VISION, BACKGROUND]
+
+
+@pytest.mark.asyncio
+async def test_full_queue_rejects_with_retry_after(scheduler):
+    """Test a call is rejected fast once max_queue calls of its class or above wait."""
+    release = asyncio.Event()
+    order = []
+    tasks = [asyncio.create_task(_hold(scheduler, VISION, release, order)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    with pytest.raises(OllamaBusy) as exc_info:
+        scheduler.check_capacity(VISION)
+    assert exc_info.value.retry_after >= 1
+    assert isinstance(exc_info.value, ConnectionError)
+
+    with pytest.raises(OllamaBusy):
+        async with scheduler.slot(VISION):
+            pass
+
+    # Waiting vision calls are not ahead of an interactive call, but are
+    # ahead of a background one
+    scheduler.check_capacity(INTERACTIVE)
+    with pytest.raises(OllamaBusy):
+        scheduler.check_capacity(BACKGROUND)
+
+    release.set()
+    await asyncio.gather(*tasks)
+    scheduler.check_capacity(VISION)
+    assert scheduler.get_stats()["classes"][VISION]["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_gives_up_its_place(scheduler):
+    """Test a cancelled waiter neither blocks the queue nor leaks a slot."""
+    release = asyncio.Event()
+    order = []
+    running = asyncio.create_task(_hold(scheduler, VISION, release, order))
+    await asyncio.sleep(0)
+    abandoned = asyncio.create_task(_hold(scheduler, INTERACTIVE, release, order))
+    waiting = asyncio.create_task(_hold(scheduler, BACKGROUND, release, order))
+    await asyncio.sleep(0)
+
+    abandoned.cancel()
+    await asyncio.sleep(0)
+    assert scheduler.queued() == 1
+
+    release.set()
+    await asyncio.gather(running, waiting)
+    assert order == [VISION, BACKGROUND]
+    assert scheduler.running == 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_priority_rejected(scheduler):
+    """Test an unknown priority class is a ValueError."""
+    with pytest.raises(ValueError):
+        async with scheduler.slot("urgent"):
+            pass
+
+
+def test_latency_histogram_buckets_are_cumulative():
+    """Test observations land in cumulative upper-bound buckets."""
+    histogram = LatencyHistogram(buckets=(0.5, 1.0))
+    for seconds in (0.2, 0.7, 3.0):
+        histogram.observe(seconds)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.5": 1, "1.0": 2, "+Inf": 3}
+    assert snapshot["count"] == 3
+    assert snapshot["mean_ms"] == 1300.0
+
+
+@pytest.mark.asyncio
+async def test_client_calls_hold_a_slot(settings, scheduler):
+    """Test generate runs inside a scheduler slot of the requested class."""
+    client = OllamaVisionClient(settings, scheduler=scheduler)
+    response = Mock()
+    response.raise_for_status = Mock()
+    response.json = Mock(return_value={"message": {"content": "answer"}})
+
+    async def post(*args, **kwargs):
+        assert scheduler.running == 1
+        return response
+
+    client._client = Mock(return_value=Mock(post=AsyncMock(side_effect=post)))
+
+    assert await client.generate("question", priority=BACKGROUND) == "answer"
+    stats = scheduler.get_stats()["classes"]
+    assert stats[BACKGROUND]["completed"] == 1
+    assert stats[BACKGROUND]["duration"]["count"] == 1
+    assert scheduler.running == 0
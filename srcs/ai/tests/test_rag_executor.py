@@ -0,0 +1,74 @@
+import asyncio
+import threading
+import time
+import pytest
+
+from src.services.rag_executor import RAGExecutor
+from src.config import Settings
+
+
+@pytest.mark.asyncio
+async def test_runs_off_event_loop_thread():
+    """Test blocking work runs on a RAG worker thread, not the loop thread."""
+    executor = RAGExecutor(Settings())
+
+    thread_name = await executor.run(lambda: threading.current_thread().name)
+    executor.shutdown()
+
+    assert thread_name.startswith("rag")
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive():
+    """Test other coroutines keep running while a blocking call is in progress."""
+    executor = RAGExecutor(Settings())
+    ticks = []
+
+    async def ticker():
+        for _ in range(5):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.02)
+
+    await asyncio.gather(executor.run(time.sleep, 0.2), ticker())
+    executor.shutdown()
+
+    assert len(ticks) == 5
+    assert ticks[-1] - ticks[0] < 0.2
+
+
+@pytest.mark.asyncio
+async def test_rejects_when_queue_full():
+    """Test work beyond workers + max_queue fails fast with ConnectionError."""
+    executor = RAGExecutor(Settings(RAG_EXECUTOR_WORKERS=1, RAG_EXECUTOR_MAX_QUEUE=1))
+
+    results = await asyncio.gather(
+        executor.run(time.sleep, 0.1),
+        executor.run(time.sleep, 0.1),
+        executor.run(time.sleep, 0.1),
+        return_exceptions=True
+    )
+    stats = executor.get_stats()
+    executor.shutdown()
+
+    assert isinstance(results[2], ConnectionError)
+    assert stats["rejected"] == 1
+    assert stats["completed"] == 2
+    assert stats["max_queued"] == 1
+    assert stats["avg_queue_wait_ms"] > 0
+
+
+@pytest.mark.asyncio
+async def test_exceptions_propagate():
+    """Test errors raised by the blocking call reach the caller."""
+    executor = RAGExecutor(Settings())
+
+    def fail():
+        raise ValueError("Cannot embed empty text")
+
+    with pytest.raises(ValueError, match="empty text"):
+        await executor.run(fail)
+    stats = executor.get_stats()
+    executor.shutdown()
+
+    assert stats["running"] == 0
+    assert stats["queued"] == 0
@@ -1,7 +1,7 @@
 """Tests for RAG API routes."""
 
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
 from fastapi.testclient import TestClient
 from fastapi import Request
 from pathlib import Path
@@ -9,19 +9,29 @@ from pathlib import Path
 from src.main import app
 from src.routes import rag
 from src.config import Settings
+from src.services.document_processor import Chunk
+from src.services.ingestion_jobs import IngestionJob, IngestionJobManager
 from src.middleware.localhost import require_localhost
 
 
 @pytest.fixture
-def mock_rag_service():
+def mock_rag_service(tmp_path):
     """Mock RAG service."""
     service = Mock()
-    service.config = Settings()
+    # Ingestion manifest lives in the Chroma directory; keep it out of ./data
+    service.config = Settings(
+        CHROMA_PERSIST_DIR=str(tmp_path / "chroma"),
+        INGEST_WORKERS=1,  # Chunk in-process with the mocked document processor
+        INGEST_EMBED_BATCH_SIZE=1  # One embedding batch per file
+    )
     service.get_stats = Mock(return_value={
         "collection_name": "pet_knowledge",
         "document_count": 10
     })
     service.add_documents = Mock(return_value=5)
+    service.delete_chunks = Mock(side_effect=lambda ids: len(ids))
+    service.build_breed_context_table = AsyncMock(return_value=0)
+    service.executor = Mock(in_flight=0)  # No queries competing with ingestion
     return service
 
 
@@ -61,6 +71,9 @@ def client(mock_rag_service, mock_document_processor):
     """Create test client with mocked services."""
     rag.rag_service = mock_rag_service
     rag.document_processor = mock_document_processor
+    rag.ingestion_jobs = IngestionJobManager(mock_rag_service.config)
+    rag.ingestion_jobs.register("initialize", rag.run_initialize_job)
+    rag.ingestion_jobs.register("ingest", rag.run_ingest_job)
     return TestClient(app)
 
 
@@ -155,7 +168,7 @@ class TestInitializeEndpoint:
         # Mock add_documents to return different counts
         mock_rag_service.add_documents.side_effect = [5, 4, 3]
 
-        response = client_localhost.post("/api/v1/admin/rag/initialize")
+        response = client_localhost.post("/api/v1/admin/rag/initialize?wait=true")
 
         assert response.status_code == 200
         data = response.json()
@@ -167,6 +180,9 @@ class TestInitializeEndpoint:
         assert data["data"]["files_skipped"] == 0
         assert len(data["data"]["errors"]) == 0
 
+        # Breed context table is rebuilt once, after all files are ingested
+        mock_rag_service.build_breed_context_table.assert_awaited_once()
+
     def test_initialize_with_errors(self, client_localhost, mock_rag_service, mock_document_processor, tmp_path):
         """Test initialization handles errors gracefully."""
         kb_dir = tmp_path / "knowledge_base"
@@ -184,7 +200,7 @@ class TestInitializeEndpoint:
             ValueError("Invalid frontmatter")  # Error
         ]
 
-        response = client_localhost.post("/api/v1/admin/rag/initialize")
+        response = client_localhost.post("/api/v1/admin/rag/initialize?wait=true")
 
         assert response.status_code == 200
         data = response.json()
@@ -239,7 +255,7 @@ class TestInitializeEndpoint:
         mock_rag_service.config.KNOWLEDGE_BASE_DIR = str(kb_dir)
         mock_rag_service.add_documents.return_value = 2
 
-        response = client_localhost.post("/api/v1/admin/rag/initialize")
+        response = client_localhost.post("/api/v1/admin/rag/initialize?wait=true")
 
         assert response.status_code == 200
         data = response.json()
@@ -261,10 +277,233 @@ class TestInitializeEndpoint:
         mock_rag_service.config.KNOWLEDGE_BASE_DIR = str(kb_dir)
         mock_rag_service.add_documents.return_value = 3
 
-        response = client_localhost.post("/api/v1/admin/rag/initialize")
+        response = client_localhost.post("/api/v1/admin/rag/initialize?wait=true")
 
         assert response.status_code == 200
         data = response.json()
 
         # Should only process the .md file
         assert data["data"]["files_processed"] == 1
+
+    def test_initialize_is_incremental(self, client_localhost, mock_rag_service, mock_document_processor, tmp_path):
+        """Test re-initializing only re-ingests changed files and removes deleted ones."""
+        kb_dir = tmp_path / "knowledge_base"
+        kb_dir.mkdir()
+        (kb_dir / "beagle.md").write_text("# Beagle\nScent hound.")
+        (kb_dir / "poodle.md").write_text("# Poodle\nIntelligent dog.")
+        (kb_dir / "pug.md").write_text("# Pug\nCompact dog.")
+
+        mock_rag_service.config.KNOWLEDGE_BASE_DIR = str(kb_dir)
+        mock_document_processor.process.side_effect = lambda content, metadata: [
+            Chunk(content=content, metadata={**metadata, "chunk_index": 0})
+        ]
+
+        first = client_localhost.post("/api/v1/admin/rag/initialize?wait=true").json()["data"]
+        assert first["files_processed"] == 3
+
+        # Unchanged KB: nothing is re-embedded
+        mock_rag_service.add_documents.reset_mock()
+        second = client_localhost.post("/api/v1/admin/rag/initialize?wait=true").json()["data"]
+        assert second["files_processed"] == 0
+        assert second["files_unchanged"] == 3
+        mock_rag_service.add_documents.assert_not_called()
+
+        # One file changed, one removed
+        (kb_dir / "beagle.md").write_text("# Beagle\nScent hound with a loud bay.")
+        (kb_dir / "pug.md").unlink()
+        third = client_localhost.post("/api/v1/admin/rag/initialize?wait=true").json()["data"]
+
+        assert third["files_processed"] == 1
+        assert third["files_unchanged"] == 1
+        assert third["files_removed"] == 1
+        assert third["chunks_deleted"] == 2  # Old beagle chunk + pug chunk
+        assert mock_rag_service.add_documents.call_count == 1
+
+    def test_initialize_batches_chunks_across_files(self, client_localhost, mock_rag_service, mock_document_processor, tmp_path):
+        """Test chunks from several files are embedded and upserted in one batch."""
+        kb_dir = tmp_path / "knowledge_base"
+        kb_dir.mkdir()
+        for name in ["beagle", "poodle", "pug"]:
+            (kb_dir / f"{name}.md").write_text(f"# {name}\nContent")
+
+        mock_rag_service.config.KNOWLEDGE_BASE_DIR = str(kb_dir)
+        mock_rag_service.config.INGEST_EMBED_BATCH_SIZE = 100
+        mock_rag_service.add_documents.return_value = 6
+
+        response = client_localhost.post("/api/v1/admin/rag/initialize?wait=true")
+
+        data = response.json()["data"]
+        assert data["files_processed"] == 3
+        assert data["total_chunks_created"] == 6
+        mock_rag_service.add_documents.assert_called_once()
+        assert len(mock_rag_service.add_documents.call_args[0][0]) == 6  # 2 chunks x 3 files
+
+    def test_initialize_returns_job(self, client_localhost, mock_rag_service, tmp_path):
+        """Test initialize without wait returns 202 with a pollable job id."""
+        kb_dir = tmp_path / "knowledge_base"
+        kb_dir.mkdir()
+        mock_rag_service.config.KNOWLEDGE_BASE_DIR = str(kb_dir)
+
+        response = client_localhost.post("/api/v1/admin/rag/initialize")
+
+        assert response.status_code == 202
+        job = response.json()["data"]
+        assert job["kind"] == "initialize"
+        assert job["status"] in ("queued", "running", "completed")
+
+        poll = client_localhost.get(f"/api/v1/admin/rag/jobs/{job['job_id']}")
+        assert poll.status_code == 200
+        assert poll.json()["data"]["job_id"] == job["job_id"]
+
+    def test_unknown_job_not_found(self, client_localhost):
+        """Test polling an unknown job id returns 404."""
+        response = client_localhost.get("/api/v1/admin/rag/jobs/does-not-exist")
+
+        assert response.status_code == 404
+        assert response.json()["detail"]["error"]["code"] == "JOB_NOT_FOUND"
+
+    def test_cancel_queued_job(self, client_localhost, mock_rag_service, tmp_path):
+        """Test cancelling a job that has not started drops it from the queue."""
+        rag.ingestion_jobs._save(IngestionJob(job_id="queued-job"))
+
+        response = client_localhost.post("/api/v1/admin/rag/jobs/queued-job/cancel")
+
+        assert response.status_code == 200
+        assert response.json()["data"]["status"] == "cancelled"
+        assert rag.ingestion_jobs.get("queued-job").status == "cancelled"
+
+    def test_cancel_finished_job_conflicts(self, client_localhost):
+        """Test cancelling a completed job returns 409."""
+        rag.ingestion_jobs._save(IngestionJob(job_id="done-job", status="completed"))
+
+        response = client_localhost.post("/api/v1/admin/rag/jobs/done-job/cancel")
+
+        assert response.status_code == 409
+        assert response.json()["detail"]["error"]["code"] == "JOB_FINISHED"
+
+    def test_cancel_unknown_job_not_found(self, client_localhost):
+        """Test cancelling an unknown job id returns 404."""
+        response = client_localhost.post("/api/v1/admin/rag/jobs/does-not-exist/cancel")
+
+        assert response.status_code == 404
+
+    def test_list_jobs(self, client_localhost):
+        """Test listing returns jobs oldest first."""
+        rag.ingestion_jobs._save(IngestionJob(job_id="a", status="completed", created_at="2026-01-01T00:00:00Z"))
+        rag.ingestion_jobs._save(IngestionJob(job_id="b", status="completed", created_at="2026-01-02T00:00:00Z"))
+
+        response = client_localhost.get("/api/v1/admin/rag/jobs")
+
+        assert response.status_code == 200
+        assert [j["job_id"] for j in response.json()["data"]] == ["a", "b"]
+
+
+class TestIngestEndpoint:
+    """Test single-document ingestion through the job queue."""
+
+    def test_ingest_wait_returns_stats(self, client, mock_rag_service):
+        """Test ingest with wait=true runs the job and returns chunk stats."""
+        response = client.post(
+            "/api/v1/rag/ingest?wait=true",
+            json={"content": "# Beagle\nScent hound.", "source_name": "breeds/beagle.md"}
+        )
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["chunks_created"] == 5
+        assert data["document_id"] == "breeds_beagle_md"
+        mock_rag_service.build_breed_context_table.assert_awaited_once()
+
+    def test_ingest_returns_job(self, client):
+        """Test ingest without wait returns 202 with a pollable job."""
+        response = client.post(
+            "/api/v1/rag/ingest",
+            json={"content": "# Beagle\nScent hound.", "source_name": "breeds/beagle.md"}
+        )
+
+        assert response.status_code == 202
+        job = response.json()["data"]
+        assert job["kind"] == "ingest"
+        assert "payload" not in job
+
+    def test_ingest_invalid_document(self, client, mock_document_processor):
+        """Test a document the processor rejects fails the job with 422."""
+        mock_document_processor.process.side_effect = ValueError("Document is empty")
+
+        response = client.post(
+            "/api/v1/rag/ingest?wait=true",
+            json={"content": "   ", "source_name": "empty.md"}
+        )
+
+        assert response.status_code == 422
+        assert response.json()["detail"]["error"]["code"] == "INVALID_DOCUMENT"
+
+
+class TestQueryStreamEndpoint:
+    """Test the server-sent events variant of /query."""
+
+    @staticmethod
+    def _events(response):
+        """Parse SSE frames into (event, data) pairs."""
+        import json
+
+        events = []
+        for frame in response.text.strip().split("\n\n"):
+            event_line, data_line = frame.split("\n")
+            events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+        return events
+
+    def test_streams_sources_then_tokens(self, client, mock_rag_service):
+        """Test sources arrive before answer tokens, followed by the full response."""
+        from src.services.rag_service import RAGResponse, Source
+
+        sources = [Source(content="Beagles need walks.", source_file="beagle.md", relevance_score=0.8)]
+
+        async def query_stream(**kwargs):
+            yield "sources", sources
+            yield "token", "Walk them "
+            yield "token", "daily."
+            yield "complete", RAGResponse(answer="Walk them daily.", sources=sources, model="test-model")
+
+        mock_rag_service.query_stream = query_stream
+
+        response = client.post("/api/v1/rag/query/stream", json={"question": "Beagle exercise?"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = self._events(response)
+        assert [event for event, _ in events] == ["sources", "token", "token", "complete"]
+        assert events[0][1][0]["source_file"] == "beagle.md"
+        assert events[3][1]["answer"] == "Walk them daily."
+
+    def test_ollama_failure_emits_error_event(self, client, mock_rag_service):
+        """Test a generation failure mid-stream ends with an error event."""
+        async def query_stream(**kwargs):
+            yield "sources", []
+            raise ConnectionError("Ollama service unavailable")
+
+        mock_rag_service.query_stream = query_stream
+
+        response = client.post("/api/v1/rag/query/stream", json={"question": "Beagle exercise?"})
+
+        events = self._events(response)
+        assert events[-1] == ("error", {
+            "code": "RAG_SERVICE_UNAVAILABLE",
+            "message": "RAG service temporarily unavailable"
+        })
+
+
+class TestQueryBusy:
+    """Test fast rejection when the Ollama scheduler queue is full."""
+
+    def test_query_returns_retry_after(self, client, mock_rag_service):
+        """Test a rejected query is a 503 carrying the Retry-After hint."""
+        from src.services.ollama_scheduler import OllamaBusy, INTERACTIVE
+
+        mock_rag_service.query = AsyncMock(side_effect=OllamaBusy(INTERACTIVE, 12))
+
+        response = client.post("/api/v1/rag/query", json={"question": "Beagle exercise?"})
+
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == "12"
+        assert response.json()["detail"]["error"]["code"] == "RAG_SERVICE_BUSY"
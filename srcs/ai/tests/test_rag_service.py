@@ -1,3 +1,4 @@
+import time
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
 
@@ -151,3 +152,121 @@ async def test_get_crossbreed_context_extracts_source_file_from_metadata(rag_ser
     assert "breeds/dogs/golden_retriever.md" in result["sources"]
     assert "breeds/dogs/poodle.md" in result["sources"]
     assert "unknown" not in result["sources"]
+
+
+@pytest.mark.asyncio
+async def test_get_crossbreed_context_queries_parents_concurrently(rag_service):
+    """Test parent retrievals overlap and keep parent order in the combined context."""
+    def slow_query(query_embeddings, n_results, where=None):
+        time.sleep(0.2)
+        breed = query_embeddings[0]
+        return {
+            "documents": [[f"{breed} facts"]],
+            "metadatas": [[{"source_file": f"{breed}.md"}]]
+        }
+
+    # Embedding is the query text itself so each lookup is distinguishable
+    rag_service.embedder.embed = Mock(side_effect=lambda text: text.split(" breed")[0])
+    rag_service._collection.query = Mock(side_effect=slow_query)
+
+    started = time.perf_counter()
+    result = await rag_service.get_crossbreed_context(["Golden Retriever", "Poodle", "Beagle"])
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.5  # Sequential would take at least 0.6s
+    assert result["description"] == "Golden Retriever facts Poodle facts Beagle facts"
+
+    stats = rag_service.get_retrieval_stats()
+    assert stats["parallel_retrievals"] == 1
+    assert stats["time_saved_ms_total"] > 0
+
+
+@pytest.mark.asyncio
+async def test_warm_breed_queries_uses_breed_context_template(rag_service):
+    """Test warm-up texts match the queries get_breed_context issues."""
+    rag_service.embedder.warm = Mock(return_value=2)
+
+    warmed = await rag_service.warm_breed_queries(["golden_retriever", "maine_coon"])
+
+    assert warmed == 2
+    rag_service.embedder.warm.assert_called_once_with([
+        "Golden Retriever breed characteristics health care requirements",
+        "Maine Coon breed characteristics health care requirements"
+    ])
+
+
+def test_add_documents_upserts_stable_ids(rag_service):
+    """Test chunk ids depend only on content and position, so re-adding is idempotent."""
+    from src.services.document_processor import Chunk
+
+    chunks = [
+        Chunk(content="Beagles are scent hounds.", metadata={"source_file": "beagle.md", "chunk_index": 0}),
+        Chunk(content="They need daily walks.", metadata={"source_file": "beagle.md", "chunk_index": 1})
+    ]
+    rag_service.embedder.embed_batch = Mock(return_value=[[0.1], [0.2]])
+    rag_service._collection.upsert = Mock()
+
+    rag_service.add_documents(chunks)
+    rag_service.add_documents(chunks)
+
+    first_ids = rag_service._collection.upsert.call_args_list[0][1]["ids"]
+    second_ids = rag_service._collection.upsert.call_args_list[1][1]["ids"]
+    assert first_ids == second_ids
+    assert len(set(first_ids)) == 2
+
+
+@pytest.mark.asyncio
+async def test_breed_context_filters_by_breed_key_first(rag_service):
+    """Test breed context searches the breed's own chunks before the whole collection."""
+    def query(query_embeddings, n_results, where=None):
+        documents = ["Yorkie grooming"] if where == {"breed_key": "yorkshire_terrier"} else []
+        return {"documents": [documents], "metadatas": [[{"source_file": "yorkie.md"}] * len(documents)]}
+
+    rag_service.embedder.embed = Mock(return_value=[0.1])
+    rag_service._collection.query = Mock(side_effect=query)
+
+    result = await rag_service.get_breed_context("Yorkshire Terrier")
+
+    assert result["description"] == "Yorkie grooming"
+    assert rag_service._collection.query.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_breed_context_falls_back_without_breed_chunks(rag_service):
+    """Test a breed with no chunks of its own gets the best matches from any document."""
+    def query(query_embeddings, n_results, where=None):
+        documents = [] if where else ["General dog care"]
+        return {"documents": [documents], "metadatas": [[{"source_file": "care.md"}] * len(documents)]}
+
+    rag_service.embedder.embed = Mock(return_value=[0.1])
+    rag_service._collection.query = Mock(side_effect=query)
+
+    result = await rag_service.get_breed_context("basenji")
+
+    assert result["description"] == "General dog care"
+    assert [call.kwargs.get("where") for call in rag_service._collection.query.call_args_list] == [
+        {"breed_key": "basenji"}, None
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_stream_sends_sources_before_tokens(rag_service):
+    """Test streamed queries yield sources, then answer fragments, then the full response."""
+    async def generate_stream(prompt, priority):
+        for token in ["Walk ", "daily."]:
+            yield token
+
+    rag_service.embedder.embed = Mock(return_value=[0.1])
+    rag_service.ollama.generate_stream = generate_stream
+    rag_service._collection.query = Mock(return_value={
+        "ids": [["a"]],
+        "documents": [["Beagles need exercise."]],
+        "metadatas": [[{"source_file": "beagle.md"}]],
+        "distances": [[0.2]]
+    })
+
+    events = [event async for event in rag_service.query_stream("Beagle exercise?", mode="vector")]
+
+    assert [event for event, _ in events] == ["sources", "token", "token", "complete"]
+    assert events[0][1][0].source_file == "beagle.md"
+    assert events[-1][1].answer == "Walk daily."
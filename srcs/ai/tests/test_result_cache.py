@@ -0,0 +1,102 @@
+import base64
+import pytest
+from unittest.mock import AsyncMock, Mock, patch
+
+from src.services.result_cache import AnalysisResultCache, image_digest
+from src.config import Settings
+
+
+def make_image(payload: bytes) -> str:
+    """Build a data URI for raw bytes."""
+    return "data:image/jpeg;base64," + base64.b64encode(payload).decode()
+
+
+@pytest.fixture
+def settings():
+    """Create settings for an in-process-only cache."""
+    return Settings(REDIS_URL="", RESULT_CACHE_TTL_SECONDS=60, RESULT_CACHE_MAX_ENTRIES=2)
+
+
+@pytest.fixture
+def sample_result():
+    """Sample analysis result."""
+    return {"species": "dog", "breed_analysis": {"primary_breed": "beagle"}}
+
+
+def test_digest_ignores_data_uri_prefix():
+    """Test the key depends on image bytes, not on the URI header."""
+    raw = base64.b64encode(b"image-bytes").decode()
+    assert image_digest(f"data:image/jpeg;base64,{raw}") == image_digest(raw)
+    assert image_digest(raw) != image_digest(base64.b64encode(b"other").decode())
+
+
+@pytest.mark.asyncio
+async def test_miss_then_hit(settings, sample_result):
+    """Test a stored result is returned for the same image."""
+    cache = AnalysisResultCache(settings)
+    image = make_image(b"pet")
+
+    assert await cache.get(image) is None
+    await cache.set(image, sample_result)
+    assert await cache.get(image) == sample_result
+
+    stats = cache.get_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["backend"] == "memory"
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction(settings, sample_result):
+    """Test least recently used entries are evicted past max entries."""
+    cache = AnalysisResultCache(settings)
+    first, second, third = make_image(b"1"), make_image(b"2"), make_image(b"3")
+
+    await cache.set(first, sample_result)
+    await cache.set(second, sample_result)
+    await cache.get(first)  # first is now most recently used
+    await cache.set(third, sample_result)
+
+    assert await cache.get(first) is not None
+    assert await cache.get(second) is None
+    assert await cache.get(third) is not None
+
+
+@pytest.mark.asyncio
+async def test_ttl_expiry(settings, sample_result):
+    """Test entries expire after the TTL."""
+    cache = AnalysisResultCache(settings)
+    image = make_image(b"pet")
+
+    with patch("src.services.result_cache.time.monotonic", return_value=1000.0):
+        await cache.set(image, sample_result)
+    with patch("src.services.result_cache.time.monotonic", return_value=1061.0):
+        assert await cache.get(image) is None
+
+
+@pytest.mark.asyncio
+async def test_redis_shared_level(settings, sample_result):
+    """Test a result stored by another worker is read from Redis."""
+    redis_client = Mock()
+    redis_client.get = AsyncMock(return_value='{"species": "cat"}')
+    redis_client.set = AsyncMock()
+    cache = AnalysisResultCache(settings, redis_client=redis_client)
+
+    assert await cache.get(make_image(b"pet")) == {"species": "cat"}
+
+    await cache.set(make_image(b"other"), sample_result)
+    assert redis_client.set.call_args[1]["ex"] == 60
+
+
+@pytest.mark.asyncio
+async def test_redis_failure_falls_back_to_memory(settings, sample_result):
+    """Test Redis errors don't break caching."""
+    redis_client = Mock()
+    redis_client.get = AsyncMock(side_effect=ConnectionError("redis down"))
+    redis_client.set = AsyncMock(side_effect=ConnectionError("redis down"))
+    cache = AnalysisResultCache(settings, redis_client=redis_client)
+    image = make_image(b"pet")
+
+    await cache.set(image, sample_result)
+    assert await cache.get(image) == sample_result
+    assert cache.get_stats()["redis_errors"] == 1
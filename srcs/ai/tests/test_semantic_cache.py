@@ -0,0 +1,119 @@
+import pytest
+from unittest.mock import Mock, AsyncMock, patch
+
+from src.services.semantic_cache import SemanticAnswerCache
+from src.services.rag_service import RAGService
+from src.config import Settings
+
+
+@pytest.fixture
+def settings():
+    """Settings with a small semantic cache."""
+    return Settings(SEMANTIC_CACHE_THRESHOLD=0.9, SEMANTIC_CACHE_MAX_ENTRIES=2, SEMANTIC_CACHE_TTL_SECONDS=60)
+
+
+@pytest.fixture
+def cache(settings):
+    """Semantic answer cache."""
+    return SemanticAnswerCache(settings)
+
+
+def test_similar_question_over_same_chunks_hits(cache):
+    """Test a near-identical embedding with the same chunk set returns the answer."""
+    cache.put([1.0, 0.0], ["a", "b"], None, 5, "hybrid", "Walk them daily.")
+
+    assert cache.get([0.99, 0.05], ["b", "a"], None, 5, "hybrid") == "Walk them daily."
+    assert cache.get_stats()["hits"] == 1
+
+
+def test_dissimilar_question_misses(cache):
+    """Test an embedding below the similarity threshold misses."""
+    cache.put([1.0, 0.0], ["a"], None, 5, "hybrid", "answer")
+
+    assert cache.get([0.5, 0.9], ["a"], None, 5, "hybrid") is None
+
+
+def test_changed_chunks_or_scope_miss(cache):
+    """Test a different chunk set, filter, top_k or mode never reuses an answer."""
+    cache.put([1.0, 0.0], ["a"], {"species": "dog"}, 5, "hybrid", "answer")
+
+    assert cache.get([1.0, 0.0], ["a", "c"], {"species": "dog"}, 5, "hybrid") is None
+    assert cache.get([1.0, 0.0], ["a"], {"species": "cat"}, 5, "hybrid") is None
+    assert cache.get([1.0, 0.0], ["a"], {"species": "dog"}, 3, "hybrid") is None
+    assert cache.get([1.0, 0.0], ["a"], {"species": "dog"}, 5, "vector") is None
+
+
+def test_expired_entries_miss(settings):
+    """Test entries past their TTL are dropped."""
+    settings.SEMANTIC_CACHE_TTL_SECONDS = -1
+    cache = SemanticAnswerCache(settings)
+    cache.put([1.0, 0.0], ["a"], None, 5, "hybrid", "answer")
+
+    assert cache.get([1.0, 0.0], ["a"], None, 5, "hybrid") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_evicted(cache):
+    """Test the cache stays within max_entries, evicting the least recently used."""
+    cache.put([1.0, 0.0], ["a"], None, 5, "hybrid", "first")
+    cache.put([0.0, 1.0], ["b"], None, 5, "hybrid", "second")
+    cache.get([1.0, 0.0], ["a"], None, 5, "hybrid")
+    cache.put([1.0, 1.0], ["c"], None, 5, "hybrid", "third")
+
+    assert cache.get([1.0, 0.0], ["a"], None, 5, "hybrid") == "first"
+    assert cache.get([0.0, 1.0], ["b"], None, 5, "hybrid") is None
+    assert len(cache) == 2
+
+
+@pytest.fixture
+def rag_service(settings, cache):
+    """RAG service over a mocked collection that always retrieves chunks a and b."""
+    embedder = Mock()
+    embedder.embed = Mock(return_value=[0.1] * 384)
+    ollama = Mock()
+    ollama.generate = AsyncMock(return_value="Walk them daily.")
+    with patch('chromadb.PersistentClient'):
+        service = RAGService(settings, embedder, ollama, answer_cache=cache)
+    service._collection.query = Mock(return_value={
+        "ids": [["a", "b"]],
+        "documents": [["Beagles need exercise.", "Beagles love walks."]],
+        "metadatas": [[{"source_file": "beagle.md"}, {"source_file": "beagle.md"}]],
+        "distances": [[0.2, 0.3]]
+    })
+    return service
+
+
+@pytest.mark.asyncio
+async def test_repeated_query_skips_generation(rag_service):
+    """Test the second identical question is answered from the cache."""
+    first = await rag_service.query("How much exercise does a beagle need?", mode="vector")
+    second = await rag_service.query("How much exercise does a beagle need?", mode="vector")
+
+    assert second.answer == first.answer
+    assert len(second.sources) == 2
+    rag_service.ollama.generate.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_question_embedded_once_for_search_and_cache(rag_service):
+    """Test the query embedding used for the vector search is reused for the cache lookup."""
+    rag_service.executor.run = AsyncMock(side_effect=lambda fn, *args: fn(*args))
+
+    await rag_service.query("How much exercise does a beagle need?", mode="vector")
+
+    rag_service.embedder.embed.assert_called_once_with("How much exercise does a beagle need?")
+    assert rag_service.executor.run.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_add_documents_invalidates_cache(rag_service):
+    """Test modifying the collection forces the next query to regenerate."""
+    from src.services.document_processor import Chunk
+
+    await rag_service.query("How much exercise does a beagle need?", mode="vector")
+    rag_service.embedder.embed_batch = Mock(return_value=[[0.1]])
+    rag_service.add_documents([Chunk(content="Beagles are scent hounds.", metadata={"source_file": "beagle.md"})])
+    await rag_service.query("How much exercise does a beagle need?", mode="vector")
+
+    assert rag_service.ollama.generate.await_count == 2
+    assert rag_service.answer_cache.get_stats()["invalidations"] == 1
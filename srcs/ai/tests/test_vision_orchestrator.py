@@ -29,6 +29,7 @@ def mock_config():
     config = Mock()
     config.SPECIES_MIN_CONFIDENCE = 0.10
     config.BREED_MIN_CONFIDENCE = 0.05
+    config.CLASSIFICATION_FUSED_PIPELINE = False
     return config
 
 
@@ -329,3 +330,168 @@ async def test_cat_species_pipeline(mock_classification, mock_ollama, mock_rag,
     # Verify breed detection called with species="cat"
     call_args = mock_classification.detect_breed.call_args
     assert call_args[0][1] == "cat"
+
+
+@pytest.mark.asyncio
+async def test_fused_pipeline_single_classification_call(mock_classification, mock_ollama, mock_rag, mock_config):
+    """Test fused mode makes one classification call instead of three."""
+    mock_config.CLASSIFICATION_FUSED_PIPELINE = True
+    mock_classification.classify_pipeline = AsyncMock(return_value={
+        "content": {"is_safe": True, "nsfw_probability": 0.02},
+        "species": {"species": "dog", "confidence": 0.87},
+        "breed": {
+            "breed_analysis": {
+                "primary_breed": "golden_retriever",
+                "confidence": 0.89,
+                "is_likely_crossbreed": False,
+                "breed_probabilities": [],
+                "crossbreed_analysis": None
+            }
+        },
+        "stopped_at": None
+    })
+    mock_classification.check_content = AsyncMock()
+    mock_rag.get_breed_context = AsyncMock(return_value=None)
+    mock_ollama.analyze_with_context = AsyncMock(return_value={
+        "description": "Golden Retriever in good condition",
+        "traits": {"size": "large", "energy_level": "medium", "temperament": "friendly"},
+        "health_observations": []
+    })
+
+    orchestrator = VisionOrchestrator(mock_classification, mock_ollama, mock_rag, mock_config)
+
+    result = await orchestrator.analyze_image("data:image/jpeg;base64,test123")
+
+    assert result["species"] == "dog"
+    assert result["breed_analysis"]["primary_breed"] == "golden_retriever"
+    mock_classification.classify_pipeline.assert_called_once()
+    assert mock_classification.classify_pipeline.call_args[1]["species_min_confidence"] == 0.10
+    mock_classification.check_content.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_classification_uses_thumbnail(mock_classification, mock_ollama, mock_rag, mock_config):
+    """Test stages 1-3 get the classification thumbnail and Ollama the VLM image."""
+    mock_config.CLASSIFICATION_FUSED_PIPELINE = True
+    mock_classification.classify_pipeline = AsyncMock(return_value={
+        "content": {"is_safe": True, "nsfw_probability": 0.02},
+        "species": {"species": "cat", "confidence": 0.9},
+        "breed": {
+            "breed_analysis": {
+                "primary_breed": "persian",
+                "confidence": 0.8,
+                "is_likely_crossbreed": False,
+                "breed_probabilities": [],
+                "crossbreed_analysis": None
+            }
+        },
+        "stopped_at": None
+    })
+    mock_rag.get_breed_context = AsyncMock(return_value=None)
+    mock_ollama.analyze_with_context = AsyncMock(return_value={
+        "description": "Persian cat",
+        "traits": {"size": "medium", "energy_level": "low", "temperament": "calm"},
+        "health_observations": []
+    })
+
+    orchestrator = VisionOrchestrator(mock_classification, mock_ollama, mock_rag, mock_config)
+
+    await orchestrator.analyze_image("data:image/jpeg;base64,large", classification_image="data:image/jpeg;base64,small")
+
+    assert mock_classification.classify_pipeline.call_args[0][0] == "data:image/jpeg;base64,small"
+    assert mock_ollama.analyze_with_context.call_args[1]["image_base64"] == "data:image/jpeg;base64,large"
+
+
+@pytest.mark.asyncio
+async def test_fused_pipeline_early_exit_rejections(mock_classification, mock_ollama, mock_rag, mock_config):
+    """Test fused mode maps early-exit results to the same rejection codes."""
+    mock_config.CLASSIFICATION_FUSED_PIPELINE = True
+    orchestrator = VisionOrchestrator(mock_classification, mock_ollama, mock_rag, mock_config)
+
+    mock_classification.classify_pipeline = AsyncMock(return_value={
+        "content": {"is_safe": False, "nsfw_probability": 0.91},
+        "species": None,
+        "breed": None,
+        "stopped_at": "content"
+    })
+    with pytest.raises(ValueError, match="CONTENT_POLICY_VIOLATION"):
+        await orchestrator.analyze_image("data:image/jpeg;base64,test123")
+
+    mock_classification.classify_pipeline = AsyncMock(return_value={
+        "content": {"is_safe": True, "nsfw_probability": 0.01},
+        "species": {"species": "rabbit", "confidence": 0.92},
+        "breed": None,
+        "stopped_at": "species"
+    })
+    with pytest.raises(ValueError, match="UNSUPPORTED_SPECIES"):
+        await orchestrator.analyze_image("data:image/jpeg;base64,test123")
+
+
+@pytest.mark.asyncio
+async def test_result_cache_hit_skips_pipeline(mock_classification, mock_ollama, mock_rag, mock_config):
+    """Test a cached result is returned without calling any service."""
+    cached = {"species": "dog", "breed_analysis": {"primary_breed": "beagle"}}
+    result_cache = Mock()
+    result_cache.get = AsyncMock(return_value=cached)
+    mock_classification.check_content = AsyncMock()
+    mock_ollama.analyze_with_context = AsyncMock()
+
+    orchestrator = VisionOrchestrator(
+        mock_classification, mock_ollama, mock_rag, mock_config, result_cache=result_cache
+    )
+
+    result = await orchestrator.analyze_image("data:image/jpeg;base64,test123")
+
+    assert result == cached
+    mock_classification.check_content.assert_not_called()
+    mock_ollama.analyze_with_context.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_pipeline_event_order(mock_classification, mock_ollama, mock_rag, mock_config):
+    """Test streaming emits classification, enrichment, tokens, then the full result."""
+    mock_classification.check_content = AsyncMock(return_value={"is_safe": True})
+    mock_classification.detect_species = AsyncMock(return_value={"species": "dog", "confidence": 0.9})
+    mock_classification.detect_breed = AsyncMock(return_value={
+        "breed_analysis": {
+            "primary_breed": "beagle",
+            "confidence": 0.8,
+            "is_likely_crossbreed": False,
+            "breed_probabilities": [{"breed": "beagle", "probability": 0.8}],
+            "crossbreed_analysis": None
+        }
+    })
+    mock_rag.get_breed_context = AsyncMock(return_value={"breed": "Beagle", "sources": ["akc.md"]})
+
+    async def fake_stream(**kwargs):
+        yield "token", '{"description": '
+        yield "token", '"Happy beagle"}'
+        yield "analysis", {"description": "Happy beagle", "traits": {}, "health_observations": []}
+
+    mock_ollama.analyze_with_context_stream = fake_stream
+
+    orchestrator = VisionOrchestrator(mock_classification, mock_ollama, mock_rag, mock_config)
+
+    events = [event async for event in orchestrator.analyze_image_stream("data:image/jpeg;base64,test123")]
+
+    assert [name for name, _ in events] == ["classification", "enrichment", "token", "token", "complete"]
+    assert events[0][1]["breed_analysis"]["primary_breed"] == "beagle"
+    assert events[1][1]["enriched_info"]["breed"] == "Beagle"
+    assert events[2][1] == {"content": '{"description": '}
+    assert events[-1][1]["description"] == "Happy beagle"
+    assert events[-1][1]["species"] == "dog"
+
+
+@pytest.mark.asyncio
+async def test_stream_pipeline_rejection_raises(mock_classification, mock_ollama, mock_rag, mock_config):
+    """Test validation failures surface from the stream before any event."""
+    mock_classification.check_content = AsyncMock(return_value={
+        "is_safe": False,
+        "nsfw_probability": 0.95
+    })
+
+    orchestrator = VisionOrchestrator(mock_classification, mock_ollama, mock_rag, mock_config)
+
+    with pytest.raises(ValueError, match="CONTENT_POLICY_VIOLATION"):
+        async for _ in orchestrator.analyze_image_stream("data:image/jpeg;base64,test123"):
+            pass
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""Benchmark classifier forward-pass latency: eager torch vs onnxruntime.
+
+Times ClassifierRuntime.logits on preprocessed batches (preprocessing is
+the same for both backends and excluded) for each batch size, and for
+onnxruntime at each intra-op thread count. Models must be exported first
+(python -m scripts.export_onnx).
+
+Usage (from srcs/classification-service, or /app in the container):
+    python -m scripts.bench_inference [--models nsfw species] [--batch-sizes 1,8] [--threads 0,1,4] [--runs N]
+"""
+
+import argparse
+import statistics
+import time
+
+import torch
+from PIL import Image
+from transformers import AutoImageProcessor
+
+from src.config import settings
+from src.models.inference import ClassifierRuntime
+
+MODELS = {
+    "nsfw": settings.NSFW_MODEL,
+    "species": settings.SPECIES_MODEL,
+    "dog_breed": settings.DOG_BREED_MODEL,
+    "cat_breed": settings.CAT_BREED_MODEL
+}
+
+
+def time_runtime(runtime: ClassifierRuntime, pixel_values: torch.Tensor, runs: int) -> tuple:
+    """Median and p95 latency in ms over `runs` forward passes, after a warm-up."""
+    for _ in range(3):
+        runtime.logits(pixel_values)
+    latencies = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        runtime.logits(pixel_values)
+        latencies.append((time.perf_counter() - started) * 1000)
+    latencies.sort()
+    return statistics.median(latencies), latencies[int(0.95 * (len(latencies) - 1))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--batch-sizes", default="1,8", help="Comma-separated batch sizes")
+    parser.add_argument("--threads", default="0,1,4", help="Comma-separated ONNX intra-op thread counts (0 = default)")
+    parser.add_argument("--torch-threads", type=int, default=0, help="torch.set_num_threads (0 = leave default)")
+    parser.add_argument("--onnx-dir", default=settings.ONNX_MODEL_DIR)
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    if args.torch_threads:
+        torch.set_num_threads(args.torch_threads)
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+    thread_counts = [int(threads) for threads in args.threads.split(",")]
+    print(f"CPU inference, torch {torch.__version__} ({torch.get_num_threads()} threads), {args.runs} runs each")
+
+    for name in args.models:
+        model_id = MODELS[name]
+        processor = AutoImageProcessor.from_pretrained(model_id)
+        runtimes = [("torch", ClassifierRuntime(model_id, device="cpu"))]
+        runtimes += [
+            (f"onnx/{threads or 'default'}", ClassifierRuntime(
+                model_id, device="cpu", backend="onnx", onnx_dir=args.onnx_dir, intra_op_threads=threads
+            ))
+            for threads in thread_counts
+        ]
+
+        print(f"{name} ({model_id}):")
+        for batch_size in batch_sizes:
+            images = [Image.new("RGB", (640, 480), (i * 20 % 255, 120, 80)) for i in range(batch_size)]
+            pixel_values = processor(images=images, return_tensors="pt")["pixel_values"]
+            for label, runtime in runtimes:
+                p50, p95 = time_runtime(runtime, pixel_values, args.runs)
+                print(
+                    f"  batch {batch_size:>2}  {label:<14} p50 {p50:>8.2f} ms  p95 {p95:>8.2f} ms  "
+                    f"{p50 / batch_size:>7.2f} ms/image"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Benchmark /classify/pipeline request encodings: base64 JSON vs raw bytes vs multipart.
+
+Runs the real route (body parsing, validation, image decode) against stub
+models in-process over ASGI, so the numbers are the transport overhead per
+image on both ends: the client's encoding plus the service's parsing and
+decoding. Reports wall-clock latency and process CPU time per request.
+
+Usage (from srcs/classification-service, or /app in the container):
+    python -m scripts.bench_transport [--sizes 224,1024,2048] [--requests N]
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import time
+from io import BytesIO
+from unittest.mock import Mock
+
+import httpx
+from fastapi import FastAPI
+from PIL import Image
+
+from src.routes import classify
+
+OPTIONS = {"species_top_k": 3, "breed_top_k": 5, "species_min_confidence": 0.0}
+
+
+def _stub(result):
+    """Model stub that forces a full decode of the image, then returns result."""
+    def predict(image, **options):
+        image.load()
+        return result
+    return Mock(predict=Mock(side_effect=predict))
+
+
+def build_app() -> FastAPI:
+    """App with the classify router and stub models (no batching)."""
+    classify.nsfw_detector = _stub({"is_safe": True, "nsfw_probability": 0.01})
+    classify.species_classifier = _stub({"species": "dog", "confidence": 0.9, "top_predictions": []})
+    classify.dog_breed_classifier = _stub([{"breed": "beagle", "probability": 0.9}])
+    classify.cat_breed_classifier = classify.dog_breed_classifier
+    classify.crossbreed_detector = Mock(process_breed_result=Mock(return_value={"primary_breed": "beagle"}))
+    app = FastAPI()
+    app.include_router(classify.router)
+    return app
+
+
+def make_image(side: int) -> str:
+    """Noisy JPEG (worst case for compression) as the data URI the AI service holds."""
+    image = Image.frombytes("RGB", (side, side * 3 // 4), os.urandom(side * (side * 3 // 4) * 3))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+
+def json_request(image: str) -> dict:
+    """Previous encoding: base64 image inside a JSON body."""
+    return {
+        "content": json.dumps({"image": image, **OPTIONS}).encode(),
+        "headers": {"Content-Type": "application/json"}
+    }
+
+
+def raw_request(image: str) -> dict:
+    """Raw bytes body, options as query parameters (what ClassificationClient sends)."""
+    return {
+        "content": base64.b64decode(image.split(",", 1)[1]),
+        "params": OPTIONS,
+        "headers": {"Content-Type": "application/octet-stream"}
+    }
+
+
+def multipart_request(image: str) -> dict:
+    """Multipart body with the image part and options as form fields."""
+    return {
+        "files": {"image": ("image.jpg", base64.b64decode(image.split(",", 1)[1]), "image/jpeg")},
+        "data": {key: str(value) for key, value in OPTIONS.items()}
+    }
+
+
+async def run(client: httpx.AsyncClient, name: str, build, image: str, requests: int, report: bool = True):
+    """Send the requests one at a time and print per-request latency and CPU."""
+    body_bytes = len(client.build_request("POST", "/classify/pipeline", **build(image)).read())
+    latencies = []
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.post("/classify/pipeline", **build(image))
+        latencies.append(time.perf_counter() - started)
+        response.raise_for_status()
+    cpu = (time.process_time() - cpu_started) / requests
+    if not report:
+        return
+
+    print(
+        f"  {name:<10} body {body_bytes / 1024:>8.1f} KiB  "
+        f"p50 {statistics.median(latencies) * 1000:>7.2f} ms  "
+        f"mean {statistics.fmean(latencies) * 1000:>7.2f} ms  "
+        f"cpu {cpu * 1000:>7.2f} ms/image"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="224,1024,2048", help="Comma-separated image widths")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per encoding and size")
+    args = parser.parse_args()
+
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://classification") as client:
+        for side in (int(size) for size in args.sizes.split(",")):
+            image = make_image(side)
+            print(f"{side}x{side * 3 // 4} JPEG, {len(image) / 1024:.1f} KiB as base64:")
+            for name, build in (("json", json_request), ("raw", raw_request), ("multipart", multipart_request)):
+                await run(client, name, build, image, 3, report=False)  # Warm up
+                await run(client, name, build, image, args.requests)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
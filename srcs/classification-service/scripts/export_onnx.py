@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Export the configured classification models to ONNX for INFERENCE_BACKEND=onnx.
+
+Writes <ONNX_MODEL_DIR>/<model id with "/" as "--">/model.onnx for each of
+NSFW_MODEL, SPECIES_MODEL, DOG_BREED_MODEL and CAT_BREED_MODEL, then checks
+the exported graph against the torch model on a few random images.
+
+Usage (from srcs/classification-service, or /app in the container):
+    python -m scripts.export_onnx [--models nsfw species dog_breed cat_breed] [--output DIR] [--opset N]
+"""
+
+import argparse
+
+import torch
+from transformers import AutoImageProcessor, AutoModelForImageClassification
+from PIL import Image
+
+from src.config import settings
+from src.models.inference import ONNX_OPSET, create_onnx_session, export_onnx
+
+MODELS = {
+    "nsfw": settings.NSFW_MODEL,
+    "species": settings.SPECIES_MODEL,
+    "dog_breed": settings.DOG_BREED_MODEL,
+    "cat_breed": settings.CAT_BREED_MODEL
+}
+
+
+def check_parity(model_id: str, path, images: int = 4) -> float:
+    """Largest absolute difference between torch and onnxruntime softmax outputs."""
+    model = AutoModelForImageClassification.from_pretrained(model_id).eval()
+    processor = AutoImageProcessor.from_pretrained(model_id)
+    generator = torch.Generator().manual_seed(0)
+    batch = [
+        Image.fromarray((torch.rand(300, 400, 3, generator=generator) * 255).to(torch.uint8).numpy())
+        for _ in range(images)
+    ]
+    pixel_values = processor(images=batch, return_tensors="pt")["pixel_values"]
+
+    with torch.no_grad():
+        expected = torch.softmax(model(pixel_values=pixel_values).logits, dim=-1)
+    (logits,) = create_onnx_session(path).run(["logits"], {"pixel_values": pixel_values.numpy()})
+    actual = torch.softmax(torch.from_numpy(logits), dim=-1)
+    return (expected - actual).abs().max().item()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), default=list(MODELS))
+    parser.add_argument("--output", default=settings.ONNX_MODEL_DIR, help="ONNX_MODEL_DIR to export into")
+    parser.add_argument("--opset", type=int, default=ONNX_OPSET)
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Max probability difference allowed")
+    args = parser.parse_args()
+
+    failed = []
+    for name in args.models:
+        model_id = MODELS[name]
+        path = export_onnx(model_id, args.output, opset=args.opset)
+        difference = check_parity(model_id, path)
+        ok = difference <= args.tolerance
+        print(f"{name:<10} {model_id} -> {path}  max |p_torch - p_onnx| = {difference:.2e}  {'ok' if ok else 'MISMATCH'}")
+        if not ok:
+            failed.append(name)
+
+    if failed:
+        raise SystemExit(f"Exported graphs disagree with torch: {failed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,6 +28,23 @@ class Settings(BaseSettings):
     PUREBRED_GAP_THRESHOLD: float = 0.30
     CROSSBREED_MIN_SECOND_BREED: float = 0.05  # Minimum second breed probability for crossbreed detection
 
+    # Model loading (models load concurrently in the background after startup;
+    # /health is liveness, /ready turns 200 once every eagerly loaded model is resident)
+    LAZY_BREED_MODELS: bool = False  # Load dog/cat breed models on first use instead of at startup
+    MODEL_LOAD_RETRY_SECONDS: float = 5.0  # First retry delay for a failed startup load (doubles; 0 disables)
+    MODEL_LOAD_RETRY_MAX_SECONDS: float = 300.0
+
+    # Inference backend ("torch" runs the HF models eagerly; "onnx" runs graphs
+    # exported with python -m scripts.export_onnx through onnxruntime)
+    INFERENCE_BACKEND: str = "torch"
+    ONNX_MODEL_DIR: str = "/app/.cache/huggingface/onnx"  # Inside the HF cache volume, so exports persist
+    ONNX_INTRA_OP_THREADS: int = 0  # Threads per model; 0 = onnxruntime default (all physical cores)
+
+    # Micro-batching (per-model inference queues)
+    BATCHING_ENABLED: bool = True
+    BATCH_MAX_SIZE: int = 8
+    BATCH_MAX_WAIT_MS: float = 5.0  # How long the first request waits for others to join its batch
+
     # HuggingFace
     TRANSFORMERS_CACHE: str = "/app/.cache/huggingface"
     HF_HOME: str = "/app/.cache/huggingface"
@@ -1,5 +1,7 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 import torch
@@ -8,8 +10,10 @@ from src.config import settings
 from src.routes import classify
 from src.models.nsfw_detector import NSFWDetector
 from src.models.species_classifier import SpeciesClassifier
-from src.models.breed_classifier import DogBreedClassifier, CatBreedClassifier
+from src.models.breed_classifier import DogBreedClassifier, CatBreedClassifier, breed_labels
 from src.services.crossbreed_detector import CrossbreedDetector
+from src.services.batch_scheduler import BatchScheduler
+from src.services.model_registry import ModelRegistry
 
 # Setup logging
 logging.basicConfig(
@@ -19,6 +23,30 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# Route module attribute each registry model is injected into
+ROUTE_MODELS = {
+    "nsfw": "nsfw_detector",
+    "species": "species_classifier",
+    "dog_breed": "dog_breed_classifier",
+    "cat_breed": "cat_breed_classifier"
+}
+
+
+def install_model(name: str, model, batchers: list):
+    """Inject a freshly loaded model (and its micro-batching queue) into the routes.
+
+    Args:
+        name: Registry model name
+        model: Loaded classifier
+        batchers: List collecting the created BatchSchedulers (stopped at shutdown)
+    """
+    setattr(classify, ROUTE_MODELS[name], model)
+    if settings.BATCHING_ENABLED:
+        batcher = BatchScheduler(model, name, settings.BATCH_MAX_SIZE, settings.BATCH_MAX_WAIT_MS)
+        setattr(classify, f"{name}_batcher", batcher)
+        batchers.append(batcher)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application startup and shutdown events."""
@@ -32,27 +60,59 @@ async def lifespan(app: FastAPI):
 
     logger.info(f"Using device: {device} (config: {settings.DEVICE})")
 
-    # Load models (can take 60-90 seconds on first run)
-    logger.info("Loading classification models...")
-    nsfw = NSFWDetector(device=device, model_id=settings.NSFW_MODEL)
-    species = SpeciesClassifier(device=device, model_id=settings.SPECIES_MODEL)
-    dog_breed = DogBreedClassifier(device=device, model_id=settings.DOG_BREED_MODEL)
-    cat_breed = CatBreedClassifier(device=device, model_id=settings.CAT_BREED_MODEL)
-    crossbreed = CrossbreedDetector(settings)
+    # Models load in worker threads, concurrently, after startup (can take
+    # 60-90 seconds on first run); /ready reports when they are resident
+    runtime = {
+        "device": device,
+        "backend": settings.INFERENCE_BACKEND,
+        "onnx_dir": settings.ONNX_MODEL_DIR,
+        "intra_op_threads": settings.ONNX_INTRA_OP_THREADS
+    }
+    logger.info(f"Inference backend: {settings.INFERENCE_BACKEND}")
+
+    registry = ModelRegistry(
+        retry_seconds=settings.MODEL_LOAD_RETRY_SECONDS,
+        retry_max_seconds=settings.MODEL_LOAD_RETRY_MAX_SECONDS
+    )
+    registry.register("nsfw", lambda: NSFWDetector(model_id=settings.NSFW_MODEL, **runtime))
+    registry.register("species", lambda: SpeciesClassifier(model_id=settings.SPECIES_MODEL, **runtime))
+    registry.register(
+        "dog_breed",
+        lambda: DogBreedClassifier(model_id=settings.DOG_BREED_MODEL, **runtime),
+        lazy=settings.LAZY_BREED_MODELS,
+        labels=lambda: breed_labels(settings.DOG_BREED_MODEL)
+    )
+    registry.register(
+        "cat_breed",
+        lambda: CatBreedClassifier(model_id=settings.CAT_BREED_MODEL, **runtime),
+        lazy=settings.LAZY_BREED_MODELS,
+        labels=lambda: breed_labels(settings.CAT_BREED_MODEL)
+    )
+
+    # Per-model micro-batching queues, created as each model arrives
+    batchers = []
+    registry.add_listener(lambda name, model: install_model(name, model, batchers))
+    if not settings.BATCHING_ENABLED:
+        logger.info("Micro-batching disabled, running predictions inline")
 
     # Inject into routes
-    classify.nsfw_detector = nsfw
-    classify.species_classifier = species
-    classify.dog_breed_classifier = dog_breed
-    classify.cat_breed_classifier = cat_breed
-    classify.crossbreed_detector = crossbreed
+    classify.crossbreed_detector = CrossbreedDetector(settings)
+    classify.model_registry = registry
+    app.state.model_registry = registry
+
+    logger.info(f"Loading classification models in the background: {registry.eager()}")
+    if settings.LAZY_BREED_MODELS:
+        logger.info("Breed models load on first use")
+    loading = asyncio.create_task(registry.load_all())
 
-    logger.info("All models loaded successfully")
     logger.info(f"{settings.SERVICE_NAME} started successfully on port {settings.SERVICE_PORT}")
 
     yield
 
     logger.info(f"Shutting down {settings.SERVICE_NAME}...")
+    loading.cancel()
+    for batcher in batchers:
+        await batcher.stop()
 
 
 # Create FastAPI app
@@ -76,7 +136,7 @@ app.add_middleware(
 # Health check
 @app.get("/health")
 async def health_check():
-    """Service health check endpoint."""
+    """Liveness check: the process is up, whether or not models are loaded yet."""
     return {
         "status": "healthy",
         "service": settings.SERVICE_NAME,
@@ -84,5 +144,36 @@ async def health_check():
     }
 
 
+@app.get("/ready")
+async def readiness_check(request: Request):
+    """Readiness check: 200 once every eagerly loaded model is resident, else 503.
+
+    Lazily loaded breed models do not hold readiness back; their state is
+    reported alongside.
+    """
+    registry = request.app.state.model_registry
+    ready = registry.ready()
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"status": "ready" if ready else "loading", "models": registry.status()}
+    )
+
+
+@app.get("/ready/{model}")
+async def model_readiness_check(model: str, request: Request):
+    """Readiness of a single model (nsfw, species, dog_breed or cat_breed): 200 once loaded, else 503."""
+    registry = request.app.state.model_registry
+    models = registry.status()
+    if model not in models:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "UNKNOWN_MODEL", "message": f"Unknown model: {model}"}
+        )
+    return JSONResponse(
+        status_code=status.HTTP_200_OK if registry.is_ready(model) else status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"model": model, **models[model]}
+    )
+
+
 # Include routers
 app.include_router(classify.router)
@@ -1,37 +1,53 @@
 from PIL import Image
-from transformers import AutoModelForImageClassification, AutoImageProcessor
+from transformers import AutoConfig, AutoImageProcessor
 import torch
-from typing import List, Dict
+from typing import List, Dict, Optional
 import logging
 
+from src.models.inference import ClassifierRuntime
+
 logger = logging.getLogger(__name__)
 
 
 class BreedClassifierBase:
     """Base class for breed classifiers."""
 
-    def __init__(self, device: str, model_id: str, species: str):
+    def __init__(
+        self,
+        device: str,
+        model_id: str,
+        species: str,
+        backend: str = "torch",
+        onnx_dir: Optional[str] = None,
+        intra_op_threads: int = 0
+    ):
         """Initialize breed classifier.
 
         Args:
             device: Device to run model on ("cuda" or "cpu")
             model_id: HuggingFace model ID
             species: Species name for logging (dog/cat)
+            backend: Inference backend ("torch" or "onnx")
+            onnx_dir: Directory of exported ONNX models (onnx backend)
+            intra_op_threads: onnxruntime intra-op threads, 0 for its default
         """
         self.device = device
         self.model_id = model_id
         self.species = species
 
-        logger.info(f"Loading {species} breed classifier: {model_id} on {device}")
-
-        # Load model and processor
-        self.model = AutoModelForImageClassification.from_pretrained(model_id)
+        logger.info(f"Loading {species} breed classifier: {model_id} on {device} ({backend})")
+
+        # Load model (torch module or onnxruntime session) and processor
+        self.runtime = ClassifierRuntime(
+            model_id,
+            device=device,
+            backend=backend,
+            onnx_dir=onnx_dir,
+            intra_op_threads=intra_op_threads
+        )
+        self.model = self.runtime.model  # None on the onnx backend
         self.processor = AutoImageProcessor.from_pretrained(model_id)
 
-        # Move model to device
-        self.model.to(self.device)
-        self.model.eval()
-
         logger.info(f"{species.capitalize()} breed classifier loaded successfully")
 
     def predict(self, image: Image.Image, top_k: int = 5) -> List[Dict]:
@@ -44,26 +60,48 @@ class BreedClassifierBase:
         Returns:
             List of {"breed": str, "probability": float} sorted descending
         """
-        # Preprocess image
-        inputs = self.processor(images=image, return_tensors="pt")
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        return self.predict_batch([image], top_k=top_k)[0]
 
-        # Run inference
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
+    def predict_batch(self, images: List[Image.Image], top_k: int = 5) -> List[List[Dict]]:
+        """Predict breeds for several images in one forward pass.
+
+        Args:
+            images: List of PIL Image objects
+            top_k: Number of top predictions to return per image
+
+        Returns:
+            One list of {"breed": str, "probability": float} per image,
+            in the same order as images
+        """
+        # Preprocess images
+        inputs = self.processor(images=images, return_tensors="pt")
+
+        # Run inference (torch or onnxruntime)
+        logits = self.runtime.logits(inputs["pixel_values"])
 
         # Get probabilities
-        probs = torch.nn.functional.softmax(logits, dim=-1)[0]
+        probs = torch.nn.functional.softmax(logits, dim=-1)
 
+        return [self._format_prediction(image_probs, top_k) for image_probs in probs]
+
+    def _format_prediction(self, probs: torch.Tensor, top_k: int) -> List[Dict]:
+        """Build the top-K breed list for one image's probability vector.
+
+        Args:
+            probs: Softmax probabilities for a single image
+            top_k: Number of top predictions to return
+
+        Returns:
+            List of {"breed": str, "probability": float} sorted descending
+        """
         # Get top-K predictions
         top_probs, top_indices = torch.topk(probs, k=min(top_k, len(probs)))
 
         # Map indices to breed labels
-        id2label = self.model.config.id2label
+        id2label = self.runtime.config.id2label
         top_predictions = [
             {
-                "breed": id2label[idx.item()].lower().replace(" ", "_").replace("-", "_"),
+                "breed": self._normalize_label(id2label[idx.item()]),
                 "probability": round(prob.item(), 3)
             }
             for prob, idx in zip(top_probs, top_indices)
@@ -71,6 +109,32 @@ class BreedClassifierBase:
 
         return top_predictions
 
+    def labels(self) -> List[str]:
+        """List every breed label this classifier can emit.
+
+        Returns:
+            Normalized breed labels (same format as predict() results)
+        """
+        return [self._normalize_label(label) for label in self.runtime.config.id2label.values()]
+
+    @staticmethod
+    def _normalize_label(label: str) -> str:
+        """Normalize a model label to snake_case (e.g. "Golden Retriever" -> "golden_retriever")."""
+        return label.lower().replace(" ", "_").replace("-", "_")
+
+
+def breed_labels(model_id: str) -> List[str]:
+    """List a breed model's labels from its config, without loading the weights.
+
+    Args:
+        model_id: HuggingFace model ID
+
+    Returns:
+        Normalized breed labels (same as BreedClassifierBase.labels())
+    """
+    id2label = AutoConfig.from_pretrained(model_id).id2label
+    return [BreedClassifierBase._normalize_label(label) for label in id2label.values()]
+
 
 class DogBreedClassifier(BreedClassifierBase):
     """Dog breed classifier using ViT model (120 breeds)."""
@@ -78,10 +142,20 @@ class DogBreedClassifier(BreedClassifierBase):
     def __init__(
         self,
         device: str = "cuda",
-        model_id: str = "wesleyacheng/dog-breeds-multiclass-image-classification-with-vit"
+        model_id: str = "wesleyacheng/dog-breeds-multiclass-image-classification-with-vit",
+        backend: str = "torch",
+        onnx_dir: Optional[str] = None,
+        intra_op_threads: int = 0
     ):
         """Initialize dog breed classifier."""
-        super().__init__(device=device, model_id=model_id, species="dog")
+        super().__init__(
+            device=device,
+            model_id=model_id,
+            species="dog",
+            backend=backend,
+            onnx_dir=onnx_dir,
+            intra_op_threads=intra_op_threads
+        )
 
 
 class CatBreedClassifier(BreedClassifierBase):
@@ -90,7 +164,17 @@ class CatBreedClassifier(BreedClassifierBase):
     def __init__(
         self,
         device: str = "cuda",
-        model_id: str = "dima806/cat_breed_image_detection"
+        model_id: str = "dima806/cat_breed_image_detection",
+        backend: str = "torch",
+        onnx_dir: Optional[str] = None,
+        intra_op_threads: int = 0
     ):
         """Initialize cat breed classifier."""
-        super().__init__(device=device, model_id=model_id, species="cat")
+        super().__init__(
+            device=device,
+            model_id=model_id,
+            species="cat",
+            backend=backend,
+            onnx_dir=onnx_dir,
+            intra_op_threads=intra_op_threads
+        )
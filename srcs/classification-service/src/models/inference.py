@@ -0,0 +1,174 @@
+from pathlib import Path
+from PIL import Image
+from transformers import AutoConfig, AutoImageProcessor, AutoModelForImageClassification
+import torch
+from typing import Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Inference backends selectable with INFERENCE_BACKEND
+BACKENDS = ("torch", "onnx")
+
+ONNX_OPSET = 17
+
+
+def onnx_model_path(onnx_dir: str, model_id: str) -> Path:
+    """Where the exported ONNX graph of a model lives.
+
+    Args:
+        onnx_dir: Root directory for exported models (ONNX_MODEL_DIR)
+        model_id: HuggingFace model ID or local model path
+
+    Returns:
+        Path of the model's model.onnx
+    """
+    return Path(onnx_dir) / model_id.strip("/").replace("/", "--") / "model.onnx"
+
+
+class _LogitsOnly(torch.nn.Module):
+    """Wraps an HF classifier so the exported graph maps pixel_values to logits."""
+
+    def __init__(self, model: torch.nn.Module):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        return self.model(pixel_values=pixel_values).logits
+
+
+def export_onnx(model_id: str, onnx_dir: str, opset: int = ONNX_OPSET) -> Path:
+    """Export a HuggingFace image classifier to ONNX with a dynamic batch axis.
+
+    The input shape is taken from the model's own image processor, so the
+    graph accepts exactly what predict_batch feeds it.
+
+    Args:
+        model_id: HuggingFace model ID or local model path
+        onnx_dir: Root directory for exported models
+        opset: ONNX opset version
+
+    Returns:
+        Path of the written model.onnx
+    """
+    path = onnx_model_path(onnx_dir, model_id)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    model = AutoModelForImageClassification.from_pretrained(model_id).eval()
+    processor = AutoImageProcessor.from_pretrained(model_id)
+    sample = processor(images=[Image.new("RGB", (256, 256))], return_tensors="pt")["pixel_values"]
+
+    logger.info(f"Exporting {model_id} to {path} (input {tuple(sample.shape[1:])}, opset {opset})")
+    with torch.no_grad():
+        torch.onnx.export(
+            _LogitsOnly(model),
+            (sample,),
+            str(path),
+            input_names=["pixel_values"],
+            output_names=["logits"],
+            dynamic_axes={"pixel_values": {0: "batch"}, "logits": {0: "batch"}},
+            opset_version=opset,
+            dynamo=False
+        )
+    return path
+
+
+def create_onnx_session(path: Path, device: str = "cpu", intra_op_threads: int = 0):
+    """Open an onnxruntime session tuned for one-batch-at-a-time inference.
+
+    Each model's BatchScheduler runs one batch at a time, so all
+    parallelism is intra-op: inter-op threads stay at 1 and the intra-op
+    pool gets intra_op_threads (0 lets onnxruntime use every physical core).
+
+    Args:
+        path: Exported model.onnx
+        device: "cuda" uses the CUDA execution provider when onnxruntime has it
+        intra_op_threads: Threads per operator
+
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    import onnxruntime as ort
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = max(0, intra_op_threads)
+    options.inter_op_num_threads = 1
+
+    providers = ["CPUExecutionProvider"]
+    if device == "cuda" and "CUDAExecutionProvider" in ort.get_available_providers():
+        providers.insert(0, "CUDAExecutionProvider")
+
+    return ort.InferenceSession(str(path), sess_options=options, providers=providers)
+
+
+class ClassifierRuntime:
+    """Forward pass of an image classification model on the torch or ONNX backend.
+
+    The torch backend runs the HF model eagerly, as before. The onnx backend
+    runs the graph written by export_onnx (python -m scripts.export_onnx)
+    through onnxruntime and only loads the model config, not the weights,
+    into PyTorch.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        device: str = "cpu",
+        backend: str = "torch",
+        onnx_dir: Optional[str] = None,
+        intra_op_threads: int = 0
+    ):
+        """Load the model for the chosen backend.
+
+        Args:
+            model_id: HuggingFace model ID or local model path
+            device: Device to run on ("cuda" or "cpu")
+            backend: "torch" or "onnx"
+            onnx_dir: Root directory of exported models (onnx backend)
+            intra_op_threads: onnxruntime intra-op threads, 0 for its default
+
+        Raises:
+            ValueError: If the backend is unknown
+            FileNotFoundError: If the onnx backend is selected but the model was not exported
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown inference backend: {backend} (expected one of {BACKENDS})")
+
+        self.model_id = model_id
+        self.device = device
+        self.backend = backend
+        self.model: Optional[torch.nn.Module] = None
+        self.session = None
+
+        if backend == "onnx":
+            path = onnx_model_path(onnx_dir or ".", model_id)
+            if not path.exists():
+                raise FileNotFoundError(
+                    f"No ONNX export of {model_id} at {path}; run python -m scripts.export_onnx"
+                )
+            self.session = create_onnx_session(path, device, intra_op_threads)
+            self.config = AutoConfig.from_pretrained(model_id)
+            logger.info(f"{model_id}: onnxruntime {self.session.get_providers()[0]}, intra_op_threads={intra_op_threads}")
+        else:
+            self.model = AutoModelForImageClassification.from_pretrained(model_id)
+            self.model.to(device)
+            self.model.eval()
+            self.config = self.model.config
+
+    def logits(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        """Run the model on a preprocessed batch.
+
+        Args:
+            pixel_values: Batch from the model's image processor, shape (N, C, H, W)
+
+        Returns:
+            Logits tensor of shape (N, num_labels)
+        """
+        if self.session is None:
+            with torch.no_grad():
+                return self.model(pixel_values=pixel_values.to(self.device)).logits
+
+        (logits,) = self.session.run(["logits"], {"pixel_values": pixel_values.cpu().numpy()})
+        return torch.from_numpy(logits)
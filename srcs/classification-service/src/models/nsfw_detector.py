@@ -1,35 +1,50 @@
 from PIL import Image
-from transformers import AutoModelForImageClassification, AutoProcessor
+from transformers import AutoProcessor
 import torch
-from typing import Dict
+from typing import Dict, List, Optional
 import logging
 
+from src.models.inference import ClassifierRuntime
+
 logger = logging.getLogger(__name__)
 
 
 class NSFWDetector:
     """NSFW content detection using HuggingFace model."""
 
-    def __init__(self, device: str = "cuda", model_id: str = "Falconsai/nsfw_image_detection"):
+    def __init__(
+        self,
+        device: str = "cuda",
+        model_id: str = "Falconsai/nsfw_image_detection",
+        backend: str = "torch",
+        onnx_dir: Optional[str] = None,
+        intra_op_threads: int = 0
+    ):
         """Initialize NSFW detector.
 
         Args:
             device: Device to run model on ("cuda" or "cpu")
             model_id: HuggingFace model ID
+            backend: Inference backend ("torch" or "onnx")
+            onnx_dir: Directory of exported ONNX models (onnx backend)
+            intra_op_threads: onnxruntime intra-op threads, 0 for its default
         """
         self.device = device
         self.model_id = model_id
 
-        logger.info(f"Loading NSFW detector: {model_id} on {device}")
-
-        # Load model and processor
-        self.model = AutoModelForImageClassification.from_pretrained(model_id)
+        logger.info(f"Loading NSFW detector: {model_id} on {device} ({backend})")
+
+        # Load model (torch module or onnxruntime session) and processor
+        self.runtime = ClassifierRuntime(
+            model_id,
+            device=device,
+            backend=backend,
+            onnx_dir=onnx_dir,
+            intra_op_threads=intra_op_threads
+        )
+        self.model = self.runtime.model  # None on the onnx backend
         self.processor = AutoProcessor.from_pretrained(model_id)
 
-        # Move model to device
-        self.model.to(self.device)
-        self.model.eval()
-
         logger.info("NSFW detector loaded successfully")
 
     def predict(self, image: Image.Image) -> Dict[str, any]:
@@ -41,23 +56,36 @@ class NSFWDetector:
         Returns:
             Dict with is_safe (bool) and nsfw_probability (float)
         """
-        # Preprocess image
-        inputs = self.processor(images=image, return_tensors="pt")
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        return self.predict_batch([image])[0]
+
+    def predict_batch(self, images: List[Image.Image]) -> List[Dict[str, any]]:
+        """Predict NSFW probability for several images in one forward pass.
+
+        Args:
+            images: List of PIL Image objects
+
+        Returns:
+            List of dicts with is_safe (bool) and nsfw_probability (float),
+            in the same order as images
+        """
+        # Preprocess images
+        inputs = self.processor(images=images, return_tensors="pt")
 
-        # Run inference
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
+        # Run inference (torch or onnxruntime)
+        logits = self.runtime.logits(inputs["pixel_values"])
 
         # Get probabilities
         probs = torch.nn.functional.softmax(logits, dim=-1)
 
-        # Assuming binary classification: [safe, nsfw]
-        # (Note: Actual label mapping may vary by model)
-        nsfw_prob = probs[0][1].item() if probs.shape[1] > 1 else 0.0
+        results = []
+        for image_probs in probs:
+            # Assuming binary classification: [safe, nsfw]
+            # (Note: Actual label mapping may vary by model)
+            nsfw_prob = image_probs[1].item() if image_probs.shape[0] > 1 else 0.0
+
+            results.append({
+                "is_safe": nsfw_prob < 0.5,  # Simple threshold for now
+                "nsfw_probability": round(nsfw_prob, 3)
+            })
 
-        return {
-            "is_safe": nsfw_prob < 0.5,  # Simple threshold for now
-            "nsfw_probability": round(nsfw_prob, 3)
-        }
+        return results
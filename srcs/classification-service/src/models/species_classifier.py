@@ -1,9 +1,11 @@
 from PIL import Image
-from transformers import AutoModelForImageClassification, AutoProcessor
+from transformers import AutoProcessor
 import torch
-from typing import Dict, List
+from typing import Dict, List, Optional
 import logging
 
+from src.models.inference import ClassifierRuntime
+
 logger = logging.getLogger(__name__)
 
 # Species mapping from scientific names to simple labels
@@ -25,27 +27,36 @@ class SpeciesClassifier:
     def __init__(
         self,
         device: str = "cuda",
-        model_id: str = "dima806/animal_151_types_image_detection"
+        model_id: str = "dima806/animal_151_types_image_detection",
+        backend: str = "torch",
+        onnx_dir: Optional[str] = None,
+        intra_op_threads: int = 0
     ):
         """Initialize species classifier.
 
         Args:
             device: Device to run model on ("cuda" or "cpu")
             model_id: HuggingFace model ID
+            backend: Inference backend ("torch" or "onnx")
+            onnx_dir: Directory of exported ONNX models (onnx backend)
+            intra_op_threads: onnxruntime intra-op threads, 0 for its default
         """
         self.device = device
         self.model_id = model_id
 
-        logger.info(f"Loading species classifier: {model_id} on {device}")
-
-        # Load model and processor
-        self.model = AutoModelForImageClassification.from_pretrained(model_id)
+        logger.info(f"Loading species classifier: {model_id} on {device} ({backend})")
+
+        # Load model (torch module or onnxruntime session) and processor
+        self.runtime = ClassifierRuntime(
+            model_id,
+            device=device,
+            backend=backend,
+            onnx_dir=onnx_dir,
+            intra_op_threads=intra_op_threads
+        )
+        self.model = self.runtime.model  # None on the onnx backend
         self.processor = AutoProcessor.from_pretrained(model_id)
 
-        # Move model to device
-        self.model.to(self.device)
-        self.model.eval()
-
         logger.info("Species classifier loaded successfully")
 
     def predict(self, image: Image.Image, top_k: int = 3) -> Dict:
@@ -58,23 +69,45 @@ class SpeciesClassifier:
         Returns:
             Dict with species, confidence, and top_predictions
         """
-        # Preprocess image
-        inputs = self.processor(images=image, return_tensors="pt")
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        return self.predict_batch([image], top_k=top_k)[0]
+
+    def predict_batch(self, images: List[Image.Image], top_k: int = 3) -> List[Dict]:
+        """Predict animal species for several images in one forward pass.
+
+        Args:
+            images: List of PIL Image objects
+            top_k: Number of top predictions to return per image
+
+        Returns:
+            List of dicts with species, confidence, and top_predictions,
+            in the same order as images
+        """
+        # Preprocess images
+        inputs = self.processor(images=images, return_tensors="pt")
 
-        # Run inference
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
+        # Run inference (torch or onnxruntime)
+        logits = self.runtime.logits(inputs["pixel_values"])
 
         # Get probabilities
-        probs = torch.nn.functional.softmax(logits, dim=-1)[0]
+        probs = torch.nn.functional.softmax(logits, dim=-1)
 
+        return [self._format_prediction(image_probs, top_k) for image_probs in probs]
+
+    def _format_prediction(self, probs: torch.Tensor, top_k: int) -> Dict:
+        """Build the species result for one image's probability vector.
+
+        Args:
+            probs: Softmax probabilities for a single image
+            top_k: Number of top predictions to return
+
+        Returns:
+            Dict with species, confidence, and top_predictions
+        """
         # Get top-K predictions
         top_probs, top_indices = torch.topk(probs, k=min(top_k, len(probs)))
 
         # Map indices to labels
-        id2label = self.model.config.id2label
+        id2label = self.runtime.config.id2label
         top_predictions = [
             {
                 "label": id2label[idx.item()].lower(),
@@ -1,9 +1,13 @@
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
-from typing import Literal
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, status
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, Dict, Literal, Tuple, Type, TypeVar, Union
 import logging
 
 from src.services.image_utils import ImageUtils
+from src.services.model_registry import ModelNotReady
 
 logger = logging.getLogger(__name__)
 
@@ -11,24 +15,137 @@ router = APIRouter(prefix="/classify", tags=["classification"])
 
 
 # Request models
-class ContentCheckRequest(BaseModel):
+#
+# Each route accepts three body encodings:
+#   - application/json: the *Request model, image as base64 (data URI allowed)
+#   - application/octet-stream (or image/*): the raw image file as the body,
+#     options as query parameters
+#   - multipart/form-data: the image file in the "image" part, options as
+#     form fields
+# The binary encodings skip base64 (a third smaller on the wire) and the
+# JSON parse of a multi-megabyte string.
+class ContentCheckOptions(BaseModel):
+    """Options for content safety check."""
+
+
+class ContentCheckRequest(ContentCheckOptions):
     """Request for content safety check."""
     image: str = Field(..., description="Base64-encoded image")
 
 
-class SpeciesDetectRequest(BaseModel):
-    """Request for species detection."""
-    image: str = Field(..., description="Base64-encoded image")
+class SpeciesDetectOptions(BaseModel):
+    """Options for species detection."""
     top_k: int = Field(3, ge=1, le=10, description="Number of top predictions")
 
 
-class BreedDetectRequest(BaseModel):
-    """Request for breed classification."""
+class SpeciesDetectRequest(SpeciesDetectOptions):
+    """Request for species detection."""
     image: str = Field(..., description="Base64-encoded image")
+
+
+class BreedDetectOptions(BaseModel):
+    """Options for breed classification."""
     species: Literal["dog", "cat"] = Field(..., description="Species (dog or cat)")
     top_k: int = Field(5, ge=1, le=10, description="Number of top predictions")
 
 
+class BreedDetectRequest(BreedDetectOptions):
+    """Request for breed classification."""
+    image: str = Field(..., description="Base64-encoded image")
+
+
+class PipelineOptions(BaseModel):
+    """Options for the fused content -> species -> breed pipeline."""
+    species_top_k: int = Field(3, ge=1, le=10, description="Number of top species predictions")
+    breed_top_k: int = Field(5, ge=1, le=10, description="Number of top breed predictions")
+    species_min_confidence: float = Field(
+        0.0, ge=0.0, le=1.0,
+        description="Skip breed classification when species confidence is below this value"
+    )
+
+
+class PipelineRequest(PipelineOptions):
+    """Request for the fused content -> species -> breed pipeline."""
+    image: str = Field(..., description="Base64-encoded image")
+
+
+OptionsT = TypeVar("OptionsT", bound=BaseModel)
+
+
+def _image_body(request_model: Type[BaseModel]) -> Dict[str, Any]:
+    """OpenAPI request body listing the JSON, raw and multipart encodings."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": request_model.model_json_schema()},
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"image": {"type": "string", "format": "binary"}},
+                        "required": ["image"]
+                    }
+                }
+            }
+        }
+    }
+
+
+async def _read_image_request(
+    request: Request,
+    options_model: Type[OptionsT],
+    request_model: Type[OptionsT]
+) -> Tuple[OptionsT, Union[str, bytes]]:
+    """Read the options and the image from a JSON, raw or multipart body.
+
+    Args:
+        request: Incoming request
+        options_model: Model validating the options (query or form fields)
+        request_model: Model validating a JSON body (options plus base64 image)
+
+    Returns:
+        Tuple of (validated options, base64 string or raw image bytes)
+
+    Raises:
+        RequestValidationError: If the body or options are invalid (422)
+        HTTPException: If the content type is not supported (415)
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    location = "body"
+    try:
+        if content_type in ("", "application/json"):
+            params = request_model.model_validate_json(await request.body())
+            return params, params.image
+
+        if content_type == "application/octet-stream" or content_type.startswith("image/"):
+            location = "query"
+            return options_model.model_validate(dict(request.query_params)), await request.body()
+
+        if content_type == "multipart/form-data":
+            form = await request.form()
+            upload = form.get("image")
+            if upload is None or isinstance(upload, str):
+                raise RequestValidationError([{
+                    "type": "missing",
+                    "loc": ("body", "image"),
+                    "msg": "Image file part is required",
+                    "input": None
+                }])
+            fields = {key: value for key, value in form.items() if key != "image"}
+            return options_model.model_validate(fields), await upload.read()
+
+    except ValidationError as e:
+        raise RequestValidationError([
+            {**error, "loc": (location, *error["loc"])} for error in e.errors(include_url=False)
+        ])
+
+    raise HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail={"code": "UNSUPPORTED_MEDIA_TYPE", "message": f"Unsupported content type: {content_type}"}
+    )
+
+
 # Service instances (injected at startup)
 nsfw_detector = None
 species_classifier = None
@@ -36,20 +153,73 @@ dog_breed_classifier = None
 cat_breed_classifier = None
 crossbreed_detector = None
 
+# Batch schedulers (injected at startup; None runs predictions inline)
+nsfw_batcher = None
+species_batcher = None
+dog_breed_batcher = None
+cat_breed_batcher = None
+
+# Model registry (injected at startup; None when the models above are set directly)
+model_registry = None
+
+
+async def _ensure_models(*names: str):
+    """Wait for lazily loaded models, or fail fast on ones still loading at startup.
+
+    Args:
+        *names: Registry model names (e.g. "nsfw", "dog_breed")
+
+    Raises:
+        ModelNotReady: If a model is not available
+    """
+    if model_registry is not None:
+        await asyncio.gather(*(model_registry.ensure(name) for name in names))
+
+
+def _model_not_ready(e: ModelNotReady) -> HTTPException:
+    """503 for a request that needs a model which is not loaded."""
+    logger.warning(str(e))
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={"code": "MODEL_NOT_READY", "message": str(e)},
+        headers={"Retry-After": "5"}
+    )
 
-@router.post("/content")
-async def check_content(request: ContentCheckRequest):
+
+async def _predict(model, batcher, image, **options):
+    """Run a prediction through the model's batch scheduler when one is configured.
+
+    Args:
+        model: Classifier instance (used directly when batcher is None)
+        batcher: BatchScheduler for the model, or None
+        image: PIL Image object
+        **options: Prediction options (e.g. top_k)
+
+    Returns:
+        The model's prediction for the image
+    """
+    if batcher is not None:
+        return await batcher.submit(image, **options)
+    return model.predict(image, **options)
+
+
+@router.post("/content", openapi_extra=_image_body(ContentCheckRequest))
+async def check_content(request: Request):
     """Check image content safety (NSFW detection).
 
     Returns:
         Dict with is_safe, nsfw_probability, threshold
     """
+    _, image = await _read_image_request(request, ContentCheckOptions, ContentCheckRequest)
+
     try:
+        await _ensure_models("nsfw")
+
         # Decode image
-        pil_image = ImageUtils.decode_base64(request.image)
+        pil_image = ImageUtils.decode_image(image)
 
         # Run NSFW detection
-        result = nsfw_detector.predict(pil_image)
+        result = await _predict(nsfw_detector, nsfw_batcher, pil_image)
 
         # Add threshold to response
         from src.config import settings
@@ -57,6 +227,8 @@ async def check_content(request: ContentCheckRequest):
 
         return result
 
+    except ModelNotReady as e:
+        raise _model_not_ready(e)
     except ValueError as e:
         logger.warning(f"Invalid image: {e}")
         raise HTTPException(
@@ -71,22 +243,28 @@ async def check_content(request: ContentCheckRequest):
         )
 
 
-@router.post("/species")
-async def detect_species(request: SpeciesDetectRequest):
+@router.post("/species", openapi_extra=_image_body(SpeciesDetectRequest))
+async def detect_species(request: Request):
     """Detect animal species from image.
 
     Returns:
         Dict with species, confidence, top_predictions
     """
+    params, image = await _read_image_request(request, SpeciesDetectOptions, SpeciesDetectRequest)
+
     try:
+        await _ensure_models("species")
+
         # Decode image
-        pil_image = ImageUtils.decode_base64(request.image)
+        pil_image = ImageUtils.decode_image(image)
 
         # Run species classification
-        result = species_classifier.predict(pil_image, top_k=request.top_k)
+        result = await _predict(species_classifier, species_batcher, pil_image, top_k=params.top_k)
 
         return result
 
+    except ModelNotReady as e:
+        raise _model_not_ready(e)
     except ValueError as e:
         logger.warning(f"Invalid image: {e}")
         raise HTTPException(
@@ -101,31 +279,37 @@ async def detect_species(request: SpeciesDetectRequest):
         )
 
 
-@router.post("/breed")
-async def detect_breed(request: BreedDetectRequest):
+@router.post("/breed", openapi_extra=_image_body(BreedDetectRequest))
+async def detect_breed(request: Request):
     """Detect breed from image (dog or cat).
 
     Returns:
         Dict with breed_analysis including crossbreed detection
     """
+    params, image = await _read_image_request(request, BreedDetectOptions, BreedDetectRequest)
+
     try:
+        await _ensure_models(f"{params.species}_breed")
+
         # Decode image
-        pil_image = ImageUtils.decode_base64(request.image)
+        pil_image = ImageUtils.decode_image(image)
 
         # Select appropriate classifier
-        if request.species == "dog":
-            classifier = dog_breed_classifier
+        if params.species == "dog":
+            classifier, batcher = dog_breed_classifier, dog_breed_batcher
         else:  # cat
-            classifier = cat_breed_classifier
+            classifier, batcher = cat_breed_classifier, cat_breed_batcher
 
         # Run breed classification
-        breed_probabilities = classifier.predict(pil_image, top_k=request.top_k)
+        breed_probabilities = await _predict(classifier, batcher, pil_image, top_k=params.top_k)
 
         # Process with crossbreed detector
         breed_analysis = crossbreed_detector.process_breed_result(breed_probabilities)
 
         return {"breed_analysis": breed_analysis}
 
+    except ModelNotReady as e:
+        raise _model_not_ready(e)
     except ValueError as e:
         logger.warning(f"Invalid image: {e}")
         raise HTTPException(
@@ -138,3 +322,98 @@ async def detect_breed(request: BreedDetectRequest):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail={"code": "CLASSIFICATION_ERROR", "message": "Breed detection failed"}
         )
+
+
+@router.post("/pipeline", openapi_extra=_image_body(PipelineRequest))
+async def classify_pipeline(request: Request):
+    """Run content check, species detection and breed classification in one call.
+
+    The image is decoded once and the stages run in-process with early exit:
+    unsafe content skips species detection, and a species other than dog/cat
+    (or below species_min_confidence) skips breed classification.
+
+    Returns:
+        Dict with content, species, breed (same shapes as the individual
+        endpoints, None for skipped stages) and stopped_at
+    """
+    params, image = await _read_image_request(request, PipelineOptions, PipelineRequest)
+
+    try:
+        await _ensure_models("nsfw", "species")
+
+        # Decode image once for all stages
+        pil_image = ImageUtils.decode_image(image)
+
+        result = {"content": None, "species": None, "breed": None, "stopped_at": None}
+
+        # Stage 1: Content safety
+        from src.config import settings
+        content = await _predict(nsfw_detector, nsfw_batcher, pil_image)
+        content["threshold"] = settings.NSFW_REJECTION_THRESHOLD
+        result["content"] = content
+
+        if not content["is_safe"]:
+            result["stopped_at"] = "content"
+            return result
+
+        # Stage 2: Species detection
+        species = await _predict(species_classifier, species_batcher, pil_image, top_k=params.species_top_k)
+        result["species"] = species
+
+        if species["species"] not in ("dog", "cat") or species["confidence"] < params.species_min_confidence:
+            result["stopped_at"] = "species"
+            return result
+
+        # Stage 3: Breed classification (breed models may load on first use)
+        await _ensure_models(f"{species['species']}_breed")
+        if species["species"] == "dog":
+            classifier, batcher = dog_breed_classifier, dog_breed_batcher
+        else:  # cat
+            classifier, batcher = cat_breed_classifier, cat_breed_batcher
+
+        breed_probabilities = await _predict(classifier, batcher, pil_image, top_k=params.breed_top_k)
+        result["breed"] = {"breed_analysis": crossbreed_detector.process_breed_result(breed_probabilities)}
+
+        return result
+
+    except ModelNotReady as e:
+        raise _model_not_ready(e)
+    except ValueError as e:
+        logger.warning(f"Invalid image: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={"code": "INVALID_IMAGE", "message": str(e)}
+        )
+    except Exception as e:
+        logger.error(f"Classification pipeline failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={"code": "CLASSIFICATION_ERROR", "message": "Classification pipeline failed"}
+        )
+
+
+@router.get("/labels")
+async def list_labels():
+    """List every breed label the breed classifiers can emit.
+
+    Used by clients to precompute per-breed data (e.g. query embeddings).
+
+    Returns:
+        Dict with dog_breeds and cat_breeds label lists
+    """
+    if model_registry is None:
+        return {
+            "dog_breeds": dog_breed_classifier.labels(),
+            "cat_breeds": cat_breed_classifier.labels()
+        }
+
+    # Read from the model configs, so lazily loaded breed models stay unloaded
+    try:
+        dog_breeds, cat_breeds = await asyncio.gather(
+            model_registry.labels("dog_breed"),
+            model_registry.labels("cat_breed")
+        )
+    except ModelNotReady as e:
+        raise _model_not_ready(e)
+
+    return {"dog_breeds": dog_breeds, "cat_breeds": cat_breeds}
@@ -0,0 +1,196 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Dict, List, Tuple
+import logging
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingPrediction:
+    """A single queued prediction waiting for its batch to run."""
+    image: Image.Image
+    options: Tuple[Tuple[str, Any], ...]
+    future: asyncio.Future = field(repr=False)
+
+
+class BatchScheduler:
+    """Micro-batching queue in front of a single classification model.
+
+    Concurrent requests are collected for up to max_wait_ms (or until
+    max_batch_size is reached), run through the model's predict_batch in
+    one forward pass, and the per-image results are handed back to the
+    waiting callers. Requests with different options (e.g. top_k) are
+    grouped into separate forward passes within the same batch window.
+    """
+
+    def __init__(self, model, name: str, max_batch_size: int = 8, max_wait_ms: float = 5.0):
+        """Initialize batch scheduler.
+
+        Args:
+            model: Classifier exposing predict_batch(images, **options)
+            name: Model name for logging (e.g. "nsfw", "dog_breed")
+            max_batch_size: Maximum number of images per forward pass
+            max_wait_ms: Maximum time to hold the first request while
+                waiting for more to arrive
+        """
+        self.model = model
+        self.name = name
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+
+        self._queue: asyncio.Queue = None
+        self._worker: asyncio.Task = None
+        self._in_flight: List[_PendingPrediction] = []  # Batch being collected or run
+        self._stopped = False
+        # Single inference thread per model: one batch in flight at a time,
+        # and the event loop stays free to accept new requests meanwhile.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"batch-{name}")
+
+        self.batches_run = 0
+        self.images_processed = 0
+
+        logger.info(
+            f"BatchScheduler initialized for {name}: "
+            f"max_batch_size={self.max_batch_size}, max_wait_ms={max_wait_ms}"
+        )
+
+    async def submit(self, image: Image.Image, **options) -> Any:
+        """Queue an image for prediction and wait for its result.
+
+        Args:
+            image: PIL Image object
+            **options: Keyword arguments forwarded to predict_batch (e.g. top_k)
+
+        Returns:
+            The model's prediction for this image (same shape as predict())
+
+        Raises:
+            RuntimeError: If the scheduler has been stopped
+            Exception: Whatever the model raised for the batch containing this image
+        """
+        if self._stopped:
+            raise RuntimeError("scheduler stopped")
+        self._ensure_worker()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put(_PendingPrediction(
+            image=image,
+            options=tuple(sorted(options.items())),
+            future=future
+        ))
+        return await future
+
+    async def stop(self):
+        """Stop the worker task and release the inference thread.
+
+        Predictions still queued or in the batch being run fail with
+        RuntimeError, so their callers get an error instead of hanging.
+        """
+        self._stopped = True
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        pending = self._in_flight
+        self._in_flight = []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for prediction in pending:
+            if not prediction.future.done():
+                prediction.future.set_exception(RuntimeError("scheduler stopped"))
+        if pending:
+            logger.warning(f"BatchScheduler for {self.name} failed {len(pending)} pending predictions on stop")
+
+        self._executor.shutdown(wait=False)
+        logger.info(f"BatchScheduler for {self.name} stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching statistics.
+
+        Returns:
+            Dict with batches run, images processed and average batch size
+        """
+        return {
+            "model": self.name,
+            "batches_run": self.batches_run,
+            "images_processed": self.images_processed,
+            "average_batch_size": round(self.images_processed / self.batches_run, 2) if self.batches_run else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0
+        }
+
+    def _ensure_worker(self):
+        """Start the worker task on the running event loop if needed."""
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        """Worker loop: collect a batch, run it, repeat."""
+        while True:
+            batch = await self._collect_batch()
+            await self._run_batch(batch)
+            self._in_flight = []
+
+    async def _collect_batch(self) -> List[_PendingPrediction]:
+        """Wait for the first request, then gather more until size or time limit."""
+        loop = asyncio.get_running_loop()
+
+        batch = self._in_flight = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            # Take whatever is already queued without waiting
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run_batch(self, batch: List[_PendingPrediction]):
+        """Run one forward pass per option group and resolve the waiting futures."""
+        loop = asyncio.get_running_loop()
+
+        groups: Dict[Tuple[Tuple[str, Any], ...], List[_PendingPrediction]] = {}
+        for pending in batch:
+            # Callers that gave up (e.g. client disconnected) don't need a slot
+            if not pending.future.cancelled():
+                groups.setdefault(pending.options, []).append(pending)
+
+        for options, items in groups.items():
+            try:
+                results = await loop.run_in_executor(
+                    self._executor,
+                    partial(self.model.predict_batch, [p.image for p in items], **dict(options))
+                )
+            except Exception as e:
+                logger.error(f"{self.name} batch of {len(items)} failed: {e}")
+                for pending in items:
+                    if not pending.future.done():
+                        pending.future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.images_processed += len(items)
+            logger.debug(f"{self.name} ran batch of {len(items)} images")
+
+            for pending, result in zip(items, results):
+                if not pending.future.done():
+                    pending.future.set_result(result)
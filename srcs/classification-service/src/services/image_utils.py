@@ -3,7 +3,7 @@ from io import BytesIO
 from PIL import Image
 import torch
 from torchvision import transforms
-from typing import Tuple
+from typing import Tuple, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,6 +33,26 @@ class ImageUtils:
             # Decode base64
             image_bytes = base64.b64decode(image_base64)
 
+        except Exception as e:
+            logger.error(f"Failed to decode base64 image: {e}")
+            raise ValueError(f"Failed to decode base64 image: {str(e)}")
+
+        return ImageUtils.decode_bytes(image_bytes)
+
+    @staticmethod
+    def decode_bytes(image_bytes: bytes) -> Image.Image:
+        """Open raw encoded image bytes (JPEG, PNG, ...) as a PIL Image.
+
+        Args:
+            image_bytes: Encoded image file contents
+
+        Returns:
+            PIL Image object
+
+        Raises:
+            ValueError: If the image cannot be opened
+        """
+        try:
             # Open image
             pil_image = Image.open(BytesIO(image_bytes))
 
@@ -43,8 +63,25 @@ class ImageUtils:
             return pil_image
 
         except Exception as e:
-            logger.error(f"Failed to decode base64 image: {e}")
-            raise ValueError(f"Failed to decode base64 image: {str(e)}")
+            logger.error(f"Failed to decode image: {e}")
+            raise ValueError(f"Failed to decode image: {str(e)}")
+
+    @staticmethod
+    def decode_image(image: Union[str, bytes]) -> Image.Image:
+        """Decode an image sent either as base64 text or as raw bytes.
+
+        Args:
+            image: Base64 string (JSON requests) or raw bytes (binary requests)
+
+        Returns:
+            PIL Image object
+
+        Raises:
+            ValueError: If the image cannot be decoded
+        """
+        if isinstance(image, bytes):
+            return ImageUtils.decode_bytes(image)
+        return ImageUtils.decode_base64(image)
 
     @staticmethod
     def preprocess_for_model(
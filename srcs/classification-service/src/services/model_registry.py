@@ -0,0 +1,251 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Model states reported by status()
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ModelNotReady(Exception):
+    """Raised when a request needs a model that is not loaded (yet)."""
+
+    def __init__(self, name: str, state: str):
+        super().__init__(f"Model {name} is not ready ({state})")
+        self.name = name
+        self.state = state
+
+
+class ModelRegistry:
+    """Loads classification models off the event loop and tracks their readiness.
+
+    Each model is registered with a loader (a blocking callable returning the
+    model). Loads run in worker threads, so several models load concurrently
+    and the service answers liveness probes while they do. A model loads at
+    most once at a time: concurrent load() calls for it share one task.
+
+    Eager models are loaded at startup (load_all), which keeps retrying a
+    failed load with exponential backoff; lazy ones load on first use
+    (ensure). The service is ready once every eager model is loaded.
+
+    A model can also be registered with a labels callable that lists its
+    labels without loading the weights (e.g. from the HF config), so
+    clients can ask for a lazy model's labels without triggering its load.
+    """
+
+    def __init__(self, retry_seconds: float = 5.0, retry_max_seconds: float = 300.0):
+        """Initialize an empty registry.
+
+        Args:
+            retry_seconds: Delay before retrying a failed eager load, doubled
+                after every further failure (0 disables retries)
+            retry_max_seconds: Upper bound for the retry delay
+        """
+        self.retry_seconds = retry_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._label_sources: Dict[str, Callable[[], List[str]]] = {}
+        self._labels: Dict[str, List[str]] = {}
+        self._lazy: Dict[str, bool] = {}
+        self._models: Dict[str, Any] = {}
+        self._states: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._listeners: List[Callable[[str, Any], None]] = []
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        lazy: bool = False,
+        labels: Optional[Callable[[], List[str]]] = None
+    ):
+        """Register a model.
+
+        Args:
+            name: Model name (e.g. "nsfw", "dog_breed")
+            loader: Blocking callable that loads and returns the model
+            lazy: Load on first use instead of at startup
+            labels: Blocking callable listing the model's labels without loading it
+        """
+        self._loaders[name] = loader
+        if labels is not None:
+            self._label_sources[name] = labels
+        self._lazy[name] = lazy
+        self._states[name] = PENDING
+
+    def add_listener(self, callback: Callable[[str, Any], None]):
+        """Call callback(name, model) on the event loop whenever a model finishes loading.
+
+        Args:
+            callback: Listener (e.g. injects the model into the routes)
+        """
+        self._listeners.append(callback)
+
+    @property
+    def names(self) -> List[str]:
+        """Registered model names."""
+        return list(self._loaders)
+
+    def eager(self) -> List[str]:
+        """Names of the models loaded at startup."""
+        return [name for name, lazy in self._lazy.items() if not lazy]
+
+    def is_ready(self, name: str) -> bool:
+        """Whether a model is loaded."""
+        return self._states.get(name) == READY
+
+    def ready(self) -> bool:
+        """Whether every eager model is loaded (lazy models do not count)."""
+        return all(self.is_ready(name) for name in self.eager())
+
+    async def load(self, name: str) -> Any:
+        """Load a model, or wait for the load already in progress.
+
+        Args:
+            name: Registered model name
+
+        Returns:
+            The loaded model
+
+        Raises:
+            KeyError: If the model is not registered
+            Exception: Whatever the loader raised
+        """
+        if name in self._models:
+            return self._models[name]
+
+        task = self._tasks.get(name)
+        if task is None or task.done():
+            # No load yet, or the last one failed: (re)try
+            task = asyncio.get_running_loop().create_task(self._load(name))
+            self._tasks[name] = task
+
+        # Shielded: a caller giving up must not cancel the load for everyone else
+        return await asyncio.shield(task)
+
+    async def _load(self, name: str) -> Any:
+        """Run the loader in a worker thread and publish the model."""
+        loader = self._loaders[name]
+        self._states[name] = LOADING
+        self._errors.pop(name, None)
+        started = time.perf_counter()
+        logger.info(f"Loading model {name}...")
+
+        try:
+            model = await asyncio.to_thread(loader)
+        except Exception as e:
+            self._states[name] = FAILED
+            self._errors[name] = str(e)
+            logger.error(f"Loading model {name} failed: {e}")
+            raise
+
+        self._load_seconds[name] = time.perf_counter() - started
+        self._models[name] = model
+        for listener in self._listeners:
+            listener(name, model)
+        self._states[name] = READY
+        logger.info(f"Model {name} loaded in {self._load_seconds[name]:.1f}s")
+        return model
+
+    async def load_all(self, names: Optional[Iterable[str]] = None):
+        """Load several models concurrently, logging (not raising) failures.
+
+        A failed model is retried after retry_seconds, then after twice
+        that, up to retry_max_seconds, until it loads; this only returns
+        once every model has loaded (or, with retries disabled, failed).
+
+        Args:
+            names: Models to load (defaults to the eager ones)
+        """
+        names = list(self.eager() if names is None else names)
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self._load_with_retry(name) for name in names), return_exceptions=True)
+        failed = [name for name, result in zip(names, results) if isinstance(result, Exception)]
+        if failed:
+            logger.error(f"Models failed to load: {failed}")
+        else:
+            logger.info(f"Loaded {names} in {time.perf_counter() - started:.1f}s")
+
+    async def _load_with_retry(self, name: str) -> Any:
+        """Load a model, retrying with exponential backoff while retries are enabled."""
+        delay = self.retry_seconds
+        while True:
+            try:
+                return await self.load(name)
+            except Exception:
+                if delay <= 0:
+                    raise
+            logger.warning(f"Retrying model {name} in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.retry_max_seconds)
+
+    async def ensure(self, name: str):
+        """Make sure a model is loaded before a request uses it.
+
+        Lazy models are loaded here on first use (the request waits). Eager
+        models are never loaded on demand: until the startup load finishes
+        the request fails fast.
+
+        Args:
+            name: Registered model name
+
+        Raises:
+            ModelNotReady: If the model is not (and cannot now be) loaded
+        """
+        if self.is_ready(name):
+            return
+        if not self._lazy.get(name, False):
+            raise ModelNotReady(name, self._states.get(name, "unknown"))
+        try:
+            await self.load(name)
+        except Exception:
+            raise ModelNotReady(name, FAILED)
+
+    async def labels(self, name: str) -> List[str]:
+        """List a model's labels, without loading it when a labels callable was registered.
+
+        Args:
+            name: Registered model name
+
+        Returns:
+            The model's labels
+
+        Raises:
+            ModelNotReady: If the labels cannot be obtained
+        """
+        if name in self._models:
+            return self._models[name].labels()
+        if name not in self._label_sources:
+            await self.ensure(name)
+            return self._models[name].labels()
+        if name not in self._labels:
+            try:
+                self._labels[name] = await asyncio.to_thread(self._label_sources[name])
+            except Exception as e:
+                logger.error(f"Listing labels of model {name} failed: {e}")
+                raise ModelNotReady(name, FAILED)
+        return self._labels[name]
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Get per-model load state.
+
+        Returns:
+            Dict mapping model name to its state, whether it is lazy, load
+            time in seconds (once loaded) and error (if the last load failed)
+        """
+        status = {}
+        for name in self._loaders:
+            entry = {"state": self._states[name], "lazy": self._lazy[name]}
+            if name in self._load_seconds:
+                entry["load_seconds"] = round(self._load_seconds[name], 2)
+            if name in self._errors:
+                entry["error"] = self._errors[name]
+            status[name] = entry
+        return status
@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import pytest
+from PIL import Image
+
+from src.services.batch_scheduler import BatchScheduler
+
+
+class FakeModel:
+    """Model stub that records the size of every batch it receives."""
+
+    def __init__(self, fail: bool = False):
+        self.batch_sizes = []
+        self.fail = fail
+
+    def predict_batch(self, images, top_k=3):
+        if self.fail:
+            raise RuntimeError("inference failed")
+        self.batch_sizes.append(len(images))
+        return [{"size": image.size, "top_k": top_k} for image in images]
+
+
+def make_image(width: int) -> Image.Image:
+    """Create an image whose width identifies it in results."""
+    return Image.new('RGB', (width, 10), color='red')
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batch():
+    """Test requests arriving within the wait window run as a single batch."""
+    model = FakeModel()
+    scheduler = BatchScheduler(model, "fake", max_batch_size=8, max_wait_ms=50)
+
+    results = await asyncio.gather(*[scheduler.submit(make_image(w)) for w in range(10, 15)])
+    await scheduler.stop()
+
+    assert model.batch_sizes == [5]
+    # Results are fanned back out in submission order
+    assert [r["size"][0] for r in results] == [10, 11, 12, 13, 14]
+
+
+@pytest.mark.asyncio
+async def test_batch_size_is_capped():
+    """Test batches never exceed max_batch_size."""
+    model = FakeModel()
+    scheduler = BatchScheduler(model, "fake", max_batch_size=2, max_wait_ms=50)
+
+    await asyncio.gather(*[scheduler.submit(make_image(w)) for w in range(10, 15)])
+    await scheduler.stop()
+
+    assert sum(model.batch_sizes) == 5
+    assert max(model.batch_sizes) <= 2
+
+
+@pytest.mark.asyncio
+async def test_different_options_run_separately():
+    """Test requests with different top_k are not mixed in one forward pass."""
+    model = FakeModel()
+    scheduler = BatchScheduler(model, "fake", max_batch_size=8, max_wait_ms=50)
+
+    results = await asyncio.gather(
+        scheduler.submit(make_image(10), top_k=3),
+        scheduler.submit(make_image(11), top_k=5),
+        scheduler.submit(make_image(12), top_k=3)
+    )
+    await scheduler.stop()
+
+    assert sorted(model.batch_sizes) == [1, 2]
+    assert [r["top_k"] for r in results] == [3, 5, 3]
+
+
+@pytest.mark.asyncio
+async def test_model_error_propagates_to_callers():
+    """Test an inference failure is raised in every waiting request."""
+    scheduler = BatchScheduler(FakeModel(fail=True), "fake", max_batch_size=8, max_wait_ms=10)
+
+    results = await asyncio.gather(
+        scheduler.submit(make_image(10)),
+        scheduler.submit(make_image(11)),
+        return_exceptions=True
+    )
+    await scheduler.stop()
+
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_stats_track_batches():
+    """Test statistics reflect processed batches."""
+    model = FakeModel()
+    scheduler = BatchScheduler(model, "fake", max_batch_size=8, max_wait_ms=20)
+
+    await asyncio.gather(*[scheduler.submit(make_image(w)) for w in range(10, 14)])
+    stats = scheduler.get_stats()
+    await scheduler.stop()
+
+    assert stats["batches_run"] == 1
+    assert stats["images_processed"] == 4
+    assert stats["average_batch_size"] == 4.0
+
+
+@pytest.mark.asyncio
+async def test_stop_fails_pending_predictions():
+    """Test predictions queued or running at shutdown fail instead of hanging."""
+    release = threading.Event()
+
+    class BlockingModel(FakeModel):
+        def predict_batch(self, images, top_k=3):
+            release.wait(5)
+            return super().predict_batch(images, top_k=top_k)
+
+    scheduler = BatchScheduler(BlockingModel(), "fake", max_batch_size=1, max_wait_ms=0)
+    tasks = [asyncio.create_task(scheduler.submit(make_image(w))) for w in range(10, 13)]
+    await asyncio.sleep(0.05)
+
+    await scheduler.stop()
+    release.set()
+
+    results = await asyncio.wait_for(asyncio.gather(*tasks, return_exceptions=True), timeout=1)
+    assert all(isinstance(result, RuntimeError) and str(result) == "scheduler stopped" for result in results)
+    with pytest.raises(RuntimeError, match="scheduler stopped"):
+        await scheduler.submit(make_image(20))
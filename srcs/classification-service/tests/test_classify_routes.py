@@ -1,4 +1,7 @@
+import base64
+
 import pytest
+from unittest.mock import Mock
 
 
 def test_classify_content_endpoint(client, sample_image_base64):
@@ -73,3 +76,222 @@ def test_classify_content_invalid_image(client):
     )
 
     assert response.status_code == 422
+
+
+def test_classify_pipeline_runs_all_stages(client, sample_image_base64, mock_nsfw_detector, mock_dog_breed_classifier):
+    """Test POST /classify/pipeline returns content, species and breed in one call."""
+    response = client.post(
+        "/classify/pipeline",
+        json={"image": sample_image_base64}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stopped_at"] is None
+    assert data["content"]["is_safe"] is True
+    assert "threshold" in data["content"]
+    assert data["species"]["species"] == "dog"
+    assert data["breed"]["breed_analysis"]["primary_breed"] == "golden_retriever"
+
+    # Image decoded once and passed to every stage
+    nsfw_image = mock_nsfw_detector.predict.call_args[0][0]
+    breed_image = mock_dog_breed_classifier.predict.call_args[0][0]
+    assert nsfw_image is breed_image
+
+
+def test_classify_pipeline_stops_on_unsafe_content(client, sample_image_base64, mock_nsfw_detector, mock_species_classifier):
+    """Test pipeline exits after the content stage for unsafe images."""
+    mock_nsfw_detector.predict.return_value = {"is_safe": False, "nsfw_probability": 0.9}
+
+    response = client.post(
+        "/classify/pipeline",
+        json={"image": sample_image_base64}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stopped_at"] == "content"
+    assert data["species"] is None
+    assert data["breed"] is None
+    mock_species_classifier.predict.assert_not_called()
+
+
+def test_classify_pipeline_stops_on_low_species_confidence(client, sample_image_base64, mock_dog_breed_classifier):
+    """Test pipeline skips breed classification below species_min_confidence."""
+    response = client.post(
+        "/classify/pipeline",
+        json={"image": sample_image_base64, "species_min_confidence": 0.99}
+    )
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stopped_at"] == "species"
+    assert data["breed"] is None
+    mock_dog_breed_classifier.predict.assert_not_called()
+
+
+def test_classify_pipeline_invalid_image(client):
+    """Test pipeline with invalid base64."""
+    response = client.post(
+        "/classify/pipeline",
+        json={"image": "invalid_base64"}
+    )
+
+    assert response.status_code == 422
+
+
+def test_list_labels(client, mock_dog_breed_classifier, mock_cat_breed_classifier):
+    """Test GET /classify/labels returns every breed label per species."""
+    mock_dog_breed_classifier.labels.return_value = ["golden_retriever", "poodle"]
+    mock_cat_breed_classifier.labels.return_value = ["persian", "siamese"]
+
+    response = client.get("/classify/labels")
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "dog_breeds": ["golden_retriever", "poodle"],
+        "cat_breeds": ["persian", "siamese"]
+    }
+
+
+@pytest.fixture
+def sample_image_bytes(sample_image_base64):
+    """Raw JPEG bytes of the sample image."""
+    return base64.b64decode(sample_image_base64.split(",", 1)[1])
+
+
+def test_classify_species_raw_body(client, sample_image_bytes, mock_species_classifier):
+    """Test an application/octet-stream body with options as query parameters."""
+    response = client.post(
+        "/classify/species",
+        params={"top_k": 2},
+        content=sample_image_bytes,
+        headers={"Content-Type": "application/octet-stream"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["species"] == "dog"
+    assert mock_species_classifier.predict.call_args[1] == {"top_k": 2}
+    assert mock_species_classifier.predict.call_args[0][0].size == (224, 224)
+
+
+def test_classify_breed_multipart_body(client, sample_image_bytes, mock_cat_breed_classifier):
+    """Test a multipart body with the image part and options as form fields."""
+    response = client.post(
+        "/classify/breed",
+        data={"species": "cat", "top_k": "3"},
+        files={"image": ("pet.jpg", sample_image_bytes, "image/jpeg")}
+    )
+
+    assert response.status_code == 200
+    assert "breed_analysis" in response.json()
+    assert mock_cat_breed_classifier.predict.call_args[1] == {"top_k": 3}
+
+
+def test_classify_pipeline_raw_body(client, sample_image_bytes, mock_dog_breed_classifier):
+    """Test the fused pipeline accepts a raw image body."""
+    response = client.post(
+        "/classify/pipeline",
+        params={"breed_top_k": 4},
+        content=sample_image_bytes,
+        headers={"Content-Type": "image/jpeg"}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["stopped_at"] is None
+    assert mock_dog_breed_classifier.predict.call_args[1] == {"top_k": 4}
+
+
+def test_classify_raw_body_invalid_options(client, sample_image_bytes):
+    """Test out-of-range query options on a raw body are a 422."""
+    response = client.post(
+        "/classify/breed",
+        params={"species": "rabbit"},
+        content=sample_image_bytes,
+        headers={"Content-Type": "application/octet-stream"}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"] == ["query", "species"]
+
+
+def test_classify_raw_body_invalid_image(client):
+    """Test undecodable raw bytes are rejected as an invalid image."""
+    response = client.post(
+        "/classify/content",
+        content=b"not an image",
+        headers={"Content-Type": "application/octet-stream"}
+    )
+
+    assert response.status_code == 422
+    assert response.json()["detail"]["code"] == "INVALID_IMAGE"
+
+
+def test_classify_multipart_without_image(client):
+    """Test a multipart body without an image part is a 422."""
+    response = client.post("/classify/content", data={"top_k": "3"}, files={"other": ("x.txt", b"x")})
+
+    assert response.status_code == 422
+
+
+def test_classify_unsupported_content_type(client):
+    """Test other content types are a 415."""
+    response = client.post("/classify/content", content=b"image", headers={"Content-Type": "text/plain"})
+
+    assert response.status_code == 415
+
+
+@pytest.fixture
+def lazy_registry(monkeypatch, mock_cat_breed_classifier):
+    """Registry with core models loaded and the cat breed model loading on first use."""
+    from src.routes import classify
+    from src.services.model_registry import ModelRegistry
+
+    registry = ModelRegistry()
+    registry.register("nsfw", Mock())
+    registry.register("species", Mock())
+    loader = Mock(return_value=mock_cat_breed_classifier)
+    registry.register("cat_breed", loader, lazy=True, labels=lambda: ["persian"])
+    registry.add_listener(lambda name, model: setattr(classify, f"{name}_classifier", model))
+    monkeypatch.setattr(classify, "model_registry", registry)
+    monkeypatch.setattr(classify, "cat_breed_classifier", None)
+    return registry, loader
+
+
+def test_lazy_breed_model_loads_on_first_use(client, sample_image_base64, lazy_registry, mock_cat_breed_classifier):
+    """Test the first cat breed request loads the model, later ones reuse it."""
+    registry, loader = lazy_registry
+
+    for _ in range(2):
+        response = client.post(
+            "/classify/breed",
+            json={"image": sample_image_base64, "species": "cat"}
+        )
+        assert response.status_code == 200
+
+    assert loader.call_count == 1
+    assert mock_cat_breed_classifier.predict.call_count == 2
+
+
+def test_model_not_ready_returns_503(client, sample_image_base64, lazy_registry):
+    """Test requests needing an eager model that is still loading get a 503."""
+    response = client.post("/classify/content", json={"image": sample_image_base64})
+
+    assert response.status_code == 503
+    assert response.json()["detail"]["code"] == "MODEL_NOT_READY"
+    assert response.headers["Retry-After"] == "5"
+
+
+def test_list_labels_leaves_lazy_breed_models_unloaded(client, lazy_registry, mock_dog_breed_classifier):
+    """Test /classify/labels reads labels without loading lazy breed models."""
+    registry, loader = lazy_registry
+    dog_loader = Mock()
+    registry.register("dog_breed", dog_loader, lazy=True, labels=lambda: ["beagle"])
+
+    response = client.get("/classify/labels")
+
+    assert response.status_code == 200
+    assert response.json() == {"dog_breeds": ["beagle"], "cat_breeds": ["persian"]}
+    loader.assert_not_called()
+    dog_loader.assert_not_called()
+    mock_dog_breed_classifier.labels.assert_not_called()
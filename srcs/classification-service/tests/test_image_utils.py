@@ -58,3 +58,18 @@ def test_preprocess_image_for_model(sample_image_base64):
     assert isinstance(tensor, torch.Tensor)
     assert tensor.shape == (3, 224, 224)  # C, H, W
     assert tensor.dtype == torch.float32
+
+
+def test_decode_bytes_and_decode_image(sample_image_base64):
+    """Test raw bytes decode to the same image as their base64 form."""
+    image_bytes = base64.b64decode(sample_image_base64.split(",", 1)[1])
+
+    assert ImageUtils.decode_bytes(image_bytes).size == (100, 100)
+    assert ImageUtils.decode_image(image_bytes).size == (100, 100)
+    assert ImageUtils.decode_image(sample_image_base64).size == (100, 100)
+
+
+def test_decode_bytes_invalid():
+    """Test undecodable bytes raise ValueError."""
+    with pytest.raises(ValueError, match="Failed to decode image"):
+        ImageUtils.decode_bytes(b"not an image")
@@ -0,0 +1,198 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import Mock
+
+from src.services.model_registry import FAILED, LOADING, READY, ModelNotReady, ModelRegistry
+
+
+def slow_loader(model, seconds=0.2):
+    """Loader that blocks its thread for a while, like from_pretrained."""
+    def load():
+        time.sleep(seconds)
+        return model
+    return load
+
+
+@pytest.mark.asyncio
+async def test_models_load_concurrently():
+    """Test eager models load in parallel threads rather than one after another."""
+    registry = ModelRegistry()
+    for name in ("nsfw", "species", "dog_breed", "cat_breed"):
+        registry.register(name, slow_loader(name, seconds=0.3))
+
+    started = time.perf_counter()
+    await registry.load_all()
+
+    assert time.perf_counter() - started < 0.9
+    assert registry.ready()
+    assert registry.status()["nsfw"]["state"] == READY
+    assert registry.status()["nsfw"]["load_seconds"] >= 0.3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_share_one_call():
+    """Test callers asking for a model mid-load wait for the same load."""
+    registry = ModelRegistry()
+    loader = Mock(side_effect=slow_loader("model", seconds=0.1))
+    registry.register("dog_breed", loader, lazy=True)
+
+    results = await asyncio.gather(*(registry.load("dog_breed") for _ in range(5)))
+
+    assert results == ["model"] * 5
+    assert loader.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_listener_runs_before_model_reports_ready():
+    """Test listeners see every loaded model before requests can use it."""
+    registry = ModelRegistry()
+    registry.register("nsfw", lambda: "detector")
+    installed = {}
+    registry.add_listener(lambda name, model: installed.update({name: (model, registry.is_ready(name))}))
+
+    await registry.load_all()
+
+    assert installed == {"nsfw": ("detector", False)}
+    assert registry.is_ready("nsfw")
+
+
+@pytest.mark.asyncio
+async def test_readiness_ignores_lazy_models():
+    """Test the registry is ready once eager models load, with lazy ones still pending."""
+    registry = ModelRegistry()
+    registry.register("species", lambda: "species")
+    registry.register("cat_breed", lambda: "cat", lazy=True)
+
+    await registry.load_all()
+
+    assert registry.eager() == ["species"]
+    assert registry.ready()
+    assert not registry.is_ready("cat_breed")
+
+    await registry.ensure("cat_breed")
+    assert registry.is_ready("cat_breed")
+
+
+@pytest.mark.asyncio
+async def test_ensure_fails_fast_for_eager_model_still_loading():
+    """Test a request for an eager model still loading raises instead of waiting."""
+    registry = ModelRegistry()
+    release = threading.Event()
+    registry.register("nsfw", lambda: release.wait(5) and "detector")
+    loading = asyncio.create_task(registry.load_all())
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(ModelNotReady) as exc_info:
+        await registry.ensure("nsfw")
+    assert exc_info.value.state == LOADING
+
+    release.set()
+    await loading
+    await registry.ensure("nsfw")
+
+
+@pytest.mark.asyncio
+async def test_failed_load_is_reported_and_retried():
+    """Test a failing loader marks the model failed; a lazy model retries on next use."""
+    registry = ModelRegistry()
+    loader = Mock(side_effect=[OSError("download failed"), "cat"])
+    registry.register("cat_breed", loader, lazy=True)
+
+    with pytest.raises(ModelNotReady):
+        await registry.ensure("cat_breed")
+    assert registry.status()["cat_breed"] == {"state": FAILED, "lazy": True, "error": "download failed"}
+
+    await registry.ensure("cat_breed")
+    assert registry.is_ready("cat_breed")
+    assert "error" not in registry.status()["cat_breed"]
+
+
+@pytest.mark.asyncio
+async def test_load_all_logs_failures_without_raising():
+    """Test one model failing at startup does not stop the others."""
+    registry = ModelRegistry(retry_seconds=0)
+    registry.register("nsfw", Mock(side_effect=OSError("no space left")))
+    registry.register("species", lambda: "species")
+
+    await registry.load_all()
+
+    assert registry.is_ready("species")
+    assert registry.status()["nsfw"]["state"] == FAILED
+    assert not registry.ready()
+
+
+@pytest.mark.asyncio
+async def test_failed_eager_load_retried_with_backoff(monkeypatch):
+    """Test load_all keeps retrying a failed eager model, doubling the delay, until it loads."""
+    delays = []
+    real_sleep = asyncio.sleep
+
+    async def sleep(seconds):
+        delays.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    registry = ModelRegistry(retry_seconds=1, retry_max_seconds=3)
+    loader = Mock(side_effect=[OSError("hub down"), OSError("hub down"), OSError("hub down"), "detector"])
+    registry.register("nsfw", loader)
+
+    await registry.load_all()
+
+    assert delays == [1, 2, 3]
+    assert loader.call_count == 4
+    assert registry.ready()
+
+
+@pytest.mark.asyncio
+async def test_labels_without_loading_model():
+    """Test labels come from the labels callable, leaving a lazy model unloaded."""
+    registry = ModelRegistry()
+    loader = Mock()
+    label_source = Mock(return_value=["beagle", "poodle"])
+    registry.register("dog_breed", loader, lazy=True, labels=label_source)
+
+    assert await registry.labels("dog_breed") == ["beagle", "poodle"]
+    assert await registry.labels("dog_breed") == ["beagle", "poodle"]
+
+    loader.assert_not_called()
+    assert label_source.call_count == 1
+    assert not registry.is_ready("dog_breed")
+
+
+@pytest.mark.asyncio
+async def test_labels_failure_raises_model_not_ready():
+    """Test a failing labels callable surfaces as ModelNotReady."""
+    registry = ModelRegistry()
+    registry.register("cat_breed", Mock(), lazy=True, labels=Mock(side_effect=OSError("offline")))
+
+    with pytest.raises(ModelNotReady):
+        await registry.labels("cat_breed")
+
+
+def test_ready_endpoints():
+    """Test /ready and /ready/{model} report readiness while /health stays up."""
+    from src.main import app
+
+    registry = ModelRegistry()
+    registry.register("nsfw", lambda: "detector")
+    registry.register("dog_breed", lambda: "dogs", lazy=True)
+    app.state.model_registry = registry
+    client = TestClient(app)
+
+    assert client.get("/health").status_code == 200
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "loading"
+
+    asyncio.run(registry.load_all())
+
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["models"]["dog_breed"] == {"state": "pending", "lazy": True}
+    assert client.get("/ready/nsfw").status_code == 200
+    assert client.get("/ready/dog_breed").status_code == 503
+    assert client.get("/ready/unicorn").status_code == 404
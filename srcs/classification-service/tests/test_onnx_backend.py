@@ -0,0 +1,100 @@
+"""Parity of the onnxruntime backend with eager torch, on a tiny local ViT."""
+import pytest
+import torch
+from PIL import Image
+from transformers import ViTConfig, ViTForImageClassification, ViTImageProcessor
+
+from src.models.breed_classifier import DogBreedClassifier
+from src.models.inference import ClassifierRuntime, export_onnx, onnx_model_path
+from src.models.nsfw_detector import NSFWDetector
+from src.models.species_classifier import SpeciesClassifier
+
+pytest.importorskip("onnxruntime")
+pytest.importorskip("onnx")  # Needed by torch.onnx.export
+
+LABELS = ["golden retriever", "poodle", "Beagle", "cat", "dog"]
+
+
+@pytest.fixture(scope="module")
+def model_dirs(tmp_path_factory):
+    """Randomly initialised tiny ViT saved like a HF checkpoint, plus its ONNX export."""
+    root = tmp_path_factory.mktemp("onnx")
+    model_dir = root / "tiny-vit"
+    torch.manual_seed(0)
+    config = ViTConfig(
+        image_size=32, patch_size=8, hidden_size=32, num_hidden_layers=2,
+        num_attention_heads=2, intermediate_size=64, num_labels=len(LABELS),
+        id2label=dict(enumerate(LABELS)), label2id={label: i for i, label in enumerate(LABELS)}
+    )
+    ViTForImageClassification(config).save_pretrained(model_dir)
+    ViTImageProcessor(size={"height": 32, "width": 32}).save_pretrained(model_dir)
+
+    onnx_dir = root / "exported"
+    export_onnx(str(model_dir), str(onnx_dir))
+    return str(model_dir), str(onnx_dir)
+
+
+@pytest.fixture
+def images():
+    """A few random images of different sizes."""
+    generator = torch.Generator().manual_seed(1)
+    return [
+        Image.fromarray((torch.rand(h, w, 3, generator=generator) * 255).to(torch.uint8).numpy())
+        for h, w in ((40, 40), (64, 48), (100, 30))
+    ]
+
+
+def test_export_writes_graph_per_model(model_dirs):
+    """Test the export lands at the path the onnx backend reads from."""
+    model_dir, onnx_dir = model_dirs
+    assert onnx_model_path(onnx_dir, model_dir).exists()
+
+
+def test_logits_match_torch(model_dirs, images):
+    """Test onnxruntime logits match eager torch for a whole batch."""
+    model_dir, onnx_dir = model_dirs
+    pixel_values = ViTImageProcessor.from_pretrained(model_dir)(images=images, return_tensors="pt")["pixel_values"]
+
+    torch_logits = ClassifierRuntime(model_dir).logits(pixel_values)
+    onnx_runtime = ClassifierRuntime(model_dir, backend="onnx", onnx_dir=onnx_dir, intra_op_threads=1)
+    onnx_logits = onnx_runtime.logits(pixel_values)
+
+    assert onnx_runtime.model is None
+    assert onnx_logits.shape == (len(images), len(LABELS))
+    assert torch.allclose(torch_logits, onnx_logits, atol=1e-4)
+
+
+@pytest.mark.parametrize("classifier_cls,options", [
+    (DogBreedClassifier, {"top_k": 3}),
+    (SpeciesClassifier, {"top_k": 3}),
+    (NSFWDetector, {})
+])
+def test_classifier_predictions_match(model_dirs, images, classifier_cls, options):
+    """Test each classifier returns the same predictions on both backends."""
+    model_dir, onnx_dir = model_dirs
+    torch_classifier = classifier_cls(device="cpu", model_id=model_dir)
+    onnx_classifier = classifier_cls(device="cpu", model_id=model_dir, backend="onnx", onnx_dir=onnx_dir)
+
+    assert onnx_classifier.predict_batch(images, **options) == torch_classifier.predict_batch(images, **options)
+
+
+def test_breed_labels_available_without_torch_weights(model_dirs):
+    """Test labels come from the model config on the onnx backend."""
+    model_dir, onnx_dir = model_dirs
+    classifier = DogBreedClassifier(device="cpu", model_id=model_dir, backend="onnx", onnx_dir=onnx_dir)
+
+    assert classifier.labels() == ["golden_retriever", "poodle", "beagle", "cat", "dog"]
+
+
+def test_missing_export_raises(model_dirs, tmp_path):
+    """Test selecting the onnx backend without an export fails with a hint."""
+    model_dir, _ = model_dirs
+    with pytest.raises(FileNotFoundError, match="scripts.export_onnx"):
+        ClassifierRuntime(model_dir, backend="onnx", onnx_dir=str(tmp_path))
+
+
+def test_unknown_backend_raises(model_dirs):
+    """Test an unknown INFERENCE_BACKEND is a ValueError."""
+    model_dir, _ = model_dirs
+    with pytest.raises(ValueError, match="Unknown inference backend"):
+        ClassifierRuntime(model_dir, backend="tensorrt")